@@ -0,0 +1,125 @@
+"""pytest-benchmark suite for the runtime hot paths.
+
+The ``test_*_bench.py`` modules in this directory time the code every
+assignment and every state change runs through: input expansion and output
+shrinking, evented states, the agent's patch loop, assignments through a
+loopback transport, the SQLite sink and retriever, the wire encodings and the
+FastAPI broadcast. They are not part of
+the regular test run (``testpaths`` only lists ``tests``) and need the
+``pytest-benchmark`` dev dependency.
+
+Runs are stored in ``benchmarks/baselines/<host name>`` (and in there one folder
+per platform and python version, as pytest-benchmark lays them out), which is
+not checked in: timings are only comparable on the machine that recorded them.
+Record a baseline on the machine that should guard against regressions, then
+compare later runs against it: passing ``--benchmark-compare-fail`` fails the
+run if a benchmark regressed by more than the given amount (it compares against
+the latest run saved on this machine, unless ``--benchmark-compare`` picks
+another one).
+
+Usage::
+
+    python -m pytest benchmarks --benchmark-save=baseline
+    python -m pytest benchmarks --benchmark-compare-fail=median:25%
+    python -m pytest benchmarks --benchmark-compare=0001 --benchmark-compare-fail=mean:10%
+"""
+
+import asyncio
+import glob
+import os
+import platform
+import warnings
+from typing import Any, Awaitable, Callable, Dict, Generator
+
+import pytest
+
+BASELINES = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baselines", platform.node() or "local"
+)
+"""Where runs of this machine are saved and compared from, unless
+``--benchmark-storage`` is given."""
+
+DEFAULT_STORAGE = "file://./.benchmarks"
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config: pytest.Config) -> None:
+    """Point the benchmark storage at this machine's baselines and enable comparing.
+
+    Runs before pytest-benchmark reads its options.
+    """
+    own_storage = config.getoption("benchmark_storage", None) == DEFAULT_STORAGE
+    if own_storage:
+        config.option.benchmark_storage = f"file://{BASELINES}"
+    if config.getoption("benchmark_compare_fail", None) and not config.getoption(
+        "benchmark_compare", None
+    ):
+        if own_storage and not glob.glob(os.path.join(BASELINES, "*", "*.json")):
+            # A fresh machine has nothing to regress from yet
+            warnings.warn(
+                f"No baseline saved in {BASELINES}, not comparing. Record one with "
+                "--benchmark-save first."
+            )
+            config.option.benchmark_compare_fail = None
+        else:
+            # Compare against the latest baseline saved on this machine
+            config.option.benchmark_compare = True
+
+
+class MemoryShelver:
+    """Keeps shelved values in memory, like the shelver of a running agent."""
+
+    def __init__(self) -> None:
+        """Start with an empty shelve."""
+        self.shelve: Dict[str, Any] = {}
+
+    async def aput_on_shelve(self, identifier: str, value: Any) -> str:  # noqa: ANN401
+        """Shelve a value and return its key."""
+        key = f"{identifier}-{len(self.shelve)}"
+        self.shelve[key] = value
+        return key
+
+    async def aget_from_shelve(self, key: str) -> Any:  # noqa: ANN401
+        """Return a shelved value."""
+        return self.shelve[key]
+
+
+@pytest.fixture
+def shelver() -> MemoryShelver:
+    """An in-memory shelver."""
+    return MemoryShelver()
+
+
+@pytest.fixture
+def event_loop_runner() -> Generator[Callable[[Awaitable[Any]], Any], None, None]:
+    """Run coroutines to completion on one event loop for the whole benchmark.
+
+    Background tasks created by one round (e.g. the agent's patch loop) keep
+    running between rounds.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        yield loop.run_until_complete
+    finally:
+        for task in asyncio.all_tasks(loop):
+            task.cancel()
+        loop.run_until_complete(asyncio.sleep(0))
+        loop.close()
+
+
+@pytest.fixture
+def abenchmark(
+    benchmark: Any,  # noqa: ANN401
+    event_loop_runner: Callable[[Awaitable[Any]], Any],
+) -> Callable[..., Any]:
+    """Benchmark a coroutine function: every round awaits a fresh coroutine.
+
+    Returns:
+        Callable[..., Any]: Call it with the coroutine function and its
+            arguments, it returns the result of the last round.
+    """
+
+    def run(function: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        return benchmark(lambda: event_loop_runner(function(*args, **kwargs)))
+
+    return run
@@ -0,0 +1,98 @@
+"""Benchmark: assignments per second of a no-op action, with and without micro-task mode.
+
+Runs entirely in-process: the agent talks to a transport that drops every message,
+and each assignment is driven straight through the actor's ``on_assign``, so the
+numbers measure the per-assignment overhead of the actor pipeline itself.
+
+Usage::
+
+    python benchmarks/micro_task.py [--assignments 5000]
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from typing import AsyncIterator
+
+from rekuest_next import messages
+from rekuest_next.actors.types import RegisterConfig
+from rekuest_next.agents.base import BaseAgent
+from rekuest_next.agents.transport.base import AgentTransport
+from rekuest_next.app import AppRegistry
+from rekuest_next.register import register_func
+from rekuest_next.structures.default import get_default_structure_registry
+
+
+class NullTransport(AgentTransport):
+    """A transport that accepts and drops every message."""
+
+    @property
+    def connected(self) -> bool:
+        return True
+
+    async def asend(self, message: messages.FromAgentMessage) -> None:
+        return None
+
+    async def aconnect(self) -> None:
+        return None
+
+    async def areceive(self) -> AsyncIterator[messages.ToAgentMessage]:
+        await asyncio.Event().wait()
+        yield  # type: ignore[misc]
+
+    async def adisconnect(self) -> None:
+        return None
+
+
+async def noop(x: int) -> int:
+    """Return the input unchanged."""
+    return x
+
+
+def _assign(interface: str) -> messages.Assign:
+    return messages.Assign(
+        interface=interface,
+        task=str(uuid.uuid4()),
+        args={"x": 1},
+        user="bench",
+        org="bench",
+        action="bench",
+        implementation="bench",
+    )
+
+
+async def _arate(micro_task: bool, assignments: int) -> float:
+    registry = AppRegistry()
+    register_func(
+        noop,
+        get_default_structure_registry(),
+        registry,
+        RegisterConfig(interface="noop", micro_task=micro_task),
+    )
+    agent = BaseAgent(transport=NullTransport(), app_registry=registry, name="bench")
+    actor = await agent.aspawn_actor_from_assign(_assign("noop"))
+
+    batch = [_assign("noop") for _ in range(assignments)]
+    start = time.perf_counter()
+    for assign in batch:
+        await actor.on_assign(assign)
+    elapsed = time.perf_counter() - start
+    return assignments / elapsed
+
+
+async def main(assignments: int) -> None:
+    """Run the benchmark and print assignments/sec for both modes."""
+    await _arate(False, 100)  # warm up imports and lazy model builds
+    await _arate(True, 100)
+
+    default = await _arate(False, assignments)
+    micro = await _arate(True, assignments)
+    print(f"default:    {default:10.0f} assignments/s")
+    print(f"micro_task: {micro:10.0f} assignments/s ({micro / default:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assignments", type=int, default=5000)
+    asyncio.run(main(parser.parse_args().assignments))
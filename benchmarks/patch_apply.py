@@ -0,0 +1,110 @@
+"""Benchmark: applying state patches with ``jsonpatch`` vs ``rekuest_next.state.apply``.
+
+The workload mirrors what the agent and the retrievers see: a state with a
+growing list of positions and a few scalar fields, patched by a stream of
+appends to the list and replaces of fields and list items. Each implementation
+applies the same operations to its own copy of the state.
+
+Usage::
+
+    python benchmarks/patch_apply.py [--operations 20000]
+"""
+
+import argparse
+import copy
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+import jsonpatch  # type: ignore[import-untyped]
+
+from rekuest_next.state.apply import apply_operation, apply_operations
+
+
+def _initial_state() -> Dict[str, Any]:
+    return {
+        "positions": [{"x": 0.0, "y": 0.0, "z": 0.0} for _ in range(100)],
+        "meta": {"label": "stage", "moving": False, "temperature": 21.0},
+    }
+
+
+def _operations(count: int) -> List[Dict[str, Any]]:
+    rng = random.Random(42)
+    length = 100
+    operations: List[Dict[str, Any]] = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.4:
+            operations.append(
+                {
+                    "op": "add",
+                    "path": "/positions/-",
+                    "value": {"x": 1.0, "y": 2.0, "z": 3.0},
+                }
+            )
+            length += 1
+        elif roll < 0.8:
+            operations.append(
+                {
+                    "op": "replace",
+                    "path": f"/positions/{rng.randrange(length)}/x",
+                    "value": rng.random(),
+                }
+            )
+        else:
+            operations.append(
+                {"op": "replace", "path": "/meta/temperature", "value": rng.random()}
+            )
+    return operations
+
+
+def _jsonpatch(state: Any, operations: List[Dict[str, Any]]) -> Any:  # noqa: ANN401
+    for operation in operations:
+        state = jsonpatch.apply_patch(state, [operation], in_place=True)
+    return state
+
+
+def _single(state: Any, operations: List[Dict[str, Any]]) -> Any:  # noqa: ANN401
+    for operation in operations:
+        state = apply_operation(
+            state, operation["op"], operation["path"], operation.get("value")
+        )
+    return state
+
+
+def _batch(state: Any, operations: List[Dict[str, Any]]) -> Any:  # noqa: ANN401
+    return apply_operations(state, operations)
+
+
+def _rate(
+    apply: Callable[[Any, List[Dict[str, Any]]], Any],
+    operations: List[Dict[str, Any]],
+) -> tuple[float, Any]:
+    state = _initial_state()
+    # Appended values are modified by later replaces, every run gets its own
+    operations = copy.deepcopy(operations)
+    start = time.perf_counter()
+    result = apply(state, operations)
+    elapsed = time.perf_counter() - start
+    return len(operations) / elapsed, result
+
+
+def main(count: int) -> None:
+    """Run the benchmark and print operations/sec for each implementation."""
+    operations = _operations(count)
+
+    baseline, expected = _rate(_jsonpatch, operations)
+    single, single_result = _rate(_single, operations)
+    batch, batch_result = _rate(_batch, operations)
+
+    assert single_result == expected and batch_result == expected
+
+    print(f"jsonpatch:        {baseline:12.0f} ops/s")
+    print(f"apply_operation:  {single:12.0f} ops/s ({single / baseline:.1f}x)")
+    print(f"apply_operations: {batch:12.0f} ops/s ({batch / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operations", type=int, default=20000)
+    main(parser.parse_args().operations)
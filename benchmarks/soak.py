@@ -0,0 +1,108 @@
+"""Soak test: a RekuestAgent under sustained load from a local fake backend.
+
+Starts a :class:`~rekuest_next.testing.FakeRekuestServer`, connects a
+``RekuestAgent`` with a ``WebsocketAgentTransport`` to it and fires
+assignments at a fixed rate, optionally dropping the connection and bouncing
+the agent while doing so. Prints the end-to-end latency percentiles and the
+sustained assignments per second. Nothing leaves the machine, so this runs in
+CI: with ``--max-p99-ms``/``--min-throughput`` the script exits non-zero if the
+agent does not keep up.
+
+Usage::
+
+    python benchmarks/soak.py [--rate 200] [--duration 10] [--work-ms 0]
+        [--disconnect-every 2] [--bounce-every 3] [--encoding JSON]
+        [--max-p99-ms 50] [--min-throughput 150]
+"""
+
+import argparse
+import asyncio
+import sys
+
+from rekuest_next import messages
+from rekuest_next.actors.types import RegisterConfig
+from rekuest_next.agents.base import RekuestAgent
+from rekuest_next.agents.transport.websocket import WebsocketAgentTransport
+from rekuest_next.app import AppRegistry
+from rekuest_next.register import register_func
+from rekuest_next.structures.default import get_default_structure_registry
+from rekuest_next.testing import FakeRekuestServer, LoadReport
+
+
+async def work(x: int, milliseconds: float) -> int:
+    """Simulate an assignment that takes some time."""
+    if milliseconds > 0:
+        await asyncio.sleep(milliseconds / 1000)
+    return x + 1
+
+
+async def soak(args: argparse.Namespace) -> LoadReport:
+    registry = AppRegistry()
+    register_func(work, get_default_structure_registry(), registry, RegisterConfig())
+
+    async with FakeRekuestServer() as server:
+        agent = RekuestAgent(
+            transport=WebsocketAgentTransport(
+                endpoint_url=server.endpoint_url,
+                token_loader=server.atoken,
+                encoding=messages.WireEncoding(args.encoding),
+                time_between_retries=0.05,
+            ),
+            rath=server.rath(),
+            app_registry=registry,
+            name="soak",
+        )
+        async with agent.rath, agent:
+            provide = asyncio.create_task(agent.aprovide())
+            try:
+                await server.aawait_connected(timeout=10)
+                return await server.arun_load(
+                    "work",
+                    {"x": 1, "milliseconds": args.work_ms},
+                    rate=args.rate,
+                    duration=args.duration,
+                    disconnect_every=args.disconnect_every,
+                    bounce_every=args.bounce_every,
+                )
+            finally:
+                provide.cancel()
+                try:
+                    await provide
+                except asyncio.CancelledError:
+                    pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=200.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--work-ms", type=float, default=0.0)
+    parser.add_argument("--disconnect-every", type=float, default=None)
+    parser.add_argument("--bounce-every", type=float, default=None)
+    parser.add_argument(
+        "--encoding",
+        choices=[encoding.value for encoding in messages.WireEncoding],
+        default=messages.WireEncoding.JSON.value,
+    )
+    parser.add_argument("--max-p99-ms", type=float, default=None)
+    parser.add_argument("--min-throughput", type=float, default=None)
+    args = parser.parse_args()
+
+    report = asyncio.run(soak(args))
+    print(report.summary())
+
+    failures = []
+    if report.outstanding:
+        failures.append(f"{report.outstanding} assignments never finished")
+    p99 = report.percentile(99)
+    if args.max_p99_ms is not None and (p99 is None or p99 * 1000 > args.max_p99_ms):
+        failures.append(f"p99 latency above {args.max_p99_ms} ms")
+    if args.min_throughput is not None and report.throughput < args.min_throughput:
+        failures.append(f"throughput below {args.min_throughput} assignments/s")
+    if failures:
+        print("FAILED: " + "; ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmarks for assignment throughput of the agent runtime, without any I/O.
+
+The agent runs against a :class:`LoopbackAgentTransport`, so a round measures
+the assign → actor → report → ack path and nothing of the network.
+"""
+
+import asyncio
+from typing import Any, AsyncGenerator, Callable, Generator
+
+import pytest
+
+from rekuest_next import messages
+from rekuest_next.actors.types import RegisterConfig
+from rekuest_next.agents.transport.loopback import (
+    LoopbackAgent,
+    LoopbackAgentTransport,
+    LoopbackDriver,
+)
+from rekuest_next.app import AppRegistry
+from rekuest_next.register import register_func
+from rekuest_next.structures.default import get_default_structure_registry
+
+ASSIGNMENTS = 100
+
+
+async def add_one(x: int) -> int:
+    """Add one to a number."""
+    return x + 1
+
+
+async def count_to(x: int) -> AsyncGenerator[int, None]:
+    """Count up to a number."""
+    for i in range(x):
+        yield i
+
+
+@pytest.fixture
+def driver(
+    event_loop_runner: Callable[..., Any],
+) -> Generator[LoopbackDriver, None, None]:
+    """A driver of a provided loopback agent."""
+    registry = AppRegistry()
+    for function in (add_one, count_to):
+        register_func(
+            function, get_default_structure_registry(), registry, RegisterConfig()
+        )
+    transport = LoopbackAgentTransport()
+    agent = LoopbackAgent(transport=transport, app_registry=registry, name="bench")
+
+    async def astart() -> None:
+        await agent.__aenter__()
+        asyncio.create_task(agent.aprovide())
+
+    event_loop_runner(astart())
+    yield transport.driver
+    event_loop_runner(agent.__aexit__(None, None, None))
+
+
+async def _asequential(driver: LoopbackDriver) -> messages.FromAgentEvent:
+    result = None
+    for i in range(ASSIGNMENTS):
+        task = await driver.aassign("add_one", {"x": i})
+        result = await driver.aresult(task, timeout=10)
+    assert isinstance(result, messages.Completed)
+    return result
+
+
+async def _aconcurrent(driver: LoopbackDriver) -> list[messages.FromAgentEvent]:
+    tasks = [await driver.aassign("add_one", {"x": i}) for i in range(ASSIGNMENTS)]
+    return await asyncio.gather(*(driver.aresult(task, timeout=10) for task in tasks))
+
+
+async def _agenerator(driver: LoopbackDriver) -> int:
+    task = await driver.aassign("count_to", {"x": ASSIGNMENTS})
+    return len([e async for e in driver.aevents(task) if isinstance(e, messages.Yield)])
+
+
+def test_sequential_assignments(
+    abenchmark: Any,  # noqa: ANN401
+    driver: LoopbackDriver,
+) -> None:
+    abenchmark(_asequential, driver)
+
+
+def test_concurrent_assignments(
+    abenchmark: Any,  # noqa: ANN401
+    driver: LoopbackDriver,
+) -> None:
+    results = abenchmark(_aconcurrent, driver)
+    assert all(isinstance(result, messages.Completed) for result in results)
+
+
+def test_generator_yields(
+    abenchmark: Any,  # noqa: ANN401
+    driver: LoopbackDriver,
+) -> None:
+    assert abenchmark(_agenerator, driver) == ASSIGNMENTS
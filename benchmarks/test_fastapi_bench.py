@@ -0,0 +1,122 @@
+"""Benchmarks for the FastAPI agent: websocket broadcasts and state reads."""
+
+from typing import Any, Callable, List
+
+import pytest
+
+from rekuest_next import messages
+from rekuest_next.api.schema import PortKind, ReturnPortInput, StateDefinitionInput
+from rekuest_next.contrib.fastapi.agent import (
+    FastAPIConnectionManager,
+    FastApiAgent,
+    _WebSocketSubscriptions,
+)
+
+
+class CountingWebSocket:
+    """Counts the frames a connection manager sends to it."""
+
+    def __init__(self) -> None:
+        """Start without frames."""
+        self.frames = 0
+
+    async def send_text(self, data: str) -> None:
+        """Count a text frame."""
+        self.frames += 1
+
+    async def send_bytes(self, data: bytes) -> None:
+        """Count a binary frame."""
+        self.frames += 1
+
+
+async def _amanager(
+    connections: int, subscriptions: Callable[[int], _WebSocketSubscriptions]
+) -> tuple[FastAPIConnectionManager, List[CountingWebSocket]]:
+    manager = FastAPIConnectionManager()
+    websockets = [CountingWebSocket() for _ in range(connections)]
+    for i, websocket in enumerate(websockets):
+        await manager.connect(websocket, subscriptions(i))  # type: ignore[arg-type]
+    return manager, websockets
+
+
+@pytest.mark.parametrize("connections", [1, 10, 100])
+def test_broadcast_fan_out(
+    abenchmark: Any,  # noqa: ANN401
+    event_loop_runner: Callable[..., Any],
+    connections: int,
+) -> None:
+    manager, websockets = event_loop_runner(
+        _amanager(connections, lambda i: _WebSocketSubscriptions())
+    )
+    message = messages.Lock(key="stage", task="task-1")
+
+    abenchmark(manager.broadcast_model, message)
+    assert all(websocket.frames for websocket in websockets)
+
+
+def test_broadcast_filtered_fan_out(
+    abenchmark: Any,  # noqa: ANN401
+    event_loop_runner: Callable[..., Any],
+) -> None:
+    # Only one in ten connections subscribed to the lock
+    manager, websockets = event_loop_runner(
+        _amanager(
+            100,
+            lambda i: _WebSocketSubscriptions(
+                lock_keys={"stage" if i % 10 == 0 else f"other-{i}"}
+            ),
+        )
+    )
+    message = messages.Lock(key="stage", task="task-1")
+
+    abenchmark(manager.broadcast_model, message)
+    assert sum(1 for websocket in websockets if websocket.frames) == 10
+
+
+def _state_agent() -> FastApiAgent:
+    agent = FastApiAgent()
+    agent.current_session = "session-1"
+    agent._collected_state_schemas["stage"] = StateDefinitionInput(
+        name="Stage",
+        ports=(
+            ReturnPortInput(
+                key="positions",
+                kind=PortKind.LIST,
+                nullable=False,
+                children=(
+                    ReturnPortInput(
+                        key="...",
+                        kind=PortKind.LIST,
+                        nullable=False,
+                        children=(
+                            ReturnPortInput(
+                                key="...", kind=PortKind.FLOAT, nullable=False
+                            ),
+                        ),
+                    ),
+                ),
+            ),
+        ),
+    )
+    agent.states["stage"] = object()
+    agent._current_shrunk_states["stage"] = {
+        "positions": [[float(i), float(i)] for i in range(5000)]
+    }
+    return agent
+
+
+async def _aread_uncached(agent: FastApiAgent) -> bytes:
+    # What the state list route did before: deep copy, then serialize
+    views = await agent.aget_state_views()
+    return views.model_dump_json().encode()
+
+
+def test_state_read_uncached(abenchmark: Any) -> None:  # noqa: ANN401
+    abenchmark(_aread_uncached, _state_agent())
+
+
+def test_state_read_same_revision(abenchmark: Any) -> None:  # noqa: ANN401
+    # Polls between two patches are served from the per-revision cache
+    agent = _state_agent()
+    etag, body = abenchmark(agent.aget_serialized_state_views)
+    assert etag == agent.state_etag() and body.startswith(b'{"current_session"')
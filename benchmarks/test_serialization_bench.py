@@ -0,0 +1,124 @@
+"""Benchmarks for expanding inputs and shrinking outputs on nested and large ports."""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+
+from rekuest_next.definition.define import prepare_definition
+from rekuest_next.structures.model import model
+from rekuest_next.structures.registry import StructureRegistry
+from rekuest_next.structures.serialization.actor import expand_inputs, shrink_outputs
+
+
+@model
+@dataclass
+class Position:
+    """A position of a stage."""
+
+    x: float
+    y: float
+    z: float
+
+
+@model
+@dataclass
+class Track:
+    """A labelled track of positions."""
+
+    label: str
+    positions: List[Position]
+
+
+def large_list(values: List[float]) -> List[float]:
+    """A long list of floats."""
+    return values
+
+
+def nested_lists(values: List[List[int]]) -> List[List[int]]:
+    """A list of lists of ints."""
+    return values
+
+
+def nested_dicts(values: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, int]]:
+    """A dict of dicts of ints."""
+    return values
+
+
+def nested_models(tracks: List[Track]) -> List[Track]:
+    """A list of models containing lists of models."""
+    return tracks
+
+
+def _tracks() -> List[Track]:
+    return [
+        Track(
+            label=f"track-{i}",
+            positions=[Position(x=j, y=j + 1.0, z=j + 2.0) for j in range(50)],
+        )
+        for i in range(20)
+    ]
+
+
+def _wire(tracks: List[Track]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "label": track.label,
+            "positions": [{"x": p.x, "y": p.y, "z": p.z} for p in track.positions],
+        }
+        for track in tracks
+    ]
+
+
+CASES: Dict[str, Tuple[Callable[..., Any], Callable[[], Any], Callable[[], Any]]] = {
+    "large_list": (
+        large_list,
+        lambda: [float(i) for i in range(10_000)],
+        lambda: [float(i) for i in range(10_000)],
+    ),
+    "nested_lists": (
+        nested_lists,
+        lambda: [list(range(100)) for _ in range(100)],
+        lambda: [list(range(100)) for _ in range(100)],
+    ),
+    "nested_dicts": (
+        nested_dicts,
+        lambda: {f"k{i}": {f"v{j}": j for j in range(50)} for i in range(50)},
+        lambda: {f"k{i}": {f"v{j}": j for j in range(50)} for i in range(50)},
+    ),
+    "nested_models": (nested_models, lambda: _wire(_tracks()), _tracks),
+}
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_expand_inputs(abenchmark: Any, shelver: Any, case: str) -> None:  # noqa: ANN401
+    function, wire, _ = CASES[case]
+    registry = StructureRegistry()
+    definition = prepare_definition(function, structure_registry=registry)
+    key = definition.args[0].key
+    args = {key: wire()}
+
+    expanded = abenchmark(
+        expand_inputs,
+        definition,
+        args,
+        structure_registry=registry,
+        shelver=shelver,
+    )
+    assert key in expanded
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_shrink_outputs(abenchmark: Any, shelver: Any, case: str) -> None:  # noqa: ANN401
+    function, _, value = CASES[case]
+    registry = StructureRegistry()
+    definition = prepare_definition(function, structure_registry=registry)
+
+    shrunk = abenchmark(
+        shrink_outputs,
+        definition,
+        value(),
+        structure_registry=registry,
+        shelver=shelver,
+    )
+    assert "return0" in shrunk
@@ -0,0 +1,93 @@
+"""Benchmarks for the SQLite sink (write rate) and retriever (time travel)."""
+
+import itertools
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+from rekuest_next import messages
+from rekuest_next.contrib.fastapi.retriever.protocol import Snapshot
+from rekuest_next.contrib.sql_lite.retriever import SQLLiteRetriever
+from rekuest_next.contrib.sql_lite.sink import SQLLiteSink
+
+PATCHES = 2000
+"""How many patches the time travel database holds after its snapshot."""
+
+
+def _patch(session_id: str, revision: int) -> messages.StatePatch:
+    return messages.StatePatch(
+        session_id=session_id,
+        global_rev=revision,
+        state_name="StageState",
+        ts=time.time(),
+        op="replace",
+        path=f"/positions/{revision % 100}",
+        value=float(revision),
+        old_value=None,
+    )
+
+
+async def _asink(db_path: Path) -> SQLLiteSink:
+    sink = SQLLiteSink(str(db_path))
+    await sink.ainitialize()
+    await sink.acreate_session([], [])
+    assert sink.current_session_id is not None
+    await sink.adump_snapshot(
+        messages.StateSnapshot(
+            session_id=sink.current_session_id,
+            global_rev=0,
+            snapshots={"StageState": {"positions": [0.0] * 100, "label": "stage"}},
+        )
+    )
+    return sink
+
+
+def test_sink_write_patch(
+    benchmark: Any,  # noqa: ANN401
+    event_loop_runner: Callable[..., Any],
+    tmp_path: Path,
+) -> None:
+    sink = event_loop_runner(_asink(tmp_path / "sink.db"))
+    assert sink.current_session_id is not None
+    revisions = itertools.count(1)
+
+    benchmark(
+        lambda: event_loop_runner(
+            sink.awrite_patch(_patch(sink.current_session_id, next(revisions)))
+        )
+    )
+    assert event_loop_runner(sink.is_cought_up_to(1))
+
+
+@pytest.fixture
+def history(event_loop_runner: Callable[..., Any], tmp_path: Path) -> Path:
+    """A database with a snapshot at revision 0 and ``PATCHES`` patches after it."""
+    db_path = tmp_path / "history.db"
+
+    async def afill() -> None:
+        sink = await _asink(db_path)
+        assert sink.current_session_id is not None
+        for revision in range(1, PATCHES + 1):
+            await sink.awrite_patch(_patch(sink.current_session_id, revision))
+
+    event_loop_runner(afill())
+    return db_path
+
+
+@pytest.mark.parametrize("revision", [1, PATCHES // 2, PATCHES])
+def test_retriever_time_travel(
+    abenchmark: Any,  # noqa: ANN401
+    event_loop_runner: Callable[..., Any],
+    history: Path,
+    revision: int,
+) -> None:
+    retriever = SQLLiteRetriever(str(history))
+    event_loop_runner(retriever.ainitialize())
+
+    snapshot = abenchmark(
+        retriever.aget_state_at_global_rev, revision, state_id="StageState"
+    )
+    assert isinstance(snapshot, Snapshot)
+    assert snapshot.global_revision == revision
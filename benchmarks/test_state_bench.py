@@ -0,0 +1,158 @@
+"""Benchmarks for evented states and the patch loop of the agent."""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List
+
+import janus
+import pytest
+
+from rekuest_next import messages
+from rekuest_next.agents.base import BaseAgent
+from rekuest_next.agents.transport.base import AgentTransport
+from rekuest_next.app import AppRegistry
+from rekuest_next.state.decorator import state
+from rekuest_next.state.lock import acquired_locks
+from rekuest_next.state.observable import make_evented
+from rekuest_next.state.publish import BasePublisher, Patch
+from rekuest_next.structures.registry import StructureRegistry
+
+PATCHES = 1000
+"""How many patches one round of the patch loop benchmark processes."""
+
+
+@dataclass
+class Position:
+    """A position of a stage."""
+
+    x: float = 0.0
+    y: float = 0.0
+    z: float = 0.0
+
+
+app_registry = AppRegistry()
+
+
+@state(registry=app_registry, structure_reg=StructureRegistry())
+@dataclass
+class StageState:
+    """A stage with a track of positions."""
+
+    positions: List[float] = field(default_factory=list)
+    settings: Dict[str, float] = field(default_factory=dict)
+    label: str = "stage"
+    moving: bool = False
+
+
+class CountingHolder:
+    """Counts the patches an evented state publishes."""
+
+    def __init__(self) -> None:
+        """Start without patches."""
+        self.patches = 0
+
+    def publish_patch(self, interface: str, patch: Patch, task_id: Any = None) -> None:  # noqa: ANN401
+        """Count the patch."""
+        self.patches += 1
+
+
+class NullTransport(AgentTransport):
+    """Drops everything the agent sends and never receives."""
+
+    @property
+    def connected(self) -> bool:
+        """Always connected."""
+        return True
+
+    async def asend(self, message: messages.FromAgentMessage) -> None:
+        """Drop the message."""
+
+    async def aconnect(self) -> None:
+        """Nothing to connect to."""
+
+    async def areceive(self) -> AsyncIterator[messages.ToAgentMessage]:
+        """Never receive anything."""
+        await asyncio.Event().wait()
+        yield  # type: ignore[misc]
+
+    async def adisconnect(self) -> None:
+        """Nothing to disconnect from."""
+
+
+class PatchAgent(BaseAgent):
+    """An agent that publishes nothing but processes every patch."""
+
+    async def apublish_patch(self, patch: messages.StatePatch) -> None:
+        """Drop the patch."""
+
+    async def apublish_snapshot(self, snapshot: messages.StateSnapshot) -> None:
+        """Drop the snapshot."""
+
+
+def _stage() -> StageState:
+    return StageState(
+        positions=[float(i) for i in range(1000)],
+        settings={f"axis{i}": float(i) for i in range(100)},
+    )
+
+
+def test_make_evented_construction(benchmark: Any) -> None:  # noqa: ANN401
+    config = StageState.__rekuest_state_config__  # type: ignore[attr-defined]
+    positions = [Position(x=i) for i in range(500)]
+    value = {"positions": positions, "grid": [[0.0] * 20 for _ in range(20)]}
+
+    evented = benchmark(make_evented, value, config, "")
+    assert len(evented["positions"]) == 500
+
+
+MUTATIONS: Dict[str, Callable[[StageState], None]] = {
+    "replace_scalar": lambda stage: setattr(stage, "label", "moved"),
+    "append": lambda stage: stage.positions.append(1.0),
+    "set_item": lambda stage: stage.positions.__setitem__(10, -1.0),
+    "set_key": lambda stage: stage.settings.__setitem__("axis3", -1.0),
+}
+
+
+@pytest.mark.parametrize("mutation", MUTATIONS)
+def test_evented_mutation(benchmark: Any, mutation: str) -> None:  # noqa: ANN401
+    stage = _stage()
+    holder = CountingHolder()
+    mutate = MUTATIONS[mutation]
+
+    def run() -> None:
+        # A fresh value every round, so replacing always emits a patch
+        stage.label = "stage"
+        mutate(stage)
+
+    with BasePublisher(holder), acquired_locks():
+        benchmark(run)
+    assert holder.patches > 0
+
+
+def test_patch_event_loop_throughput(
+    benchmark: Any,  # noqa: ANN401
+    event_loop_runner: Callable[..., Any],
+) -> None:
+    async def astart() -> PatchAgent:
+        agent = PatchAgent(transport=NullTransport(), app_registry=app_registry)
+        agent.states["StageState"] = _stage()
+        agent._interface_stateschema_input_map["StageState"] = app_registry.states[
+            "StageState"
+        ].definition
+        agent._event_queue = janus.Queue()
+        asyncio.create_task(agent.apatch_event_loop())
+        return agent
+
+    agent = event_loop_runner(astart())
+    stage = agent.states["StageState"]
+
+    async def around() -> None:
+        with BasePublisher(agent), acquired_locks():
+            for i in range(PATCHES):
+                stage.positions[i % 1000] = float(i)
+        assert agent._event_queue is not None
+        # A failing patch loop would never drain the queue
+        await asyncio.wait_for(agent._event_queue.async_q.join(), timeout=60)
+
+    benchmark(lambda: event_loop_runner(around()))
+    assert agent.global_revision >= PATCHES
@@ -0,0 +1,92 @@
+"""Benchmarks for encoding sent and decoding received websocket messages."""
+
+import random
+import time
+from typing import Any, Dict
+
+import pytest
+from pydantic import BaseModel
+
+from rekuest_next import messages
+from rekuest_next.agents.transport.encoding import decode_payload, encode_message
+from rekuest_next.agents.transport.websocket import InMessagePayload
+
+ENCODINGS = [
+    messages.WireEncoding.JSON,
+    messages.WireEncoding.MSGPACK,
+    messages.WireEncoding.CBOR,
+]
+
+
+@pytest.fixture(params=ENCODINGS, ids=lambda encoding: encoding.value.lower())
+def encoding(request: pytest.FixtureRequest) -> messages.WireEncoding:
+    """Every wire encoding whose extra is installed."""
+    if request.param == messages.WireEncoding.MSGPACK:
+        pytest.importorskip("msgpack")
+    if request.param == messages.WireEncoding.CBOR:
+        pytest.importorskip("cbor2")
+    return request.param
+
+
+def _sent() -> Dict[str, BaseModel]:
+    rng = random.Random(42)
+    return {
+        "yield": messages.Yield(
+            task="task-1", returns={"trace": [rng.random() for _ in range(2048)]}
+        ),
+        "state_patch": messages.StatePatch(
+            session_id="session-1",
+            global_rev=1234,
+            state_name="StageState",
+            ts=time.time(),
+            op="replace",
+            path="/positions/10",
+            value={"x": 1.0, "y": 2.0, "z": 3.0},
+            old_value=None,
+        ),
+        "heartbeat_answer": messages.HeartbeatEvent(),
+    }
+
+
+def _received() -> Dict[str, BaseModel]:
+    return {
+        "assign": messages.Assign(
+            interface="move_stage",
+            task="task-1",
+            args={"positions": [{"x": i, "y": i, "z": i} for i in range(100)]},
+            user="user-1",
+            org="org-1",
+            action="action-1",
+            implementation="implementation-1",
+        ),
+        "heartbeat": messages.Heartbeat(),
+        "cancel": messages.Cancel(task="task-1"),
+    }
+
+
+@pytest.mark.parametrize("message", _sent())
+def test_encode_sent(
+    benchmark: Any,  # noqa: ANN401
+    encoding: messages.WireEncoding,
+    message: str,
+) -> None:
+    model = _sent()[message]
+
+    payload = benchmark(encode_message, model, encoding)
+    assert payload
+
+
+@pytest.mark.parametrize("message", _received())
+def test_decode_received(
+    benchmark: Any,  # noqa: ANN401
+    encoding: messages.WireEncoding,
+    message: str,
+) -> None:
+    model = _received()[message]
+    payload = encode_message(model, encoding)
+
+    # As the websocket transport does for every frame it receives
+    received = benchmark(
+        lambda: InMessagePayload(message=decode_payload(payload, encoding))
+    )
+    assert type(received.message) is type(model)
@@ -0,0 +1,125 @@
+"""Benchmark: size and encode/decode throughput of the agent wire encodings.
+
+Encodes representative messages from ``rekuest_next.messages`` as JSON (the
+default text frames) and as MessagePack/CBOR binary frames (whichever of the
+``msgpack``/``cbor`` extras is installed), and prints the payload size and how
+many messages per second each encoding packs and unpacks.
+
+Usage::
+
+    python benchmarks/wire_encoding.py [--repeat 2000]
+"""
+
+import argparse
+import base64
+import random
+import time
+from typing import Callable, Dict, List
+
+from pydantic import BaseModel
+
+from rekuest_next import messages
+from rekuest_next.agents.transport.encoding import (
+    decode_payload,
+    encode_message,
+    ensure_encoding,
+)
+from rekuest_next.agents.transport.errors import EncodingUnavailable
+
+
+def _messages() -> Dict[str, BaseModel]:
+    rng = random.Random(42)
+    trace = [rng.random() for _ in range(2048)]
+    return {
+        "yield (2048 floats)": messages.Yield(task="task-1", returns={"trace": trace}),
+        "yield (16 KiB bytes)": messages.Yield(
+            task="task-1", returns={"image": rng.randbytes(16 * 1024)}
+        ),
+        "state patch": messages.StatePatch(
+            session_id="session-1",
+            global_rev=1234,
+            state_name="StageState",
+            ts=time.time(),
+            op="replace",
+            path="/positions/12/x",
+            value=rng.random(),
+            old_value=None,
+        ),
+        "state snapshot": messages.StateSnapshot(
+            session_id="session-1",
+            global_rev=1234,
+            snapshots={
+                "StageState": {
+                    "positions": [
+                        {"x": rng.random(), "y": rng.random(), "z": rng.random()}
+                        for _ in range(500)
+                    ],
+                    "label": "stage",
+                }
+            },
+        ),
+    }
+
+
+def _json_compatible(message: BaseModel) -> BaseModel:
+    """JSON cannot carry raw bytes: a JSON client sends them as base64."""
+    returns = getattr(message, "returns", None)
+    if not returns:
+        return message
+    return message.model_copy(
+        update={
+            "returns": {
+                key: base64.b64encode(value).decode()
+                if isinstance(value, bytes)
+                else value
+                for key, value in returns.items()
+            }
+        }
+    )
+
+
+def _rate(function: Callable[[], object], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return repeat / (time.perf_counter() - start)
+
+
+def main(repeat: int) -> None:
+    """Run the benchmark and print one table row per message and encoding."""
+    encodings: List[messages.WireEncoding] = []
+    for encoding in messages.WireEncoding:
+        try:
+            ensure_encoding(encoding)
+        except EncodingUnavailable as e:
+            print(f"skipping {encoding.value}: {e}")
+            continue
+        encodings.append(encoding)
+
+    print(
+        f"{'message':22} {'encoding':8} {'bytes':>8} {'encode/s':>10} {'decode/s':>10}"
+    )
+    for name, original in _messages().items():
+        json_size = len(
+            encode_message(_json_compatible(original), messages.WireEncoding.JSON)
+        )
+        for encoding in encodings:
+            message = (
+                _json_compatible(original)
+                if encoding == messages.WireEncoding.JSON
+                else original
+            )
+            payload = encode_message(message, encoding)
+            size = len(payload)
+            encode = _rate(lambda: encode_message(message, encoding), repeat)
+            decode = _rate(lambda: decode_payload(payload, encoding), repeat)
+            print(
+                f"{name:22} {encoding.value:8} {size:8d} {encode:10.0f} {decode:10.0f}"
+                f"  ({size / json_size:.2f}x JSON size)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    main(parser.parse_args().repeat)
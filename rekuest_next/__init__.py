@@ -26,59 +26,154 @@ Examples:
                 panel = jsx("<Panel><Label text=\"ready\" /></Panel>")
 """
 
-from .blok.parser import jsx
-from .remote import (
-    acall,
-    call,
-    acall_raw,
-    acall_dependency,
-    acall_dependency_raw,
-    call_dependency_raw,
-    call_dependency,
-    call_raw,
-    aiterate,
-    iterate,
-    find,
-)
-from .agents.context import context
-from .agents.hooks.startup import startup
-from .agents.hooks.shutdown import shutdown
-from .agents.hooks.background import background
-from .actors.context import (
-    log,
-    alog,
-    progress,
-    aprogress,
-    apausepoint,
-    pausepoint,
-    install_hook,
-)
-from .declare import declare, declare_state
-from .definition.demands import demand, demand_state
-from .structures.model import model, model_field
-from .structures.decorator import structure
-from .state.decorator import state
-from .app import (
-    AppRegistry,
-    get_default_app_registry,
-    set_default_app_registry,
-    reset_default_app_registry,
-)
-from rekuest_next.annotations import (
-    Requires,
-    Provides,
-    Description,
-    Default,
-    Units,
-)
-
-try:
+import importlib
+import importlib.util
+import sys
+import types
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from .blok.parser import jsx
+    from .remote import (
+        acall,
+        call,
+        acall_raw,
+        acall_dependency,
+        acall_dependency_raw,
+        call_dependency_raw,
+        call_dependency,
+        call_raw,
+        aiterate,
+        iterate,
+        find,
+    )
+    from .agents.context import context
+    from .agents.hooks.startup import startup
+    from .agents.hooks.shutdown import shutdown
+    from .agents.hooks.background import background
+    from .actors.context import (
+        log,
+        alog,
+        progress,
+        aprogress,
+        apausepoint,
+        pausepoint,
+        install_hook,
+    )
+    from .declare import declare, declare_state
+    from .definition.demands import demand, demand_state
+    from .structures.model import model, model_field
+    from .structures.decorator import structure
+    from .state.decorator import state
+    from .state.transaction import state_transaction
+    from .app import (
+        AppRegistry,
+        get_default_app_registry,
+        set_default_app_registry,
+        reset_default_app_registry,
+    )
+    from .annotations import (
+        Requires,
+        Provides,
+        Description,
+        Default,
+        Units,
+    )
     from .arkitekt import RekuestNextService
-except ImportError:
-    pass
+    from .builtin_structures import structure_reg
+
+
+#: Maps every lazily exported name to the submodule that defines it. The
+#: submodule is only imported on first attribute access, so ``import
+#: rekuest_next`` stays cheap for CLI tools and short-lived workers.
+_LAZY_EXPORTS: Dict[str, str] = {
+    "jsx": ".blok.parser",
+    "acall": ".remote",
+    "call": ".remote",
+    "acall_raw": ".remote",
+    "acall_dependency": ".remote",
+    "acall_dependency_raw": ".remote",
+    "call_dependency_raw": ".remote",
+    "call_dependency": ".remote",
+    "call_raw": ".remote",
+    "aiterate": ".remote",
+    "iterate": ".remote",
+    "find": ".remote",
+    "context": ".agents.context",
+    "startup": ".agents.hooks.startup",
+    "shutdown": ".agents.hooks.shutdown",
+    "background": ".agents.hooks.background",
+    "log": ".actors.context",
+    "alog": ".actors.context",
+    "progress": ".actors.context",
+    "aprogress": ".actors.context",
+    "apausepoint": ".actors.context",
+    "pausepoint": ".actors.context",
+    "install_hook": ".actors.context",
+    "declare": ".declare",
+    "declare_state": ".declare",
+    "demand": ".definition.demands",
+    "demand_state": ".definition.demands",
+    "model": ".structures.model",
+    "model_field": ".structures.model",
+    "structure": ".structures.decorator",
+    "state": ".state.decorator",
+    "state_transaction": ".state.transaction",
+    "AppRegistry": ".app",
+    "get_default_app_registry": ".app",
+    "set_default_app_registry": ".app",
+    "reset_default_app_registry": ".app",
+    "Requires": ".annotations",
+    "Provides": ".annotations",
+    "Description": ".annotations",
+    "Default": ".annotations",
+    "Units": ".annotations",
+    "RekuestNextService": ".arkitekt",
+    "structure_reg": ".builtin_structures",
+}
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import a public name from its submodule on first access."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        module = importlib.import_module(module_name, __name__)
+    except ImportError as e:
+        if name == "RekuestNextService":
+            raise AttributeError(
+                "RekuestNextService requires the optional arkitekt_next dependency"
+            ) from e
+        raise
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+
+class _LazyModule(types.ModuleType):
+    """Keeps exports that share their name with a submodule (``state``,
+    ``declare``) resolvable: importing ``rekuest_next.state.x`` would otherwise
+    bind the submodule over the lazily exported decorator."""
+
+    def __setattr__(self, name: str, value: Any) -> None:  # noqa: ANN401
+        if name in _LAZY_EXPORTS and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyModule
+
 
+# arkitekt_next discovers the rekuest service through the registration side
+# effect of this import, so keep it eager whenever arkitekt_next is installed.
+if importlib.util.find_spec("arkitekt_next") is not None:
+    from .arkitekt import RekuestNextService  # noqa: F811
 
-from .builtin_structures import structure_reg
 
 __version__ = "0.4.1"
 
@@ -105,6 +200,7 @@ __all__ = [
     "pausepoint",
     "apausepoint",
     "install_hook",
+    "state_transaction",
     # remote execution helpers
     "find",
     "call",
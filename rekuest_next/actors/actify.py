@@ -44,9 +44,11 @@ def derive_implementation_details(
     """Inspect a function's state/context/dependency variables and resolve the
     implementation metadata.
 
-    Explicit ``config.locks``/``config.manipulates`` win; otherwise locks are
-    inferred from the required state/context locks (when ``config.auto_locks``)
-    and manipulates from the written state variables.
+    Explicit ``config.locks``/``config.read_locks``/``config.manipulates`` win;
+    otherwise locks are inferred from the required state/context locks, read
+    locks from the locks of read-only states (both when ``config.auto_locks``),
+    and manipulates from the written state variables. A key that is locked for
+    writing is never also a read lock.
     """
     state_variables, state_returns = prepare_state_variables(function)
     context_variables, context_returns = prepare_context_variables(function)
@@ -61,6 +63,15 @@ def derive_implementation_details(
             newlocks.extend(lock)
         locks = list(set(newlocks))
 
+    read_locks = config.read_locks
+    if read_locks is None and config.auto_locks:
+        newreadlocks: set[str] = set()
+        for lock in state_variables.read_only_state_locks.values():
+            newreadlocks.update(lock)
+        read_locks = list(newreadlocks)
+    if read_locks:
+        read_locks = [lock for lock in read_locks if lock not in (locks or [])]
+
     manipulates = config.manipulates
     if manipulates is None:
         manipulates = list(set(state_variables.write_state_variables.values()))
@@ -72,6 +83,7 @@ def derive_implementation_details(
         context_returns=context_returns,
         dependency_variables=dependency_variables,
         locks=locks,
+        read_locks=read_locks or None,
         tracks=config.tracks,
         manipulates=manipulates,
     )
@@ -154,7 +166,12 @@ def reactify(
         "context_returns": implementation_details.context_returns,
         "dependency_variables": implementation_details.dependency_variables,
         "locks": implementation_details.locks,
+        "read_locks": implementation_details.read_locks,
         "concurrency": config.concurrency,
+        "micro_task": config.micro_task,
+        "latest_only": config.latest_only,
+        "transactional": config.transactional,
+        "profile": config.profile,
     }
 
     if is_coroutine:
@@ -7,6 +7,7 @@ from rekuest_next.declare import DeclaredAgentProtocol, DeclaredAgentAction
 import asyncio
 import contextlib
 import logging
+from dataclasses import dataclass, field
 from typing import (
     Any,
     Dict,
@@ -63,6 +64,11 @@ class Actor(BaseModel):
         default=None,
         description="The lock keys this actor requires. Locks will be acquired before running.",
     )
+    read_locks: Optional[Tuple[str, ...]] = Field(
+        default=None,
+        description="The lock keys this actor only reads under. They are held shared, "
+        "so readers of a key run concurrently while writers wait for them.",
+    )
     concurrency: Literal["parallel", "serial"] = Field(
         default="serial",
         description="Whether assignments to this actor may run concurrently ('parallel') or one at a time ('serial', the default).",
@@ -101,6 +107,9 @@ class Actor(BaseModel):
         that re-enters this actor or calls another implementation requiring one
         of its keys will deadlock.
 
+        ``read_locks`` are held shared (see ``ReaderWriterLock``); they satisfy
+        no write checks of the states they guard.
+
         Args:
             task_id: The ID of the task.
             interface: The interface name for this actor.
@@ -112,15 +121,18 @@ class Actor(BaseModel):
             if self.concurrency == "serial":
                 await stack.enter_async_context(self._serial_lock)
 
-            if self.locks:
+            if self.locks or self.read_locks:
                 lock_group = LockGroup(
-                    locks=self.agent.get_locks_for_keys(self.locks),
+                    locks=self.agent.get_locks_for_keys(self.locks or ()),
                     task_id=task_id,
+                    shared_locks=self.agent.get_locks_for_keys(self.read_locks or ()),
                 )
                 await stack.enter_async_context(lock_group)
 
             with direct_publishing(self.agent):
-                with acquired_locks(*(self.locks or [])):
+                with acquired_locks(
+                    *(self.locks or []), shared=tuple(self.read_locks or ())
+                ):
                     yield
 
     async def on_resume(self: Self, resume: messages.Resume) -> None:
@@ -434,6 +446,110 @@ class AgentDependencyProxy:
         )
 
 
+@dataclass
+class InjectionPlan:
+    """The locals an actor injects into its function, compiled once per actor.
+
+    Resolving locals on every assignment used to walk the prepared variables,
+    build a fresh protocol proxy per dependency and merge several mappings.
+    The plan flattens the variables into tuples, builds the dependency proxies
+    up front and memoizes the resolved contexts per agent ``locals_revision``,
+    so per-assignment resolution is a single dict build.
+    """
+
+    contexts: Tuple[Tuple[str, str], ...]
+    write_states: Tuple[Tuple[str, str], ...]
+    read_only_states: Tuple[Tuple[str, str], ...]
+    dependencies: Dict[str, "AgentDependencyProxy"]
+    _resolved_contexts: Optional[Tuple[int, Dict[str, AnyContext]]] = field(
+        default=None, repr=False
+    )
+
+    @classmethod
+    def compile(
+        cls,
+        context_variables: PreparedContextVariables,
+        state_variables: PreparedStateVariables,
+        dependency_variables: PreparedDependencyVariables,
+    ) -> "InjectionPlan":
+        """Compile the plan from the prepared variables of an actor.
+
+        Args:
+            context_variables (PreparedContextVariables): The context variables.
+            state_variables (PreparedStateVariables): The state variables.
+            dependency_variables (PreparedDependencyVariables): The dependency variables.
+
+        Returns:
+            InjectionPlan: The compiled plan.
+        """
+        return cls(
+            contexts=tuple(context_variables.context_variables.items()),
+            write_states=tuple(state_variables.write_state_variables.items()),
+            read_only_states=tuple(state_variables.read_only_variables.items()),
+            dependencies={
+                key: AgentDependencyProxy(
+                    key=key, agent_protocol=dependency_to_protocol(agent_protocol)
+                )
+                for key, agent_protocol in dependency_variables.dependency_variables.items()
+            },
+        )
+
+    async def aresolve_contexts(self, agent: Agent) -> Dict[str, AnyContext]:
+        """Resolve the contexts, reusing them while the agent's contexts are unchanged.
+
+        Args:
+            agent (Agent): The agent to resolve the contexts from.
+
+        Returns:
+            Dict[str, AnyContext]: The contexts, keyed by the function parameter.
+        """
+        if not self.contexts:
+            return {}
+
+        revision: Optional[int] = getattr(agent, "locals_revision", None)
+        if (
+            revision is not None
+            and self._resolved_contexts is not None
+            and self._resolved_contexts[0] == revision
+        ):
+            return self._resolved_contexts[1]
+
+        contexts: Dict[str, AnyContext] = {}
+        for key, interface in self.contexts:
+            try:
+                contexts[key] = await agent.aget_context(interface)
+            except KeyError as e:
+                raise StateRequirementsNotMet(f"State requirements not met: {e}") from e
+
+        if revision is not None:
+            self._resolved_contexts = (revision, contexts)
+        return contexts
+
+    async def aresolve(self, agent: Agent, params: Mapping[str, Any]) -> Dict[str, Any]:
+        """Build the keyword arguments for a call.
+
+        Args:
+            agent (Agent): The agent to resolve contexts and states from.
+            params (Mapping[str, Any]): The (expanded) assignment arguments.
+
+        Returns:
+            Dict[str, Any]: ``params`` merged with all injected locals.
+        """
+        kwargs = dict(params)
+        if self.contexts:
+            kwargs.update(await self.aresolve_contexts(agent))
+        try:
+            for key, interface in self.write_states:
+                kwargs[key] = await agent.aget_write_proxy(interface)
+            for key, interface in self.read_only_states:
+                kwargs[key] = await agent.aget_read_only_proxy(interface)
+        except KeyError as e:
+            raise StateRequirementsNotMet(f"State requirements not met: {e}") from e
+        if self.dependencies:
+            kwargs.update(self.dependencies)
+        return kwargs
+
+
 class SerializingActor(Actor):
     """A serializing actor is an actor that will
     serialize and deserialize the arguments and return values
@@ -473,6 +589,30 @@ class SerializingActor(Actor):
         description="Whether to shrink the outputs of the actor. Can overwrite the default behaviour of the actor to shrink the outputs with the structure registry.",
     )
 
+    _injection_plan: Optional[InjectionPlan] = PrivateAttr(default=None)
+
+    @property
+    def injection_plan(self) -> InjectionPlan:
+        """The compiled injection plan of this actor (built on first use)."""
+        if self._injection_plan is None:
+            self._injection_plan = InjectionPlan.compile(
+                self.context_variables,
+                self.state_variables,
+                self.dependency_variables,
+            )
+        return self._injection_plan
+
+    async def aget_params(self, input_kwargs: Mapping[str, Any]) -> Dict[str, Any]:
+        """Merge the expanded inputs with the injected locals.
+
+        Args:
+            input_kwargs (Mapping[str, Any]): The expanded assignment arguments.
+
+        Returns:
+            Dict[str, Any]: The keyword arguments to call the function with.
+        """
+        return await self.injection_plan.aresolve(self.agent, input_kwargs)
+
     async def aget_locals(
         self: Self,
     ) -> Tuple[
@@ -481,41 +621,19 @@ class SerializingActor(Actor):
         Mapping[str, AgentDependencyProxy],
     ]:
         """A function to for locals"""
+        plan = self.injection_plan
 
-        state_kwargs: Mapping[str, AnyContext | AnyState] = {}
-        context_kwargs: Mapping[str, AnyContext] = {}
-        dependency_kwargs: Mapping[str, AgentDependencyProxy] = {}
-
-        for key, interface in self.context_variables.context_variables.items():
-            try:
-                context_kwargs[key] = await self.agent.aget_context(interface)
-            except KeyError as e:
-                raise StateRequirementsNotMet(f"State requirements not met: {e}") from e
-
-        for key, interface in self.state_variables.write_state_variables.items():
-            try:
+        context_kwargs = await plan.aresolve_contexts(self.agent)
+        state_kwargs: Dict[str, AnyState] = {}
+        try:
+            for key, interface in plan.write_states:
                 state_kwargs[key] = await self.agent.aget_write_proxy(interface)
-            except KeyError as e:
-                raise StateRequirementsNotMet(f"State requirements not met: {e}") from e
-
-        for key, interface in self.state_variables.read_only_variables.items():
-            try:
+            for key, interface in plan.read_only_states:
                 state_kwargs[key] = await self.agent.aget_read_only_proxy(interface)
-            except KeyError as e:
-                raise StateRequirementsNotMet(f"State requirements not met: {e}") from e
-
-        for (
-            key,
-            agent_protocol,
-        ) in self.dependency_variables.dependency_variables.items():
-            try:
-                dependency_kwargs[key] = AgentDependencyProxy(
-                    key=key, agent_protocol=dependency_to_protocol(agent_protocol)
-                )
-            except KeyError as e:
-                raise StateRequirementsNotMet(f"State requirements not met: {e}") from e
+        except KeyError as e:
+            raise StateRequirementsNotMet(f"State requirements not met: {e}") from e
 
-        return context_kwargs, state_kwargs, dependency_kwargs
+        return context_kwargs, state_kwargs, plan.dependencies
 
 
 Actor.model_rebuild()
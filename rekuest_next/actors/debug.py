@@ -1,16 +1,220 @@
 from __future__ import annotations
+import asyncio
 import contextlib
+import contextvars
+import logging
 import os
+import sys
 import threading
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Awaitable, Callable, Optional, TextIO
 
 from rekuest_next import messages
 from rekuest_next.actors.types import Agent
 
 
+current_capture: contextvars.ContextVar[Optional[list[str]]] = contextvars.ContextVar(
+    "current_capture", default=None
+)
+"""The log buffer of the captured task running in this context, if any."""
+
+current_capture_level: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "current_capture_level", default=logging.INFO
+)
+"""The lowest level of the log records captured for the task in this context."""
+
+
+class _RoutingStream:
+    """A ``sys.stdout``/``sys.stderr`` stand-in that routes per task.
+
+    Writes from a context with a captured task go to that task's log buffer,
+    everything else goes to the original stream.
+    """
+
+    def __init__(self, fallback: TextIO) -> None:
+        self._fallback = fallback
+
+    def write(self, text: str) -> int:
+        logs = current_capture.get()
+        if logs is None:
+            return self._fallback.write(text)
+        logs.append(text)
+        return len(text)
+
+    def flush(self) -> None:
+        self._fallback.flush()
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        return getattr(self._fallback, name)
+
+
+class _CaptureLogHandler(logging.Handler):
+    """Routes log records of a captured task to that task's log buffer."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        logs = current_capture.get()
+        if logs is None or record.name.startswith("rekuest_next"):
+            # Not captured, or the agent's own bookkeeping while sending reports
+            return
+        if record.levelno < current_capture_level.get():
+            return
+        try:
+            logs.append(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+
+class _UncapturedLevelFilter(logging.Filter):
+    """Keeps the other root handlers at the root level while it is lowered.
+
+    Drops the records that only reach them because the root logger was lowered
+    for a captured task: those whose logger takes its level from the root.
+    """
+
+    def __init__(self, level: int) -> None:
+        super().__init__()
+        self.level = level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.level:
+            return True
+        logger: Optional[logging.Logger] = logging.getLogger(record.name)
+        while logger is not None and logger.level == logging.NOTSET:
+            logger = logger.parent
+        return logger is not None and logger is not logging.getLogger()
+
+
+_capture_log_handler = _CaptureLogHandler()
+
+_capture_lock = threading.Lock()
+_active_levels: list[int] = []
+"""The capture levels of the running captured tasks (one entry per task)."""
+_installed_streams: list[_RoutingStream] = []
+_root_level: int = logging.WARNING
+_root_filter: Optional[_UncapturedLevelFilter] = None
+
+
+def _lower_root_level() -> None:
+    """Let the root logger pass the records of the lowest active capture level."""
+    global _root_filter
+    root = logging.getLogger()
+    level = min(min(_active_levels), _root_level)
+    if _root_filter is None and level < _root_level:
+        _root_filter = _UncapturedLevelFilter(_root_level)
+        for handler in root.handlers:
+            if handler is not _capture_log_handler:
+                handler.addFilter(_root_filter)
+    root.setLevel(level)
+
+
+def _acquire_context_capture(level: int) -> None:
+    """Install the per-task routing of output and logging for one captured task.
+
+    Reference counted: the first captured task wraps ``sys.stdout`` and
+    ``sys.stderr`` and adds the log handler, the last one removes them again
+    (see :func:`_release_context_capture`).
+    """
+    global _root_level
+    with _capture_lock:
+        if not _active_levels:
+            root = logging.getLogger()
+            _root_level = root.level
+            for name in ("stdout", "stderr"):
+                stream = _RoutingStream(getattr(sys, name))
+                setattr(sys, name, stream)
+                _installed_streams.append(stream)
+            root.addHandler(_capture_log_handler)
+        _active_levels.append(level)
+        _lower_root_level()
+
+
+def _release_context_capture(level: int) -> None:
+    """Undo :func:`_acquire_context_capture` for one captured task."""
+    global _root_filter
+    with _capture_lock:
+        _active_levels.remove(level)
+        if _active_levels:
+            _lower_root_level()
+            return
+
+        root = logging.getLogger()
+        root.removeHandler(_capture_log_handler)
+        if _root_filter is not None:
+            for handler in root.handlers:
+                handler.removeFilter(_root_filter)
+            _root_filter = None
+        root.setLevel(_root_level)
+        for name, stream in zip(("stdout", "stderr"), _installed_streams):
+            # Leave streams that were swapped out since (e.g. by a test runner)
+            if getattr(sys, name) is stream:
+                setattr(sys, name, stream._fallback)
+        _installed_streams.clear()
+
+
+async def _aflush_periodically(
+    aflush: Callable[[], Awaitable[None]], interval: float
+) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        await aflush()
+
+
+@contextlib.asynccontextmanager
+async def capture_in_context(
+    logs: list[str],
+    aflush: Optional[Callable[[], Awaitable[None]]] = None,
+    flush_interval: float = 0.5,
+    level: int = logging.INFO,
+) -> AsyncGenerator[None, None]:
+    """Capture the output of the current task (and the threads it spawns).
+
+    Output written to ``sys.stdout``/``sys.stderr`` and log records emitted from
+    this context are appended to ``logs``; other tasks are unaffected, so any
+    number of captured tasks can run concurrently. Worker threads started with
+    koil inherit the context and are captured as well.
+
+    The routing is only installed while captured tasks run. Meanwhile the root
+    logger passes records down to ``level``; its other handlers still only see
+    what they would without the capture.
+
+    Args:
+        logs (list[str]): The buffer to append the captured output to.
+        aflush (Callable[[], Awaitable[None]], optional): Called every
+            ``flush_interval`` seconds to stream the buffer incrementally.
+        flush_interval (float): Seconds between two calls of ``aflush``.
+        level (int): The lowest level of the log records to capture.
+    """
+    _acquire_context_capture(level)
+
+    # Created before the buffer is bound, so the flusher's own output is not captured
+    flusher = (
+        asyncio.create_task(_aflush_periodically(aflush, flush_interval))
+        if aflush is not None
+        else None
+    )
+    token = current_capture.set(logs)
+    level_token = current_capture_level.set(level)
+    try:
+        yield
+    finally:
+        current_capture_level.reset(level_token)
+        current_capture.reset(token)
+        try:
+            if flusher is not None:
+                flusher.cancel()
+                try:
+                    await flusher
+                except asyncio.CancelledError:
+                    pass
+        finally:
+            _release_context_capture(level)
+
+
 @contextlib.asynccontextmanager
 async def capture_to_list(
-    logs: list[str], agent: Agent, assignment: messages.Assign
+    logs: list[str],
+    agent: Agent,
+    assignment: messages.Assign,
+    aflush: Optional[Callable[[], Awaitable[None]]] = None,
 ) -> AsyncGenerator[None, None]:
     """
     Unified context manager that:
@@ -23,6 +227,11 @@ async def capture_to_list(
     - Capture assignments capture stdout + stderr at FD level and write directly to logs list.
     - Normal assignments do not capture logs and do not block other normals.
 
+    If the agent's ``capture_mode`` is ``"context"``, output is instead routed
+    per task (see :func:`capture_in_context`): captured assignments run
+    concurrently with everything else and ``aflush`` streams their output every
+    ``capture_flush_interval`` seconds.
+
     Parameters
     ----------
     logs : list[str]
@@ -39,7 +248,19 @@ async def capture_to_list(
 
     should_capture: bool = False if assignment.capture is None else assignment.capture
 
-    if should_capture:
+    if getattr(agent, "capture_mode", "exclusive") == "context":
+        if should_capture:
+            async with capture_in_context(
+                logs,
+                aflush,
+                flush_interval=getattr(agent, "capture_flush_interval", 0.5),
+                level=getattr(agent, "capture_log_level", logging.INFO),
+            ):
+                yield
+        else:
+            yield
+
+    elif should_capture:
         # ================================
         #  CAPTURE ASSIGNMENT (exclusive)
         # ================================
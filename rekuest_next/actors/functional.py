@@ -1,15 +1,26 @@
 """Functional actors for rekuest_next"""
 
+import contextlib
 import logging
-from typing import Any, AsyncGenerator, Callable, Dict, List, Self
+import time
+from typing import Any, AsyncContextManager, AsyncGenerator, Callable, Dict, List, Self
 from koil.bridge import iterate_threaded, run_threaded  # type: ignore
 from rekuest_next.actors.base import SerializingActor
 from rekuest_next.messages import Assign
 from rekuest_next.structures.serialization.actor import expand_inputs, shrink_outputs
 from rekuest_next.actors.helper import AssignmentHelper
+from rekuest_next.actors.vars import current_task_helper
+from rekuest_next.api.schema import ActionKind
+from rekuest_next.postmans.vars import current_postman
 from rekuest_next.structures.errors import SerializationError
 from rekuest_next import messages
 from rekuest_next.actors.debug import capture_to_list
+from rekuest_next.state.lock import acquired_locks
+from rekuest_next.state.publish import direct_publishing
+from rekuest_next.state.transaction import state_transaction
+from rekuest_next.metrics import get_metrics
+from rekuest_next.actors.profiling import AssignmentProfiler
+from rekuest_next.datalayer import current_rekuest_datalayer
 
 logger = logging.getLogger(__name__)
 
@@ -28,10 +39,46 @@ class FunctionalActor(SerializingActor):
     strategy (see :data:`FUNC`, :data:`GEN`, :data:`THREADED_FUNC`,
     :data:`THREADED_GEN`) rather than via subclassing — async vs sync and
     single-value vs generator only differ in that one step.
+
+    With ``micro_task`` set, assignments that need no locks, state or log
+    capture take a leaner path (see :meth:`on_micro_assign`). With
+    ``transactional`` set, every assignment mutates the states it writes within
+    a :func:`~rekuest_next.state.transaction.state_transaction`.
     """
 
     assign: Callable[..., Any]
     iterator: "ResultIterator"
+    micro_task: bool = False
+    latest_only: bool = False
+    """Send conflating yields: only the newest unsent yield of a task is kept."""
+    transactional: bool = False
+    """Publish the state changes of an assignment as one minimal patch, roll back on errors."""
+    profile: bool = False
+    """Profile every assignment (see :mod:`rekuest_next.actors.profiling`)."""
+
+    @property
+    def runs_micro_tasks(self) -> bool:
+        """Whether assignments may take the micro-task path.
+
+        Only actors without locks and state qualify; capture is decided per
+        assignment.
+        """
+        return (
+            self.micro_task
+            and not self.locks
+            and not self.read_locks
+            and self.state_variables.count == 0
+            and self.state_returns.count == 0
+        )
+
+    async def astate_transaction(self: Self) -> AsyncContextManager[Any]:
+        """The transaction an assignment runs in (a no-op unless ``transactional``)."""
+        names = set(self.state_variables.write_state_variables.values())
+        if not self.transactional or not names:
+            return contextlib.nullcontext()
+        return state_transaction(
+            *[await self.agent.aget_write_proxy(name) for name in sorted(names)]
+        )
 
     def aiterate_results(
         self: Self, **params: Dict[str, Any]
@@ -39,11 +86,43 @@ class FunctionalActor(SerializingActor):
         """Invoke the wrapped callable and yield its result(s)."""
         return self.iterator(self.assign, **params)
 
+    async def areport_profile(
+        self: Self, assignment: Assign, profiler: AssignmentProfiler
+    ) -> None:
+        """Send the hot functions of a profiled assignment as a log of its task.
+
+        The raw profile is stored in the datalayer, if there is one.
+        """
+        summary = profiler.summary()
+        if summary is None:
+            return
+
+        message = f"Profile of {self.definition.name}:\n{summary}"
+        datalayer = (
+            getattr(self.agent, "datalayer", None) or current_rekuest_datalayer.get()
+        )
+        dump = profiler.dump()
+        if datalayer is not None and dump is not None:
+            try:
+                store_id = await datalayer.aput_bytes(dump, f"{assignment.task}.prof")
+                message += f"\nThe raw profile was stored as {store_id}"
+            except Exception:
+                logger.exception(f"Could not store the profile of {assignment.task}")
+
+        await self.asend(
+            message=messages.Log(task=assignment.task, message=message, level="DEBUG")
+        )
+
     async def on_assign(
         self: Self,
         assignment: Assign,
     ) -> None:
         """This method is called when the actor is assigned to a task"""
+        profiler = AssignmentProfiler() if self.profile or assignment.profile else None
+
+        if self.runs_micro_tasks and not assignment.capture and profiler is None:
+            await self.on_micro_assign(assignment)
+            return
 
         impl_id = (
             f"implementation '{self.definition.name}' "
@@ -59,7 +138,10 @@ class FunctionalActor(SerializingActor):
             )
         )
 
+        phase_seconds = get_metrics().phase_seconds
+
         async with self.sync_context(assignment.task, assignment.interface):
+            started = time.perf_counter()
             try:
                 input_kwargs = await expand_inputs(
                     self.definition,
@@ -79,32 +161,48 @@ class FunctionalActor(SerializingActor):
                     )
                 )
                 return
+            phase_seconds.labels(assignment.interface, "expand").observe(
+                time.perf_counter() - started
+            )
 
-            context_kwargs, state_kwargs, dependency_kwargs = await self.aget_locals()
-
-            params: Dict[str, Any] = {
-                **input_kwargs,
-                **context_kwargs,
-                **state_kwargs,
-                **dependency_kwargs,
-            }
+            params = await self.aget_params(input_kwargs)
 
             logs: List[str] = []
 
             async def aflush_captured_logs() -> None:
                 if logs and assignment.capture:
+                    # Drain only what is sent, output may still arrive from threads.
+                    # The send may block on a full send queue, so the batch is only
+                    # dropped once it is queued: a flush cancelled meanwhile leaves it
+                    # for the final flush.
+                    batch = logs[:]
                     await self.asend(
                         message=messages.Log(
                             task=assignment.task,
-                            message="".join(logs),
+                            message="".join(batch),
                             level="INFO",
                         )
                     )
+                    del logs[: len(batch)]
 
             try:
-                async with capture_to_list(logs, self.agent, assignment):
-                    async with AssignmentHelper(assignment=assignment, actor=self):
-                        async for returns in self.aiterate_results(**params):
+                async with capture_to_list(
+                    logs, self.agent, assignment, aflush=aflush_captured_logs
+                ):
+                    async with (
+                        AssignmentHelper(assignment=assignment, actor=self),
+                        await self.astate_transaction(),
+                    ):
+                        executing = shrinking = 0.0
+                        resumed = time.perf_counter()
+                        results = (
+                            self.aiterate_results(**params)
+                            if profiler is None
+                            else profiler.aiterate(self.iterator, self.assign, **params)
+                        )
+                        async for returns in results:
+                            yielded = time.perf_counter()
+                            executing += yielded - resumed
                             try:
                                 returns = await shrink_outputs(
                                     self.definition,
@@ -126,14 +224,28 @@ class FunctionalActor(SerializingActor):
                                 )
                                 return
 
+                            shrinking += time.perf_counter() - yielded
+
                             await self.asend(
                                 message=messages.Yield(
                                     task=assignment.task,
                                     returns=returns,
+                                    conflate=self.latest_only,
                                 )
                             )
+                            resumed = time.perf_counter()
+
+                        executing += time.perf_counter() - resumed
+                        phase_seconds.labels(assignment.interface, "execute").observe(
+                            executing
+                        )
+                        phase_seconds.labels(assignment.interface, "shrink").observe(
+                            shrinking
+                        )
 
                 await aflush_captured_logs()
+                if profiler is not None:
+                    await self.areport_profile(assignment, profiler)
 
                 await self.asend(
                     message=messages.Completed(
@@ -143,6 +255,8 @@ class FunctionalActor(SerializingActor):
 
             except Exception as ex:
                 await aflush_captured_logs()
+                if profiler is not None:
+                    await self.areport_profile(assignment, profiler)
 
                 logger.critical(f"Task error in {impl_id}", exc_info=True)
                 await self.asend(
@@ -153,6 +267,117 @@ class FunctionalActor(SerializingActor):
                 )
                 return
 
+    async def on_micro_assign(
+        self: Self,
+        assignment: Assign,
+    ) -> None:
+        """Run an assignment through the low-latency micro-task path.
+
+        Compared to :meth:`on_assign` this skips the "queued" progress report,
+        takes no shared locks and opens no state transaction or log capture (the
+        actor holds no locks or state, and the assignment does not capture logs)
+        and, for plain functions, folds the single ``Yield`` into the terminal
+        ``Completed`` if the backend advertised support for it
+        (``Init.fold_returns``). The task helper and caller postman are bound as
+        plain context variables instead of through the helper's context manager;
+        state mutations still publish directly and see no held locks, as on the
+        full path.
+        """
+        task = assignment.task
+        phase_seconds = get_metrics().phase_seconds
+
+        helper_token = current_task_helper.set(
+            AssignmentHelper.model_construct(assignment=assignment, actor=self)
+        )
+        postman_token = current_postman.set(self.agent.caller_postman)
+
+        if self.concurrency == "serial":
+            await self._serial_lock.acquire()
+
+        try:
+            started = time.perf_counter()
+            try:
+                input_kwargs = await expand_inputs(
+                    self.definition,
+                    assignment.args,
+                    structure_registry=self.structure_registry,
+                    shelver=self.agent,
+                    skip_expanding=not self.expand_inputs,
+                )
+            except Exception as ex:
+                logger.critical(
+                    f"Input serialization error in micro task {task}", exc_info=True
+                )
+                await self.asend(message=messages.Failed(task=task, error=str(ex)))
+                return
+            phase_seconds.labels(assignment.interface, "expand").observe(
+                time.perf_counter() - started
+            )
+
+            params = await self.aget_params(input_kwargs)
+            fold = self.definition.kind == ActionKind.FUNCTION and getattr(
+                self.agent, "folds_returns", False
+            )
+            folded: Dict[str, Any] | None = None
+
+            try:
+                with direct_publishing(self.agent), acquired_locks():
+                    executing = shrinking = 0.0
+                    resumed = time.perf_counter()
+                    async for returns in self.aiterate_results(**params):
+                        yielded = time.perf_counter()
+                        executing += yielded - resumed
+                        try:
+                            returns = await shrink_outputs(
+                                self.definition,
+                                returns,
+                                structure_registry=self.structure_registry,
+                                shelver=self.agent,
+                                skip_shrinking=not self.shrink_outputs,
+                            )
+                        except SerializationError as ex:
+                            logger.critical(
+                                f"Output serialization error in micro task {task}",
+                                exc_info=True,
+                            )
+                            await self.asend(
+                                message=messages.Failed(task=task, error=str(ex))
+                            )
+                            return
+
+                        shrinking += time.perf_counter() - yielded
+
+                        if fold:
+                            folded = returns
+                        else:
+                            await self.asend(
+                                message=messages.Yield(
+                                    task=task,
+                                    returns=returns,
+                                    conflate=self.latest_only,
+                                )
+                            )
+                        resumed = time.perf_counter()
+
+                    executing += time.perf_counter() - resumed
+                    phase_seconds.labels(assignment.interface, "execute").observe(
+                        executing
+                    )
+                    phase_seconds.labels(assignment.interface, "shrink").observe(
+                        shrinking
+                    )
+
+                await self.asend(message=messages.Completed(task=task, returns=folded))
+
+            except Exception as ex:
+                logger.critical(f"Task error in micro task {task}", exc_info=True)
+                await self.asend(message=messages.Critical(task=task, error=str(ex)))
+        finally:
+            if self.concurrency == "serial":
+                self._serial_lock.release()
+            current_postman.reset(postman_token)
+            current_task_helper.reset(helper_token)
+
 
 async def _func_iterator(
     assign: Callable[..., Any], **params: Any
@@ -1,5 +1,6 @@
 """The AssignmentHelper is a helper class that is used to manage the assignment"""
 
+import asyncio
 from typing import Any, Optional, Self
 from pydantic import BaseModel, ConfigDict
 from rekuest_next.api.schema import LogLevel
@@ -8,6 +9,7 @@ from rekuest_next import messages
 from rekuest_next.actors.vars import (
     current_task_helper,
 )
+from rekuest_next.actors.reporting import ReportChannel
 from rekuest_next.actors.types import Actor, AssignmentHook
 from rekuest_next.postmans.vars import current_postman
 
@@ -23,6 +25,7 @@ class AssignmentHelper(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
     _token = None
     _postman_token = None
+    _reporter: Optional[ReportChannel] = None
 
     async def alog(
         self: Self, level: LogLevel | messages.LogLevelLiteral, message: str
@@ -86,21 +89,38 @@ class AssignmentHelper(BaseModel):
     def progress(self, progress: int, message: Optional[str] = None) -> None:
         """Send a progress message to the agent.
 
+        Within the helper's async context this does not block: the progress is
+        handed to the assignment's report channel, which sends at most
+        ``max_report_rate`` updates per second and skips values that were
+        superseded in the meantime.
+
         Args:
             progress (int): The progress percentage.
             message (Optional[str]): The progress message.
         """
+        if self._reporter is None:
+            return unkoil(self.aprogress, progress, message=message)
 
-        return unkoil(self.aprogress, progress, message=message)
+        if progress < 0 or progress > 100:
+            raise ValueError("Progress must be between 0 and 100")
+        self._reporter.post_progress(progress, message)
 
-    def log(self, level: LogLevel, message: str) -> None:
+    def log(self, level: LogLevel | messages.LogLevelLiteral, message: str) -> None:
         """Send a log message to the agent.
 
+        Within the helper's async context this does not block: the line is
+        handed to the assignment's report channel and sent in a batch.
+
         Args:
             level (LogLevel): The log level.
             message (str): The log message.
         """
-        return unkoil(self.alog, level, message)
+        if self._reporter is None:
+            return unkoil(self.alog, level, message)
+
+        self._reporter.post_log(
+            level.value if isinstance(level, LogLevel) else level, message
+        )
 
     @property
     def user(self) -> str:
@@ -173,7 +193,12 @@ class AssignmentHelper(BaseModel):
         This is used to send logs and progress messages to the actor.
         Within this context all get_task_helper() calls will return this instance.
         """
-
+        self._reporter = ReportChannel(
+            self.assignment.task,
+            self.actor.asend,
+            asyncio.get_running_loop(),
+            max_rate=getattr(self.actor.agent, "max_report_rate", 10.0),
+        )
         return self.__enter__()
 
     async def __aexit__(
@@ -189,4 +214,6 @@ class AssignmentHelper(BaseModel):
             exc_val (Optional[Exception]): The exception value
             exc_tb (Optional[type]): The traceback
         """
+        if self._reporter is not None:
+            await self._reporter.aclose()
         return self.__exit__(exc_type, exc_val, exc_tb)
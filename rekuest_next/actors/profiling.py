@@ -0,0 +1,153 @@
+"""Opt-in profiling of single assignments.
+
+An assignment is profiled if its implementation was registered with
+``profile=True`` or the ``Assign`` asks for it (``profile``). The execution of
+the wrapped callable (not the expansion and shrinking around it) runs under a
+deterministic :mod:`cProfile` profiler:
+
+* sync functions and generators run in koil worker threads, every call (and
+  every step of a generator) is profiled in the thread it runs in,
+* async functions and generators are profiled on the event loop thread while
+  they are awaited. Other tasks the loop runs in the meantime show up in the
+  profile as well.
+
+Afterwards the aggregated hot functions are sent as a ``Log`` event of the task
+and, if a datalayer is available, the raw profile (a :mod:`pstats` dump, open
+it with ``pstats.Stats``) is stored there. Actors that do not profile never
+create a profiler: their assignments run exactly as before.
+"""
+
+import cProfile
+import functools
+import inspect
+import io
+import logging
+import marshal
+import pstats
+import threading
+from typing import Any, AsyncGenerator, Callable, Generator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AssignmentProfiler:
+    """Profiles the execution of one assignment
+
+    Args:
+        limit (int): How many functions the summary lists.
+    """
+
+    def __init__(self, limit: int = 25) -> None:
+        """Create a profiler without any profiles yet."""
+        self.limit = limit
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def _new_profile(self) -> cProfile.Profile:
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.append(profile)
+        return profile
+
+    def wrap_sync(self, function: Callable[..., Any]) -> Callable[..., Any]:
+        """Profile a sync function (or generator function) in its own thread."""
+        if inspect.isgeneratorfunction(function):
+
+            @functools.wraps(function)
+            def profiled_generator(
+                *args: Any, **kwargs: Any
+            ) -> Generator[Any, Any, Any]:  # noqa: ANN401
+                # Steps may run in different worker threads: one profile per step
+                generator = self._new_profile().runcall(function, *args, **kwargs)
+                while True:
+                    try:
+                        value = self._new_profile().runcall(next, generator)
+                    except StopIteration as stop:
+                        return stop.value
+                    yield value
+
+            return profiled_generator
+
+        @functools.wraps(function)
+        def profiled(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            return self._new_profile().runcall(function, *args, **kwargs)
+
+        return profiled
+
+    async def aiterate(
+        self,
+        iterator: Callable[..., AsyncGenerator[Any, None]],
+        assign: Callable[..., Any],
+        **params: Any,  # noqa: ANN401
+    ) -> AsyncGenerator[Any, None]:
+        """Iterate the results of ``assign`` (through ``iterator``) while profiling.
+
+        Args:
+            iterator (Callable[..., AsyncGenerator[Any, None]]): The result
+                iterator strategy of the actor.
+            assign (Callable[..., Any]): The wrapped callable.
+            **params (Any): The parameters of the call.
+
+        Yields:
+            Any: The results, exactly as the iterator yields them.
+        """
+        if not (
+            inspect.iscoroutinefunction(assign) or inspect.isasyncgenfunction(assign)
+        ):
+            async for returns in iterator(self.wrap_sync(assign), **params):
+                yield returns
+            return
+
+        profile: Optional[cProfile.Profile] = self._new_profile()
+        results = iterator(assign, **params)
+        try:
+            while True:
+                # Time spent on the yielded value (shrinking, sending) is excluded
+                if profile is not None:
+                    try:
+                        profile.enable()
+                    except ValueError:
+                        # Another profiler is active on this thread: run unprofiled
+                        profile = None
+                try:
+                    returns = await results.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    if profile is not None:
+                        profile.disable()
+                yield returns
+        finally:
+            await results.aclose()
+
+    def stats(self) -> Optional[pstats.Stats]:
+        """The aggregated statistics of every profile, None if nothing ran."""
+        stats: Optional[pstats.Stats] = None
+        with self._lock:
+            profiles = list(self._profiles)
+        for profile in profiles:
+            profile.create_stats()
+            if not profile.stats:  # type: ignore[attr-defined]
+                continue
+            if stats is None:
+                stats = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+        return stats
+
+    def summary(self) -> Optional[str]:
+        """The hottest functions by cumulative time, as printed by pstats."""
+        stats = self.stats()
+        if stats is None:
+            return None
+        output = io.StringIO()
+        stats.stream = output  # type: ignore[attr-defined]
+        stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.limit)
+        return output.getvalue()
+
+    def dump(self) -> Optional[bytes]:
+        """The raw aggregated profile, in the format ``pstats.Stats`` loads."""
+        stats = self.stats()
+        if stats is None:
+            return None
+        return marshal.dumps(stats.stats)  # type: ignore[attr-defined]
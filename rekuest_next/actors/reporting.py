@@ -0,0 +1,168 @@
+"""Rate-limited progress and log reporting from worker threads.
+
+Sync actors report through :meth:`AssignmentHelper.progress` and
+:meth:`AssignmentHelper.log` from their worker thread. Sending each report
+through the event loop and waiting for it would stall the thread on every call
+and, in tight loops, flood the transport. A :class:`ReportChannel` decouples
+both sides: threads only post to a buffer and return immediately, and a flusher
+on the event loop emits at most ``max_rate`` batches per second, each carrying
+only the newest progress value and the log lines gathered since the last one.
+"""
+
+import asyncio
+import collections
+import threading
+import time
+from typing import Awaitable, Callable, Deque, List, Optional, Tuple
+
+from rekuest_next import messages
+
+
+class ReportChannel:
+    """Coalesces the progress and log reports of one assignment.
+
+    The ``post_*`` methods are safe to call from any thread; everything else must
+    run on the event loop the channel was created for.
+    """
+
+    def __init__(
+        self,
+        task: str,
+        asend: Callable[[messages.FromAgentMessage], Awaitable[None]],
+        loop: asyncio.AbstractEventLoop,
+        max_rate: float = 10.0,
+    ) -> None:
+        """Create the channel.
+
+        Args:
+            task (str): The task the reports belong to.
+            asend (Callable): Sends a message to the agent (e.g. ``actor.asend``).
+            loop (asyncio.AbstractEventLoop): The loop the flusher runs on.
+            max_rate (float): The maximum number of flushes per second
+                (0: flush as soon as possible).
+        """
+        self.task = task
+        self.max_rate = max_rate
+        self._asend = asend
+        self._loop = loop
+        # Thread side: deque appends and pops are atomic, the progress deque
+        # only ever holds the newest value
+        self._logs: Deque[Tuple[messages.LogLevelLiteral, str]] = collections.deque()
+        self._progress: Deque[Tuple[int, Optional[str]]] = collections.deque(maxlen=1)
+        self._wakeup_pending = threading.Event()
+        # Loop side
+        self._flusher: Optional[asyncio.Task[None]] = None
+        self._dirty = asyncio.Event()
+        self._closed = False
+        self._finished = False
+        self._sending = False
+        self._last_flush = 0.0
+
+    def post_progress(self, progress: int, message: Optional[str] = None) -> None:
+        """Report progress, replacing any progress that was not sent yet.
+
+        Args:
+            progress (int): The progress percentage.
+            message (Optional[str]): The progress message.
+        """
+        self._progress.append((progress, message))
+        self._wake()
+
+    def post_log(self, level: messages.LogLevelLiteral, message: str) -> None:
+        """Queue a log line for the next batch.
+
+        Args:
+            level (LogLevelLiteral): The log level.
+            message (str): The log message.
+        """
+        self._logs.append((level, message))
+        self._wake()
+
+    def _wake(self) -> None:
+        # At most one wakeup in flight, so posting stays cheap in tight loops
+        if not self._wakeup_pending.is_set():
+            self._wakeup_pending.set()
+            self._loop.call_soon_threadsafe(self._on_wake)
+
+    def _on_wake(self) -> None:
+        self._wakeup_pending.clear()
+        if self._finished:
+            # Late report of a thread that outlived the assignment: its outcome
+            # was already sent, so the report is dropped
+            self._logs.clear()
+            self._progress.clear()
+            return
+        if self._closed:
+            # Sent by the final flush of ``aclose``
+            return
+        if self._flusher is None:
+            self._flusher = self._loop.create_task(self._run())
+        self._dirty.set()
+
+    async def _run(self) -> None:
+        while True:
+            await self._dirty.wait()
+            self._dirty.clear()
+            if self.max_rate > 0:
+                wait = self._last_flush + 1 / self.max_rate - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            self._sending = True
+            try:
+                await self.aflush()
+            finally:
+                self._sending = False
+            if self._closed:
+                return
+
+    def _take_batch(self) -> List[messages.FromAgentMessage]:
+        batch: List[messages.FromAgentMessage] = []
+        lines: List[str] = []
+        level: messages.LogLevelLiteral = "INFO"
+        while self._logs:
+            line_level, line = self._logs.popleft()
+            if lines and line_level != level:
+                batch.append(
+                    messages.Log(task=self.task, level=level, message="\n".join(lines))
+                )
+                lines = []
+            level = line_level
+            lines.append(line)
+        if lines:
+            batch.append(
+                messages.Log(task=self.task, level=level, message="\n".join(lines))
+            )
+
+        if self._progress:
+            progress = self._progress.popleft()
+            batch.append(
+                messages.Progress(
+                    task=self.task, progress=progress[0], message=progress[1]
+                )
+            )
+        return batch
+
+    async def aflush(self) -> None:
+        """Send everything posted so far."""
+        self._last_flush = time.monotonic()
+        for message in self._take_batch():
+            await self._asend(message)
+
+    async def aclose(self) -> None:
+        """Stop the flusher and send what is left.
+
+        Call this before the assignment reports its outcome, so no progress
+        or log arrives after it. Reports posted after it returns are dropped.
+        """
+        self._closed = True
+        if self._flusher is not None:
+            if not self._sending:
+                self._flusher.cancel()
+            try:
+                # A batch that is half sent is finished first
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.aflush()
+        self._finished = True
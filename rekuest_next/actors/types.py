@@ -30,7 +30,7 @@ from rekuest_next.definition.define import (
     ReturnWidgetMap,
 )
 from typing import Optional, List, Dict, Sequence, Tuple, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 if TYPE_CHECKING:
@@ -54,6 +54,8 @@ class PreparedStateVariables:
     write_state_variables: Dict[str, str]
     read_only_variables: Dict[str, str]
     required_state_locks: Dict[str, list[str]]
+    read_only_state_locks: Dict[str, list[str]] = field(default_factory=dict)
+    """The locks of the read-only states, held shared while reading."""
 
     @property
     def count(self) -> int:
@@ -113,6 +115,7 @@ class ImplementationDetails:
     locks: Optional[List[str]] = None
     tracks: Optional[List["TrackInput"]] = None
     manipulates: Optional[List[str]] = None
+    read_locks: Optional[List[str]] = None
 
 
 @runtime_checkable
@@ -153,6 +156,14 @@ class Agent(Protocol):
         locks on the agent."""
         ...
 
+    async def alock_group(self, keys: List[str], task: str) -> None:
+        """A function to announce that a task acquired a group of locks at once."""
+        ...
+
+    async def aunlock_group(self, keys: List[str]) -> None:
+        """A function to announce that a group of locks was released at once."""
+        ...
+
     def get_locks_for_keys(self, keys: Sequence[str]) -> List["TaskLock"]:
         """Resolve the agent's task locks for the given lock keys."""
         ...
@@ -299,7 +310,9 @@ class RegisterConfig:
     * **implementation/actor-shaping** — used by the actifier's actor build and by
       ``register_func`` when constructing the ``ImplementationInput``: ``dynamic``,
       ``optimistics``, ``locks``, ``tracks``, ``manipulates``, ``in_process``,
-      ``bypass_shrink``, ``bypass_expand``, ``auto_locks``, ``concurrency``.
+      ``bypass_shrink``, ``bypass_expand``, ``auto_locks``, ``concurrency``,
+      ``micro_task``, ``latest_only``, ``read_locks``, ``transactional``,
+      ``profile``.
     """
 
     # definition-shaping
@@ -329,6 +342,11 @@ class RegisterConfig:
     bypass_expand: bool = False
     auto_locks: bool = True
     concurrency: Literal["parallel", "serial"] = "serial"
+    micro_task: bool = False
+    latest_only: bool = False
+    read_locks: Optional[List[str]] = None
+    transactional: bool = False
+    profile: bool = False
 
 
 @runtime_checkable
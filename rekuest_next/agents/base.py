@@ -8,9 +8,11 @@ for managing the lifecycle of the actors that are spawned from it.
 import random
 
 import asyncio
+import collections
 import copy
 import logging
 import uuid
+import weakref
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from types import TracebackType
@@ -18,8 +20,10 @@ from typing import (
     TYPE_CHECKING,
     Any,
     AsyncIterator,
+    Deque,
     Dict,
     List,
+    Literal,
     Optional,
     Self,
     Sequence,
@@ -28,7 +32,6 @@ from typing import (
     cast,
 )
 import janus
-import jsonpatch  # type: ignore[import-untyped]
 from pydantic import ConfigDict, Field, PrivateAttr
 
 from koil.composition import KoiledModel
@@ -43,6 +46,9 @@ from rekuest_next.agents.hooks.registry import (
 )
 from rekuest_next.agents.lock import TaskLock
 from rekuest_next.app import AppRegistry, get_default_app_registry
+from rekuest_next.datalayer import DataLayer, current_rekuest_datalayer
+from rekuest_next.io.offload import aoffload_returns
+from rekuest_next.metrics import get_metrics
 from rekuest_next.agents.transport.types import AgentTransport
 from rekuest_next.api.schema import (
     Agent,
@@ -56,9 +62,12 @@ from rekuest_next.api.schema import (
 from rekuest_next.protocols import AnyState
 from rekuest_next.rath import RekuestNextRath
 from rekuest_next.scalars import Identifier
+from rekuest_next.state.apply import apply_operation
+from rekuest_next.state.diff import diff_json
 from rekuest_next.state.lock import acquired_locks
 from rekuest_next.state.publish import Patch
 from rekuest_next.state.shrink import ashrink_state
+from rekuest_next.state.transaction import TRANSACTION_OP
 from rekuest_next.structures.registry import StructureRegistry
 from rekuest_next.structures.serialization.actor import ashrink_return
 from rekuest_next.structures.types import JSONSerializable
@@ -79,6 +88,12 @@ _TERMINAL_FROM_AGENT_TYPES = (
 if TYPE_CHECKING:
     from rekuest_next.agents.caller import AgentPostman
 
+# The started agents whose queues the gauges sum over, by id (agents are not
+# hashable). Entries go away on ``__aexit__`` or when the agent is collected.
+_metered_agents: "weakref.WeakValueDictionary[int, BaseAgent]" = (
+    weakref.WeakValueDictionary()
+)
+
 
 class AppContext:
     """Protocol for the app context that is passed to the hooks."""
@@ -155,6 +170,27 @@ class BaseAgent(KoiledModel):
 
     capture_condition: asyncio.Condition = Field(default_factory=asyncio.Condition)
     capture_active: bool = Field(default=False)
+    capture_mode: Literal["exclusive", "context"] = Field(
+        default="exclusive",
+        description="How assignments with capture are run. 'exclusive' redirects the "
+        "process-wide stdout/stderr file descriptors and runs them one at a time, "
+        "'context' routes sys.stdout/sys.stderr and logging per task so they run "
+        "concurrently and stream their output in batched logs.",
+    )
+    capture_flush_interval: float = Field(
+        default=0.5,
+        description="Seconds between two batched log messages in 'context' capture mode",
+    )
+    capture_log_level: int = Field(
+        default=logging.INFO,
+        description="The lowest level of the log records captured in 'context' "
+        "capture mode",
+    )
+    max_report_rate: float = Field(
+        default=10.0,
+        description="The maximum number of batched progress/log reports per second "
+        "and assignment sent on behalf of worker threads (0: unlimited)",
+    )
 
     managed_actors: Dict[str, Actor] = Field(default_factory=dict)
 
@@ -181,6 +217,14 @@ class BaseAgent(KoiledModel):
     _caller_postman: Optional["AgentPostman"] = PrivateAttr(default=None)
     """The agent-as-caller postman, lazily built. Bound as ``current_postman`` while an
     actor body runs so actor-internal ``acall``/``acall_dependency`` route over this socket."""
+    _remote_agent_id: Optional[str] = PrivateAttr(default=None)
+    """The agent id the backend acknowledged us as (taken from the ``Init`` message)."""
+    _fold_returns: bool = PrivateAttr(default=False)
+    """Whether the backend accepts results folded into ``Completed`` (from ``Init``)."""
+    _local_assign: bool = PrivateAttr(default=False)
+    """Whether the backend accepts ``LocalAssign`` reports (from ``Init``)."""
+    _locals_revision: int = PrivateAttr(default=0)
+    """Bumped whenever startup (re)provides contexts, see ``locals_revision``."""
 
     _connected_event: asyncio.Event = PrivateAttr(default_factory=asyncio.Event)
     """Set when the server acknowledges the agent (an ``Init`` message is received)."""
@@ -224,7 +268,26 @@ class BaseAgent(KoiledModel):
     _unacked_events: Dict[str, messages.FromAgentMessage] = PrivateAttr(
         default_factory=dict
     )
+    offload_threshold: Optional[int] = Field(
+        default=None,
+        description="Yield returns larger than this many bytes (shrunk, as JSON) are stored in the datalayer and the Yield carries a reference instead. None disables offloading. The returns of a Completed that folds a micro-task's result are never offloaded, so keep those small.",
+    )
+    datalayer: Optional[DataLayer] = Field(
+        default=None,
+        description="The datalayer oversized returns are offloaded to. Defaults to the current datalayer.",
+    )
     global_revision: int = 0
+    patch_history_size: int = Field(
+        default=1024,
+        description="How many published state patches are kept to resend the ones the backend missed after a reconnect. If the missing patches were evicted already, the agent resends a full snapshot instead.",
+    )
+    _patch_history: Deque[messages.StatePatch] = PrivateAttr(
+        default_factory=collections.deque
+    )
+    _evicted_global_rev: int = PrivateAttr(default=0)
+    """The newest revision of which patches were evicted from ``_patch_history``."""
+    _state_publish_lock: asyncio.Lock = PrivateAttr(default_factory=asyncio.Lock)
+    """Held while publishing state, so a resync never interleaves with new patches."""
     snapshot_interval: int = Field(
         default=60,
         description="How many persisted patches should elapse before all current shrunk states are checkpointed.",
@@ -241,10 +304,39 @@ class BaseAgent(KoiledModel):
         default=20.0,
         description="Maximum seconds a single shutdown hook may run during teardown before it is abandoned. Bounds teardown so it can never hang on a hook that does not return.",
     )
+    local_routing: bool = Field(
+        default=True,
+        description="Whether actor-internal calls that target an interface registered on this agent are dispatched to the local actor directly instead of travelling to the backend and back. Only used with backends that accept LocalAssign reports (Init.local_assign). This saves the round trip, not serialization: args are still shrunk and expanded, and the reports still go over the transport. Dependency calls are resolved by the backend and always go remote.",
+    )
     started: bool = False
     running: bool = False
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+    @property
+    def agent_id(self) -> Optional[str]:
+        """The backend id of this agent, once known (``None`` before the first ``Init``)."""
+        if self._remote_agent_id is not None:
+            return self._remote_agent_id
+        if self._agent is not None:
+            return self._agent.id
+        return None
+
+    @property
+    def folds_returns(self) -> bool:
+        """Whether the backend accepts a function's result folded into ``Completed``.
+
+        Advertised by the backend in ``Init.fold_returns``; ``False`` until then.
+        """
+        return self._fold_returns
+
+    @property
+    def accepts_local_assign(self) -> bool:
+        """Whether the backend accepts ``LocalAssign`` reports.
+
+        Advertised by the backend in ``Init.local_assign``; ``False`` until then.
+        """
+        return self._local_assign
+
     @property
     def caller_postman(self) -> "AgentPostman":
         """The agent-as-caller postman (lazily built).
@@ -267,6 +359,28 @@ class BaseAgent(KoiledModel):
         """Signal that a task has released a lock."""
         return None
 
+    async def alock_group(self, keys: List[str], task: str) -> None:
+        """Signal that a task has acquired a group of locks.
+
+        Defaults to one :meth:`alock` per key; agents that can announce a group
+        in a single message override this.
+
+        Args:
+            keys (List[str]): The lock keys, in acquisition order.
+            task (str): The task holding the locks.
+        """
+        for key in keys:
+            await self.alock(key, task)
+
+    async def aunlock_group(self, keys: List[str]) -> None:
+        """Signal that a group of locks has been released.
+
+        Args:
+            keys (List[str]): The lock keys, in acquisition order.
+        """
+        for key in reversed(keys):
+            await self.aunlock(key)
+
     async def aget_read_only_proxy(self, key: str) -> AnyState:
         """Acquire a read-only state proxy for a given key."""
         return self.states[key]
@@ -284,8 +398,14 @@ class BaseAgent(KoiledModel):
             logger.debug("Starting patch event loop")
             while True:
                 queued_patch = await self._event_queue.async_q.get()
+                get_metrics().patch_lag_seconds.observe(
+                    (
+                        datetime.now(timezone.utc) - queued_patch.event_time
+                    ).total_seconds()
+                )
                 try:
-                    await self._aprocess_patch_event(queued_patch)
+                    async with self._state_publish_lock:
+                        await self._aprocess_patch_event(queued_patch)
                 finally:
                     self._event_queue.async_q.task_done()
         except asyncio.CancelledError:
@@ -308,6 +428,10 @@ class BaseAgent(KoiledModel):
         interface = queued_patch.interface
         patch = queued_patch.patch
 
+        if patch.op == TRANSACTION_OP:
+            await self._aprocess_transaction_event(queued_patch)
+            return
+
         # Check the revisions of the state
         future_global_rev = self.global_revision + 1
 
@@ -323,19 +447,9 @@ class BaseAgent(KoiledModel):
         self._aapply_patch_to_shrunk_state(interface, patch, shrunk_value)
 
         self.global_revision = future_global_rev
-        if self.global_revision % self.snapshot_interval == 0:
-            await self.apublish_snapshot(
-                messages.StateSnapshot(
-                    session_id=self.current_session,
-                    global_rev=self.global_revision,
-                    snapshots={
-                        interface: copy.deepcopy(shrunk_state)
-                        for interface, shrunk_state in self._current_shrunk_states.items()
-                    },
-                )
-            )
+        await self._amaybe_publish_snapshot()
 
-        await self.apublish_patch(
+        await self._apublish_state_patch(
             messages.StatePatch(
                 global_rev=self.global_revision,
                 state_name=interface,
@@ -349,6 +463,128 @@ class BaseAgent(KoiledModel):
             ),
         )
 
+    async def _aprocess_transaction_event(self, queued_patch: QueuedPatchEvent) -> None:
+        """Publish a committed state transaction.
+
+        The state is shrunk as a whole and diffed against the last published
+        shrunk state. Every operation of the minimal patch is applied and
+        published as its own revision, back to back: the publish lock is held,
+        so no other patch interleaves, and sinks keyed by revision (e.g. the
+        SQLite sink) get exactly one patch per revision.
+        """
+        interface = queued_patch.interface
+        patch = queued_patch.patch
+
+        new_shrunk = await self.ashrink_state(interface=interface, state=patch.value)
+        old_shrunk = self._current_shrunk_states.get(interface)
+        if old_shrunk is None:
+            operations = [{"op": "replace", "path": "", "value": new_shrunk}]
+        else:
+            operations = diff_json(old_shrunk, new_shrunk)
+
+        for operation in operations:
+            value = operation.get("value")
+            self._current_shrunk_states[interface] = apply_operation(
+                self._current_shrunk_states.get(interface),
+                operation["op"],
+                operation["path"],
+                value,
+                copy_values=True,
+            )
+            self.global_revision += 1
+            await self._amaybe_publish_snapshot()
+
+            await self._apublish_state_patch(
+                messages.StatePatch(
+                    global_rev=self.global_revision,
+                    state_name=interface,
+                    ts=queued_patch.event_time.timestamp(),
+                    op=operation["op"],
+                    path=operation["path"],
+                    # Detached from the live shrunk state, which later patches mutate
+                    value=copy.deepcopy(value),
+                    old_value=None,
+                    task_id=patch.correlation_id,
+                    session_id=self.current_session,
+                ),
+            )
+
+    async def _amaybe_publish_snapshot(self) -> None:
+        if self.global_revision % self.snapshot_interval == 0:
+            await self.apublish_snapshot(
+                messages.StateSnapshot(
+                    session_id=self.current_session,
+                    global_rev=self.global_revision,
+                    snapshots={
+                        interface: copy.deepcopy(shrunk_state)
+                        for interface, shrunk_state in self._current_shrunk_states.items()
+                    },
+                )
+            )
+
+    async def _apublish_state_patch(self, patch: messages.StatePatch) -> None:
+        """Publish a state patch and keep it for resuming after a reconnect."""
+        if self.patch_history_size <= 0:
+            self._evicted_global_rev = patch.global_rev
+        else:
+            if len(self._patch_history) >= self.patch_history_size:
+                self._evicted_global_rev = self._patch_history.popleft().global_rev
+            self._patch_history.append(patch)
+        await self.apublish_patch(patch)
+
+    async def aresume_states(self, acked_global_rev: Optional[int]) -> None:
+        """Resend the state the backend missed while the agent was disconnected.
+
+        Resends the published patches after ``acked_global_rev`` if they are
+        all still in the patch history, and a snapshot of the current states
+        otherwise. Both only go to the transport: they were handled locally
+        (e.g. persisted) when first published.
+
+        The transport holds back state messages until the ``Init`` was handled.
+        They are dropped when the backend acknowledged a revision (everything
+        after it is resent here) and sent as they are otherwise.
+
+        Args:
+            acked_global_rev (Optional[int]): The last revision the backend
+                persisted, as reported by ``Init``. ``None`` resends nothing.
+        """
+        async with self._state_publish_lock:
+            release_state = getattr(self.transport, "arelease_state", None)
+            if release_state is not None:
+                await release_state(discard=acked_global_rev is not None)
+            if acked_global_rev is None or acked_global_rev >= self.global_revision:
+                return
+
+            if acked_global_rev >= self._evicted_global_rev:
+                missing = [
+                    patch
+                    for patch in self._patch_history
+                    if patch.global_rev > acked_global_rev
+                ]
+                logger.info(
+                    "Resending %s state patches after revision %s",
+                    len(missing),
+                    acked_global_rev,
+                )
+                for patch in missing:
+                    await self.transport.asend(patch)
+                return
+
+            logger.info(
+                "State patches after revision %s were evicted, resending a snapshot",
+                acked_global_rev,
+            )
+            await self.transport.asend(
+                messages.StateSnapshot(
+                    session_id=self.current_session,
+                    global_rev=self.global_revision,
+                    snapshots={
+                        interface: copy.deepcopy(shrunk_state)
+                        for interface, shrunk_state in self._current_shrunk_states.items()
+                    },
+                )
+            )
+
     async def _ashrink_patch_value(
         self, interface: str, patch: Patch
     ) -> JSONSerializable | None:
@@ -367,17 +603,14 @@ class BaseAgent(KoiledModel):
         patch: Patch,
         shrunk_value: JSONSerializable | None,
     ) -> None:
-        patch_document: dict[str, JSONSerializable] = {
-            "op": patch.op,
-            "path": patch.path,
-        }
-        if patch.op != "remove":
-            patch_document["value"] = shrunk_value
-
-        jsonpatch.apply_patch(
+        # The value is also sent as StatePatch.value: later patches of the
+        # shrunk state must not modify it.
+        self._current_shrunk_states[interface] = apply_operation(
             self._current_shrunk_states[interface],
-            [patch_document],
-            in_place=True,
+            patch.op,
+            patch.path,
+            shrunk_value,
+            copy_values=True,
         )
 
     async def acollect(self, key: str) -> None:
@@ -503,12 +736,16 @@ class BaseAgent(KoiledModel):
             # Signal that the agent is connected so callers awaiting aconnect()
             # can proceed.
             self._connected_event.set()
+            self._remote_agent_id = message.agent
+            self._fold_returns = message.fold_returns
+            self._local_assign = message.local_assign
             # Reconnect (the backend re-sends Init after a transient drop): resend any
             # terminal reports we retained but never saw acked. Sent as-is (not via
             # _adispatch) so seq is preserved and they are not re-buffered; the backend
             # dedups terminal reports by task id.
             for retained in list(self._unacked_events.values()):
                 await self.transport.asend(retained)
+            await self.aresume_states(message.global_rev)
             for inquiry in message.inquiries:
                 if inquiry.task in self.managed_assignments:
                     assignment = self.managed_assignments[inquiry.task]
@@ -540,6 +777,7 @@ class BaseAgent(KoiledModel):
                     )
 
         elif isinstance(message, messages.Assign):
+            get_metrics().assignments.labels(message.interface).inc()
             if message.interface in self.managed_actors:
                 # The actor is already spawned
                 actor = self.managed_actors[message.interface]
@@ -732,8 +970,48 @@ class BaseAgent(KoiledModel):
             message = message.model_copy(update={"seq": self._event_seq})
             if isinstance(message, _TERMINAL_FROM_AGENT_TYPES):
                 self._unacked_events[message.id] = message
+            if self._caller_postman is not None:
+                # Feed reports of short-circuited local calls back to their caller.
+                self._caller_postman.handle_local_event(message)
+            if self.offload_threshold is not None and isinstance(
+                message, messages.Yield
+            ):
+                message = await self._aoffload_yield(message)
         await self.transport.asend(message)
 
+    async def _aoffload_yield(self, message: messages.Yield) -> messages.Yield:
+        """Replace oversized returns of a yield with a datalayer reference.
+
+        Local callers were already handed the inline returns; only the copy that
+        goes to the backend carries the reference. If the datalayer fails, the
+        yield is sent inline rather than lost.
+        """
+        assert self.offload_threshold is not None
+        if not message.returns:
+            return message
+        datalayer = self.datalayer or current_rekuest_datalayer.get()
+        if datalayer is None:
+            logger.warning(
+                "Offloading is enabled, but there is no datalayer. Sending inline."
+            )
+            return message
+
+        try:
+            returns = await aoffload_returns(
+                message.returns,
+                datalayer,
+                self.offload_threshold,
+                file_name=f"{message.task}-{message.seq}.json",
+            )
+        except Exception:
+            logger.exception(
+                f"Could not offload the returns of task {message.task}. Sending inline."
+            )
+            return message
+        if returns is message.returns:
+            return message
+        return message.model_copy(update={"returns": returns})
+
     async def asend(self, actor: "Actor", message: messages.FromAgentMessage) -> None:
         """Sends a message to the actor. This is used for sending messages to the
         agent from the actor. The agent will then send the message to the transport.
@@ -815,6 +1093,15 @@ class BaseAgent(KoiledModel):
         raise NotImplementedError("apublish_snapshot not implemented in BaseAgent")
 
     # Agent Related Getters
+    @property
+    def locals_revision(self) -> int:
+        """A counter that changes whenever the agent's contexts are (re)provided.
+
+        Actors memoize the contexts they inject per revision, so contexts
+        resolved once are reused until the startup hooks run again.
+        """
+        return self._locals_revision
+
     async def aget_context(self, context: str) -> Any:  # noqa: ANN401
         """Get a context from the agent. This is used to get contexts from the
         agent from the actor."""
@@ -924,6 +1211,34 @@ class BaseAgent(KoiledModel):
     async def aensure(self) -> None:
         """A function that gets called so that we create the agent with its definitions before we start the ooop"""
 
+    def _bind_metrics(self) -> None:
+        """Count this agent in the patch queue and running assignment gauges.
+
+        The gauges sum over every started agent, until it is exited.
+        """
+        metrics = get_metrics()
+        _metered_agents[id(self)] = self
+
+        def patch_queue_depth() -> int:
+            return sum(
+                agent._event_queue.async_q.qsize()
+                for agent in list(_metered_agents.values())
+                if agent._event_queue is not None
+            )
+
+        def active_assignments() -> int:
+            return sum(
+                len(agent.managed_assignments)
+                for agent in list(_metered_agents.values())
+            )
+
+        metrics.patch_queue_depth.set_function(patch_queue_depth)
+        metrics.active_assignments.set_function(active_assignments)
+
+    def _unbind_metrics(self) -> None:
+        """Stop counting this agent in the gauges."""
+        _metered_agents.pop(id(self), None)
+
     async def astart(self, app_context: Optional[AppContext] = None) -> None:
         """Starts the agent. This is used to start the agent and all the actors
         that are spawned from it. The agent will then start the transport and
@@ -948,7 +1263,10 @@ class BaseAgent(KoiledModel):
             await self.ainit_states(hook_return=hook_return, app_context=app_context)
 
         self.global_revision = 0
+        self._patch_history.clear()
+        self._evicted_global_rev = 0
         self._event_queue = janus.Queue()
+        self._bind_metrics()
         self._patch_processor_task = asyncio.create_task(self.apatch_event_loop())
         self._patch_processor_task.add_done_callback(
             lambda x: (
@@ -960,6 +1278,7 @@ class BaseAgent(KoiledModel):
 
         for context_key, context_value in hook_return.contexts.items():
             self.contexts[context_key] = context_value
+        self._locals_revision += 1
 
         await self.arun_background()
         self._errorfuture = asyncio.Future()
@@ -1177,6 +1496,7 @@ class BaseAgent(KoiledModel):
             exc_tb (Optional[type]): The traceback
 
         """
+        self._unbind_metrics()
         await self.atear_down()
         await self.transport.__aexit__(exc_type, exc_val, exc_tb)
 
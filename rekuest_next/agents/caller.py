@@ -20,6 +20,17 @@ The translation is:
 
 The agent's message loop (``BaseAgent.process``) forwards ``AssignResponse`` /
 ``ControlResponse`` / ``ExecutionEvent`` here via the ``handle_*`` methods.
+
+Calls that target an interface registered on this very agent (``AssignInput.interface``
+with no ``agent`` or our own agent id) skip the backend round trip if the backend
+accepts it (``Init.local_assign``): the postman mints a
+task id, reports it as a :class:`~rekuest_next.messages.LocalAssign` and hands a locally
+built ``Assign`` straight to the actor. The actor's own reports still go out over the
+socket for bookkeeping, and ``BaseAgent._adispatch`` mirrors them back here through
+:meth:`AgentPostman.handle_local_event`. What this saves is the backend round trip
+(``AssignRequest`` → ``AssignResponse`` → ``Assign``), not serialization: args are still
+shrunk by the caller and expanded by the actor, and the ``LocalAssign`` and every report
+still travel over the transport, so the backend keeps an exact record of the task.
 """
 
 from __future__ import annotations
@@ -68,6 +79,16 @@ _TERMINAL_TYPES = (
 )
 
 
+#: Agent reports that end a short-circuited local task.
+_LOCAL_TERMINAL_TYPES = (
+    messages.Completed,
+    messages.Failed,
+    messages.Critical,
+    messages.Cancelled,
+    messages.Interrupted,
+)
+
+
 def _adapt(event: "messages.ExecutionEvent") -> Optional[CallerTaskEvent]:
     """Translate a backend mirror into a ``CallerTaskEvent`` (or ``None`` to skip).
 
@@ -91,6 +112,28 @@ def _adapt(event: "messages.ExecutionEvent") -> Optional[CallerTaskEvent]:
     return None
 
 
+def _adapt_local(event: "messages.FromAgentEvent") -> Optional[CallerTaskEvent]:
+    """Translate an agent report of a local task into a ``CallerTaskEvent``.
+
+    The local counterpart of :func:`_adapt`: the same four kinds are surfaced, with
+    ``Cancelled``/``Interrupted`` escalated to ``CRITICAL``.
+    """
+    if isinstance(event, messages.Yield):
+        return CallerTaskEvent(kind=TaskEventKind.YIELD, returns=event.returns)
+    if isinstance(event, messages.Completed):
+        return CallerTaskEvent(kind=TaskEventKind.COMPLETED)
+    if isinstance(event, messages.Failed):
+        return CallerTaskEvent(kind=TaskEventKind.FAILED, message=event.error)
+    if isinstance(event, messages.Critical):
+        return CallerTaskEvent(kind=TaskEventKind.CRITICAL, message=event.error)
+    if isinstance(event, (messages.Cancelled, messages.Interrupted)):
+        return CallerTaskEvent(
+            kind=TaskEventKind.CRITICAL,
+            message="The delegated task was cancelled or interrupted before completion.",
+        )
+    return None
+
+
 class AgentPostman:
     """A :class:`Postman` that originates work over the agent's socket.
 
@@ -119,12 +162,34 @@ class AgentPostman:
         self._reference_to_task: Dict[str, str] = {}
         # task id -> last seen seq (gap detection only)
         self._last_seq: Dict[str, int] = {}
+        # locally minted task id -> queue of the local actor's reports
+        self._local_queues: Dict[str, "asyncio.Queue[messages.FromAgentEvent]"] = {}
 
     @property
     def connected(self) -> bool:
         """Whether the underlying agent transport is connected."""
         return getattr(self.agent.transport, "connected", False)
 
+    # ------------------------------------------------------------------ routing
+
+    def resolve_local_interface(self, assign: AssignInput) -> Optional[str]:
+        """Return the local interface ``assign`` targets, or ``None`` to go remote.
+
+        A call is local when it names an ``interface`` that is registered in the agent's
+        app registry and either names no ``agent`` or names this agent, and the backend
+        accepts ``LocalAssign`` reports. Calls resolved by the backend (by action, hash
+        or dependency) always go remote.
+        """
+        if not getattr(self.agent, "local_routing", False) or assign.interface is None:
+            return None
+        if not getattr(self.agent, "accepts_local_assign", False):
+            return None
+        if assign.agent is not None and assign.agent != self.agent.agent_id:
+            return None
+        if assign.interface not in self.agent.app_registry.actor_builders:
+            return None
+        return assign.interface
+
     # ------------------------------------------------------------------ outbound
 
     def _build_request(
@@ -164,6 +229,17 @@ class AgentPostman:
         is set and the cancel is not confirmed in time, an ``InterruptRequest`` follows.
         """
         reference = assign.reference or str(uuid.uuid4())
+        local_interface = self.resolve_local_interface(assign)
+        if local_interface is not None:
+            async for event in self._aassign_local(
+                assign,
+                local_interface,
+                reference,
+                cancel_timeout if cancel_timeout is not None else self.cancel_timeout,
+            ):
+                yield event
+            return
+
         request = self._build_request(assign, reference)
         loop = asyncio.get_event_loop()
         response_future: "asyncio.Future[messages.AssignResponse]" = (
@@ -227,6 +303,95 @@ class AgentPostman:
                 self._last_seq.pop(task, None)
             self._reference_to_task.pop(reference, None)
 
+    def _build_local_assign(
+        self, assign: AssignInput, interface: str, reference: str, task: str
+    ) -> messages.Assign:
+        """Build the ``Assign`` a local actor receives for a short-circuited call.
+
+        User and org are inherited from the parent assignment, as the backend would.
+        """
+        parent = (
+            self.agent.managed_assignments.get(assign.parent) if assign.parent else None
+        )
+        return messages.Assign(
+            interface=interface,
+            task=task,
+            root=(parent.root or parent.task) if parent else None,
+            parent=assign.parent,
+            resolution=assign.resolution,
+            capture=assign.capture,
+            reference=reference,
+            args=dict(assign.args or {}),
+            step=assign.step,
+            user=parent.user if parent else "",
+            org=parent.org if parent else "",
+            action=assign.action or (parent.action if parent else ""),
+            implementation=assign.implementation or "",
+            token=parent.token if parent else None,
+        )
+
+    async def _aassign_local(
+        self,
+        assign: AssignInput,
+        interface: str,
+        reference: str,
+        cancel_timeout: float,
+    ) -> AsyncGenerator[CallerTaskEvent, None]:
+        """Run ``assign`` on the local actor for ``interface`` and stream its events."""
+        task = str(uuid.uuid4())
+        message = self._build_local_assign(assign, interface, reference, task)
+        queue: "asyncio.Queue[messages.FromAgentEvent]" = asyncio.Queue()
+        self._local_queues[task] = queue
+        self._reference_to_task[reference] = task
+        actor = None
+        try:
+            await self.agent._adispatch(
+                messages.LocalAssign(
+                    task=task,
+                    interface=interface,
+                    reference=reference,
+                    parent=assign.parent,
+                    action=assign.action,
+                    implementation=assign.implementation,
+                    args=message.args,
+                )
+            )
+            actor = self.agent.managed_actors.get(interface)
+            if actor is None:
+                actor = await self.agent.aspawn_actor_from_assign(message)
+            else:
+                self.agent.managed_assignments[task] = message
+            await actor.apass(message)
+
+            while True:
+                event = await queue.get()
+                if isinstance(event, messages.Completed) and event.returns is not None:
+                    # A micro-task folded its single result into the terminal report
+                    yield CallerTaskEvent(
+                        kind=TaskEventKind.YIELD, returns=event.returns
+                    )
+                adapted = _adapt_local(event)
+                if adapted is not None:
+                    yield adapted
+                if isinstance(event, _LOCAL_TERMINAL_TYPES):
+                    return
+        except (asyncio.CancelledError, GeneratorExit):
+            if actor is not None and await actor.acheck_task(task):
+                try:
+                    await asyncio.wait_for(
+                        actor.apass(messages.Cancel(task=task)),
+                        timeout=cancel_timeout,
+                    )
+                except Exception:
+                    logger.warning(
+                        "Failed to cancel local task %s", task, exc_info=True
+                    )
+            raise
+        finally:
+            self._local_queues.pop(task, None)
+            self._reference_to_task.pop(reference, None)
+            self.agent.managed_assignments.pop(task, None)
+
     def _register_task(
         self, reference: str, task: str
     ) -> "asyncio.Queue[messages.ExecutionEvent]":
@@ -343,6 +508,17 @@ class AgentPostman:
         else:
             self._orphan_by_task.setdefault(message.task, []).append(message)
 
+    def handle_local_event(self, message: messages.FromAgentEvent) -> None:
+        """Route an agent report to the caller of a short-circuited local task, if any."""
+        if not self._local_queues:
+            return
+        task = getattr(message, "task", None)
+        if task is None:
+            return
+        queue = self._local_queues.get(task)
+        if queue is not None:
+            queue.put_nowait(message)
+
     # --------------------------------------------------------- protocol niceties
 
     async def __aenter__(self) -> "AgentPostman":
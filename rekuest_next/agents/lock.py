@@ -26,13 +26,46 @@ Deadlock invariants
    while the local ``asyncio.Lock`` is held so the server observes lock and
    unlock events in their true order. Every failure path must release the
    local lock; ``TaskLock.acquire`` and ``TaskLock.release`` guarantee this.
+
+Grouped announcements
+---------------------
+
+``LockGroup`` takes all local locks first (in sorted order) and then announces
+the whole group once via ``agent.alock_group``/``aunlock_group``, so an
+assignment holding ``n`` keys costs two lock messages instead of ``2n``.
+Invariant 4 holds for the group as a whole: the group is announced while every
+key is held, and a failing announcement releases all of them.
+
+Shared (reader) holds
+---------------------
+
+Every ``TaskLock`` is a reader/writer lock. Implementations that only read the
+states guarded by a key hold it *shared*: any number of readers run
+concurrently, writers hold the key exclusively. A writer that is waiting blocks
+newly arriving readers (writer preference), so a steady stream of readers cannot
+starve it. Shared keys take part in the global ordering like exclusive ones, so
+invariant 1 still holds. Shared holds are local only and are not announced to
+the agent.
 """
 
 import asyncio
+import collections
 import logging
+import time
 from types import TracebackType
 from rekuest_next.api.schema import LockImplementationInput
-from typing import TYPE_CHECKING, Self
+from rekuest_next.metrics import get_metrics
+from typing import (
+    TYPE_CHECKING,
+    Awaitable,
+    Callable,
+    Deque,
+    Iterable,
+    List,
+    Optional,
+    Self,
+    Tuple,
+)
 
 if TYPE_CHECKING:
     from rekuest_next.actors.types import Agent
@@ -40,18 +73,121 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+class ReaderWriterLock:
+    """An asyncio lock with shared (reader) and exclusive (writer) holds.
+
+    ``acquire``/``release`` (and ``async with``) take the lock exclusively, like
+    an ``asyncio.Lock``; ``acquire_shared``/``release_shared`` take it shared.
+    Waiters are served in arrival order, readers that queue up behind each other
+    are let in together. A reader never overtakes a waiting writer, so writers
+    cannot starve. Not reentrant.
+    """
+
+    def __init__(self) -> None:
+        self._readers = 0
+        self._writer = False
+        # (shared, future) in arrival order
+        self._waiters: Deque[Tuple[bool, asyncio.Future[None]]] = collections.deque()
+
+    def locked(self) -> bool:
+        """Whether the lock is held, shared or exclusively."""
+        return self._writer or self._readers > 0
+
+    @property
+    def readers(self) -> int:
+        """The number of shared holders."""
+        return self._readers
+
+    def _wake(self) -> None:
+        while self._waiters and not self._writer:
+            shared, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            if shared:
+                self._readers += 1
+            elif self._readers == 0:
+                self._writer = True
+            else:
+                return
+            self._waiters.popleft()
+            future.set_result(None)
+
+    async def _wait(self, shared: bool) -> None:
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append((shared, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the cancellation arrived
+                if shared:
+                    self.release_shared()
+                else:
+                    self.release()
+            else:
+                self._wake()
+            raise
+
+    async def acquire(self) -> bool:
+        """Acquire the lock exclusively."""
+        if not self.locked() and not self._waiters:
+            self._writer = True
+            return True
+        await self._wait(shared=False)
+        return True
+
+    def release(self) -> None:
+        """Release an exclusive hold."""
+        if not self._writer:
+            raise RuntimeError("Lock is not acquired exclusively.")
+        self._writer = False
+        self._wake()
+
+    async def acquire_shared(self) -> bool:
+        """Acquire the lock shared, waiting for the writer and queued writers."""
+        if not self._writer and not self._waiters:
+            self._readers += 1
+            return True
+        await self._wait(shared=True)
+        return True
+
+    def release_shared(self) -> None:
+        """Release a shared hold."""
+        if self._readers <= 0:
+            raise RuntimeError("Lock is not acquired shared.")
+        self._readers -= 1
+        if self._readers == 0:
+            self._wake()
+
+    async def __aenter__(self) -> None:
+        """Acquire the lock exclusively."""
+        await self.acquire()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Release the exclusive hold."""
+        self.release()
+
+
 class TaskLock:
     """A named lock shared by all implementations that declare its key.
 
-    Wraps a local ``asyncio.Lock`` and mirrors acquire/release to the agent
-    (``agent.alock``/``aunlock``) so the server can display lock state.
+    Wraps a local :class:`ReaderWriterLock` and mirrors exclusive
+    acquire/release to the agent (``agent.alock``/``aunlock``) so the server can
+    display lock state.
     """
 
     def __init__(self, agent: "Agent", lock: "LockImplementationInput"):
         self.agent = agent
-        self.lock = asyncio.Lock()
+        self.lock = ReaderWriterLock()
         self.lock_key = lock.definition.key
         self.locking_task: str | None = None
+        self.reading_tasks: set[str] = set()
         self.definition = lock.definition
 
     async def acquire(self, task: str) -> None:
@@ -60,15 +196,36 @@ class TaskLock:
         If notifying the agent fails, the local lock is released again so the
         key cannot be left held forever (deadlock invariant 4).
         """
-        await self.lock.acquire()
+        await self.acquire_local(task)
         try:
-            self.locking_task = task
             await self.agent.alock(self.definition.key, task)
         except BaseException:
-            self.locking_task = None
-            self.lock.release()
+            self.release_local()
             raise
 
+    async def acquire_local(self, task: str) -> None:
+        """Acquire only the local lock, without notifying the agent.
+
+        The caller is responsible for announcing the lock (see ``LockGroup``).
+        """
+        await self.lock.acquire()
+        self.locking_task = task
+
+    def release_local(self) -> None:
+        """Release only the local lock, without notifying the agent."""
+        self.locking_task = None
+        self.lock.release()
+
+    async def acquire_shared(self, task: str) -> None:
+        """Hold the lock shared (for reading) on behalf of a task."""
+        await self.lock.acquire_shared()
+        self.reading_tasks.add(task)
+
+    def release_shared(self, task: str) -> None:
+        """Release a shared hold of a task."""
+        self.reading_tasks.discard(task)
+        self.lock.release_shared()
+
     async def release(self) -> None:
         """Notify the agent and release the lock.
 
@@ -87,46 +244,116 @@ class LockGroup:
     """The set of task locks an assignment holds while it runs.
 
     Acquires the locks in sorted key order (deadlock invariant 1) and releases
-    them in reverse. Use as an async context manager.
+    them in reverse. The exclusive part of the group is announced to the agent
+    in a single grouped lock and unlock message. Use as an async context manager.
     """
 
     def __init__(
         self,
         locks: list[TaskLock],
         task_id: str,
+        shared_locks: Optional[Iterable[TaskLock]] = None,
     ) -> None:
         """Initialize the LockGroup.
 
         Args:
-            locks: The TaskLock instances to acquire.
+            locks: The TaskLock instances to acquire exclusively.
             task_id: The ID of the task acquiring them.
+            shared_locks: The TaskLock instances to acquire shared (for reading).
+                Locks that are also in ``locks`` are held exclusively.
         """
         self.locks = locks
         self.task_id = task_id
+        exclusive_keys = {lock.lock_key for lock in locks}
+        self.shared_locks = [
+            lock for lock in shared_locks or [] if lock.lock_key not in exclusive_keys
+        ]
         self._acquired_locks: list[TaskLock] = []
+        self._shared_acquired_locks: list[TaskLock] = []
+        self._held: list[tuple[TaskLock, bool]] = []
+        self._announced = False
+
+    @property
+    def keys(self) -> List[str]:
+        """The keys of the exclusively acquired locks, in acquisition order."""
+        return [lock.lock_key for lock in self._acquired_locks]
+
+    async def _alock_group(self, keys: List[str]) -> None:
+        agent = self._acquired_locks[0].agent
+        alock_group: Optional[Callable[[List[str], str], Awaitable[None]]] = getattr(
+            agent, "alock_group", None
+        )
+        if alock_group is not None:
+            await alock_group(keys, self.task_id)
+            return
+        # Agents without grouped announcements get one message per key
+        for key in keys:
+            await agent.alock(key, self.task_id)
+
+    async def _aunlock_group(self, keys: List[str]) -> None:
+        agent = self._acquired_locks[0].agent
+        aunlock_group: Optional[Callable[[List[str]], Awaitable[None]]] = getattr(
+            agent, "aunlock_group", None
+        )
+        if aunlock_group is not None:
+            await aunlock_group(keys)
+            return
+        for key in reversed(keys):
+            try:
+                await agent.aunlock(key)
+            except Exception:
+                logger.exception("Failed to announce release of lock %s", key)
 
     async def acquire(self) -> Self:
-        """Acquire all locks in sorted key order.
+        """Acquire all locks in sorted key order and announce them as a group.
 
         Returns:
             LockGroup: This group, with all locks held.
         """
-        for lock in sorted(self.locks, key=lambda x: x.lock_key):
-            await lock.acquire(self.task_id)
-            self._acquired_locks.append(lock)
+        wanted = [(lock, False) for lock in self.locks] + [
+            (lock, True) for lock in self.shared_locks
+        ]
+        lock_wait_seconds = get_metrics().lock_wait_seconds
+        for lock, shared in sorted(wanted, key=lambda x: x[0].lock_key):
+            started = time.perf_counter()
+            if shared:
+                await lock.acquire_shared(self.task_id)
+                self._shared_acquired_locks.append(lock)
+            else:
+                await lock.acquire_local(self.task_id)
+                self._acquired_locks.append(lock)
+            lock_wait_seconds.labels(lock.lock_key).observe(
+                time.perf_counter() - started
+            )
+            self._held.append((lock, shared))
+
+        if self._acquired_locks:
+            # Announced while every key is held (deadlock invariant 4); the
+            # caller releases the local locks if this fails
+            await self._alock_group(self.keys)
+            self._announced = True
         return self
 
     async def release(self) -> None:
-        """Release all acquired locks in reverse order.
+        """Announce the release of the group and release all locks in reverse order.
 
-        Best-effort: a failing release does not leave the remaining keys held.
+        Best-effort: a failing announcement does not leave any key held.
         """
-        for lock in reversed(self._acquired_locks):
-            try:
-                await lock.release()
-            except Exception:
-                logger.exception("Failed to release lock %s", lock.lock_key)
-        self._acquired_locks.clear()
+        try:
+            if self._announced:
+                await self._aunlock_group(self.keys)
+        except Exception:
+            logger.exception("Failed to release lock group %s", self.keys)
+        finally:
+            self._announced = False
+            for lock, shared in reversed(self._held):
+                if shared:
+                    lock.release_shared(self.task_id)
+                else:
+                    lock.release_local()
+            self._held.clear()
+            self._acquired_locks.clear()
+            self._shared_acquired_locks.clear()
 
     async def __aenter__(self) -> Self:
         """Acquire all locks (sorted) and return the group."""
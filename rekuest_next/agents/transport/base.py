@@ -55,6 +55,19 @@ class AgentTransport(KoiledModel):
         raise NotImplementedError("This is an abstract Base Class")
         yield
 
+    async def arelease_state(self, discard: bool) -> None:
+        """Release the state messages held back since the connection opened.
+
+        The agent calls this when it handles an ``Init``, right before it
+        resends the state the backend is missing. Transports that do not hold
+        back state messages have nothing to release.
+
+        Args:
+            discard (bool): Drop the held messages, because the agent resends
+                everything after the revision the backend acknowledged.
+        """
+        return None
+
     @abstractmethod
     async def adisconnect(self) -> None:
         """Disconnect the agent."""
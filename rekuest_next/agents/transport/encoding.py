@@ -0,0 +1,170 @@
+"""Wire encodings for agent messages.
+
+Agent messages travel as JSON text frames by default. A transport can negotiate a
+binary encoding (:class:`~rekuest_next.messages.WireEncoding`): messages are then
+sent as MessagePack or CBOR binary frames, which are smaller and faster to encode
+for numeric payloads. Text frames stay JSON in every case, so a peer can decode a
+frame by its type alone.
+
+The message envelope is dumped by pydantic (in JSON mode) and then packed. The
+payloads (the ``returns`` of a report, state values and snapshots) are packed as
+they are, by the packer itself: ``bytes`` stay raw binary instead of being turned
+into text, and ndarray-like values (anything with a ``dtype``, a ``shape`` and
+``tobytes``) are sent as::
+
+    {"__ndarray__": {"dtype": "<f8", "shape": [2, 3], "data": b"..."}}
+
+MessagePack needs the ``msgpack`` extra, CBOR the ``cbor`` extra.
+"""
+
+import json
+from typing import Any, Callable, Dict, Tuple, cast
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+from rekuest_next.agents.transport.errors import EncodingUnavailable
+from rekuest_next.messages import WireEncoding
+
+NDARRAY_KEY = "__ndarray__"
+"""The key of the map an ndarray-like value is packed as."""
+
+_RAW_FIELDS = ("returns", "snapshots", "states", "value")
+"""Payload fields packed as they are, without the JSON-mode dump of the envelope."""
+
+Codec = Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]
+_codecs: Dict[WireEncoding, Codec] = {}
+
+
+def _is_ndarray_like(value: Any) -> bool:  # noqa: ANN401
+    return (
+        hasattr(value, "dtype")
+        and hasattr(value, "shape")
+        and hasattr(value, "tobytes")
+    )
+
+
+def _default(value: Any) -> Any:  # noqa: ANN401
+    """Turn a value the packer has no native form for into one it has."""
+    if _is_ndarray_like(value):
+        return {
+            NDARRAY_KEY: {
+                "dtype": value.dtype.str,
+                "shape": list(value.shape),
+                "data": value.tobytes(),
+            }
+        }
+    return to_jsonable_python(value)
+
+
+def _load_codec(encoding: WireEncoding) -> Codec:
+    # Containers, numbers and bytes are packed natively (in C), only other
+    # values go through _default
+    if encoding == WireEncoding.MSGPACK:
+        try:
+            import msgpack  # type: ignore[import-untyped]
+        except ImportError as e:
+            raise EncodingUnavailable(
+                "MessagePack encoding requires the 'msgpack' extra"
+            ) from e
+
+        def _pack(value: Any) -> bytes:  # noqa: ANN401
+            return cast(
+                bytes, msgpack.packb(value, use_bin_type=True, default=_default)
+            )
+
+        def _unpack(payload: bytes) -> Any:  # noqa: ANN401
+            return msgpack.unpackb(payload, raw=False)
+
+        return _pack, _unpack
+    if encoding == WireEncoding.CBOR:
+        try:
+            import cbor2  # type: ignore[import-untyped]
+        except ImportError as e:
+            raise EncodingUnavailable("CBOR encoding requires the 'cbor' extra") from e
+        return (
+            lambda value: cbor2.dumps(
+                value, default=lambda encoder, item: encoder.encode(_default(item))
+            ),
+            cbor2.loads,
+        )
+    raise EncodingUnavailable(f"{encoding} is not a binary encoding")
+
+
+def get_codec(encoding: WireEncoding) -> Codec:
+    """The ``(pack, unpack)`` functions of a binary encoding.
+
+    Args:
+        encoding (WireEncoding): A binary encoding.
+
+    Returns:
+        Codec: Functions turning a plain python value into bytes and back.
+    """
+    codec = _codecs.get(encoding)
+    if codec is None:
+        codec = _codecs[encoding] = _load_codec(encoding)
+    return codec
+
+
+def ensure_encoding(encoding: WireEncoding) -> None:
+    """Raise :class:`EncodingUnavailable` if ``encoding`` cannot be used here."""
+    if encoding != WireEncoding.JSON:
+        get_codec(encoding)
+
+
+def encode_value(value: Any, encoding: WireEncoding) -> str | bytes:  # noqa: ANN401
+    """Encode a plain python value (e.g. an initial websocket payload).
+
+    Args:
+        value (Any): The value to encode.
+        encoding (WireEncoding): The encoding to use.
+
+    Returns:
+        str | bytes: JSON text for ``JSON``, the packed bytes otherwise.
+    """
+    if encoding == WireEncoding.JSON:
+        return json.dumps(
+            to_jsonable_python(value), separators=(",", ":"), ensure_ascii=False
+        )
+    pack, _ = get_codec(encoding)
+    return pack(value)
+
+
+def encode_message(message: BaseModel, encoding: WireEncoding) -> str | bytes:
+    """Encode an agent message for the wire.
+
+    Args:
+        message (BaseModel): The message to encode.
+        encoding (WireEncoding): The encoding to use.
+
+    Returns:
+        str | bytes: JSON text for ``JSON`` (send as a text frame), the packed
+            bytes otherwise (send as a binary frame).
+    """
+    if encoding == WireEncoding.JSON:
+        return message.model_dump_json()
+
+    pack, _ = get_codec(encoding)
+    raw_fields = {name for name in _RAW_FIELDS if name in type(message).model_fields}
+    data = message.model_dump(mode="json", exclude=raw_fields)
+    for name in raw_fields:
+        data[name] = getattr(message, name)
+    return pack(data)
+
+
+def decode_payload(payload: str | bytes, encoding: WireEncoding) -> Any:  # noqa: ANN401
+    """Decode a received frame into plain python values.
+
+    Args:
+        payload (str | bytes): The frame: text frames are always JSON.
+        encoding (WireEncoding): The encoding binary frames use.
+
+    Returns:
+        Any: The decoded value, ready for model validation.
+    """
+    if isinstance(payload, str):
+        return json.loads(payload)
+    if encoding == WireEncoding.JSON:
+        raise EncodingUnavailable("Received a binary frame, but no binary encoding")
+    _, unpack = get_codec(encoding)
+    return unpack(payload)
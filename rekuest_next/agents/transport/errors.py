@@ -67,3 +67,9 @@ class AgentIsAlreadyBusy(AgentConnectionFail):
     """Raised when the agent is already busy with another task."""
 
     pass
+
+
+class EncodingUnavailable(AgentTransportException):
+    """Raised when a wire encoding is requested whose library is not installed."""
+
+    pass
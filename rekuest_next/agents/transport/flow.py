@@ -0,0 +1,161 @@
+"""Flow control for the outbound side of agent transports.
+
+A generator action can produce ``Yield`` reports much faster than the socket can
+carry them. With an unbounded outbound queue the backlog grows without limit and
+every other task's reports wait behind it. :class:`SendQueue` bounds the queue
+and hands out per-task *credits* for ``Yield`` reports: a task may only have
+``yield_window`` yields waiting for the wire, and the producer (and with it the
+generator) is suspended until the sender catches up.
+
+Tasks that only care about their newest value can send conflating yields
+(``Yield.conflate``): instead of waiting for a credit, a conflating yield replaces
+the task's yield that is still waiting for the wire. The replaced yield's ``seq``
+is never sent, so the backend sees a gap for every conflated yield.
+"""
+
+import asyncio
+import collections
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional
+
+from rekuest_next import messages
+
+
+@dataclass
+class _Outgoing:
+    """A message waiting for the wire."""
+
+    message: messages.FromAgentMessage
+    yield_task: Optional[str] = None
+    """The task of a ``Yield`` report (None for all other messages)."""
+
+
+class SendQueue:
+    """A bounded FIFO of outbound messages with per-task yield credits.
+
+    The interface mirrors the parts of :class:`asyncio.Queue` the transports use
+    (``put``/``get``/``task_done``/``join``). Messages are queued unserialized,
+    so the sender encodes them with the wire encoding in effect when they are
+    actually sent.
+    """
+
+    def __init__(self, maxsize: int = 0, yield_window: int = 0) -> None:
+        """Create the queue.
+
+        Args:
+            maxsize (int): The maximum number of queued messages (0: unbounded).
+            yield_window (int): The maximum number of queued yields per task
+                (0: unbounded).
+        """
+        self.maxsize = maxsize
+        self.yield_window = yield_window
+        self._entries: Deque[_Outgoing] = collections.deque()
+        self._pending_yields: Dict[str, int] = {}
+        self._latest_yield: Dict[str, _Outgoing] = {}
+        self._changed = asyncio.Condition()
+        self._unfinished = 0
+        self._finished = asyncio.Event()
+        self._finished.set()
+
+    def qsize(self) -> int:
+        """The number of queued messages."""
+        return len(self._entries)
+
+    def pending_yields(self, task: str) -> int:
+        """The number of queued yields of ``task``."""
+        return self._pending_yields.get(task, 0)
+
+    def _has_room(self, task: Optional[str]) -> bool:
+        if self.maxsize and len(self._entries) >= self.maxsize:
+            return False
+        if (
+            task is not None
+            and self.yield_window
+            and self._pending_yields.get(task, 0) >= self.yield_window
+        ):
+            return False
+        return True
+
+    async def put(self, message: messages.FromAgentMessage) -> None:
+        """Queue a message, waiting for room (and, for yields, a credit).
+
+        Args:
+            message (FromAgentMessage): The message to queue.
+        """
+        task = message.task if isinstance(message, messages.Yield) else None
+
+        async with self._changed:
+            if isinstance(message, messages.Yield) and message.conflate:
+                latest = self._latest_yield.get(message.task)
+                if latest is not None:
+                    # Still waiting for the wire: only the newest value matters
+                    latest.message = message
+                    return
+
+            await self._changed.wait_for(lambda: self._has_room(task))
+
+            entry = _Outgoing(message=message, yield_task=task)
+            self._entries.append(entry)
+            self._unfinished += 1
+            self._finished.clear()
+            if task is not None:
+                self._pending_yields[task] = self._pending_yields.get(task, 0) + 1
+                self._latest_yield[task] = entry
+            self._changed.notify_all()
+
+    async def get(self) -> messages.FromAgentMessage:
+        """Take the next message off the queue, returning its credit."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: bool(self._entries))
+            entry = self._entries.popleft()
+            self._release(entry)
+            self._changed.notify_all()
+            return entry.message
+
+    async def atake(
+        self, predicate: Callable[[messages.FromAgentMessage], bool]
+    ) -> List[messages.FromAgentMessage]:
+        """Remove the queued messages matching ``predicate``, in queue order.
+
+        Args:
+            predicate (Callable[[FromAgentMessage], bool]): Selects the messages.
+
+        Returns:
+            List[FromAgentMessage]: The removed messages. They count as sent.
+        """
+        async with self._changed:
+            taken: List[_Outgoing] = []
+            kept: Deque[_Outgoing] = collections.deque()
+            for entry in self._entries:
+                (taken if predicate(entry.message) else kept).append(entry)
+            if not taken:
+                return []
+            self._entries = kept
+            for entry in taken:
+                self._release(entry)
+                self.task_done()
+            self._changed.notify_all()
+            return [entry.message for entry in taken]
+
+    def _release(self, entry: _Outgoing) -> None:
+        task = entry.yield_task
+        if task is not None:
+            remaining = self._pending_yields[task] - 1
+            if remaining:
+                self._pending_yields[task] = remaining
+            else:
+                del self._pending_yields[task]
+            if self._latest_yield.get(task) is entry:
+                del self._latest_yield[task]
+
+    def task_done(self) -> None:
+        """Mark a message taken with :meth:`get` as sent."""
+        if self._unfinished <= 0:
+            raise ValueError("task_done() called too many times")
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._finished.set()
+
+    async def join(self) -> None:
+        """Wait until every queued message was sent."""
+        await self._finished.wait()
@@ -0,0 +1,282 @@
+"""In-memory loopback transport
+
+Connects an agent to a :class:`LoopbackDriver` in the same event loop through
+asyncio queues: no sockets, no threads and no encoding. Messages are handed
+over as the message objects themselves, so benchmarks and tests of the agent
+runtime measure the actors instead of the transport.
+
+Example::
+
+    transport = LoopbackAgentTransport()
+    agent = LoopbackAgent(transport=transport, app_registry=registry)
+    async with agent:
+        provide = asyncio.create_task(agent.aprovide())
+        task = await transport.driver.aassign("add_one", {"x": 1})
+        completed = await transport.driver.aresult(task)
+"""
+
+import asyncio
+import uuid
+from types import TracebackType
+from typing import Any, AsyncIterator, Dict, Optional, Self, cast
+
+from pydantic import ConfigDict, PrivateAttr
+
+from rekuest_next import messages
+from rekuest_next.agents.base import BaseAgent
+from rekuest_next.agents.transport.base import AgentTransport
+from rekuest_next.agents.transport.errors import AgentTransportException
+
+TERMINAL_EVENTS = (
+    messages.Completed,
+    messages.Failed,
+    messages.Critical,
+    messages.Cancelled,
+    messages.Interrupted,
+)
+"""The reports that end a task."""
+
+
+class _Closed:
+    """Marks the end of the inbound stream."""
+
+
+CLOSED = _Closed()
+
+
+class LoopbackDriver:
+    """The backend side of a :class:`LoopbackAgentTransport`
+
+    Submits messages to the agent and routes what the agent sends: reports of
+    tasks assigned through :meth:`aassign` go to that task (read them with
+    :meth:`aevents` or :meth:`aresult`), every other message is available
+    through :meth:`anext_message`.
+    """
+
+    def __init__(self, transport: "LoopbackAgentTransport") -> None:
+        """Create the driver of a transport (the transport does this)."""
+        self.transport = transport
+        self.messages: asyncio.Queue[messages.FromAgentMessage] = asyncio.Queue()
+        self.heartbeat_answers = 0
+        self._tasks: Dict[str, asyncio.Queue[messages.FromAgentEvent]] = {}
+
+    async def asubmit(self, message: messages.ToAgentMessage) -> None:
+        """Hand a message to the agent.
+
+        Args:
+            message (messages.ToAgentMessage): The message, as the backend
+                would send it.
+        """
+        if isinstance(message, messages.Assign):
+            self._tasks.setdefault(message.task, asyncio.Queue())
+        await self.transport._ainbound(message)
+
+    async def aassign(
+        self,
+        interface: str,
+        args: Optional[Dict[str, Any]] = None,
+        **fields: Any,  # noqa: ANN401
+    ) -> str:
+        """Assign an implementation of the agent.
+
+        Args:
+            interface (str): The interface of the implementation.
+            args (Optional[Dict[str, Any]]): The (shrunk) arguments.
+            **fields (Any): Further fields of the ``Assign``.
+
+        Returns:
+            str: The task id, to await its reports with.
+        """
+        task = fields.pop("task", None) or str(uuid.uuid4())
+        defaults: Dict[str, Any] = {
+            "reference": task,
+            "user": "user-1",
+            "org": "org-1",
+            "action": f"action-{interface}",
+            "implementation": f"implementation-{interface}",
+        }
+        await self.asubmit(
+            messages.Assign(
+                interface=interface,
+                task=task,
+                args=args or {},
+                **{**defaults, **fields},
+            )
+        )
+        return task
+
+    async def acancel(self, task: str) -> None:
+        """Ask the agent to cancel a task."""
+        await self.asubmit(messages.Cancel(task=task))
+
+    async def aevents(self, task: str) -> AsyncIterator[messages.FromAgentEvent]:
+        """Yield the reports of a task, up to and including its terminal one.
+
+        Args:
+            task (str): A task assigned through this driver.
+
+        Yields:
+            messages.FromAgentEvent: The reports, in the order they were sent.
+        """
+        queue = self._tasks.get(task)
+        if queue is None:
+            raise AgentTransportException(
+                f"Task {task} was not assigned through this driver"
+            )
+        while True:
+            event = await queue.get()
+            yield event
+            if isinstance(event, TERMINAL_EVENTS):
+                del self._tasks[task]
+                return
+
+    async def aresult(
+        self, task: str, timeout: Optional[float] = None
+    ) -> messages.FromAgentEvent:
+        """Wait for the terminal report of a task, skipping the others.
+
+        Args:
+            task (str): A task assigned through this driver.
+            timeout (Optional[float]): Seconds to wait at most.
+
+        Returns:
+            messages.FromAgentEvent: The ``Completed`` (or ``Failed``, ...) report.
+        """
+
+        async def alast() -> messages.FromAgentEvent:
+            event = None
+            async for event in self.aevents(task):
+                pass
+            return cast(messages.FromAgentEvent, event)
+
+        return await asyncio.wait_for(alast(), timeout)
+
+    async def anext_message(
+        self, timeout: Optional[float] = None
+    ) -> messages.FromAgentMessage:
+        """Wait for the next message that is not a report of a driven task.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait at most.
+
+        Returns:
+            messages.FromAgentMessage: E.g. a state patch or a lock.
+        """
+        return await asyncio.wait_for(self.messages.get(), timeout)
+
+    async def _ahandle(self, message: messages.FromAgentMessage) -> None:
+        if isinstance(message, messages.HeartbeatEvent):
+            self.heartbeat_answers += 1
+            return
+
+        task = getattr(message, "task", None)
+        queue = self._tasks.get(task) if isinstance(task, str) else None
+        if queue is not None and isinstance(message, messages.FromAgentEvent):
+            queue.put_nowait(message)
+        else:
+            self.messages.put_nowait(message)
+
+        if self.transport.ack_events and isinstance(message, TERMINAL_EVENTS):
+            await self.transport._ainbound(
+                messages.EventAck(event=message.id, task=message.task, seq=message.seq)
+            )
+
+
+class LoopbackAgentTransport(AgentTransport):
+    """An in-process transport, driven by a :class:`LoopbackDriver`
+
+    ``aconnect`` acknowledges the agent with an ``Init`` right away and, like
+    the backend, terminal reports are acknowledged with an ``EventAck``.
+    """
+
+    agent_id: str = "loopback"
+    """The agent id the ``Init`` carries."""
+    ack_events: bool = True
+    """Acknowledge terminal reports, so the agent stops retaining them."""
+
+    _inbound: Optional[asyncio.Queue[object]] = PrivateAttr(default=None)
+    _driver: Optional[LoopbackDriver] = PrivateAttr(default=None)
+    _connected: bool = PrivateAttr(default=False)
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the transport is connected."""
+        return self._connected
+
+    @property
+    def driver(self) -> LoopbackDriver:
+        """The driver of the entered transport."""
+        if self._driver is None:
+            raise AgentTransportException(
+                "Transport was not entered. Use it as an async context manager."
+            )
+        return self._driver
+
+    async def __aenter__(self) -> Self:
+        """Create the queues and the driver."""
+        self._inbound = asyncio.Queue()
+        self._driver = LoopbackDriver(self)
+        return self
+
+    async def _ainbound(self, message: messages.ToAgentMessage) -> None:
+        if self._inbound is None:
+            raise AgentTransportException(
+                "Transport was not entered. Use it as an async context manager."
+            )
+        self._inbound.put_nowait(message)
+
+    async def aconnect(self) -> None:
+        """Connect, the agent is acknowledged with an ``Init``."""
+        await self._ainbound(messages.Init(agent=self.agent_id))
+        self._connected = True
+
+    async def areceive(self) -> AsyncIterator[messages.ToAgentMessage]:
+        """Yield what the driver submits, until the transport disconnects."""
+        if self._inbound is None:
+            raise AgentTransportException(
+                "Transport was not entered. Use it as an async context manager."
+            )
+        while True:
+            item = await self._inbound.get()
+            if isinstance(item, _Closed):
+                return
+            yield cast(messages.ToAgentMessage, item)
+
+    async def asend(self, message: messages.FromAgentMessage) -> None:
+        """Hand a message of the agent to the driver."""
+        await self.driver._ahandle(message)
+
+    async def adisconnect(self) -> None:
+        """Disconnect, ending the stream ``areceive`` yields."""
+        self._connected = False
+        if self._inbound is not None:
+            self._inbound.put_nowait(CLOSED)
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Disconnect."""
+        await self.adisconnect()
+
+
+class LoopbackAgent(BaseAgent):
+    """A ``BaseAgent`` that publishes its state through the transport
+
+    Unlike a ``RekuestAgent`` it needs no graph client: nothing is registered
+    with a backend, so it runs against a :class:`LoopbackAgentTransport` alone.
+    Snapshots and patches reach the driver (see
+    :meth:`LoopbackDriver.anext_message`).
+    """
+
+    async def apublish_snapshot(self, snapshot: messages.StateSnapshot) -> None:
+        """Send the snapshot to the driver."""
+        await self.transport.asend(snapshot)
+
+    async def apublish_patch(self, patch: messages.StatePatch) -> None:
+        """Send the patch to the driver."""
+        await self.transport.asend(patch)
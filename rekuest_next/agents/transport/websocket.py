@@ -1,18 +1,28 @@
 """WebSocket transport used by agents to exchange messages with the backend."""
 
+from dataclasses import dataclass
 from types import TracebackType
-from typing import Awaitable, Callable, Dict, Optional, Self, Type, cast
+from typing import Awaitable, Callable, Dict, List, Optional, Self, Type, cast
 import pydantic
+import random
+import time
+import weakref
 import websockets
 from rekuest_next.agents.transport.base import AgentTransport
+from rekuest_next.agents.transport.encoding import (
+    decode_payload,
+    encode_message,
+    ensure_encoding,
+)
+from rekuest_next.agents.transport.flow import SendQueue
 import asyncio
-import json
 from rekuest_next.agents.transport.errors import (
     AgentTransportException,
 )
 from rekuest_next import messages
 import logging
 from websockets.exceptions import (
+    ConnectionClosed,
     ConnectionClosedError,
     InvalidHandshake,
 )
@@ -21,6 +31,7 @@ from pydantic import ConfigDict, Field
 import ssl
 import certifi
 from koil.types import ContextBool, Contextual
+from rekuest_next.metrics import get_metrics
 from .errors import (
     BounceError,
     CorrectableConnectionFail,
@@ -72,6 +83,62 @@ agent_error_message: Dict[int, str] = {
 }
 
 
+@dataclass
+class ReconnectMetrics:
+    """Connection statistics of a :class:`WebsocketAgentTransport`."""
+
+    connects: int = 0
+    """Successful connects, including the first one."""
+    reconnects: int = 0
+    """Successful connects after the connection was lost."""
+    failed_attempts: int = 0
+    """Connection attempts that failed recoverably (and were retried)."""
+    last_reconnect_latency: Optional[float] = None
+    """Seconds from losing the connection to the last successful reconnect."""
+    max_reconnect_latency: float = 0.0
+    total_reconnect_latency: float = 0.0
+
+    @property
+    def mean_reconnect_latency(self) -> Optional[float]:
+        """The mean seconds a reconnect took (``None`` before the first one)."""
+        if not self.reconnects:
+            return None
+        return self.total_reconnect_latency / self.reconnects
+
+    def record_connect(self, disconnected_at: Optional[float]) -> None:
+        """Record a successful connect.
+
+        Args:
+            disconnected_at (Optional[float]): The ``time.monotonic()`` at which
+                the previous connection was lost, ``None`` for a first connect.
+        """
+        self.connects += 1
+        if disconnected_at is None:
+            return
+        latency = time.monotonic() - disconnected_at
+        self.reconnects += 1
+        get_metrics().reconnect_seconds.observe(latency)
+        self.last_reconnect_latency = latency
+        self.max_reconnect_latency = max(self.max_reconnect_latency, latency)
+        self.total_reconnect_latency += latency
+
+
+_STATE_MESSAGES = (messages.StatePatch, messages.StateSnapshot)
+
+# The open transports whose queues the gauges sum over, by id (transports are
+# not hashable). Entries go away on ``__aexit__`` or when the transport is
+# collected.
+_metered_transports: "weakref.WeakValueDictionary[int, WebsocketAgentTransport]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _message_type(message: pydantic.BaseModel) -> str:
+    # Defaults keep the enum member, validated messages hold its value
+    message_type = message.type  # type: ignore[attr-defined]
+    return getattr(message_type, "value", message_type)
+
+
 class _Closed:
     """Sentinel pushed onto the inbound queue when the connection loop is done."""
 
@@ -108,6 +175,21 @@ class WebsocketAgentTransport(AgentTransport):
     token_loader: Callable[[], Awaitable[str]] = Field(exclude=True)
     max_retries: int = 5
     time_between_retries: float = 3
+    """The base delay in seconds between reconnect attempts."""
+    max_time_between_retries: float = 60
+    """The upper bound of the (exponentially growing) reconnect delay."""
+    backoff_factor: float = 2
+    """The factor the reconnect delay grows by with every failed attempt."""
+    jitter: bool = True
+    """Wait a random time between zero and the backoff delay ("full jitter"), so a
+    fleet of agents does not reconnect to a restarted server in lockstep."""
+    token_expiry: float = 300
+    """Seconds a loaded token is reused for reconnects before ``token_loader`` is
+    called again. A rejected handshake, or a connection that closes before the
+    ``Init``, always reloads the token."""
+    reconnect_metrics: ReconnectMetrics = Field(
+        default_factory=ReconnectMetrics, exclude=True
+    )
     allow_reconnect: bool = True
     auto_connect: bool = True
     force: bool = False
@@ -119,14 +201,31 @@ class WebsocketAgentTransport(AgentTransport):
     flush_timeout: float = 5.0
     """Maximum seconds to spend sending still-queued messages when disconnecting. Bounds
     the flush so a dead socket cannot hang teardown."""
+    max_send_queue: int = 1024
+    """Maximum number of messages waiting for the socket (0: unbounded). Senders are
+    suspended while the queue is full."""
+    encoding: messages.WireEncoding = messages.WireEncoding.JSON
+    """The binary encoding to request on ``Register`` (MessagePack or CBOR need their
+    extra). Messages are sent as JSON text frames until the ``Init`` grants it."""
+    yield_window: int = 16
+    """Maximum number of ``Yield`` reports a single task may have waiting for the socket
+    (0: unbounded). A generator producing faster than the socket is suspended until its
+    yields are sent; conflating yields replace the waiting one instead."""
 
     _futures: Contextual[Dict[str, asyncio.Future[str]]] = None
     _healthy: ContextBool = False
     _closing: ContextBool = False
-    _send_queue: Contextual[asyncio.Queue[str]] = None
+    _send_queue: Contextual[SendQueue] = None
     _in_queue: Contextual[asyncio.Queue[object]] = None
     _connection_task: Contextual[asyncio.Task[None]] = None
     _client: Contextual["websockets.ClientConnection"] = None
+    _state_session: Contextual[str] = None
+    _state_global_rev: Contextual[int] = None
+    _held_state: Contextual[List[messages.FromAgentMessage]] = None
+    _holding_state: ContextBool = False
+    _token: Contextual[str] = None
+    _wire_encoding: messages.WireEncoding = messages.WireEncoding.JSON
+    _token_loaded_at: float = 0
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -137,12 +236,46 @@ class WebsocketAgentTransport(AgentTransport):
         registry. The network connection is opened by ``aconnect()``.
         """
         self._futures = {}
-        self._send_queue = asyncio.Queue()
+        self._send_queue = SendQueue(
+            maxsize=self.max_send_queue, yield_window=self.yield_window
+        )
         self._in_queue = asyncio.Queue()
+        self._held_state = []
+        self._holding_state = False
         self._closing = False
         self._client = None
+        self._bind_metrics()
         return self
 
+    def _bind_metrics(self) -> None:
+        """Count this transport in the send and inbound queue gauges.
+
+        The gauges sum over every open transport, until it is exited.
+        """
+        metrics = get_metrics()
+        _metered_transports[id(self)] = self
+
+        def send_queue_depth() -> int:
+            return sum(
+                transport._send_queue.qsize()
+                for transport in list(_metered_transports.values())
+                if transport._send_queue is not None
+            )
+
+        def in_queue_depth() -> int:
+            return sum(
+                transport._in_queue.qsize()
+                for transport in list(_metered_transports.values())
+                if transport._in_queue is not None
+            )
+
+        metrics.send_queue_depth.set_function(send_queue_depth)
+        metrics.in_queue_depth.set_function(in_queue_depth)
+
+    def _unbind_metrics(self) -> None:
+        """Stop counting this transport in the gauges."""
+        _metered_transports.pop(id(self), None)
+
     async def aconnect(self) -> None:
         """Start the connection task that owns the WebSocket.
 
@@ -154,6 +287,7 @@ class WebsocketAgentTransport(AgentTransport):
             raise AgentTransportException(
                 "Transport was not entered. Use it as an async context manager."
             )
+        ensure_encoding(self.encoding)
 
         self._closing = False
         if self._connection_task is None or self._connection_task.done():
@@ -179,6 +313,34 @@ class WebsocketAgentTransport(AgentTransport):
                 raise item
             yield cast(messages.ToAgentMessage, item)
 
+    def retry_delay(self, retry: int) -> float:
+        """The delay before a reconnect attempt.
+
+        Args:
+            retry (int): How many attempts failed before this one (0 for the first
+                retry).
+
+        Returns:
+            float: Seconds to wait: the exponential backoff, capped at
+                ``max_time_between_retries``, and with ``jitter`` a uniformly
+                random fraction of it.
+        """
+        ceiling = min(
+            self.max_time_between_retries,
+            self.time_between_retries * self.backoff_factor ** min(retry, 64),
+        )
+        if self.jitter:
+            return random.uniform(0, ceiling)
+        return ceiling
+
+    async def aget_token(self) -> str:
+        """The token to register with, loaded again once ``token_expiry`` passed."""
+        now = time.monotonic()
+        if self._token is None or now - self._token_loaded_at >= self.token_expiry:
+            self._token = await self.token_loader()
+            self._token_loaded_at = now
+        return self._token
+
     async def _aconnection_loop(self) -> None:
         """Own the socket: connect, register, receive, retry — until disconnected.
 
@@ -200,15 +362,19 @@ class WebsocketAgentTransport(AgentTransport):
         """The connect/register/receive/retry loop itself."""
         assert self._in_queue is not None, "Should be entered"
         retry = 0
+        disconnected_at: Optional[float] = None
+        bounced = False
 
         while True:
             if self._closing:
                 # Disconnect was requested; stop the (re)connect loop cleanly.
                 return
             send_task = None
+            connected = False
+            initialized = False
             try:
                 try:
-                    token = await self.token_loader()
+                    token = await self.aget_token()
                     async with websockets.connect(
                         f"{self.endpoint_url}",
                         ssl=(
@@ -218,14 +384,28 @@ class WebsocketAgentTransport(AgentTransport):
                         ),
                     ) as client:
                         retry = 0
+                        self.reconnect_metrics.record_connect(disconnected_at)
+                        disconnected_at = None
+                        connected = True
                         self._client = client
                         logger.info("Agent on Websockets connected")
 
+                        # Every connection starts out in JSON until its Init
+                        # grants the requested encoding again
+                        self._wire_encoding = messages.WireEncoding.JSON
+                        # Queued state may be older than what the backend
+                        # acknowledges in the Init, and the agent resends what
+                        # it is missing then: hold it (and newer state) back
+                        # until the agent handled the Init
+                        await self._ahold_state()
                         await client.send(
                             messages.Register(
                                 token=token,
                                 force=self.force,
                                 mode=self.mode,
+                                state_session=self._state_session,
+                                global_rev=self._state_global_rev,
+                                encoding=self.encoding,
                             ).model_dump_json()
                         )
 
@@ -233,13 +413,20 @@ class WebsocketAgentTransport(AgentTransport):
                         self._healthy = True
 
                         async for message in client:
-                            assert isinstance(message, str), (
-                                "Message should be a string"
-                            )
                             try:
-                                payload = InMessagePayload(message=json.loads(message))
+                                payload = InMessagePayload(
+                                    message=decode_payload(message, self._wire_encoding)
+                                )
                                 logger.debug(f"<<<< {payload}")
 
+                                if isinstance(payload.message, messages.Init):
+                                    initialized = True
+                                    # Only switch to what we asked for
+                                    if payload.message.encoding == self.encoding:
+                                        self._wire_encoding = self.encoding
+                                    else:
+                                        self._wire_encoding = messages.WireEncoding.JSON
+
                                 if isinstance(payload.message, messages.Heartbeat):
                                     await self.asend(messages.HeartbeatEvent())
                                 elif isinstance(payload.message, messages.Bounce):
@@ -251,6 +438,9 @@ class WebsocketAgentTransport(AgentTransport):
                                         f"Agent was kicked by the server: {payload.message.reason or 'No reason provided'}"
                                     )
                                 else:
+                                    get_metrics().messages_received.labels(
+                                        _message_type(payload.message)
+                                    ).inc()
                                     self._in_queue.put_nowait(payload.message)
                             except pydantic.ValidationError:
                                 logger.error(
@@ -267,12 +457,14 @@ class WebsocketAgentTransport(AgentTransport):
                         ),
                         exc_info=True,
                     )
+                    self._token = None
                     raise CorrectableConnectionFail(
                         "Received an InvalidHandshake"
                     ) from e
 
                 except BounceError as e:
                     logger.warning("Received Bounce message", exc_info=True)
+                    bounced = True
                     raise CorrectableConnectionFail(
                         "Was bounced. Debug call to reconnect"
                     ) from e
@@ -298,6 +490,7 @@ class WebsocketAgentTransport(AgentTransport):
                         )
 
                     if close_code == BOUNCED_CODE:
+                        bounced = True
                         raise CorrectableConnectionFail(
                             "Was bounced. Debug call to reconnect"
                         ) from e
@@ -312,6 +505,11 @@ class WebsocketAgentTransport(AgentTransport):
                     raise DefiniteConnectionFail(e) from e
 
                 finally:
+                    if connected and not initialized:
+                        # The token travels in the Register, so a rejected or
+                        # expired one closes the socket instead of failing the
+                        # handshake. Never retry it.
+                        self._token = None
                     self._client = None
                     if send_task:
                         send_task.cancel()
@@ -326,14 +524,19 @@ class WebsocketAgentTransport(AgentTransport):
                     # Disconnect was requested while connected; do not reconnect.
                     return
                 logger.info(f"Trying to Recover from Exception {e}")
+                if connected:
+                    disconnected_at = time.monotonic()
+                else:
+                    self.reconnect_metrics.failed_attempts += 1
                 if retry > self.max_retries or not self.allow_reconnect:
                     logger.error("Max retries reached. Giving up")
                     raise DefiniteConnectionFail("Exceeded Number of Retries")
 
-                logger.info(
-                    f"Waiting for some time before retrying: {self.time_between_retries}"
-                )
-                await asyncio.sleep(self.time_between_retries)
+                # A bounce is a deliberate, clean close: reconnect right away once
+                delay = 0.0 if bounced and retry == 0 else self.retry_delay(retry)
+                bounced = False
+                logger.info(f"Waiting for some time before retrying: {delay:.2f}s")
+                await asyncio.sleep(delay)
                 logger.info("Retrying to connect")
                 retry += 1
                 continue
@@ -351,21 +554,76 @@ class WebsocketAgentTransport(AgentTransport):
         try:
             while True:
                 message = await self._send_queue.get()
-                await client.send(message)
-                self._send_queue.task_done()
+                try:
+                    # Encoded here so queued messages use the encoding of the
+                    # connection they are actually sent on
+                    try:
+                        payload = encode_message(message, self._wire_encoding)
+                    except Exception:
+                        logger.exception("Could not encode %s, dropping it", message)
+                        continue
+                    await client.send(payload)
+                    if isinstance(message, _STATE_MESSAGES):
+                        # Announced on (re)register: only what reached the socket
+                        self._state_session = message.session_id
+                        self._state_global_rev = message.global_rev
+                finally:
+                    self._send_queue.task_done()
         except asyncio.CancelledError:
             logger.info("Sending Task sucessfully Cancelled")
+        except ConnectionClosed:
+            # The receive loop sees the close as well and reconnects. Terminal
+            # reports lost with the frame are retained and resent after the Init.
+            logger.info("Connection closed while sending")
 
     async def delayaction(self, action: messages.FromAgentMessage) -> None:
-        """Serialize and enqueue an outbound message for the sender task.
+        """Enqueue an outbound message for the sender task.
 
         Messages are queued even when the caller is not writing directly to the
         socket; the background sender started by ``areceive()`` flushes them in
-        order.
+        order. Waits while the queue is full or, for a ``Yield``, while its task
+        has used up its ``yield_window``. The sender encodes the message when it
+        goes out, in the encoding negotiated for that connection.
         """
         assert self._send_queue, "Should be connected"
-        logger.debug(">>>>> Sending message %s", action.model_dump_json())
-        await self._send_queue.put(action.model_dump_json())
+        if self._holding_state and isinstance(action, _STATE_MESSAGES):
+            assert self._held_state is not None, "Should be entered"
+            self._held_state.append(action)
+            return
+        logger.debug(">>>>> Sending message %s", action)
+        get_metrics().messages_sent.labels(_message_type(action)).inc()
+        await self._send_queue.put(action)
+
+    async def _ahold_state(self) -> None:
+        assert self._send_queue is not None and self._held_state is not None
+        self._holding_state = True
+        self._held_state.extend(
+            await self._send_queue.atake(
+                lambda message: isinstance(message, _STATE_MESSAGES)
+            )
+        )
+
+    async def arelease_state(self, discard: bool) -> None:
+        """Release the state messages held back since the connection opened.
+
+        Until the agent handled the ``Init`` of a connection, state patches and
+        snapshots are held back, so a revision is neither sent twice (queued
+        and resent) nor after a newer one.
+
+        Args:
+            discard (bool): Drop the held messages, because the agent resends
+                everything after the revision the backend acknowledged.
+                Otherwise they are queued as they are.
+        """
+        if self._held_state is None or self._send_queue is None:
+            return
+        held, self._held_state = self._held_state, []
+        self._holding_state = False
+        if discard:
+            logger.debug("Dropping %s held state messages", len(held))
+            return
+        for message in held:
+            await self.delayaction(message)
 
     async def asend(self, message: messages.FromAgentMessage) -> None:
         """Public send API used by the agent runtime to queue one message."""
@@ -436,5 +694,6 @@ class WebsocketAgentTransport(AgentTransport):
         traceback: Optional[TracebackType],
     ) -> None:
         """Exit the transport context, closing the connection if it is still up."""
+        self._unbind_metrics()
         if self._connection_task is not None or self._client is not None:
             await self.adisconnect()
@@ -0,0 +1,46 @@
+"""Base model for the generated GraphQL schema.
+
+``rekuest_next.api.schema`` defines several hundred pydantic models. Building
+their validators eagerly dominates the import time of the package, while a
+typical process only ever touches a handful of them. Every generated model
+therefore derives from :class:`BaseModel` here (configured through
+``object_bases``/``input_bases`` in ``graphql.config.yaml``), which defers the
+schema build until a model is first validated, serialized or inspected.
+"""
+
+from typing import Any, Optional
+
+from pydantic import BaseModel as PydanticBaseModel, ConfigDict
+
+
+class BaseModel(PydanticBaseModel):
+    """A pydantic ``BaseModel`` that builds its schema on first use."""
+
+    model_config = ConfigDict(defer_build=True)
+
+    @classmethod
+    def model_rebuild(
+        cls,
+        *,
+        force: bool = False,
+        raise_errors: bool = True,
+        _parent_namespace_depth: int = 2,
+        _types_namespace: Optional[Any] = None,
+    ) -> Optional[bool]:
+        """Rebuild the model schema, staying lazy for the generated forward refs.
+
+        The generated module ends with a plain ``Model.model_rebuild()`` for every
+        model with forward references. For a deferred model that call would build
+        the schema right away, so it is skipped here: forward references are
+        resolved against the module namespace anyway once the model is first
+        used. Forced rebuilds and pydantic's own on-demand rebuilds (which pass
+        ``raise_errors=False``) go through unchanged.
+        """
+        if not force and raise_errors and not cls.__pydantic_complete__:
+            return None
+        return super().model_rebuild(
+            force=force,
+            raise_errors=raise_errors,
+            _parent_namespace_depth=_parent_namespace_depth + 1,
+            _types_namespace=_types_namespace,
+        )
@@ -2,7 +2,8 @@
     
 from rekuest_next.traits.ports import WidgetInputTrait, ValidatorInputTrait, ReturnWidgetInputTrait, PortTrait, DefinitionInputTrait
 from rekuest_next.traits.implementation import ImplementationInputTrait
-from pydantic import ConfigDict, Field, BaseModel
+from pydantic import ConfigDict, Field
+from rekuest_next.api.base import BaseModel
 from rekuest_next.scalars import SearchQuery, ActionHash, Identifier, MediaLike, ValidatorFunction, JSONSerializable, Args
 from rath.scalars import ID, IDCoercible
 from typing_extensions import Literal
@@ -4,6 +4,7 @@ from .routes import (
     add_agent_routes,
     add_implementation_routes,
     add_lock_routes,
+    add_metrics_routes,
     add_schema_routes,
     add_state_detail_routes,
     add_state_routes,
@@ -29,6 +30,7 @@ __all__ = [
     "add_agent_routes",
     "add_implementation_routes",
     "add_lock_routes",
+    "add_metrics_routes",
     "add_schema_routes",
     "add_state_detail_routes",
     "add_state_routes",
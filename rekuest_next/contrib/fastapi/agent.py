@@ -10,6 +10,7 @@ type and the matching subscription set.
 
 import asyncio
 import copy
+import json
 import logging
 import uuid
 from dataclasses import dataclass, field as dataclass_field
@@ -19,6 +20,7 @@ from typing import (
     AsyncIterator,
     Awaitable,
     Callable,
+    Hashable,
     List,
     Optional,
     Self,
@@ -30,6 +32,11 @@ from rekuest_next import messages
 from rekuest_next.api.schema import AssignInput, StateImplementationInput
 from rekuest_next.agents.base import BaseAgent, RevisedState
 from rekuest_next.agents.transport.base import AgentTransport
+from rekuest_next.agents.transport.encoding import (
+    encode_message,
+    encode_value,
+    ensure_encoding,
+)
 from rekuest_next.contrib.fastapi.retriever.memory_retriever import MemoryRetriever
 from rekuest_next.contrib.fastapi.retriever.protocol import StateRetriever
 from rekuest_next.contrib.fastapi.sink.memory_sink import MemorySink
@@ -45,6 +52,27 @@ from rekuest_next.contrib.fastapi.models import (
 
 logger = logging.getLogger(__name__)
 
+# Reports that end a task; streaming the results of a bulk submission stops once
+# every task reached one of them.
+_TERMINAL_TASK_TYPES = (
+    messages.Completed,
+    messages.Failed,
+    messages.Critical,
+    messages.Cancelled,
+    messages.Interrupted,
+)
+
+
+def _render_json(content: Any) -> bytes:
+    """Serialize like ``fastapi.responses.JSONResponse``."""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
 
 def _is_state_message(message: messages.FromAgentMessage) -> bool:
     """Return whether a message belongs to the state update stream."""
@@ -70,11 +98,15 @@ def _state_routing_key(message: messages.FromAgentMessage) -> str | None:
     return message.state_name
 
 
-def _lock_routing_key(message: messages.FromAgentMessage) -> str | None:
-    """Resolve the lock key used for lock websocket subscriptions."""
+def _lock_routing_keys(message: messages.FromAgentMessage) -> list[str]:
+    """Resolve the lock keys used for lock websocket subscriptions.
+
+    Grouped lock messages carry several keys; they match a subscription to any
+    of them.
+    """
     if not isinstance(message, (messages.Lock, messages.Unlock)):
-        return None
-    return message.key
+        return []
+    return message.lock_keys
 
 
 @dataclass(frozen=True)
@@ -85,6 +117,7 @@ class _WebSocketSubscriptions:
     state_keys: set[str] | None = None
     lock_keys: set[str] | None = None
     state_update_intervals: dict[str, float] | None = None
+    encoding: messages.WireEncoding = messages.WireEncoding.JSON
 
     @classmethod
     def from_init(cls, payload: WebSocketSubscriptionInit) -> "_WebSocketSubscriptions":
@@ -101,6 +134,7 @@ class _WebSocketSubscriptions:
             state_keys=_normalize(payload.state_keys),
             lock_keys=_normalize(payload.lock_keys),
             state_update_intervals=payload.state_update_intervals,
+            encoding=payload.encoding,
         )
 
     def get_state_update_interval(self, state_name: str) -> float:
@@ -114,6 +148,14 @@ class _WebSocketSubscriptions:
         return max(interval, 0.0)
 
 
+async def _send_payload(websocket: WebSocket, payload: str | bytes) -> None:
+    """Send an encoded message as a text (JSON) or binary frame."""
+    if isinstance(payload, bytes):
+        await websocket.send_bytes(payload)
+    else:
+        await websocket.send_text(payload)
+
+
 @dataclass
 class _BufferedState:
     """Buffered state patch events for one connection and state."""
@@ -194,7 +236,8 @@ class FastAPIConnectionManager:
             message: The outgoing agent message to distribute.
         """
 
-        message_json = message.model_dump_json()
+        # Encoded once per encoding in use, not once per connection
+        payloads: dict[messages.WireEncoding, str | bytes] = {}
         async with self._lock:
             disconnected: List[WebSocket] = []
             for connection in self._active_connections:
@@ -203,8 +246,12 @@ class FastAPIConnectionManager:
                     connection_state.subscriptions, message
                 ):
                     continue
+                encoding = connection_state.subscriptions.encoding
+                payload = payloads.get(encoding)
+                if payload is None:
+                    payload = payloads[encoding] = encode_message(message, encoding)
                 try:
-                    await connection.send_text(message_json)
+                    await _send_payload(connection, payload)
                 except Exception as e:
                     logger.warning(f"Failed to send message to WebSocket: {e}")
                     disconnected.append(connection)
@@ -218,7 +265,7 @@ class FastAPIConnectionManager:
     ) -> None:
         """Batch or immediately forward a state patch event per connection."""
         state_name = message.state_name
-        immediate_connections: list[WebSocket] = []
+        immediate_connections: list[tuple[WebSocket, messages.WireEncoding]] = []
 
         async with self._lock:
             for websocket in self._active_connections:
@@ -232,7 +279,9 @@ class FastAPIConnectionManager:
                     state_name
                 )
                 if interval <= 0:
-                    immediate_connections.append(websocket)
+                    immediate_connections.append(
+                        (websocket, connection_state.subscriptions.encoding)
+                    )
                     continue
 
                 buffered = connection_state.pending_states.get(state_name)
@@ -248,10 +297,13 @@ class FastAPIConnectionManager:
                         self._flush_state_buffer(websocket, state_name, interval)
                     )
 
-        message_json = message.model_dump_json()
-        for websocket in immediate_connections:
+        payloads: dict[messages.WireEncoding, str | bytes] = {}
+        for websocket, encoding in immediate_connections:
+            payload = payloads.get(encoding)
+            if payload is None:
+                payload = payloads[encoding] = encode_message(message, encoding)
             try:
-                await websocket.send_text(message_json)
+                await _send_payload(websocket, payload)
             except Exception as e:
                 logger.warning(f"Failed to send message to WebSocket: {e}")
                 await self.disconnect(websocket)
@@ -273,6 +325,7 @@ class FastAPIConnectionManager:
             connection_state = self._connections.get(websocket)
             if connection_state is None:
                 return
+            encoding = connection_state.subscriptions.encoding
 
             buffered = connection_state.pending_states.pop(state_name, None)
             connection_state.flush_tasks.pop(state_name, None)
@@ -283,7 +336,7 @@ class FastAPIConnectionManager:
 
         for patch in squashed_patches:
             try:
-                await websocket.send_text(patch.model_dump_json())
+                await _send_payload(websocket, encode_message(patch, encoding))
             except Exception as e:
                 logger.warning(f"Failed to send message to WebSocket: {e}")
                 await self.disconnect(websocket)
@@ -316,9 +369,10 @@ class FastAPIConnectionManager:
             )
 
         if _is_lock_message(message):
-            lock_key = _lock_routing_key(message)
-            return lock_key is not None and (
-                subscriptions.lock_keys is None or lock_key in subscriptions.lock_keys
+            lock_keys = _lock_routing_keys(message)
+            return bool(lock_keys) and (
+                subscriptions.lock_keys is None
+                or not subscriptions.lock_keys.isdisjoint(lock_keys)
             )
 
         action_key = self.get_task_routing_key(message)
@@ -362,6 +416,9 @@ class FastApiTransport(AgentTransport):
         default=None
     )
     _connected: bool = PrivateAttr(default=False)
+    _task_listeners: dict[str, asyncio.Queue[messages.FromAgentMessage]] = PrivateAttr(
+        default_factory=dict
+    )
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -394,6 +451,52 @@ class FastApiTransport(AgentTransport):
             return message.task
         return getattr(message, "task", getattr(message, "id", "unknown"))
 
+    async def asubmit_many(self, submitted: List[messages.ToAgentMessage]) -> list[str]:
+        """Submit several messages to the agent at once.
+
+        The messages are enqueued together and in order, so the agent picks
+        them up back to back.
+
+        Args:
+            submitted: The messages to send to the agent.
+
+        Returns:
+            The task IDs of the messages, in the same order.
+        """
+        if self._receive_queue is None:
+            raise RuntimeError("Transport not connected. Call aconnect first.")
+
+        for message in submitted:
+            self._receive_queue.put_nowait(message)
+        logger.info(f"Submitted {len(submitted)} messages to agent")
+
+        return [getattr(message, "task", "unknown") for message in submitted]
+
+    def listen_to_tasks(
+        self, tasks: list[str]
+    ) -> asyncio.Queue[messages.FromAgentMessage]:
+        """Mirror the outgoing messages of some tasks into a queue.
+
+        Listen before submitting the tasks, so no message is missed, and
+        stop with ``unlisten_tasks``. A task stops being mirrored by itself
+        once its terminal report was put into the queue.
+
+        Args:
+            tasks: The task IDs to listen to.
+
+        Returns:
+            The queue that receives every message the agent sends for them.
+        """
+        queue: asyncio.Queue[messages.FromAgentMessage] = asyncio.Queue()
+        for task in tasks:
+            self._task_listeners[task] = queue
+        return queue
+
+    def unlisten_tasks(self, tasks: list[str]) -> None:
+        """Stop mirroring the outgoing messages of some tasks."""
+        for task in tasks:
+            self._task_listeners.pop(task, None)
+
     async def asend(self, message: messages.FromAgentMessage) -> None:
         """Route an outgoing agent message by message type and subscriptions.
 
@@ -408,6 +511,14 @@ class FastApiTransport(AgentTransport):
         logger.info(f"Agent sending message: {message_json}")
         await self.connection_manager.broadcast_model(message)
 
+        if self._task_listeners:
+            task = getattr(message, "task", None)
+            listener = self._task_listeners.get(task) if task else None
+            if listener is not None:
+                listener.put_nowait(message)
+                if isinstance(message, _TERMINAL_TASK_TYPES):
+                    del self._task_listeners[message.task]
+
     async def aconnect(self) -> None:
         """Connect the transport."""
         self._receive_queue = asyncio.Queue()
@@ -454,7 +565,8 @@ class FastApiTransport(AgentTransport):
         The payload may contain `action_keys`, `state_keys`, and `lock_keys`
         arrays that define which updates should be delivered. It may also
         contain `state_update_intervals`, a dictionary of per-state debounce
-        intervals in seconds used for batching and squashing state updates.
+        intervals in seconds used for batching and squashing state updates,
+        and an `encoding` (`MSGPACK` or `CBOR`) to receive binary frames.
 
         Args:
             websocket: The accepted websocket connection.
@@ -469,13 +581,16 @@ class FastApiTransport(AgentTransport):
                 raise ValueError("Websocket init payload must be a JSON object")
 
             init_payload = WebSocketSubscriptionInit.model_validate(init_data)
+            ensure_encoding(init_payload.encoding)
             subscriptions = _WebSocketSubscriptions.from_init(init_payload)
             await self.connection_manager.connect(websocket, subscriptions)
 
             if build_initial_payload is not None:
                 initial_message = await build_initial_payload(init_payload)
                 if initial_message is not None:
-                    await websocket.send_json(initial_message)
+                    await _send_payload(
+                        websocket, encode_value(initial_message, init_payload.encoding)
+                    )
 
             while True:
                 await websocket.receive()
@@ -545,6 +660,17 @@ class FastApiAgent(BaseAgent):
         default=0.05,
         description="Polling interval in seconds used while waiting for the sink to catch up during shutdown.",
     )
+    state_response_cache_size: int = Field(
+        default=64,
+        description="Maximum number of serialized state responses kept for the current revision. Use `0` to disable the cache.",
+    )
+    bulk_result_idle_timeout: float | None = Field(
+        default=300.0,
+        description="Maximum number of seconds a streamed bulk assignment waits for the next result before it gives up. Use `None` to wait indefinitely.",
+    )
+
+    _state_response_cache: dict[Hashable, bytes] = PrivateAttr(default_factory=dict)
+    _state_response_cache_etag: str | None = PrivateAttr(default=None)
 
     def model_post_init(self, __context: Any) -> None:
         """Wire task routing so websocket subscriptions use action keys."""
@@ -610,6 +736,58 @@ class FastApiAgent(BaseAgent):
             step=assign_input.step,
         )
 
+    async def aassign_bulk(self, assign_messages: list[messages.Assign]) -> list[str]:
+        """Submit many assignments at once and return their task IDs."""
+        return await self.transport.asubmit_many(list(assign_messages))
+
+    async def asubmit_bulk_streaming(
+        self,
+        assign_messages: list[messages.Assign],
+    ) -> AsyncIterator[messages.FromAgentMessage]:
+        """Submit many assignments at once and return an iterator over their results.
+
+        The assignments are submitted before this returns, so they run even if
+        the results are never read. The iterator yields the ``Yield`` and the
+        terminal reports (completed, failed, ...) of the submitted tasks in the
+        order the agent sends them, and ends once every task has finished.
+        Progress and log messages are skipped. If no result arrives for
+        ``bulk_result_idle_timeout`` seconds, it raises ``TimeoutError``.
+        """
+        tasks = [assign.task for assign in assign_messages]
+        # Listen first, a fast task could finish before the submission returns
+        queue = self.transport.listen_to_tasks(tasks)
+        try:
+            await self.aassign_bulk(assign_messages)
+        except BaseException:
+            self.transport.unlisten_tasks(tasks)
+            raise
+        return self._aiter_task_results(tasks, queue)
+
+    async def _aiter_task_results(
+        self,
+        tasks: list[str],
+        queue: asyncio.Queue[messages.FromAgentMessage],
+    ) -> AsyncIterator[messages.FromAgentMessage]:
+        try:
+            pending = set(tasks)
+            while pending:
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), self.bulk_result_idle_timeout
+                    )
+                except asyncio.TimeoutError:
+                    raise TimeoutError(
+                        f"No result for {self.bulk_result_idle_timeout}s from the "
+                        f"tasks {sorted(pending)}"
+                    ) from None
+                if isinstance(message, _TERMINAL_TASK_TYPES):
+                    pending.discard(message.task)
+                elif not isinstance(message, messages.Yield):
+                    continue
+                yield message
+        finally:
+            self.transport.unlisten_tasks(tasks)
+
     async def abuild_websocket_init_message(
         self,
         init_payload: WebSocketSubscriptionInit,
@@ -685,17 +863,25 @@ class FastApiAgent(BaseAgent):
         state_keys: list[str] | None = None,
     ) -> StateCollectionResponse:
         """Return current state values and revisions filtered by state keys."""
+        return self._build_state_views(state_keys, detach=True)
+
+    def _build_state_views(
+        self,
+        state_keys: list[str] | None,
+        detach: bool,
+    ) -> StateCollectionResponse:
         selected_keys = set(state_keys) if state_keys else None
         states: dict[str, StateView] = {}
 
         for interface, state_schema in self._collected_state_schemas.items():
             if selected_keys is not None and interface not in selected_keys:
                 continue
+            value = self._current_shrunk_states.get(interface)
             states[interface] = StateView(
                 interface=interface,
                 name=state_schema.name,
                 initialized=interface in self.states,
-                value=copy.deepcopy(self._current_shrunk_states.get(interface)),
+                value=copy.deepcopy(value) if detach else value,
             )
 
         return StateCollectionResponse(
@@ -705,6 +891,78 @@ class FastApiAgent(BaseAgent):
             states=states,
         )
 
+    def state_etag(self) -> str:
+        """Return the entity tag of the current state revision.
+
+        The tag changes with every patch, with every state that gets
+        initialized and with every new session, so a client that sends the
+        tag of its last read back (``If-None-Match``) only needs a new body
+        once one of these happened.
+        """
+        return (
+            f'"{self.current_session}-{self.global_revision}'
+            f'-{len(self._current_shrunk_states)}"'
+        )
+
+    def _cached_state_response(
+        self, key: Hashable, render: Callable[[], bytes]
+    ) -> tuple[str, bytes]:
+        """Return the ETag and the body of a state read, rendering it once per revision."""
+        etag = self.state_etag()
+        if etag != self._state_response_cache_etag:
+            self._state_response_cache.clear()
+            self._state_response_cache_etag = etag
+
+        body = self._state_response_cache.get(key)
+        if body is None:
+            # Rendered synchronously: no patch can be applied in between
+            body = render()
+            if len(self._state_response_cache) < self.state_response_cache_size:
+                self._state_response_cache[key] = body
+        return etag, body
+
+    async def aget_serialized_state_views(
+        self,
+        state_keys: list[str] | None = None,
+    ) -> tuple[str, bytes]:
+        """Return the ETag and the JSON body of ``aget_state_views``.
+
+        Reads of the same revision (and the same state keys) share one
+        serialization, and the shrunk states are serialized in place instead
+        of being deep-copied first.
+        """
+
+        def render() -> bytes:
+            return (
+                self._build_state_views(state_keys, detach=False)
+                .model_dump_json(by_alias=True)
+                .encode()
+            )
+
+        key = ("views", frozenset(state_keys) if state_keys else None)
+        return self._cached_state_response(key, render)
+
+    async def aget_serialized_revised_state(self, interface: str) -> tuple[str, bytes]:
+        """Return the ETag and the JSON body of the current state of an interface.
+
+        The body holds the ``revision`` and the ``state`` of
+        ``aget_revised_state``, serialized once per revision.
+        """
+        from rekuest_next.agents.errors import AgentException
+
+        if interface not in self._current_shrunk_states:
+            raise AgentException(f"No shrunk state found for interface {interface}")
+
+        def render() -> bytes:
+            return _render_json(
+                {
+                    "revision": self.global_revision,
+                    "state": self._current_shrunk_states[interface],
+                }
+            )
+
+        return self._cached_state_response(("state", interface), render)
+
     async def aget_checkout_state_views(
         self,
         global_revision_id: int,
@@ -791,6 +1049,18 @@ class FastApiAgent(BaseAgent):
         )
         await self.transport.asend(message)
 
+    async def alock_group(self, keys: list[str], task: str):
+        """Publish a single lock event for a group of keys to all connected clients"""
+        if len(keys) == 1:
+            return await self.alock(keys[0], task)
+        await self.transport.asend(messages.Lock(key=keys[0], keys=keys, task=task))
+
+    async def aunlock_group(self, keys: list[str]):
+        """Publish a single unlock event for a group of keys to all connected clients"""
+        if len(keys) == 1:
+            return await self.aunlock(keys[0])
+        await self.transport.asend(messages.Unlock(key=keys[0], keys=keys))
+
     async def apublish_patch(self, patch: messages.StatePatch) -> None:
         """Publish a state patch event: broadcast to websocket clients and persist to sink."""
         await self.transport.asend(patch)
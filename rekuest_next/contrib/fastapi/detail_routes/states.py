@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from fastapi.responses import JSONResponse
 
 from rekuest_next.api.schema import StateImplementationInput
@@ -30,7 +30,12 @@ from rekuest_next.contrib.fastapi.models import (
     StateSegmentsResponse,
 )
 from rekuest_next.contrib.fastapi.openapi_utils import create_json_schema_from_ports
-from rekuest_next.contrib.fastapi.route_groups.common import normalize_filter_values
+from rekuest_next.contrib.fastapi.route_groups.common import (
+    etag_json_response,
+    etag_matches,
+    normalize_filter_values,
+    not_modified_response,
+)
 
 
 def _to_task_boundary_response(
@@ -271,19 +276,18 @@ def build_state_detail_router(
         return [_to_snapshot_response(snapshot) for snapshot in snapshots]
 
     def _build_current_state_endpoint(interface: str):
-        async def current_state() -> JSONResponse:
+        async def current_state(request: Request) -> Response:
             if interface not in agent.states:
                 return JSONResponse(
                     status_code=404,
                     content={"error": "State not initialized", "interface": interface},
                 )
-            revised_state = await agent.aget_revised_state(interface)
-            return JSONResponse(
-                content={
-                    "revision": revised_state.revision,
-                    "state": revised_state.data,
-                }
-            )
+            current_etag = agent.state_etag()
+            if etag_matches(request, current_etag):
+                return not_modified_response(current_etag)
+
+            etag, body = await agent.aget_serialized_revised_state(interface)
+            return etag_json_response(etag, body)
 
         return current_state
 
@@ -299,7 +303,7 @@ def build_state_detail_router(
             _build_current_state_endpoint(interface),
             methods=["GET"],
             summary=f"Get {state_schema.definition.name} state",
-            description=f"Get the current value of the {state_schema.definition.name} state",
+            description=f"Get the current value of the {state_schema.definition.name} state. Send the `ETag` of the last read as `If-None-Match` to get a 304 while no state changed.",
             tags=["States", "State Details"],
             response_class=JSONResponse,
         )
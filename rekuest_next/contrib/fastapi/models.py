@@ -5,6 +5,8 @@ from typing import Any
 
 from pydantic import BaseModel, Field
 
+from rekuest_next.messages import WireEncoding
+
 
 class RetrieverSessionInfoResponse(BaseModel):
     """Response containing the active session identifier."""
@@ -102,6 +104,14 @@ class StateCollectionResponse(BaseModel):
     )
 
 
+class BulkAssignResponse(BaseModel):
+    """Response for a bulk submission of assignments."""
+
+    status: str
+    count: int
+    tasks: list[str]
+
+
 class LockView(BaseModel):
     """Current view of a managed lock."""
 
@@ -122,7 +132,8 @@ class WebSocketSubscriptionInit(BaseModel):
 
     All filter lists are optional. When omitted, the websocket receives all
     messages of that category. State batching can be customized per state key
-    through `state_update_intervals`. Use `"*"` for a default interval.
+    through `state_update_intervals`. Use `"*"` for a default interval. With a
+    binary `encoding` (MessagePack or CBOR) updates are sent as binary frames.
     """
 
     type: str | None = None
@@ -130,3 +141,4 @@ class WebSocketSubscriptionInit(BaseModel):
     state_keys: list[str] | None = None
     lock_keys: list[str] | None = None
     state_update_intervals: dict[str, float] | None = None
+    encoding: WireEncoding = WireEncoding.JSON
@@ -2,8 +2,6 @@ import copy
 from datetime import datetime, timezone
 from typing import Optional, cast
 
-import jsonpatch  # type: ignore[import-untyped]
-
 from rekuest_next import messages
 from rekuest_next.contrib.fastapi.retriever.protocol import (
     PatchEvent,
@@ -13,6 +11,7 @@ from rekuest_next.contrib.fastapi.retriever.protocol import (
 )
 from rekuest_next.contrib.fastapi.sink.memory_sink import MemoryStore
 from rekuest_next.messages import JSONSerializable
+from rekuest_next.state.apply import apply_operations
 
 
 class MemoryRetriever:
@@ -257,18 +256,23 @@ class MemoryRetriever:
         last_global_revision = anchor_revision
         last_timepoint = datetime.now(timezone.utc)
 
-        for patch in patches:
-            patch_document = self._to_patch_document(patch.op, patch.path, patch.value)
-            current_state = cast(
-                JSONSerializable,
-                jsonpatch.apply_patch(current_state, [patch_document], in_place=False),
-            )
-            last_global_revision = patch.global_rev
-            last_timepoint = datetime.fromtimestamp(patch.ts, tz=timezone.utc)
+        # The anchor is a private copy; values are copied as they are inserted
+        # so the stored patch messages are never modified
+        current_state = apply_operations(
+            current_state,
+            (
+                self._to_patch_document(patch.op, patch.path, patch.value)
+                for patch in patches
+            ),
+            copy_values=True,
+        )
+        if patches:
+            last_global_revision = patches[-1].global_rev
+            last_timepoint = datetime.fromtimestamp(patches[-1].ts, tz=timezone.utc)
 
         return Snapshot(
             timepoint=last_timepoint,
-            data=copy.deepcopy(current_state),
+            data=current_state,
             global_revision=last_global_revision,
             session_id=anchor_session,
         )
@@ -3,6 +3,7 @@
 from .core import build_core_router
 from .implementations import add_implementation_route, build_implementation_router
 from .locks import build_lock_router
+from .metrics import build_metrics_router
 from .schemas import build_schema_router
 from .states import build_state_router
 from .tasks import build_task_router
@@ -12,6 +13,7 @@ __all__ = [
     "build_implementation_router",
     "add_implementation_route",
     "build_lock_router",
+    "build_metrics_router",
     "build_schema_router",
     "build_state_router",
     "build_task_router",
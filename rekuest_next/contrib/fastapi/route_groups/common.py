@@ -1,5 +1,7 @@
 """Common helpers for FastAPI route groups."""
 
+from fastapi import Request, Response
+
 
 def normalize_filter_values(values: list[str] | None) -> list[str] | None:
     """Normalize repeated or comma-separated query values into a unique list."""
@@ -16,3 +18,34 @@ def normalize_filter_values(values: list[str] | None) -> list[str] | None:
                 normalized.append(clean_key)
 
     return normalized or None
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return whether the ``If-None-Match`` header of a request matches an ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", etag):
+            return True
+    return False
+
+
+def not_modified_response(etag: str) -> Response:
+    """Return an empty 304 response for an ETag the client already holds."""
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
+
+
+def etag_json_response(etag: str, body: bytes) -> Response:
+    """Return a serialized JSON body, tagged so clients can revalidate it."""
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
+    )
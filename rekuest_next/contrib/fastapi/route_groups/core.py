@@ -1,17 +1,21 @@
 """Core agent command and websocket route builders."""
 
 from __future__ import annotations
-from typing import Any, Callable
+import json
+from typing import Any, AsyncIterator, Callable
 
-from fastapi import APIRouter, Request, WebSocket
+from fastapi import APIRouter, Query, Request, WebSocket
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 
-from rekuest_next.messages import Cancel, Pause, Resume
+from rekuest_next.messages import Assign, Cancel, Pause, Resume
 from rekuest_next.api.schema import (
     CancelInput,
     PauseInput,
     ResumeInput,
 )
 from rekuest_next.contrib.fastapi.agent import FastApiAgent
+from rekuest_next.contrib.fastapi.models import BulkAssignResponse
 
 
 def build_core_router(
@@ -19,6 +23,7 @@ def build_core_router(
     get_user_from_request: Callable[[Request], Any],
     ws_path: str = "/ws",
     assign_path: str = "/assign",
+    bulk_assign_path: str = "/bulk_assign",
     cancel_path: str = "/cancel",
     pause_path: str = "/pause",
     resume_path: str = "/resume",
@@ -27,7 +32,10 @@ def build_core_router(
     """Build the core command routes for task lifecycle control.
 
     The websocket endpoint expects an init JSON payload after connect with
-    optional `action_keys`, `state_keys`, and `lock_keys` arrays.
+    optional `action_keys`, `state_keys`, and `lock_keys` arrays. The bulk
+    assign endpoint takes a JSON array of assign payloads (each with its
+    `interface`) and, with `?stream=true`, answers with newline-delimited JSON:
+    the submission first, then every yield and terminal report of the tasks.
     """
     router = APIRouter(tags=["Agent"])
 
@@ -63,6 +71,81 @@ def build_core_router(
         await agent.transport.asubmit(assign_message)
         return {"status": "submitted", "task": assign_message.task}
 
+    async def bulk_assign_action(
+        request: Request,
+        stream: bool = Query(default=False),
+    ) -> Response:
+        """Submit many tasks at once, optionally streaming their results."""
+        user = str(get_user_from_request(request))
+        payload = await request.json()
+        if not isinstance(payload, list):
+            return JSONResponse(
+                status_code=422,
+                content={"error": "Bulk assign requests must be a JSON array"},
+            )
+
+        # Validate every assignment before enqueueing any of them
+        assign_messages: list[Assign] = []
+        errors: list[dict[str, Any]] = []
+        for index, item in enumerate(payload):
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError("An assignment must be a JSON object")
+                item = dict(item)
+                interface = item.pop("interface", None)
+                assign_input = agent.build_assign_input(item, interface=interface)
+                assign_message = agent.build_assign_message(assign_input, user=user)
+                if (
+                    assign_message.interface not in agent.managed_actors
+                    and assign_message.interface
+                    not in agent.app_registry.actor_builders
+                ):
+                    raise ValueError(
+                        f"No action registered for interface {assign_message.interface}"
+                    )
+                assign_messages.append(assign_message)
+            except ValueError as e:
+                errors.append({"index": index, "error": str(e)})
+
+        if errors:
+            return JSONResponse(
+                status_code=422,
+                content={"error": "Invalid assignments", "errors": errors},
+            )
+
+        submitted = BulkAssignResponse(
+            status="submitted",
+            count=len(assign_messages),
+            tasks=[assign_message.task for assign_message in assign_messages],
+        )
+        if not stream:
+            await agent.aassign_bulk(assign_messages)
+            return JSONResponse(content=submitted.model_dump(mode="json"))
+
+        if not agent.transport.connected:
+            return JSONResponse(
+                status_code=503, content={"error": "Agent is not connected"}
+            )
+
+        # Submitted here rather than when the body is first read, so the tasks
+        # run (and a failed submission is reported) like without streaming
+        results = await agent.asubmit_bulk_streaming(assign_messages)
+
+        async def stream_results() -> AsyncIterator[str]:
+            yield json.dumps(submitted.model_dump(mode="json")) + "\n"
+            try:
+                async for message in results:
+                    yield message.model_dump_json() + "\n"
+            except TimeoutError as e:
+                yield json.dumps({"error": str(e)}) + "\n"
+
+        # The results may never be read (e.g. the client hangs up first)
+        return StreamingResponse(
+            stream_results(),
+            media_type="application/x-ndjson",
+            background=BackgroundTask(agent.transport.unlisten_tasks, submitted.tasks),
+        )
+
     async def cancel_action(request: Request) -> dict[str, str]:
         """Request cancellation of a running task."""
         payload = await request.json()
@@ -96,6 +179,14 @@ def build_core_router(
     router.add_api_route(
         f"{assign_path}/{{interface}}", assign_action, methods=["POST"]
     )
+    router.add_api_route(
+        bulk_assign_path,
+        bulk_assign_action,
+        methods=["POST"],
+        response_model=BulkAssignResponse,
+        summary="Submit many tasks",
+        description="Submit a JSON array of assignments in one request. Pass `stream=true` to receive their results as newline-delimited JSON.",
+    )
     router.add_api_route(cancel_path, cancel_action, methods=["POST"])
     router.add_api_route(pause_path, pause_action, methods=["POST"])
     router.add_api_route(resume_path, resume_action, methods=["POST"])
@@ -0,0 +1,36 @@
+"""Metrics route builders."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from rekuest_next.metrics import MetricsRegistry, get_default_metrics_registry
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def build_metrics_router(
+    registry: Optional[MetricsRegistry] = None,
+    metrics_path: str = "/metrics",
+) -> APIRouter:
+    """Build the route exporting agent metrics in the Prometheus text format."""
+    router = APIRouter(tags=["Metrics"])
+
+    async def get_metrics() -> PlainTextResponse:
+        current = registry or get_default_metrics_registry()
+        return PlainTextResponse(
+            current.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE
+        )
+
+    router.add_api_route(
+        metrics_path,
+        get_metrics,
+        methods=["GET"],
+        response_class=PlainTextResponse,
+        summary="Metrics",
+        description="Queue depths, latencies and throughput of the agent in the Prometheus text format.",
+    )
+    return router
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request, Response
 
 from rekuest_next.contrib.fastapi.agent import FastApiAgent
 from rekuest_next.contrib.fastapi.models import StateCollectionResponse
 
-from .common import normalize_filter_values
+from .common import (
+    etag_json_response,
+    etag_matches,
+    normalize_filter_values,
+    not_modified_response,
+)
 
 
 def build_state_router(
@@ -18,10 +23,16 @@ def build_state_router(
     router = APIRouter(tags=["States"])
 
     async def list_states(
+        request: Request,
         state_keys: list[str] | None = Query(default=None),
-    ) -> StateCollectionResponse:
+    ) -> Response:
+        current_etag = agent.state_etag()
+        if etag_matches(request, current_etag):
+            return not_modified_response(current_etag)
+
         normalized_state_keys = normalize_filter_values(state_keys)
-        return await agent.aget_state_views(normalized_state_keys)
+        etag, body = await agent.aget_serialized_state_views(normalized_state_keys)
+        return etag_json_response(etag, body)
 
     router.add_api_route(
         states_path,
@@ -29,6 +40,6 @@ def build_state_router(
         methods=["GET"],
         response_model=StateCollectionResponse,
         summary="List states",
-        description="List current states filtered by optional state keys.",
+        description="List current states filtered by optional state keys. Send the `ETag` of the last read as `If-None-Match` to get a 304 while no state changed.",
     )
     return router
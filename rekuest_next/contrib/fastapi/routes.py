@@ -28,6 +28,7 @@ from rekuest_next.contrib.fastapi.route_groups import (
     build_core_router,
     build_implementation_router,
     build_lock_router,
+    build_metrics_router,
     build_schema_router,
     build_state_router,
     build_task_router,
@@ -78,6 +79,7 @@ def add_agent_routes(
     get_user_from_request: Optional[Callable[[Request], object]] = None,
     ws_path: str = "/ws",
     assign_path: str = "/assign",
+    bulk_assign_path: str = "/bulk_assign",
     cancel_path: str = "/cancel",
     pause_path: str = "/pause",
     resume_path: str = "/resume",
@@ -92,6 +94,7 @@ def add_agent_routes(
             user_getter,
             ws_path=ws_path,
             assign_path=assign_path,
+            bulk_assign_path=bulk_assign_path,
             cancel_path=cancel_path,
             pause_path=pause_path,
             resume_path=resume_path,
@@ -158,6 +161,14 @@ def add_lock_routes(
     )
 
 
+def add_metrics_routes(
+    app: FastAPI,
+    metrics_path: str = "/metrics",
+) -> None:
+    """Include the Prometheus metrics route."""
+    _include_router(app, build_metrics_router(metrics_path=metrics_path))
+
+
 def add_implementation_routes(
     app: FastAPI,
     agent: FastApiAgent,
@@ -183,6 +194,7 @@ def configure_fastapi(
     add_states: bool = True,
     add_state_details: bool = True,
     add_locks: bool = True,
+    add_metrics: bool = True,
     add_tasks: bool = True,
     add_task_details: bool = True,
     ws_path: str = "/ws",
@@ -190,6 +202,7 @@ def configure_fastapi(
     assign_path: str = "/assign",
     states_path: str = "/states",
     locks_path: str = "/locks",
+    metrics_path: str = "/metrics",
     db_file: str = "agent_data.db",
     app_context: Any | None = None,
 ) -> FastApiAgent:
@@ -225,6 +238,8 @@ def configure_fastapi(
             )
         if add_locks:
             add_lock_routes(fastapi_app, agent, locks_path=locks_path)
+        if add_metrics:
+            add_metrics_routes(fastapi_app, metrics_path=metrics_path)
         if add_implementations:
             add_implementation_routes(fastapi_app, agent)
         if add_schema:
@@ -260,6 +275,7 @@ __all__ = [
     "add_implementation_route",
     "add_implementation_routes",
     "add_lock_routes",
+    "add_metrics_routes",
     "add_schema_routes",
     "add_state_detail_routes",
     "add_state_routes",
@@ -1,7 +1,7 @@
 import aiosqlite
 import json
 from datetime import datetime, timezone
-from typing import Any, Optional, cast
+from typing import Any, Mapping, Optional, cast
 
 from rekuest_next.contrib.fastapi.retriever.protocol import (
     PatchEvent,
@@ -11,6 +11,7 @@ from rekuest_next.contrib.fastapi.retriever.protocol import (
 )
 from rekuest_next.contrib.sql_lite.schema import ensure_sqlite_schema
 from rekuest_next.messages import JSONSerializable
+from rekuest_next.state.apply import apply_operations
 
 
 # ==========================================
@@ -319,18 +320,25 @@ class SQLLiteRetriever:
         state_data = cast(
             JSONSerializable, json.loads(json.dumps(anchor_snapshot.data))
         )
-        last_snapshot = anchor_snapshot
-        for row in patch_rows:
-            patch_event = self._row_to_patch_event(row)
-            state_data = self._apply_patch_document(state_data, patch_event.patch)
-            last_snapshot = Snapshot(
-                timepoint=patch_event.timepoint,
-                data=state_data,
-                global_revision=patch_event.global_future_rev,
-                session_id=patch_event.session_id,
-            )
-
-        return last_snapshot
+        if not patch_rows:
+            return anchor_snapshot
+
+        # Anchor and patch values are freshly decoded, so apply in place
+        patch_events = [self._row_to_patch_event(row) for row in patch_rows]
+        state_data = apply_operations(
+            state_data,
+            (
+                cast(Mapping[str, Any], patch_event.patch)
+                for patch_event in patch_events
+            ),
+        )
+        last_event = patch_events[-1]
+        return Snapshot(
+            timepoint=last_event.timepoint,
+            data=state_data,
+            global_revision=last_event.global_future_rev,
+            session_id=last_event.session_id,
+        )
 
     async def _aget_state_ids(self, session_id: Optional[str]) -> list[str]:
         session_filter = "WHERE session_id = ?" if session_id is not None else ""
@@ -349,18 +357,6 @@ class SQLLiteRetriever:
 
         return sorted(set(snapshot_state_ids).union(patch_state_ids))
 
-    def _apply_patch_document(
-        self,
-        state_data: JSONSerializable,
-        patch_document: JSONSerializable,
-    ) -> JSONSerializable:
-        import jsonpatch  # type: ignore[import-untyped]
-
-        return cast(
-            JSONSerializable,
-            jsonpatch.apply_patch(state_data, [patch_document], in_place=False),
-        )
-
     def _row_to_snapshot(self, row: tuple[Any, ...]) -> Snapshot:
         global_revision, event_time, session_id, state_data = row
         return Snapshot(
@@ -32,10 +32,16 @@ Example:
 """
 
 import contextvars
+import io
+import os
+import uuid
 from types import TracebackType
 from typing import Optional
 
 from koil.composition import KoiledModel
+from pydantic import PrivateAttr
+
+from rekuest_next.io.s3 import S3ClientPool
 
 
 current_rekuest_datalayer: contextvars.ContextVar[Optional["DataLayer"]] = (
@@ -62,10 +68,69 @@ class DataLayer(KoiledModel):
     host: str = ""
     port: int | None = None
     protocol: str = "https"
+    max_connections: int = 32
+    _client_pool: Optional[S3ClientPool] = PrivateAttr(default=None)
 
     async def get_endpoint_url(self):
         return self.endpoint_url
 
+    def client_pool(self) -> S3ClientPool:
+        """The long-lived, pooled S3 client of this datalayer.
+
+        The pool is created on first use and closed when the datalayer context
+        exits.
+        """
+        if self._client_pool is None:
+            self._client_pool = S3ClientPool(
+                self.get_endpoint_url, max_connections=self.max_connections
+            )
+        return self._client_pool
+
+    async def aput_bytes(
+        self,
+        data: bytes,
+        file_name: str,
+        content_type: str = "application/octet-stream",
+    ) -> str:
+        """Store a blob in the datalayer.
+
+        Requests an upload grant from rekuest (through the current rath) and
+        puts the blob into the granted S3 object.
+
+        Args:
+            data (bytes): The blob to store.
+            file_name (str): The original file name the blob is stored as.
+            content_type (str): The content type of the blob.
+
+        Returns:
+            str: The store id, pass it to :meth:`aget_bytes` to read the blob.
+        """
+        from rekuest_next.api.schema import arequest_media_upload
+        from rekuest_next.io.upload import astore_media_file
+        from rekuest_next.scalars import MediaLike
+
+        grant = await arequest_media_upload(
+            file_name, file_size=len(data), content_type=content_type
+        )
+        buffer = io.BytesIO(data)
+        buffer.name = file_name
+        return await astore_media_file(MediaLike(buffer), grant, self)
+
+    async def aget_bytes(self, store_id: str) -> bytes:
+        """Read a blob stored with :meth:`aput_bytes`.
+
+        Args:
+            store_id (str): The store id the blob was stored as.
+
+        Returns:
+            bytes: The blob.
+        """
+        from rekuest_next.api.schema import arequest_media_access
+        from rekuest_next.io.download import aretrieve_media_file
+
+        grant = await arequest_media_access(store_id)
+        return await aretrieve_media_file(grant, self)
+
     async def __aenter__(self):
         current_rekuest_datalayer.set(self)
         return self
@@ -76,4 +141,47 @@ class DataLayer(KoiledModel):
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
+        if self._client_pool is not None:
+            await self._client_pool.aclose()
+            self._client_pool = None
         current_rekuest_datalayer.set(None)
+
+
+class LocalDataLayer(DataLayer):
+    """A datalayer that stores blobs in a local directory
+
+    A stand-in for the S3 datalayer that needs neither a rekuest server nor S3,
+    e.g. for tests or for agents and callers that share a filesystem. Store ids
+    are file names within ``root``.
+
+    Attributes:
+        root (str): The directory the blobs are stored in (created on demand).
+    """
+
+    root: str
+
+    async def get_endpoint_url(self):
+        return f"file://{os.path.abspath(self.root)}"
+
+    def _blob_path(self, store_id: str) -> str:
+        if os.path.basename(store_id) != store_id:
+            raise ValueError(f"Invalid store id {store_id!r}")
+        return os.path.join(self.root, store_id)
+
+    async def aput_bytes(
+        self,
+        data: bytes,
+        file_name: str,
+        content_type: str = "application/octet-stream",
+    ) -> str:
+        """Store a blob as a file in ``root``."""
+        os.makedirs(self.root, exist_ok=True)
+        store_id = f"{uuid.uuid4().hex}-{os.path.basename(file_name)}"
+        with open(self._blob_path(store_id), "wb") as f:
+            f.write(data)
+        return store_id
+
+    async def aget_bytes(self, store_id: str) -> bytes:
+        """Read a blob stored with :meth:`aput_bytes`."""
+        with open(self._blob_path(store_id), "rb") as f:
+            return f.read()
@@ -0,0 +1,262 @@
+"""On-disk cache for prepared definitions.
+
+Building a definition walks every annotation of a function and validates a tree
+of port inputs. For apps with hundreds of registered functions this is a
+noticeable part of the startup time, even though the result only changes when
+the code does. The :class:`DefinitionCache` stores prepared definitions as JSON,
+keyed by a hash over the source of the defining module (and the modules of the
+types it uses), how those types are registered in the structure registry, the
+function's qualified name and the options it was defined with. Unchanged modules
+therefore skip the definition step on the next start.
+
+The cache is opt-in: pass a cache to ``prepare_definition`` or point the
+``REKUEST_NEXT_DEFINITION_CACHE`` environment variable at a directory.
+"""
+
+import hashlib
+import inspect
+import os
+import sys
+import tempfile
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from rekuest_next.api.schema import DefinitionInput
+
+if TYPE_CHECKING:
+    from rekuest_next.structures.registry import StructureRegistry
+
+DEFINITION_CACHE_ENV = "REKUEST_NEXT_DEFINITION_CACHE"
+
+DEFINITION_CACHE_FORMAT = 1
+"""Part of every key. Bump it whenever building definitions changes, so entries
+built by an older version are not served (``__version__`` is not bumped between
+development builds)."""
+
+_module_source_hashes: Dict[str, Optional[str]] = {}
+
+
+def module_source_hash(module_name: str) -> Optional[str]:
+    """Hash the source file of a module.
+
+    Hashes are memoized per process; modules without a source file (builtins,
+    extension modules, interactively defined code) return None.
+
+    Args:
+        module_name (str): The name of the module, as found in ``sys.modules``.
+
+    Returns:
+        Optional[str]: The sha256 hex digest of the module source, or None.
+    """
+    if module_name in _module_source_hashes:
+        return _module_source_hashes[module_name]
+
+    digest: Optional[str] = None
+    module = sys.modules.get(module_name)
+    try:
+        source_file = inspect.getsourcefile(module) if module else None
+        if source_file:
+            digest = hashlib.sha256(Path(source_file).read_bytes()).hexdigest()
+    except (TypeError, OSError):
+        digest = None
+
+    _module_source_hashes[module_name] = digest
+    return digest
+
+
+def fingerprint(value: Any) -> str:  # noqa: ANN401
+    """Build a stable textual fingerprint of a definition option.
+
+    Args:
+        value (Any): A primitive, a pydantic model, a type or a (nested)
+            list/tuple/dict of those.
+
+    Returns:
+        str: The fingerprint.
+
+    Raises:
+        TypeError: If the value has no stable representation (the definition is
+            then not cached).
+    """
+    if value is None or isinstance(value, (str, int, float, bool, Enum)):
+        return repr(value)
+    if isinstance(value, BaseModel):
+        return f"{type(value).__qualname__}({value.model_dump_json()})"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(fingerprint(v) for v in value) + "]"
+    if isinstance(value, dict):
+        return (
+            "{"
+            + ",".join(
+                f"{fingerprint(k)}:{fingerprint(v)}"
+                for k, v in sorted(value.items(), key=lambda item: repr(item[0]))
+            )
+            + "}"
+        )
+    if inspect.isclass(value) or getattr(value, "__origin__", None) is not None:
+        return repr(value)
+    raise TypeError(f"Cannot fingerprint {value!r}")
+
+
+def registration_fingerprint(cls: Any, registry: "StructureRegistry") -> str:  # noqa: ANN401
+    """Fingerprint how a class is registered in a structure registry.
+
+    Covers what ends up in the ports of the class: the kind of registration, its
+    identifier, description, choices and default widgets.
+
+    Args:
+        cls (Any): A class used in a definition.
+        registry (StructureRegistry): The registry the definition is built with.
+
+    Returns:
+        str: The fingerprint.
+
+    Raises:
+        TypeError: If the registration has no stable representation.
+    """
+    name = f"{getattr(cls, '__module__', '')}.{getattr(cls, '__qualname__', cls)}"
+    fullfilled = registry.cls_fullfilled_type_map.get(cls)
+    if fullfilled is None:
+        return f"{name}:unregistered"
+    return f"{name}:" + fingerprint(
+        {
+            "kind": type(fullfilled).__name__,
+            "identifier": fullfilled.identifier,
+            "description": fullfilled.description,
+            "choices": getattr(fullfilled, "choices", None),
+            "default_widget": getattr(fullfilled, "default_widget", None),
+            "default_returnwidget": getattr(fullfilled, "default_returnwidget", None),
+        }
+    )
+
+
+class DefinitionCache(BaseModel):
+    """A directory of prepared definitions, keyed by source and options."""
+
+    directory: Path
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def key_for(
+        self,
+        function: Any,  # noqa: ANN401
+        options: Dict[str, Any],
+        types: Iterable[Any] = (),
+        structure_registry: Optional["StructureRegistry"] = None,
+    ) -> Optional[str]:
+        """Compute the cache key for a function.
+
+        Args:
+            function (Callable): The function that is being defined.
+            options (Dict[str, Any]): The options passed to ``prepare_definition``.
+            types (Iterable[Any]): The classes used in the function's annotations;
+                the sources of their modules are part of the key.
+            structure_registry (Optional[StructureRegistry]): The registry the
+                definition is built with; how ``types`` are registered in it is
+                part of the key.
+
+        Returns:
+            Optional[str]: The key, or None if the function cannot be cached
+                (no source file or options without a stable fingerprint).
+        """
+        from rekuest_next import __version__
+
+        module_name = getattr(function, "__module__", None)
+        qualname = getattr(function, "__qualname__", None)
+        if not module_name or not qualname or "<locals>" in qualname:
+            return None
+
+        source_hash = module_source_hash(module_name)
+        if source_hash is None:
+            return None
+
+        types = list(types)
+        type_modules = sorted(
+            {
+                cls.__module__
+                for cls in types
+                if inspect.isclass(cls) and cls.__module__ != module_name
+            }
+        )
+
+        try:
+            option_print = fingerprint(options)
+            registrations = (
+                sorted(
+                    {registration_fingerprint(cls, structure_registry) for cls in types}
+                )
+                if structure_registry is not None
+                else []
+            )
+        except TypeError:
+            return None
+
+        hasher = hashlib.sha256()
+        for part in (
+            str(DEFINITION_CACHE_FORMAT),
+            __version__,
+            module_name,
+            qualname,
+            source_hash,
+            *(f"{m}:{module_source_hash(m)}" for m in type_modules),
+            option_print,
+            *registrations,
+        ):
+            hasher.update(part.encode())
+            hasher.update(b"\0")
+        return hasher.hexdigest()
+
+    def get(self, key: str) -> Optional[DefinitionInput]:
+        """Load a cached definition.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[DefinitionInput]: The definition, or None on a miss or an
+                unreadable entry.
+        """
+        try:
+            raw = (self.directory / f"{key}.json").read_bytes()
+        except OSError:
+            return None
+        try:
+            return DefinitionInput.model_validate_json(raw)
+        except ValueError:
+            return None
+
+    def set(self, key: str, definition: DefinitionInput) -> None:
+        """Store a definition.
+
+        The entry is written to a temporary file and moved into place, so
+        concurrent processes never read a partial entry. Write errors are
+        ignored: the cache is an optimization only.
+
+        Args:
+            key (str): The cache key.
+            definition (DefinitionInput): The definition to store.
+        """
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(definition.model_dump_json(by_alias=True).encode())
+            os.replace(tmp, self.directory / f"{key}.json")
+        except OSError:
+            pass
+
+
+def get_default_definition_cache() -> Optional[DefinitionCache]:
+    """Get the definition cache configured through the environment.
+
+    Returns:
+        Optional[DefinitionCache]: A cache in ``$REKUEST_NEXT_DEFINITION_CACHE``,
+            or None if the variable is unset (caching disabled).
+    """
+    directory = os.environ.get(DEFINITION_CACHE_ENV)
+    if not directory:
+        return None
+    return DefinitionCache(directory=Path(directory))
@@ -1,6 +1,7 @@
 """Define"""
 
 import collections
+import functools
 from enum import Enum
 from typing import Callable, List, Union, get_type_hints
 from rekuest_next.structures.model import (
@@ -25,7 +26,8 @@ from rekuest_next.api.schema import (
     ValidatorInput,
 )
 import inspect
-from docstring_parser import parse, DocstringStyle
+from docstring_parser import Docstring, parse, DocstringStyle
+from rekuest_next.definition.cache import DefinitionCache, get_default_definition_cache
 from rekuest_next.definition.errors import DefinitionError, NonSufficientDocumentation
 import datetime as dt
 from rekuest_next.structures.registry import (
@@ -192,6 +194,68 @@ def is_datetime(cls: Any) -> bool:  # noqa: ANN401
     return False
 
 
+def register_annotation(cls: Any, registry: StructureRegistry) -> List[Any]:  # noqa: ANN401
+    """Register the structures an annotation refers to, without building ports.
+
+    This mirrors the registrations ``convert_object_to_argport`` and
+    ``convert_object_to_returnport`` perform as a side effect, so a definition
+    loaded from the definition cache leaves the registry in the same state as
+    a freshly built one.
+
+    Args:
+        cls (Any): The annotation to walk.
+        registry (StructureRegistry): The registry to register into.
+
+    Returns:
+        List[Any]: The leaf classes the annotation is made of.
+    """
+    if cls is None or cls is Ellipsis or is_none_type(cls):
+        return []
+
+    if is_dependency_type(cls) or is_local_var(cls):
+        return []
+
+    if is_annotated(cls):
+        return register_annotation(get_args(cls)[0], registry)
+
+    if is_model(cls):
+        inspected_model = inspect_model_class(cls)
+        registry.register_as_model(cls, inspected_model.identifier)
+        leaves: List[Any] = [cls]
+        for arg in inspected_model.args:
+            leaves.extend(register_annotation(arg.cls, registry))
+        return leaves
+
+    if (
+        is_union(cls)
+        or is_list(cls)
+        or is_dict(cls)
+        or is_tuple(cls)
+        or is_generator_type(cls)
+    ):
+        leaves = []
+        for arg in get_args(cls):
+            leaves.extend(register_annotation(arg, registry))
+        return leaves
+
+    if is_literal(cls):
+        registry.get_fullfilled_type_for_cls(cls)
+        return []
+
+    if (
+        is_bool(cls)
+        or is_int(cls)
+        or is_float(cls)
+        or is_datetime(cls)
+        or is_str(cls)
+        or is_pint_quantity(cls)
+    ):
+        return [cls]
+
+    registry.get_fullfilled_type_for_cls(cls)
+    return [cls]
+
+
 def convert_object_to_argport(
     cls: Any,  # noqa: ANN401
     key: str,
@@ -817,6 +881,24 @@ def snake_to_title_case(snake_str: str) -> str:
     return title_case_str
 
 
+@functools.lru_cache(maxsize=1024)
+def parse_docstring(docstring: str) -> Docstring:
+    """Parse a docstring, memoized by its text.
+
+    ``DocstringStyle.AUTO`` tries every known style and keeps the best match,
+    which makes parsing comparatively expensive. Functions are often defined
+    more than once (e.g. per app or per test), so the result is cached. The
+    returned object is shared and must not be mutated.
+
+    Args:
+        docstring (str): The docstring to parse.
+
+    Returns:
+        Docstring: The parsed docstring.
+    """
+    return parse(docstring, style=DocstringStyle.AUTO)
+
+
 def prepare_definition(
     function: Callable[..., Any],
     structure_registry: StructureRegistry,
@@ -843,6 +925,7 @@ def prepare_definition(
     allow_annotations: bool = True,
     version: Optional[str] = None,
     key: Optional[str] = None,
+    definition_cache: Optional[DefinitionCache] = None,
 ) -> DefinitionInput:
     """Define
 
@@ -856,10 +939,50 @@ def prepare_definition(
         structure_registry (StructureRegistry): The structure registry that should be checked against and new parameters registered within
         widgets (Dict[str, WidgetInput], optional): The widgets to use for function parameters. If none or key not present the default widget will be used.
         return_widgets ()
+        definition_cache (DefinitionCache, optional): A cache to load the definition from (and store it in).
+            Defaults to the cache configured through ``REKUEST_NEXT_DEFINITION_CACHE``, if any.
     """
 
     assert structure_registry is not None, "You need to pass a StructureRegistry"
 
+    definition_cache = definition_cache or get_default_definition_cache()
+    cache_key: Optional[str] = None
+    if definition_cache is not None:
+        cache_key = _definition_cache_key(
+            definition_cache,
+            function,
+            structure_registry,
+            dict(
+                widgets=widgets,
+                return_widgets=return_widgets,
+                effects=effects,
+                port_groups=port_groups,
+                allow_empty_doc=allow_empty_doc,
+                collections=collections,
+                interfaces=interfaces,
+                description=description,
+                is_test_for=is_test_for,
+                port_label_map=port_label_map,
+                port_description_map=port_description_map,
+                validators=validators,
+                name=name,
+                omitfirst=omitfirst,
+                omitlast=omitlast,
+                logo=logo,
+                stateful=stateful,
+                omitkeys=omitkeys,
+                return_annotations=return_annotations,
+                allow_dev=allow_dev,
+                allow_annotations=allow_annotations,
+                version=version,
+                key=key,
+            ),
+        )
+        if cache_key is not None:
+            cached = definition_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
     is_generator = inspect.isasyncgenfunction(function) or inspect.isgeneratorfunction(
         function
     )
@@ -882,7 +1005,7 @@ def prepare_definition(
     # Docstring Parser to help with descriptions. ``AUTO`` tries every known
     # style (reST, Google, Numpydoc, Epydoc) and keeps the best match, so we
     # accept whatever convention the author happens to use.
-    docstring = parse(function.__doc__ or "", style=DocstringStyle.AUTO)
+    docstring = parse_docstring(function.__doc__ or "")
 
     function_name = (
         getattr(function, "__name__", None)
@@ -1119,4 +1242,57 @@ def prepare_definition(
         isTestFor=tuple(is_test_for or []),
     )
 
+    if definition_cache is not None and cache_key is not None:
+        definition_cache.set(cache_key, definition)
+
     return definition
+
+
+def _definition_cache_key(
+    definition_cache: DefinitionCache,
+    function: Callable[..., Any],
+    structure_registry: StructureRegistry,
+    options: Dict[str, Any],
+) -> Optional[str]:
+    """Compute the definition cache key for a function.
+
+    Walks the annotations of the ports ``prepare_definition`` would build and
+    registers their structures, so the registry is warmed even if the
+    definition itself is then loaded from the cache.
+    """
+    try:
+        sig = inspect.signature(function)
+        type_hints = get_type_hints(
+            function, include_extras=options["allow_annotations"]
+        )
+    except (TypeError, ValueError, NameError):
+        return None
+
+    omitfirst = options["omitfirst"]
+    omitlast = options["omitlast"]
+    omitkeys = options["omitkeys"] or []
+
+    defaults: Dict[str, Any] = {}
+    used_types: List[Any] = []
+    for index, (param_key, value) in enumerate(sig.parameters.items()):
+        if omitfirst is not None and index < omitfirst:
+            continue
+        if omitlast is not None and index > omitlast:
+            continue
+        if param_key in omitkeys:
+            continue
+        default = value.default if value.default != inspect.Parameter.empty else None
+        if default is not None:
+            defaults[param_key] = default
+        cls = type_hints.get(param_key, type(default) if default is not None else None)
+        used_types.extend(register_annotation(cls, structure_registry))
+
+    for cls in options["return_annotations"] or [type_hints.get("return")]:
+        used_types.extend(register_annotation(cls, structure_registry))
+
+    return definition_cache.key_for(
+        function,
+        dict(options, defaults=defaults, doc=function.__doc__),
+        types=used_types,
+        structure_registry=structure_registry,
+    )
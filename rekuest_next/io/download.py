@@ -0,0 +1,38 @@
+"""Module for downloading data from a DataLayer using asynchronous methods."""
+
+from typing import TYPE_CHECKING
+
+from .errors import PermissionsError
+
+from rekuest_next.datalayer import DataLayer
+
+
+if TYPE_CHECKING:
+    from rekuest_next.api.schema import MediaAccessGrant
+
+
+async def aretrieve_media_file(
+    credentials: "MediaAccessGrant",
+    datalayer: "DataLayer",
+) -> bytes:
+    """Read a media file from the datalayer with temporary access credentials.
+
+    Uses the pooled client of the datalayer, signed with the grant credentials.
+    """
+    import botocore  # type: ignore
+
+    pool = datalayer.client_pool()
+    async with pool.aclient(credentials) as client:
+        try:
+            response = await client.get_object(
+                Bucket=credentials.bucket, Key=credentials.key
+            )  # type: ignore
+            async with response["Body"] as stream:  # type: ignore
+                return await stream.read()  # type: ignore
+        except botocore.exceptions.ClientError as e:  # type: ignore
+            if e.response["Error"]["Code"] == "InvalidAccessKeyId":  # type: ignore
+                raise PermissionsError(
+                    "Access Key is invalid, trying to get new credentials"
+                ) from e
+
+            raise e
@@ -14,3 +14,9 @@ class PermissionsError(UploadError):
     """Errror wrapper for permission errors"""
 
     pass
+
+
+class DownloadError(IoError):
+    """Error while downloading from the DataLayer"""
+
+    pass
@@ -0,0 +1,90 @@
+"""Out-of-band transport of oversized returns through the datalayer.
+
+Shrunk returns travel inline in a report (e.g. a ``Yield``). Above a size
+threshold an agent instead stores them in the datalayer and the report carries
+a reference::
+
+    {"__offloaded__": {"store_id": "...", "size": 1048576}}
+
+The caller side (:func:`rekuest_next.structures.serialization.postman.aexpand_returns`)
+detects the reference and fetches the returns back before expanding them, so
+neither the backend nor the calling code has to know about offloading.
+"""
+
+import json
+from typing import Dict, Optional
+
+from pydantic_core import to_json
+
+from rekuest_next.datalayer import DataLayer, current_rekuest_datalayer
+from rekuest_next.structures.types import JSONSerializable
+from .errors import DownloadError
+
+OFFLOAD_KEY = "__offloaded__"
+"""The key of the reference that replaces offloaded returns."""
+
+OFFLOAD_CONTENT_TYPE = "application/json"
+
+
+def is_offloaded(returns: Optional[Dict[str, JSONSerializable]]) -> bool:
+    """Whether ``returns`` is a reference to offloaded returns."""
+    return returns is not None and OFFLOAD_KEY in returns
+
+
+async def aoffload_returns(
+    returns: Dict[str, JSONSerializable],
+    datalayer: DataLayer,
+    threshold: int,
+    file_name: str = "returns.json",
+) -> Dict[str, JSONSerializable]:
+    """Store ``returns`` in the datalayer if they are larger than ``threshold``.
+
+    Args:
+        returns (Dict[str, JSONSerializable]): The shrunk returns.
+        datalayer (DataLayer): The datalayer to store them in.
+        threshold (int): The size (in bytes of JSON) above which returns are
+            offloaded.
+        file_name (str): The file name the returns are stored as.
+
+    Returns:
+        Dict[str, JSONSerializable]: The returns themselves if they are small
+            enough, a reference to the stored returns otherwise.
+    """
+    data = to_json(returns)
+    if len(data) <= threshold:
+        return returns
+
+    store_id = await datalayer.aput_bytes(
+        data, file_name, content_type=OFFLOAD_CONTENT_TYPE
+    )
+    return {OFFLOAD_KEY: {"store_id": store_id, "size": len(data)}}
+
+
+async def afetch_returns(
+    returns: Dict[str, JSONSerializable],
+    datalayer: Optional[DataLayer] = None,
+) -> Dict[str, JSONSerializable]:
+    """Resolve a reference to offloaded returns (no-op for inline returns).
+
+    Args:
+        returns (Dict[str, JSONSerializable]): The returns of a report.
+        datalayer (Optional[DataLayer]): The datalayer to read them from.
+            Defaults to the current datalayer.
+
+    Returns:
+        Dict[str, JSONSerializable]: The inline returns.
+    """
+    if not is_offloaded(returns):
+        return returns
+
+    datalayer = datalayer or current_rekuest_datalayer.get()
+    if datalayer is None:
+        raise DownloadError(
+            "The returns were offloaded to the datalayer, but no datalayer is set. "
+            "Enter a datalayer context to fetch them."
+        )
+
+    reference = returns[OFFLOAD_KEY]
+    assert isinstance(reference, dict), "Invalid offload reference"
+    data = await datalayer.aget_bytes(str(reference["store_id"]))
+    return json.loads(data)
@@ -0,0 +1,287 @@
+"""A pooled S3 client and multipart uploads for the datalayer.
+
+Creating an aiobotocore client (and its TLS connection pool) is much more
+expensive than a single ``put_object``. A :class:`S3ClientPool` belongs to a
+datalayer and keeps one long-lived client for its endpoint. Every grant comes
+with its own temporary credentials, so they are not bound to the client:
+requests are signed with the credentials of the grant they were borrowed for
+(see :meth:`S3ClientPool.aclient`), and all grants share the connections.
+
+Large media is uploaded as a multipart upload, with several parts in flight at
+once (see :func:`aput_object`).
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import logging
+from typing import (
+    IO,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+MULTIPART_THRESHOLD = 16 * 1024 * 1024
+"""Media larger than this is uploaded in parts."""
+
+PART_SIZE = 8 * 1024 * 1024
+"""The size of a part of a multipart upload (S3 requires at least 5 MiB)."""
+
+PART_CONCURRENCY = 4
+"""How many parts of one multipart upload are uploaded at once."""
+
+
+class S3Credentials(Protocol):
+    """Temporary S3 credentials, e.g. a media upload or access grant."""
+
+    access_key: str
+    secret_key: str
+    session_token: str
+
+
+current_grant_credentials: contextvars.ContextVar[Optional[S3Credentials]] = (
+    contextvars.ContextVar("current_grant_credentials", default=None)
+)
+"""The credentials requests of the pooled client are signed with."""
+
+
+def _sign_with_grant(request: Any, **kwargs: Any) -> None:  # noqa: ANN401
+    """Sign a request with the credentials of the grant it is made for."""
+    credentials = current_grant_credentials.get()
+    if credentials is None:
+        return
+    from aiobotocore.credentials import AioCredentials  # type: ignore
+
+    request.context.setdefault("signing", {})["request_credentials"] = AioCredentials(  # type: ignore
+        credentials.access_key,
+        credentials.secret_key,
+        credentials.session_token,
+    )
+
+
+class S3ClientPool:
+    """The long-lived S3 client of a datalayer, shared by all grants
+
+    The client is created on first use and kept until the pool is closed (when
+    the datalayer context exits). Its connections are shared by every grant; up
+    to ``max_connections`` requests are in flight at once.
+
+    Args:
+        endpoint_loader (Callable[[], Awaitable[str]]): Loads the S3 endpoint
+            url. It is loaded once and cached until the pool is closed.
+        max_connections (int): The size of the connection pool of the client.
+    """
+
+    def __init__(
+        self,
+        endpoint_loader: Callable[[], Awaitable[str]],
+        max_connections: int = 32,
+    ) -> None:
+        """Initialize an empty pool"""
+        self.endpoint_loader = endpoint_loader
+        self.max_connections = max_connections
+        self._endpoint_url: Optional[str] = None
+        self._client: Any = None
+        self._stack: Optional[contextlib.AsyncExitStack] = None
+        self._closing: Optional[contextlib.AsyncExitStack] = None
+        self._users = 0
+        self._lock = asyncio.Lock()
+
+    async def aendpoint_url(self) -> str:
+        """The (cached) endpoint url of the datalayer."""
+        if self._endpoint_url is None:
+            self._endpoint_url = await self.endpoint_loader()
+        return self._endpoint_url
+
+    async def _acreate_client(
+        self, endpoint_url: str, credentials: S3Credentials
+    ) -> Tuple[Any, contextlib.AsyncExitStack]:
+        from aiobotocore.config import AioConfig  # type: ignore
+        from aiobotocore.session import get_session  # type: ignore
+
+        stack = contextlib.AsyncExitStack()
+        # The credentials of the first grant only keep botocore from searching
+        # for credentials, every request is signed with those of its own grant
+        client = await stack.enter_async_context(
+            get_session().create_client(  # type: ignore
+                "s3",
+                region_name="us-west-2",
+                endpoint_url=endpoint_url,
+                aws_secret_access_key=credentials.secret_key,
+                aws_access_key_id=credentials.access_key,
+                aws_session_token=credentials.session_token,
+                config=AioConfig(max_pool_connections=self.max_connections),
+            )
+        )
+        client.meta.events.register("before-sign.s3", _sign_with_grant)  # type: ignore
+        return client, stack
+
+    @contextlib.asynccontextmanager
+    async def aclient(self, credentials: S3Credentials) -> AsyncIterator[Any]:
+        """Borrow the client, signing requests with ``credentials``.
+
+        Requests made while the client is borrowed (including from tasks
+        started meanwhile) are signed with the credentials of this grant.
+
+        Args:
+            credentials (S3Credentials): The credentials of a grant.
+
+        Yields:
+            Any: An aiobotocore S3 client.
+        """
+        async with self._lock:
+            if self._client is None:
+                self._client, self._stack = await self._acreate_client(
+                    await self.aendpoint_url(), credentials
+                )
+            client = self._client
+            self._users += 1
+
+        token = current_grant_credentials.set(credentials)
+        try:
+            yield client
+        finally:
+            current_grant_credentials.reset(token)
+            self._users -= 1
+            if self._users == 0 and self._closing is not None:
+                stack, self._closing = self._closing, None
+                await stack.aclose()
+
+    async def aclose(self) -> None:
+        """Close the client (once it is returned) and forget the endpoint url."""
+        async with self._lock:
+            stack = self._stack
+            self._client = None
+            self._stack = None
+            self._endpoint_url = None
+        if stack is None:
+            return
+        if self._users:
+            self._closing = stack
+        else:
+            await stack.aclose()
+
+
+def _remaining_size(stream: IO[bytes]) -> Optional[int]:
+    try:
+        if not stream.seekable():
+            return None
+        position = stream.tell()
+        end = stream.seek(0, 2)
+        stream.seek(position)
+        return end - position
+    except (AttributeError, OSError):
+        return None
+
+
+async def aupload_multipart(
+    client: Any,  # noqa: ANN401
+    bucket: str,
+    key: str,
+    stream: IO[bytes],
+    part_size: int = PART_SIZE,
+    concurrency: int = PART_CONCURRENCY,
+) -> None:
+    """Upload a stream as a multipart upload, several parts at once.
+
+    At most ``concurrency`` parts are read into memory at a time. If a part
+    fails, the multipart upload is aborted.
+
+    Args:
+        client (Any): An aiobotocore S3 client.
+        bucket (str): The bucket.
+        key (str): The object key.
+        stream (IO[bytes]): The data, read from its current position.
+        part_size (int): The size of every part but the last.
+        concurrency (int): How many parts are uploaded at once.
+    """
+    upload = await client.create_multipart_upload(Bucket=bucket, Key=key)
+    upload_id = upload["UploadId"]
+    slots = asyncio.Semaphore(concurrency)
+    tasks: List[asyncio.Task[Dict[str, Any]]] = []
+
+    async def upload_part(number: int, body: bytes) -> Dict[str, Any]:
+        try:
+            response = await client.upload_part(
+                Bucket=bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=number,
+                Body=body,
+            )
+            return {"PartNumber": number, "ETag": response["ETag"]}
+        finally:
+            slots.release()
+
+    try:
+        number = 1
+        while True:
+            await slots.acquire()
+            # Off the event loop: the stream may be a file on slow storage
+            chunk = await asyncio.to_thread(stream.read, part_size)
+            if not chunk and number > 1:
+                slots.release()
+                break
+            tasks.append(asyncio.create_task(upload_part(number, chunk)))
+            if any(task.done() and task.exception() for task in tasks):
+                break
+            number += 1
+            if len(chunk) < part_size:
+                break
+
+        parts = await asyncio.gather(*tasks)
+        await client.complete_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            await client.abort_multipart_upload(
+                Bucket=bucket, Key=key, UploadId=upload_id
+            )
+        except Exception:
+            logger.exception(f"Could not abort the multipart upload of {key}")
+        raise
+
+
+async def aput_object(
+    client: Any,  # noqa: ANN401
+    bucket: str,
+    key: str,
+    stream: IO[bytes],
+    multipart_threshold: int = MULTIPART_THRESHOLD,
+    part_size: int = PART_SIZE,
+    concurrency: int = PART_CONCURRENCY,
+) -> None:
+    """Upload a stream: in one request if it is small, in parts otherwise.
+
+    Streams of unknown size (not seekable) are always uploaded in parts.
+
+    Args:
+        client (Any): An aiobotocore S3 client.
+        bucket (str): The bucket.
+        key (str): The object key.
+        stream (IO[bytes]): The data, read from its current position.
+        multipart_threshold (int): The size above which parts are used.
+        part_size (int): The size of a part.
+        concurrency (int): How many parts are uploaded at once.
+    """
+    size = _remaining_size(stream)
+    if size is not None and size <= multipart_threshold:
+        await client.put_object(Bucket=bucket, Key=key, Body=stream)
+        return
+    await aupload_multipart(client, bucket, key, stream, part_size, concurrency)
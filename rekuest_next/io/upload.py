@@ -1,9 +1,11 @@
 """Module for uploading various data types to a DataLayer using asynchronous methods."""
 
-from typing import TYPE_CHECKING
+import asyncio
+from typing import TYPE_CHECKING, List, Sequence, Tuple
 
 from rekuest_next.scalars import MediaLike
 from .errors import PermissionsError
+from .s3 import aput_object
 
 from rekuest_next.datalayer import DataLayer
 
@@ -17,34 +19,63 @@ async def astore_media_file(
     credentials: "MediaUploadGrant",
     datalayer: "DataLayer",
 ) -> str:
-    """Store a media file using a presigned PUT URL built from datalayer endpoint and credentials."""
-    """Store a DataFrame in the DataLayer"""
+    """Store a media file in the datalayer with the credentials of an upload grant.
 
-    from aiobotocore.session import get_session  # type: ignore
-    import botocore  # type: ignore
+    Uses the pooled client of the datalayer, signed with the grant credentials.
+    Large files are uploaded as a multipart upload with parallel parts. The file
+    is read in chunks from :meth:`MediaLike.open`, so a :class:`FileMediaLike` is
+    streamed from disk (and its checksum computed on the way).
 
-    session = get_session()
+    Args:
+        file (MediaLike): The file to store.
+        credentials (MediaUploadGrant): The upload grant.
+        datalayer (DataLayer): The datalayer to store the file in.
 
-    endpoint_url = await datalayer.get_endpoint_url()
+    Returns:
+        str: The store id of the file.
+    """
+    import botocore  # type: ignore
 
-    async with session.create_client(  # type: ignore
-        "s3",
-        region_name="us-west-2",
-        endpoint_url=endpoint_url,
-        aws_secret_access_key=credentials.secret_key,
-        aws_access_key_id=credentials.access_key,
-        aws_session_token=credentials.session_token,
-    ) as client:
+    pool = datalayer.client_pool()
+    async with pool.aclient(credentials) as client:
         try:
-            await client.put_object(
-                Bucket=credentials.bucket, Key=credentials.key, Body=file.value
-            )  # type: ignore
+            with file.open() as stream:
+                await aput_object(client, credentials.bucket, credentials.key, stream)
         except botocore.exceptions.ClientError as e:  # type: ignore
             if e.response["Error"]["Code"] == "InvalidAccessKeyId":  # type: ignore
-                return PermissionsError(
+                raise PermissionsError(
                     "Access Key is invalid, trying to get new credentials"
-                )  # type: ignore
+                ) from e
 
             raise e
 
     return credentials.store
+
+
+async def astore_media_files(
+    uploads: Sequence[Tuple[MediaLike, "MediaUploadGrant"]],
+    datalayer: "DataLayer",
+    max_concurrency: int = 8,
+) -> List[str]:
+    """Store many media files, at most ``max_concurrency`` at a time.
+
+    Args:
+        uploads (Sequence[Tuple[MediaLike, MediaUploadGrant]]): The files and
+            their upload grants.
+        datalayer (DataLayer): The datalayer to store the files in.
+        max_concurrency (int): How many files are uploaded at once.
+
+    Returns:
+        List[str]: The store ids, in the order of ``uploads``.
+    """
+    slots = asyncio.Semaphore(max_concurrency)
+
+    async def store(file: MediaLike, credentials: "MediaUploadGrant") -> str:
+        async with slots:
+            return await astore_media_file(file, credentials, datalayer)
+
+    return list(
+        await asyncio.gather(
+            *(store(file, credentials) for file, credentials in uploads)
+        )
+    )
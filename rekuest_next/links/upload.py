@@ -1,13 +1,13 @@
 import asyncio
 from rath.links.parsing import ParsingLink
 from rath.operation import Operation, opify
-from typing import Any, Tuple, Type, Union
+from typing import Any, Dict, List, Tuple, Type, Union
 from rekuest_next.io.upload import (
     astore_media_file,
+    astore_media_files,
 )
 from pydantic import Field
 from concurrent.futures import ThreadPoolExecutor
-from functools import partial
 from typing import TYPE_CHECKING
 from rekuest_next.scalars import MediaLike
 from rekuest_next.datalayer import DataLayer
@@ -69,6 +69,10 @@ class UploadLink(ParsingLink):
     """
 
     datalayer: DataLayer
+    max_concurrency: int = Field(
+        default=8,
+        description="How many files of one operation are uploaded at once.",
+    )
 
     executor: ThreadPoolExecutor = Field(
         default_factory=lambda: ThreadPoolExecutor(max_workers=4), exclude=True
@@ -81,8 +85,16 @@ class UploadLink(ParsingLink):
         return self
 
     async def aget_media_upload_credentials(
-        self, file: MediaLike, datalayer: DataLayer
+        self, file: MediaLike
     ) -> "MediaUploadGrant":
+        """Request an upload grant for a media file.
+
+        Args:
+            file (MediaLike): The file that will be uploaded.
+
+        Returns:
+            MediaUploadGrant: The grant to upload the file with.
+        """
         from rekuest_next.api.schema import (
             RequestMediaUploadInput,
             RequestMediaUploadMutation,
@@ -96,7 +108,8 @@ class UploadLink(ParsingLink):
             variables={
                 "input": RequestMediaUploadInput(
                     originalFileName=file.file_name,
-                ).model_dump(by_alias=True, exclude_unset=True)
+                    fileSize=file.size,
+                ).model_dump(by_alias=True, exclude_none=True)
             },
         )
 
@@ -112,9 +125,7 @@ class UploadLink(ParsingLink):
     ) -> str:
         """Upload a media file to the DataLayer asynchronously."""
         assert datalayer is not None, "Datalayer must be set"
-        endpoint_url = await datalayer.get_endpoint_url()
-
-        credentials = await self.aget_media_upload_credentials(file, endpoint_url)
+        credentials = await self.aget_media_upload_credentials(file)
 
         return await astore_media_file(
             file,
@@ -122,10 +133,39 @@ class UploadLink(ParsingLink):
             datalayer,
         )
 
+    async def aupload_mediafiles(
+        self,
+        files: List[MediaLike],
+        datalayer: "DataLayer",
+    ) -> List[str]:
+        """Upload many media files, at most ``max_concurrency`` at a time.
+
+        Args:
+            files (List[MediaLike]): The files to upload.
+            datalayer (DataLayer): The datalayer to upload them to.
+
+        Returns:
+            List[str]: The store ids, in the order of ``files``.
+        """
+        assert datalayer is not None, "Datalayer must be set"
+        slots = asyncio.Semaphore(self.max_concurrency)
+
+        async def request_credentials(file: MediaLike) -> "MediaUploadGrant":
+            async with slots:
+                return await self.aget_media_upload_credentials(file)
+
+        grants = await asyncio.gather(*(request_credentials(file) for file in files))
+        return await astore_media_files(
+            list(zip(files, grants)),
+            datalayer,
+            max_concurrency=self.max_concurrency,
+        )
+
     async def aparse(self, operation: Operation) -> Operation:
         """Parse the operation (Async)
 
-        Extracts the DataFrame from the operation and uploads it to the DataLayer.
+        Extracts the media files from the operation, uploads them to the
+        DataLayer (several at once) and substitutes them with their store ids.
 
         Args:
             operation (Operation): The operation to parse
@@ -133,11 +173,26 @@ class UploadLink(ParsingLink):
         Returns:
             Operation: _description_
         """
+        files: List[MediaLike] = []
+
+        async def collect(file: MediaLike) -> MediaLike:
+            files.append(file)
+            return file
+
+        await apply_recursive(collect, operation.variables, (MediaLike))
+        if not files:
+            return operation
+
+        store_ids = await self.aupload_mediafiles(files, self.datalayer)
+        uploaded: Dict[int, str] = {
+            id(file): store_id for file, store_id in zip(files, store_ids)
+        }
+
+        async def substitute(file: MediaLike) -> str:
+            return uploaded[id(file)]
 
         operation.variables = await apply_recursive(
-            partial(self.aupload_mediafile, datalayer=self.datalayer),
-            operation.variables,
-            (MediaLike),
+            substitute, operation.variables, (MediaLike)
         )
         return operation
 
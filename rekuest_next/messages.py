@@ -65,6 +65,22 @@ class AgentMode(str, Enum):
     OBSERVER = "OBSERVER"
 
 
+class WireEncoding(str, Enum):
+    """How messages in binary websocket frames are encoded.
+
+    Text frames always carry JSON. A binary encoding is requested on ``Register``
+    and only used once the ``Init`` grants it.
+
+    - ``JSON``    — no binary frames.
+    - ``MSGPACK`` — MessagePack (the ``msgpack`` extra).
+    - ``CBOR``    — CBOR (the ``cbor`` extra).
+    """
+
+    JSON = "JSON"
+    MSGPACK = "MSGPACK"
+    CBOR = "CBOR"
+
+
 class ToAgentMessageType(str, Enum):
     """The message types that can be sent to the agent from the rekuest backend"""
 
@@ -136,6 +152,7 @@ class FromAgentMessageType(str, Enum):
     INTERRUPT_REQUEST = "INTERRUPT_REQUEST"
     PAUSE_REQUEST = "PAUSE_REQUEST"
     RESUME_REQUEST = "RESUME_REQUEST"
+    LOCAL_ASSIGN = "LOCAL_ASSIGN"
 
 
 class Message(BaseModel):
@@ -197,6 +214,10 @@ class Assign(Message):
     capture: Optional[bool] = Field(
         default=None, description="Whether to run in debug mode, false by default"
     )
+    profile: Optional[bool] = Field(
+        default=None,
+        description="Whether to profile the execution and report the hot functions as a log, false by default",
+    )
     reference: Optional[str] = Field(
         default=None, description="A reference that the assinger provided"
     )
@@ -396,6 +417,35 @@ class Progress(FromAgentEvent):
     message: Optional[str] = None
 
 
+class LocalAssign(FromAgentEvent):
+    """A local assign report
+
+    Sent when an actor-internal call was short-circuited to an implementation on this
+    very agent instead of travelling to the backend as an ``AssignRequest``. Only sent
+    to backends that advertise it (``Init.local_assign``). The task id is minted by the
+    agent; every subsequent report for it (Progress, Yield, Completed, ...) flows
+    through the regular event stream, so the backend can still record the task and
+    attach it to its ``parent``. The args are the shrunk args, as in an ``Assign``.
+    """
+
+    type: Literal[FromAgentMessageType.LOCAL_ASSIGN] = FromAgentMessageType.LOCAL_ASSIGN
+    task: str = Field(description="The agent-minted task id.")
+    interface: str = Field(description="The local interface that runs the task.")
+    reference: Optional[str] = Field(
+        default=None, description="The caller-supplied reference."
+    )
+    parent: Optional[str] = Field(
+        default=None, description="The task that originated this call."
+    )
+    action: Optional[str] = Field(default=None, description="The action ID, if known.")
+    implementation: Optional[str] = Field(
+        default=None, description="The implementation ID, if known."
+    )
+    args: Dict[str, ShallowJSONSerializable] = Field(
+        default_factory=dict, description="The (shrunk) args of the task."
+    )
+
+
 class Yield(FromAgentEvent):
     """A yield report
 
@@ -405,16 +455,27 @@ class Yield(FromAgentEvent):
     type: Literal[FromAgentMessageType.YIELD] = FromAgentMessageType.YIELD
     task: str
     returns: Optional[Dict[str, Any]] = None
+    conflate: bool = Field(
+        default=False,
+        exclude=True,
+        description="Local only (never sent): a newer yield of the same task may replace this one while it still waits for the wire. The replaced yield's seq is never sent, so the backend sees a gap in the task's seq for every conflated yield.",
+    )
 
 
 class Completed(FromAgentEvent):
     """A completed report
 
     Sent when the actor has finished the task and all its children tasks.
+
+    If the backend allows it (``Init.fold_returns``), micro-task actors fold the
+    single result of a function into this report (``returns``) instead of sending
+    a separate ``Yield`` first. Folded returns are always sent inline, they are
+    never offloaded to the datalayer like oversized ``Yield`` returns.
     """
 
     type: Literal[FromAgentMessageType.COMPLETED] = FromAgentMessageType.COMPLETED
     task: str
+    returns: Optional[Dict[str, Any]] = None
 
 
 class Failed(FromAgentEvent):
@@ -524,6 +585,15 @@ class Lock(Message):
     type: Literal[FromAgentMessageType.LOCK] = FromAgentMessageType.LOCK
     key: str
     task: str
+    keys: List[str] = Field(
+        default_factory=list,
+        description="All keys of a grouped lock, acquired together (key is the first)",
+    )
+
+    @property
+    def lock_keys(self) -> List[str]:
+        """The keys this message locks (all keys of a group, or just ``key``)."""
+        return self.keys or [self.key]
 
 
 class Unlock(Message):
@@ -534,6 +604,15 @@ class Unlock(Message):
 
     type: Literal[FromAgentMessageType.UNLOCK] = FromAgentMessageType.UNLOCK
     key: str
+    keys: List[str] = Field(
+        default_factory=list,
+        description="All keys of a grouped unlock, released together (key is the first)",
+    )
+
+    @property
+    def lock_keys(self) -> List[str]:
+        """The keys this message unlocks (all keys of a group, or just ``key``)."""
+        return self.keys or [self.key]
 
 
 class AssignInquiry(BaseModel):
@@ -572,6 +651,18 @@ class Register(Message):
         default=None,
         description="Per-process identifier minted in-memory by the executor at start-up (never persisted). Its volatility is the reclaim signal: a reconnect with the SAME session_id means the process survived (reclaim in-flight work); a DIFFERENT session_id means a fresh process (fail-and-cascade). Omitted by non-executors.",
     )
+    state_session: Optional[str] = Field(
+        default=None,
+        description="The state session of the last state patch or snapshot the agent sent (None if it sent none yet). Together with global_rev this tells the backend how far the agent's state stream got.",
+    )
+    global_rev: Optional[int] = Field(
+        default=None,
+        description="The global revision of the last state patch or snapshot the agent sent in state_session.",
+    )
+    encoding: WireEncoding = Field(
+        default=WireEncoding.JSON,
+        description="The encoding the agent would like to use for binary frames. Granted (or not) by the Init.",
+    )
 
 
 class ProtocolError(Message):
@@ -591,6 +682,22 @@ class Init(Message):
     type: Literal[ToAgentMessageType.INIT] = ToAgentMessageType.INIT
     agent: str
     inquiries: list[AssignInquiry] = []
+    global_rev: Optional[int] = Field(
+        default=None,
+        description="The last global state revision the backend persisted for the state_session the agent registered with. The agent resends the patches after it (or a snapshot). None if the backend has nothing for that session (or does not resume).",
+    )
+    encoding: WireEncoding = Field(
+        default=WireEncoding.JSON,
+        description="The binary frame encoding the backend granted. JSON (the default, also for backends that do not negotiate) means text frames only.",
+    )
+    fold_returns: bool = Field(
+        default=False,
+        description="Whether the backend accepts the single result of a function folded into Completed.returns instead of a separate Yield. Backends that do not advertise it always get the Yield.",
+    )
+    local_assign: bool = Field(
+        default=False,
+        description="Whether the backend accepts LocalAssign reports for actor-internal calls the agent runs on its own actors. Backends that do not advertise it always get an AssignRequest.",
+    )
 
 
 class AssignRequest(Message):
@@ -1026,4 +1133,5 @@ FromAgentMessage = Union[
     InterruptRequest,
     PauseRequest,
     ResumeRequest,
+    LocalAssign,
 ]
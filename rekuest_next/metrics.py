@@ -0,0 +1,493 @@
+"""Low-overhead metrics of agents, actors, transports and locks.
+
+Counters, gauges and histograms live in a :class:`MetricsRegistry`. Recording a
+value is a dictionary lookup and an addition, nothing is aggregated or exported
+until the registry is collected. Gauges for queue depths are read from their
+queues only at collection time.
+
+The built-in instruments (see :class:`RekuestMetrics`) are recorded into the
+process-wide default registry. Export it in the Prometheus text format (e.g.
+through the FastAPI ``/metrics`` route) or push it to any other sink::
+
+    registry = get_default_metrics_registry()
+    registry.add_sink(lambda samples: statsd.send(samples))
+    await registry.aexport_forever(interval=10)
+"""
+
+import asyncio
+import bisect
+import logging
+import math
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import (
+    Callable,
+    ContextManager,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+"""Histogram buckets (in seconds) suited for latencies from sub-ms to a minute."""
+
+
+@dataclass(frozen=True)
+class MetricSample:
+    """One exported value of a metric."""
+
+    name: str
+    labels: Tuple[Tuple[str, str], ...]
+    value: float
+
+
+MetricsSink = Callable[[List[MetricSample]], None]
+"""Receives every sample of a registry when it is exported."""
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value", "function")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set_function(self, function: Optional[Callable[[], float]]) -> None:
+        self.function = function
+
+    def read(self) -> float:
+        if self.function is None:
+            return self.value
+        try:
+            return float(self.function())
+        except Exception:
+            logger.exception("Could not read gauge function")
+            return math.nan
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+ChildT = TypeVar("ChildT", _CounterChild, _GaugeChild, _HistogramChild)
+
+
+class _Metric(Generic[ChildT]):
+    type: str = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], ChildT] = {}
+        if not self.labelnames:
+            self._unlabeled = self.labels()
+
+    def _new_child(self) -> ChildT:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> ChildT:
+        """The child of the metric for one combination of label values.
+
+        Args:
+            *values (str): The label values, in the order of ``labelnames``.
+
+        Returns:
+            The child to record values on.
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects the labels {self.labelnames}, got {values}"
+                )
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _label_pairs(self, values: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+        return tuple(zip(self.labelnames, values))
+
+    def samples(self) -> Iterator[MetricSample]:
+        """The current samples of every child of the metric."""
+        raise NotImplementedError
+
+
+class Counter(_Metric[_CounterChild]):
+    """A value that only goes up (e.g. messages sent)."""
+
+    type = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the counter (without labels)."""
+        self._unlabeled.inc(amount)
+
+    def samples(self) -> Iterator[MetricSample]:
+        """The current samples of every child of the metric."""
+        for values, child in list(self._children.items()):
+            yield MetricSample(
+                f"{self.name}_total", self._label_pairs(values), child.value
+            )
+
+
+class Gauge(_Metric[_GaugeChild]):
+    """A value that goes up and down, or is read from a function on collection."""
+
+    type = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        """Set the gauge (without labels)."""
+        self._unlabeled.set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the gauge (without labels)."""
+        self._unlabeled.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrement the gauge (without labels)."""
+        self._unlabeled.dec(amount)
+
+    def set_function(self, function: Optional[Callable[[], float]]) -> None:
+        """Read the gauge (without labels) from ``function`` on collection."""
+        self._unlabeled.set_function(function)
+
+    def samples(self) -> Iterator[MetricSample]:
+        """The current samples of every child of the metric."""
+        for values, child in list(self._children.items()):
+            yield MetricSample(self.name, self._label_pairs(values), child.read())
+
+
+class Histogram(_Metric[_HistogramChild]):
+    """The distribution of observed values (e.g. latencies) in buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Create a histogram with sorted upper bucket bounds."""
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Observe a value (without labels)."""
+        self._unlabeled.observe(value)
+
+    def time(self) -> ContextManager[None]:
+        """Observe the duration of a with block (without labels)."""
+        return self._unlabeled.time()
+
+    def samples(self) -> Iterator[MetricSample]:
+        """The current samples of every child of the metric."""
+        for values, child in list(self._children.items()):
+            labels = self._label_pairs(values)
+            cumulative = 0
+            for bound, count in zip(self.buckets, child.counts):
+                cumulative += count
+                yield MetricSample(
+                    f"{self.name}_bucket",
+                    labels + (("le", _format_value(bound)),),
+                    cumulative,
+                )
+            yield MetricSample(
+                f"{self.name}_bucket", labels + (("le", "+Inf"),), child.count
+            )
+            yield MetricSample(f"{self.name}_sum", labels, child.sum)
+            yield MetricSample(f"{self.name}_count", labels, child.count)
+
+
+MetricT = TypeVar("MetricT", Counter, Gauge, Histogram)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRegistry:
+    """A set of metrics, collected and exported together."""
+
+    def __init__(self) -> None:
+        """Create an empty registry."""
+        self._metrics: Dict[str, _Metric] = {}  # type: ignore[type-arg]
+        self._sinks: List[MetricsSink] = []
+
+    def _get_or_create(self, kind: type[MetricT], name: str, **kwargs) -> MetricT:  # noqa: ANN003
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = kind(name, **kwargs)
+        elif not isinstance(metric, kind):
+            raise ValueError(f"{name} is already registered as a {metric.type}")
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Get or create a counter (its name is exported with ``_total``)."""
+        return self._get_or_create(
+            Counter, name, documentation=documentation, labelnames=labelnames
+        )
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        """Get or create a gauge."""
+        return self._get_or_create(
+            Gauge, name, documentation=documentation, labelnames=labelnames
+        )
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._get_or_create(
+            Histogram,
+            name,
+            documentation=documentation,
+            labelnames=labelnames,
+            buckets=buckets,
+        )
+
+    def collect(self) -> List[MetricSample]:
+        """The current samples of every metric."""
+        return [
+            sample
+            for metric in list(self._metrics.values())
+            for sample in metric.samples()
+        ]
+
+    def render_prometheus(self) -> str:
+        """The current samples in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for sample in metric.samples():
+                if sample.labels:
+                    labels = ",".join(
+                        f'{key}="{_escape(value)}"' for key, value in sample.labels
+                    )
+                    lines.append(
+                        f"{sample.name}{{{labels}}} {_format_value(sample.value)}"
+                    )
+                else:
+                    lines.append(f"{sample.name} {_format_value(sample.value)}")
+        return "\n".join(lines) + "\n"
+
+    def add_sink(self, sink: MetricsSink) -> None:
+        """Send the samples to ``sink`` on every :meth:`export`."""
+        self._sinks.append(sink)
+
+    def remove_sink(self, sink: MetricsSink) -> None:
+        """Stop sending the samples to ``sink``."""
+        self._sinks.remove(sink)
+
+    def export(self) -> List[MetricSample]:
+        """Collect the samples and send them to every sink.
+
+        Returns:
+            List[MetricSample]: The exported samples.
+        """
+        samples = self.collect()
+        for sink in list(self._sinks):
+            try:
+                sink(samples)
+            except Exception:
+                logger.exception(f"Metrics sink {sink} failed")
+        return samples
+
+    async def aexport_forever(self, interval: float = 10.0) -> None:
+        """Export to the sinks every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            self.export()
+
+
+class RekuestMetrics:
+    """The built-in instruments of the agent runtime
+
+    Args:
+        registry (MetricsRegistry): The registry the instruments live in.
+    """
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        """Create (or look up) the instruments in ``registry``."""
+        self.registry = registry
+        self.assignments = registry.counter(
+            "rekuest_assignments",
+            "Assignments the agent received, by interface.",
+            ("interface",),
+        )
+        self.active_assignments = registry.gauge(
+            "rekuest_active_assignments",
+            "Assignments the agent is currently running.",
+        )
+        self.phase_seconds = registry.histogram(
+            "rekuest_assignment_phase_seconds",
+            "Time an assignment spends expanding inputs, executing and shrinking outputs.",
+            ("interface", "phase"),
+        )
+        self.patch_lag_seconds = registry.histogram(
+            "rekuest_state_patch_lag_seconds",
+            "Time between publishing a state patch and the agent processing it.",
+        )
+        self.patch_queue_depth = registry.gauge(
+            "rekuest_state_patch_queue_depth",
+            "State patches waiting to be processed by the agent.",
+        )
+        self.lock_wait_seconds = registry.histogram(
+            "rekuest_lock_wait_seconds",
+            "Time a task waits to acquire a lock.",
+            ("lock",),
+        )
+        self.messages_sent = registry.counter(
+            "rekuest_transport_messages_sent",
+            "Messages the transport queued for the backend, by type.",
+            ("type",),
+        )
+        self.messages_received = registry.counter(
+            "rekuest_transport_messages_received",
+            "Messages the transport received from the backend, by type.",
+            ("type",),
+        )
+        self.send_queue_depth = registry.gauge(
+            "rekuest_transport_send_queue_depth",
+            "Messages waiting to be sent to the backend.",
+        )
+        self.in_queue_depth = registry.gauge(
+            "rekuest_transport_in_queue_depth",
+            "Received messages waiting to be processed by the agent.",
+        )
+        self.reconnect_seconds = registry.histogram(
+            "rekuest_transport_reconnect_seconds",
+            "Time from losing the connection to the backend to being reconnected.",
+        )
+
+
+_GLOBAL_METRICS_REGISTRY: Optional[MetricsRegistry] = None
+_GLOBAL_METRICS: Optional[RekuestMetrics] = None
+
+
+def get_default_metrics_registry() -> MetricsRegistry:
+    """Return the process-wide default :class:`MetricsRegistry` instance."""
+    global _GLOBAL_METRICS_REGISTRY
+    if _GLOBAL_METRICS_REGISTRY is None:
+        _GLOBAL_METRICS_REGISTRY = MetricsRegistry()
+    return _GLOBAL_METRICS_REGISTRY
+
+
+def set_default_metrics_registry(registry: MetricsRegistry) -> None:
+    """Replace the process-wide default :class:`MetricsRegistry` instance."""
+    global _GLOBAL_METRICS_REGISTRY, _GLOBAL_METRICS
+    _GLOBAL_METRICS_REGISTRY = registry
+    _GLOBAL_METRICS = None
+
+
+def get_metrics() -> RekuestMetrics:
+    """The built-in instruments, recorded into the default registry."""
+    global _GLOBAL_METRICS
+    if _GLOBAL_METRICS is None:
+        _GLOBAL_METRICS = RekuestMetrics(get_default_metrics_registry())
+    return _GLOBAL_METRICS
+
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricSample",
+    "MetricsRegistry",
+    "MetricsSink",
+    "RekuestMetrics",
+    "get_default_metrics_registry",
+    "set_default_metrics_registry",
+    "get_metrics",
+]
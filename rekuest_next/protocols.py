@@ -1,6 +1,15 @@
-from typing import Any, Awaitable, Protocol, Union, runtime_checkable, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Protocol,
+    Union,
+    runtime_checkable,
+    Tuple,
+)
 
-from rekuest_next.state.observable import StateConfig
+if TYPE_CHECKING:
+    from rekuest_next.state.observable import StateConfig
 
 
 @runtime_checkable
@@ -30,7 +39,7 @@ class AnyState(Protocol):
     """
 
     __rekuest_state__: str
-    __rekuest_state_config__: StateConfig
+    __rekuest_state_config__: "StateConfig"
 
     pass
 
@@ -213,6 +213,7 @@ def qtinloopactifier(
         "context_returns": implementation_details.context_returns,
         "dependency_variables": implementation_details.dependency_variables,
         "locks": implementation_details.locks,
+        "read_locks": implementation_details.read_locks,
     }
 
     in_loop_instance = QtInLoopBuilder(
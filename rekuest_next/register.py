@@ -177,7 +177,8 @@ def register_func(
             definition=definition,
             logo=config.logo,
             dynamic=config.dynamic,
-            locks=tuple(implementation_details.locks or []),
+            locks=tuple(implementation_details.locks or [])
+            + tuple(implementation_details.read_locks or []),
             optimistics=tuple(optimistics),
             dependencies=tuple(dependencies),
             tracks=tuple(implementation_details.tracks or []),
@@ -223,6 +224,11 @@ def register(
     dynamic: bool = False,
     locks: Optional[List[str]] = None,
     concurrency: Literal["parallel", "serial"] = "serial",
+    micro_task: bool = False,
+    latest_only: bool = False,
+    read_locks: Optional[List[str]] = None,
+    transactional: bool = False,
+    profile: bool = False,
     version: Optional[str] = None,
 ) -> Callable[[Callable[P, R]], WrappedFunction[P, R]]:
     """Register a function or actor with configuration: ``@register(...)``."""
@@ -252,6 +258,11 @@ def register(  # type: ignore[valid-type]
     dynamic: bool = False,
     locks: Optional[List[str]] = None,
     concurrency: Literal["parallel", "serial"] = "serial",
+    micro_task: bool = False,
+    latest_only: bool = False,
+    read_locks: Optional[List[str]] = None,
+    transactional: bool = False,
+    profile: bool = False,
     version: Optional[str] = None,
 ) -> Union[WrappedFunction[P, R], Callable[[Callable[P, R]], WrappedFunction[P, R]]]:
     """Register a function or actor with an app registry.
@@ -300,6 +311,24 @@ def register(  # type: ignore[valid-type]
         concurrency (Literal["parallel", "serial"]): Whether assignments to the
             actor may run concurrently ("parallel") or one at a time
             ("serial", the default).
+        micro_task (bool): Run assignments through the low-latency micro-task
+            path: no "queued" progress, no per-assignment context managers when
+            no locks/state/capture are involved, and, if the backend allows it,
+            a single terminal ``Completed`` carrying the result. Meant for tiny,
+            fast actions.
+        latest_only (bool): Conflate the yields of a generator: a yield that is
+            still waiting for the wire is replaced by a newer one, so slow
+            consumers only see the latest value (e.g. camera previews).
+        read_locks (Optional[List[str]]): Resource locks held shared during
+            assignment, for reading only: readers of a key run concurrently,
+            writers wait for them (auto-inferred from read-only state locks
+            when omitted).
+        transactional (bool): Mutate the written states of each assignment
+            in a state transaction: no per-mutation patches, the operations
+            of the diff (one revision each) when the assignment finishes, and
+            a rollback if it fails.
+        profile (bool): Profile every assignment and report its hot functions
+            as a log of the task (see :mod:`rekuest_next.actors.profiling`).
         version (Optional[str]): Version of the definition.
 
     Returns:
@@ -328,6 +357,11 @@ def register(  # type: ignore[valid-type]
         optimistics=optimistics,
         locks=locks,
         concurrency=concurrency,
+        micro_task=micro_task,
+        latest_only=latest_only,
+        read_locks=read_locks,
+        transactional=transactional,
+        profile=profile,
         tracks=tracks,
         in_process=in_process,
     )
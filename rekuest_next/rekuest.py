@@ -75,6 +75,17 @@ class RekuestNext(Composition):
             dynamic (bool, optional): Whether the actor definition is subject to change dynamically.
             concurrency (Literal["parallel", "serial"], optional): Whether assignments to the actor
                 may run concurrently ("parallel") or one at a time ("serial", the default).
+            micro_task (bool, optional): Use the low-latency micro-task execution path for
+                tiny actions (see :func:`rekuest_next.register.register`).
+            latest_only (bool, optional): Conflate generator yields so only the newest value
+                waiting for the wire is sent.
+            read_locks (Optional[List[str]], optional): Locks held shared while reading only;
+                concurrent readers do not block each other.
+            transactional (bool, optional): Publish the state changes of an assignment as the
+                operations of their diff, one revision each, once it finishes, and roll
+                them back if it fails.
+            profile (bool, optional): Profile every assignment and report its hot
+                functions as a log of the task.
 
         Returns:
             function: A decorator that registers the given function or actor.
@@ -154,7 +154,9 @@ def _build_assign_input(
     """Build the AssignInput for a remote call.
 
     When no ``parent`` is given and the call happens inside another
-    task, the current task is attached as the parent.
+    task, the current task is attached as the parent. A concrete
+    ``implementation`` also pins its agent and interface, which lets an
+    agent-side postman recognise calls into its own implementations.
     """
     if parent is None:
         try:
@@ -165,6 +167,8 @@ def _build_assign_input(
     return AssignInput(
         action=action.id if action else None,
         implementation=implementation.id if implementation else None,
+        agent=implementation.agent.id if implementation else None,
+        interface=implementation.interface if implementation else None,
         dependency=dependency,
         method=method,  # type: ignore
         args=args or {},
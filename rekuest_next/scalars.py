@@ -1,6 +1,10 @@
 """This module mirros exactly the scalars used in the  rekuest_next library."""
 
+import contextlib
+import hashlib
 import io
+import mmap
+import os
 
 from graphql import (
     DocumentNode,
@@ -12,7 +16,7 @@ from graphql import (
     print_source_location,
     GraphQLSyntaxError,
 )
-from typing import IO, Dict, Any, Union
+from typing import IO, Dict, Any, Iterator, Optional, Union
 
 from pydantic import GetCoreSchemaHandler
 from pydantic_core import CoreSchema, core_schema
@@ -26,7 +30,7 @@ ValueMap = Dict[str, Any]
 
 ValidatorFunctionCoercible = str
 SearchQueryCoercible = str | DocumentNode
-MediaLikeCoercible = str | IO[bytes]
+MediaLikeCoercible = str | os.PathLike[str] | IO[bytes]
 Args = Dict[str, Any]
 JSONSerializable = Union[str, int, float, bool, None, Dict, list]
 
@@ -282,6 +286,9 @@ class MediaLike:
     the mikro platform. This scalar enables validation of various array formats
     into a mikro api compliant xr.DataArray.."""
 
+    size: Optional[int] = None
+    """The size of the media in bytes, if known before uploading."""
+
     def __init__(self, value: IO[bytes]) -> None:
         """Initialize the MediaLike scalar with a file-like object."""
         self.value = value
@@ -292,6 +299,15 @@ class MediaLike:
 
     def __set__(self, instance, value: MediaLikeCoercible) -> None: ...  # noqa: ANN001, D105 # type: ignore
 
+    @contextlib.contextmanager
+    def open(self) -> Iterator[IO[bytes]]:
+        """Open the stream the media is uploaded from.
+
+        The wrapped file-like object is not closed afterwards, it belongs to
+        the caller.
+        """
+        yield self.value
+
     @classmethod
     def __get_pydantic_core_schema__(
         cls,
@@ -306,9 +322,12 @@ class MediaLike:
     @classmethod
     def validate(cls, v: MediaLikeCoercible) -> "MediaLike":
         """Validate the input array and convert it to a xr.DataArray."""
+        if isinstance(v, MediaLike):
+            return v
 
-        if isinstance(v, str):
-            v = open(v, "rb")
+        if isinstance(v, (str, os.PathLike)):
+            # Paths are streamed from disk when they are uploaded
+            return FileMediaLike(v)
 
         if not isinstance(v, io.IOBase):
             raise ValueError("This needs to be a instance of a file")
@@ -318,3 +337,123 @@ class MediaLike:
     def __repr__(self) -> str:
         """Return a string representation of the MediaLike scalar."""
         return f"MediaLike({self.value})"
+
+
+class _ChecksumReader(io.RawIOBase):
+    """Reads a stream and hashes the bytes on the fly.
+
+    Bytes are hashed once, in order: if the reader seeks back (e.g. to retry a
+    request), bytes read again are not hashed again.
+    """
+
+    def __init__(self, stream: Any, hasher: Optional[Any]) -> None:  # noqa: ANN401
+        self.stream = stream
+        self.hasher = hasher
+        self.hashed = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.stream.tell()
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self.stream.seek(offset, whence)
+        return self.stream.tell()
+
+    def read(self, size: int = -1) -> bytes:
+        position = self.stream.tell()
+        chunk = self.stream.read(size)
+        if self.hasher is not None:
+            end = position + len(chunk)
+            if position <= self.hashed < end:
+                self.hasher.update(chunk[self.hashed - position :])
+                self.hashed = end
+        return chunk
+
+    def readinto(self, buffer: Any) -> int:  # noqa: ANN401
+        chunk = self.read(len(buffer))
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+
+class FileMediaLike(MediaLike):
+    """A media file that is streamed from disk when it is uploaded
+
+    Nothing is read when the scalar is created: the file is opened for the
+    upload only and read in chunks, so large media are never held in memory.
+    With ``use_mmap`` the file is memory mapped instead of read through a file
+    object.
+
+    If a ``checksum`` algorithm (any :mod:`hashlib` algorithm, e.g.
+    ``"sha256"``) is given, the checksum is computed while the file is
+    uploaded and available as :attr:`digest` afterwards.
+
+    Args:
+        path (str | os.PathLike[str]): The path of the file.
+        checksum (Optional[str]): The hashlib algorithm of the checksum.
+        use_mmap (bool): Memory map the file instead of reading it.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        checksum: Optional[str] = None,
+        use_mmap: bool = False,
+    ) -> None:
+        """Initialize the scalar without opening the file."""
+        self.path = os.fspath(path)
+        self.key = self.path
+        self.file_name = os.path.basename(self.path)
+        self.size = os.path.getsize(self.path)
+        self.checksum = checksum
+        self.use_mmap = use_mmap
+        self.digest: Optional[str] = None
+        self._value: Optional[IO[bytes]] = None
+        if checksum is not None:
+            hashlib.new(checksum)  # Fail early for unknown algorithms
+
+    @property
+    def value(self) -> IO[bytes]:  # type: ignore[override]
+        """A file object of the media, for code that reads it directly.
+
+        It is opened on first access and closed by :meth:`close`, at the
+        latest once the media was uploaded.
+        """
+        if self._value is None:
+            self._value = open(self.path, "rb")
+        return self._value
+
+    def close(self) -> None:
+        """Close the file object opened by :attr:`value`, if any."""
+        if self._value is not None:
+            self._value.close()
+            self._value = None
+
+    @contextlib.contextmanager
+    def open(self) -> Iterator[IO[bytes]]:
+        """Open the file (or its memory map) for an upload.
+
+        The stream is closed afterwards, as is the file object of
+        :attr:`value`. If a checksum was requested and the whole file was read,
+        :attr:`digest` is set.
+        """
+        hasher = hashlib.new(self.checksum) if self.checksum is not None else None
+        with contextlib.ExitStack() as stack:
+            stack.callback(self.close)
+            stream: Any = stack.enter_context(open(self.path, "rb"))
+            if self.use_mmap and self.size:
+                stream = stack.enter_context(
+                    mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+                )
+            reader = _ChecksumReader(stream, hasher)
+            yield reader  # type: ignore[misc]
+            if hasher is not None and reader.hashed == self.size:
+                self.digest = hasher.hexdigest()
+
+    def __repr__(self) -> str:
+        """Return a string representation of the FileMediaLike scalar."""
+        return f"FileMediaLike({self.path!r})"
@@ -0,0 +1,192 @@
+"""In-place application of JSON patches to shrunk states.
+
+The agent and the state retrievers apply a patch for every state event. The
+patches they see are the ones the agent emits itself: ``add``, ``replace`` and
+``remove`` operations on JSON pointers built by ``observable._make_path`` (and
+by :func:`rekuest_next.state.diff.diff_json`). This module applies exactly those,
+without the generality (and per-call cost) of ``jsonpatch``:
+
+* pointers are parsed once and cached,
+* documents are modified in place, nothing is validated or copied up front,
+* :func:`apply_operations` applies many operations in one pass, reusing the
+  resolved parent container of consecutive operations on the same parent,
+* appends to arrays (``/-`` or the index one past the end) are plain
+  ``list.append`` calls.
+"""
+
+import copy
+import functools
+from typing import Any, Iterable, List, Mapping, Tuple
+
+from rekuest_next.messages import JSONSerializable
+
+
+class PatchApplicationError(ValueError):
+    """Raised when an operation does not fit the document it is applied to."""
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_pointer(path: str) -> Tuple[str, ...]:
+    """Split a JSON pointer (RFC 6901) into its unescaped reference tokens.
+
+    Args:
+        path (str): The pointer, e.g. ``"/positions/0"``. ``""`` is the root.
+
+    Returns:
+        Tuple[str, ...]: The reference tokens.
+    """
+    if path == "":
+        return ()
+    if not path.startswith("/"):
+        raise PatchApplicationError(f"Invalid JSON pointer {path!r}")
+    return tuple(
+        token.replace("~1", "/").replace("~0", "~") for token in path[1:].split("/")
+    )
+
+
+def _index(container: List[Any], token: str, path: str, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    try:
+        index = int(token)
+    except ValueError:
+        raise PatchApplicationError(f"Invalid array index {token!r} in {path!r}")
+    if (
+        index < 0
+        or index > len(container)
+        or (index == len(container) and not allow_end)
+    ):
+        raise PatchApplicationError(f"Array index {token!r} out of range in {path!r}")
+    return index
+
+
+def _resolve(document: Any, tokens: Tuple[str, ...], path: str) -> Any:  # noqa: ANN401
+    node = document
+    for token in tokens:
+        try:
+            if isinstance(node, list):
+                node = node[_index(node, token, path, allow_end=False)]
+            else:
+                node = node[token]
+        except (KeyError, TypeError):
+            raise PatchApplicationError(f"Path {path!r} does not exist")
+    return node
+
+
+def _apply_to_parent(
+    parent: Any,  # noqa: ANN401
+    token: str,
+    op: str,
+    value: Any,  # noqa: ANN401
+    path: str,
+) -> None:
+    if isinstance(parent, list):
+        if op == "add":
+            index = _index(parent, token, path, allow_end=True)
+            if index == len(parent):
+                parent.append(value)
+            else:
+                parent.insert(index, value)
+        elif op == "replace":
+            parent[_index(parent, token, path, allow_end=False)] = value
+        elif op == "remove":
+            del parent[_index(parent, token, path, allow_end=False)]
+        else:
+            raise PatchApplicationError(f"Unsupported operation {op!r}")
+        return
+
+    if not isinstance(parent, dict):
+        raise PatchApplicationError(f"Path {path!r} does not point into a container")
+    if op == "add":
+        parent[token] = value
+    elif op == "replace":
+        if token not in parent:
+            raise PatchApplicationError(f"Cannot replace missing path {path!r}")
+        parent[token] = value
+    elif op == "remove":
+        if token not in parent:
+            raise PatchApplicationError(f"Cannot remove missing path {path!r}")
+        del parent[token]
+    else:
+        raise PatchApplicationError(f"Unsupported operation {op!r}")
+
+
+def _copied(value: Any, copy_values: bool) -> Any:  # noqa: ANN401
+    if copy_values and isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
+
+def apply_operation(
+    document: JSONSerializable,
+    op: str,
+    path: str,
+    value: JSONSerializable | None = None,
+    copy_values: bool = False,
+) -> JSONSerializable:
+    """Apply a single ``add``/``replace``/``remove`` operation in place.
+
+    Args:
+        document (JSONSerializable): The document to modify.
+        op (str): The operation.
+        path (str): The JSON pointer the operation targets.
+        value (JSONSerializable | None): The value for ``add``/``replace``.
+        copy_values (bool): Insert copies of container values, so later
+            operations on the document cannot modify the caller's values.
+
+    Returns:
+        JSONSerializable: The document (a new one if the root was replaced).
+    """
+    tokens = parse_pointer(path)
+    if not tokens:
+        if op in ("add", "replace"):
+            return _copied(value, copy_values)
+        raise PatchApplicationError(f"Cannot {op} the document root")
+
+    parent = _resolve(document, tokens[:-1], path)
+    _apply_to_parent(parent, tokens[-1], op, _copied(value, copy_values), path)
+    return document
+
+
+def apply_operations(
+    document: JSONSerializable,
+    operations: Iterable[Mapping[str, Any]],
+    copy_values: bool = False,
+) -> JSONSerializable:
+    """Apply a sequence of patch operations in place, in one pass.
+
+    Consecutive operations below the same parent (e.g. the items a transaction
+    appended to a list) resolve that parent only once.
+
+    Args:
+        document (JSONSerializable): The document to modify.
+        operations (Iterable[Mapping[str, Any]]): Patch documents with ``op``,
+            ``path`` and (except for ``remove``) ``value``.
+        copy_values (bool): Insert copies of container values (see
+            :func:`apply_operation`).
+
+    Returns:
+        JSONSerializable: The document (a new one if the root was replaced).
+    """
+    parent_tokens: Tuple[str, ...] | None = None
+    parent: Any = None
+
+    for operation in operations:
+        op = operation["op"]
+        path = operation["path"]
+        value = operation.get("value")
+        tokens = parse_pointer(path)
+
+        if not tokens:
+            document = apply_operation(document, op, path, value, copy_values)
+            parent_tokens = None
+            continue
+
+        if tokens[:-1] != parent_tokens:
+            parent_tokens = tokens[:-1]
+            parent = _resolve(document, parent_tokens, path)
+
+        # Operations below one parent never replace the parent itself
+        _apply_to_parent(parent, tokens[-1], op, _copied(value, copy_values), path)
+
+    return document
@@ -0,0 +1,61 @@
+"""Minimal JSON patches between two shrunk (JSON-serializable) documents."""
+
+from typing import Any, Dict, List
+
+from rekuest_next.messages import JSONSerializable
+
+
+def _escape(key: str) -> str:
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def _same_leaf(old: Any, new: Any) -> bool:  # noqa: ANN401
+    # True == 1 in python, but not in JSON
+    return type(old) is type(new) and old == new
+
+
+def diff_json(
+    old: JSONSerializable, new: JSONSerializable, path: str = ""
+) -> List[Dict[str, Any]]:
+    """Compute the JSON patch (RFC 6902) that turns ``old`` into ``new``.
+
+    Only ``add``, ``remove`` and ``replace`` operations are produced: objects
+    are compared key by key and lists index by index (appended items are added,
+    dropped trailing items are removed from the end), every other change
+    replaces the value.
+
+    Args:
+        old (JSONSerializable): The document before the change.
+        new (JSONSerializable): The document after the change.
+        path (str): The JSON pointer of the compared documents.
+
+    Returns:
+        List[Dict[str, Any]]: The patch operations, in application order.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: List[Dict[str, Any]] = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(diff_json(old[key], value, child))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        ops = []
+        common = min(len(old), len(new))
+        for index in range(common):
+            ops.extend(diff_json(old[index], new[index], f"{path}/{index}"))
+        for index in range(common, len(new)):
+            ops.append({"op": "add", "path": f"{path}/{index}", "value": new[index]})
+        for index in reversed(range(common, len(old))):
+            ops.append({"op": "remove", "path": f"{path}/{index}"})
+        return ops
+
+    if _same_leaf(old, new):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
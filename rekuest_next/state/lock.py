@@ -2,15 +2,25 @@ from contextvars import ContextVar, Token
 from typing import Optional
 
 current_locks: ContextVar[set[str]] = ContextVar("current_locks", default=set())
+current_shared_locks: ContextVar[set[str]] = ContextVar(
+    "current_shared_locks", default=set()
+)
 
 
 class LockContextManager:
-    def __init__(self, lock_names: tuple[str, ...]) -> None:
+    def __init__(
+        self, lock_names: tuple[str, ...], shared_lock_names: tuple[str, ...] = ()
+    ) -> None:
         self.locks = lock_names
+        self.shared_locks = shared_lock_names
         self.reset_token: Optional[Token[set[str]]] = None
+        self.shared_reset_token: Optional[Token[set[str]]] = None
 
     def __enter__(self) -> None:
         self.reset_token = current_locks.set(set(self.locks))
+        self.shared_reset_token = current_shared_locks.set(
+            set(self.shared_locks) - set(self.locks)
+        )
 
     def __exit__(
         self,
@@ -18,15 +28,53 @@ class LockContextManager:
         exc_value: Optional[BaseException],
         traceback: Optional[object],
     ) -> None:
+        if self.shared_reset_token is not None:
+            current_shared_locks.reset(self.shared_reset_token)
         if self.reset_token is not None:
             current_locks.reset(self.reset_token)
 
 
-def acquired_locks(*lock_names: str) -> LockContextManager:
-    """Context manager to indicate which locks are held"""
-    return LockContextManager(lock_names)
+def acquired_locks(
+    *lock_names: str, shared: tuple[str, ...] = ()
+) -> LockContextManager:
+    """Context manager to indicate which locks are held
+
+    Args:
+        *lock_names: The locks held exclusively (these allow mutating state).
+        shared: The locks held shared, for reading only.
+    """
+    return LockContextManager(lock_names, shared)
 
 
 def get_acquired_locks() -> set[str]:
     """Get the currently acquired locks"""
     return current_locks.get()
+
+
+def get_shared_locks() -> set[str]:
+    """Get the locks currently held shared (for reading only)"""
+    return current_shared_locks.get()
+
+
+def missing_locks_message(
+    state_name: str, path: str, required: list[str]
+) -> str | None:
+    """Describe which of the required locks are not held exclusively.
+
+    Args:
+        state_name: The name of the state that is about to be modified.
+        path: The path within the state.
+        required: The locks required to modify the state.
+
+    Returns:
+        The error message, or None if every required lock is held exclusively.
+    """
+    acquired = get_acquired_locks()
+    missing = [lock for lock in required if lock not in acquired]
+    if not missing:
+        return None
+    message = f"Cannot modify state '{state_name}' at path '{path}' without required locks: {missing}"
+    read_only = [lock for lock in missing if lock in get_shared_locks()]
+    if read_only:
+        message += f" ({read_only} only held for reading)"
+    return message
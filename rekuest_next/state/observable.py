@@ -1,3 +1,4 @@
+import contextvars
 import dataclasses
 from typing import Any, Generic, Iterable, TypeVar, overload, SupportsIndex
 
@@ -5,7 +6,7 @@ from rekuest_next.actors.vars import (
     get_current_task_id_or_none,
 )
 from rekuest_next.api.schema import ReturnPortInput, StateDefinitionInput
-from rekuest_next.state.lock import get_acquired_locks
+from rekuest_next.state.lock import missing_locks_message
 from rekuest_next.state.publish import Patch, get_current_publisher
 from rekuest_next.structures.registry import StructureRegistry
 
@@ -44,8 +45,23 @@ class StateConfig:
     required_locks: list[str] = dataclasses.field(default_factory=list)
 
 
+current_transactions: contextvars.ContextVar[dict[str, set[str]] | None] = (
+    contextvars.ContextVar("current_transactions", default=None)
+)
+"""Maps the states in an active transaction to the dirty set of the owning
+transaction (see :mod:`rekuest_next.state.transaction`)."""
+
+
 def _publish_patch(config: StateConfig, patch: Patch) -> None:
     """Helper to publish a patch through the current publisher."""
+    transactions = current_transactions.get()
+    if transactions:
+        dirty = transactions.get(config.state_name)
+        if dirty is not None:
+            # Published as a whole when the transaction commits
+            dirty.add(config.state_name)
+            return
+
     publisher = get_current_publisher()
     if publisher:
         publisher.publish_patch(config.state_name, patch)  # type: ignore
@@ -117,14 +133,11 @@ class EventedDict(dict[K, V], Generic[K, V]):
         self._port = port
 
     def __check_if_has_required_locks(self) -> None:
-        acquired_locks = get_acquired_locks()
-        missing_locks = [
-            lock for lock in self._config.required_locks if lock not in acquired_locks
-        ]
-        if missing_locks:
-            raise RuntimeError(
-                f"Cannot modify state '{self._config.state_name}' at path '{self._path}' without required locks: {missing_locks}"
-            )
+        message = missing_locks_message(
+            self._config.state_name, self._path, self._config.required_locks
+        )
+        if message:
+            raise RuntimeError(message)
 
     def __setitem__(self, key: Any, value: Any) -> None:
         self.__check_if_has_required_locks()
@@ -280,14 +293,11 @@ class EventedList(list):
         self._port = port
 
     def __check_if_has_required_locks(self) -> None:
-        acquired_locks = get_acquired_locks()
-        missing_locks = [
-            lock for lock in self._config.required_locks if lock not in acquired_locks
-        ]
-        if missing_locks:
-            raise RuntimeError(
-                f"Cannot modify state '{self._config.state_name}' at path '{self._path}' without required locks: {missing_locks}"
-            )
+        message = missing_locks_message(
+            self._config.state_name, self._path, self._config.required_locks
+        )
+        if message:
+            raise RuntimeError(message)
 
     def _reindex_items(self, start_index: int) -> None:
         """Update the internal path references for items after a shift.
@@ -664,16 +674,13 @@ def make_evented(
                 )
 
         def __check_if_has_required_locks(self):
-            acquired_locks = get_acquired_locks()
-            missing_locks = [
-                lock
-                for lock in self.__rekuest__config__.required_locks
-                if lock not in acquired_locks
-            ]
-            if missing_locks:
-                raise RuntimeError(
-                    f"Cannot modify state '{self.__rekuest__config__.state_name}' at path '{self._event_path}' without required locks: {missing_locks}"
-                )
+            message = missing_locks_message(
+                self.__rekuest__config__.state_name,
+                self._event_path,
+                self.__rekuest__config__.required_locks,
+            )
+            if message:
+                raise RuntimeError(message)
 
         # 4. Create dynamic subclass
         original_cls = obj.__class__
@@ -4,7 +4,7 @@ from typing import Type, TypeVar
 
 from rekuest_next.definition.define import is_annotated, get_args
 from rekuest_next.protocols import AnyState
-from rekuest_next.state.types import ReadOnly
+from rekuest_next.state.types import ReadOnlyAnnotation
 
 T = TypeVar("T")
 
@@ -24,20 +24,24 @@ def is_read_only_state(cls: Type[T]) -> bool:
     if is_annotated(cls):
         real_type, *annotations = get_args(cls)
         if is_state(real_type):
-            for annotation in annotations:
-                if annotation is ReadOnly:
-                    return True
-                return False
-
-            return True
+            return any(
+                isinstance(annotation, ReadOnlyAnnotation) for annotation in annotations
+            )
         else:
             return False
     return False
 
 
+def _unwrap_state(cls: Type[T]) -> Type[T]:
+    """Strip ``Annotated`` markers (e.g. ``ReadOnly``) from a state annotation."""
+    if is_annotated(cls):
+        return get_args(cls)[0]
+    return cls
+
+
 def get_state_name(cls: Type[T]) -> str:
     """Get the name of a state class."""
-    x = getattr(cls, "__rekuest_state__", None)
+    x = getattr(_unwrap_state(cls), "__rekuest_state__", None)
     if x is None:
         raise ValueError(f"Class {cls} is not a state")
     return x
@@ -45,5 +49,5 @@ def get_state_name(cls: Type[T]) -> str:
 
 def get_state_locks(cls: Type[AnyState]) -> list[str]:
     """Get the locks required for a state class."""
-    x = cls.__rekuest_state_config__.required_locks
+    x = _unwrap_state(cls).__rekuest_state_config__.required_locks
     return x
@@ -0,0 +1,208 @@
+"""Transactional state mutation.
+
+Within a :func:`state_transaction` mutations of the given states emit no
+per-mutation patches. On commit, each changed state is published once as a
+``transaction`` patch carrying a detached copy of the state: the agent diffs
+its shrunk form against the last published one and sends the operations of the
+minimal JSON patch back to back, one revision each. If the block raises, the
+states are rolled back to their values at entry and nothing is published.
+"""
+
+import contextvars
+import dataclasses
+from typing import Any, Dict, Optional, Tuple
+
+from rekuest_next.actors.vars import get_current_task_id_or_none
+from rekuest_next.protocols import AnyState
+from rekuest_next.state.observable import (
+    EventedDict,
+    EventedList,
+    StateConfig,
+    current_transactions,
+    make_evented,
+)
+from rekuest_next.state.publish import Patch, get_current_publisher
+
+TRANSACTION_OP = "transaction"
+"""The patch op of a committed transaction; its value is a copy of the state."""
+
+
+def _snapshot(obj: Any) -> Tuple[Any, ...]:  # noqa: ANN401
+    """Record the container structure of a state value.
+
+    Dicts, lists and dataclasses are copied structurally, leaf values are kept by
+    reference (in-place mutations of leaves are not evented either).
+    """
+    if isinstance(obj, dict):
+        return ("dict", {key: _snapshot(value) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return ("list", [_snapshot(item) for item in obj])
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return (
+            "dataclass",
+            obj,
+            {
+                field.name: _snapshot(getattr(obj, field.name))
+                for field in dataclasses.fields(obj)
+            },
+        )
+    return ("leaf", obj)
+
+
+def _detach(obj: Any) -> Any:  # noqa: ANN401
+    """Copy the container structure of a state value, as it is at commit.
+
+    Mutations after the commit (which publish their own patches) must not leak
+    into the committed value while it waits in the patch queue. Like
+    :func:`_snapshot`, leaf values are kept by reference.
+    """
+    if isinstance(obj, dict):
+        return {key: _detach(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_detach(item) for item in obj]
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        clone = object.__new__(type(obj))
+        if hasattr(obj, "__dict__"):
+            clone.__dict__.update(obj.__dict__)
+        for field in dataclasses.fields(obj):
+            # Bypasses the evented hooks: no lock checks, no patches
+            object.__setattr__(clone, field.name, _detach(getattr(obj, field.name)))
+        return clone
+    return obj
+
+
+def _restore(snapshot: Tuple[Any, ...]) -> Any:  # noqa: ANN401
+    kind = snapshot[0]
+    if kind == "dict":
+        return {key: _restore(value) for key, value in snapshot[1].items()}
+    if kind == "list":
+        return [_restore(item) for item in snapshot[1]]
+    if kind == "dataclass":
+        _, obj, fields = snapshot
+        for name, value in fields.items():
+            # Bypasses the evented hooks: no lock checks, no patches
+            object.__setattr__(obj, name, _restore(value))
+        return obj
+    return snapshot[1]
+
+
+def _state_config(state: AnyState) -> StateConfig:
+    config = getattr(state, "__rekuest__config__", None)
+    if config is None and isinstance(state, (EventedDict, EventedList)):
+        config = state._config
+    if config is None:
+        raise ValueError(f"{state!r} is not an evented state")
+    return config
+
+
+class StateTransaction:
+    """A transaction over one or more evented states.
+
+    Use through :func:`state_transaction`.
+    """
+
+    def __init__(self, *states: AnyState) -> None:
+        self.states = {_state_config(state).state_name: state for state in states}
+        self.dirty: set[str] = set()
+        """The owned states that were mutated within the transaction."""
+        self._owned: Dict[str, Tuple[Any, ...]] = {}
+        self._token: Optional[contextvars.Token[Any]] = None
+
+    def __enter__(self) -> "StateTransaction":
+        active = dict(current_transactions.get() or {})
+        for name, state in self.states.items():
+            if name in active:
+                # Nested transaction: the outer one owns this state
+                continue
+            self._owned[name] = _snapshot(state)
+            active[name] = self.dirty
+        self._token = current_transactions.set(active)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[object],
+    ) -> None:
+        if self._token is not None:
+            current_transactions.reset(self._token)
+            self._token = None
+
+        if exc_type is not None:
+            self.rollback()
+        else:
+            self.commit()
+
+    async def __aenter__(self) -> "StateTransaction":
+        return self.__enter__()
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[object],
+    ) -> None:
+        self.__exit__(exc_type, exc_val, exc_tb)
+
+    def rollback(self) -> None:
+        """Restore the owned states to their values at the start."""
+        for name, snapshot in self._owned.items():
+            state = self.states[name]
+            config = _state_config(state)
+            restored = _restore(snapshot)
+            # Re-wrap the restored containers so they emit events again. Dict
+            # and list roots are refilled in place: callers hold the root.
+            if isinstance(state, EventedDict):
+                fresh = make_evented(restored, config, state._path, port=state._port)
+                dict.clear(state)
+                dict.update(state, fresh)
+            elif isinstance(state, EventedList):
+                fresh = make_evented(restored, config, state._path, port=state._port)
+                list.__setitem__(state, slice(None), fresh)
+            else:
+                make_evented(state, config, "")
+        self.dirty.clear()
+
+    def commit(self) -> None:
+        """Publish every owned state that changed as a single transaction patch."""
+        publisher = get_current_publisher()
+        for name in self._owned:
+            if name not in self.dirty:
+                continue
+            if publisher:
+                publisher.publish_patch(
+                    name,
+                    Patch(
+                        op=TRANSACTION_OP,
+                        path="",
+                        value=_detach(self.states[name]),
+                        correlation_id=get_current_task_id_or_none(),
+                    ),
+                )
+        self.dirty.clear()
+
+
+def state_transaction(*states: AnyState) -> StateTransaction:
+    """Mutate states without per-mutation patches.
+
+    Within the block the states can be mutated freely (the usual lock checks
+    still apply). On success each changed state is published once, as the
+    minimal patch between its state before and after the block, with the
+    operations in consecutive revisions. If the block raises, the states are
+    rolled back and nothing is published.
+
+    Example:
+        ```python
+        with state_transaction(stage):
+            for i, position in enumerate(positions):
+                stage.positions[i] = position
+        ```
+
+    Args:
+        *states (AnyState): The states to mutate transactionally.
+
+    Returns:
+        StateTransaction: The transaction, to be used as a context manager.
+    """
+    return StateTransaction(*states)
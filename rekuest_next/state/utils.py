@@ -77,6 +77,7 @@ def prepare_state_variables(
     write_state_variables: Dict[str, str] = {}
     read_only_variables: Dict[str, str] = {}
     required_state_locks: Dict[str, list[str]] = {}
+    read_only_state_locks: Dict[str, list[str]] = {}
     state_returns: Dict[int, str] = {}
 
     for key, value in parameters.items():
@@ -86,6 +87,7 @@ def prepare_state_variables(
             required_state_locks[key] = get_state_locks(annotation)
         elif is_read_only_state(annotation):
             read_only_variables[key] = get_state_name(annotation)
+            read_only_state_locks[key] = get_state_locks(annotation)
 
     returns = hints.get("return", sig.return_annotation)
     if is_tuple(returns):
@@ -100,6 +102,7 @@ def prepare_state_variables(
         write_state_variables=write_state_variables,
         read_only_variables=read_only_variables,
         required_state_locks=required_state_locks,
+        read_only_state_locks=read_only_state_locks,
     ), PreparedStateReturns(state_returns=state_returns)
 
 
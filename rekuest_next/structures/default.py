@@ -7,12 +7,19 @@ from .utils import id_shrink
 def get_default_structure_registry() -> StructureRegistry:
     """Return the default structure registry (the app registry's).
 
+    The built-in rekuest structures (actions, implementations, ...) are
+    registered on first use, so importing ``rekuest_next`` alone does not pull
+    in the generated GraphQL schema.
+
     Returns:
         StructureRegistry: The structure registry of the global app registry.
     """
     from rekuest_next.app import get_default_app_registry
 
-    return get_default_app_registry().structure_registry
+    registry = get_default_app_registry().structure_registry
+    import rekuest_next.builtin_structures  # noqa: F401
+
+    return registry
 
 
 __all__ = [
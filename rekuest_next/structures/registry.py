@@ -7,12 +7,14 @@ from typing import (
     Callable,
     Dict,
     List,
+    Hashable,
     Optional,
+    Tuple,
     Type,
     TypeVar,
 )
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from rekuest_next.api.schema import (
     AssignWidgetInput,
@@ -89,8 +91,36 @@ class StructureRegistry(BaseModel):
         default_factory=lambda: {}, exclude=True
     )  # Map from class to fullfilled type
 
+    _port_cache: Dict[Any, Dict[Tuple[Hashable, ...], Any]] = PrivateAttr(
+        default_factory=dict
+    )  # Memoized ports per class, keyed by (direction, overrides)
+
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+    def _cached_port(
+        self,
+        cls: Type[Any],
+        cache_key: Tuple[Any, ...],
+        build: Callable[[], T],
+    ) -> T:
+        """Return the memoized port of ``cls`` for ``cache_key``, building it on a miss.
+
+        Ports are frozen inputs, so the same instance can be handed out for every
+        function that uses the same class with the same overrides. Keys that are
+        not hashable (e.g. a list default) simply bypass the cache.
+        """
+        try:
+            hash(cache_key)
+        except TypeError:
+            return build()
+
+        try:
+            return self._port_cache[cls][cache_key]
+        except KeyError:
+            port = build()
+            self._port_cache.setdefault(cls, {})[cache_key] = port
+            return port
+
     def get_fullfilled_structure(self, identifier: str) -> FullFilledStructure:
         """Get the fullfilled structure for a given identifier."""
         return self.identifier_structure_map[identifier]
@@ -291,6 +321,8 @@ class StructureRegistry(BaseModel):
             fullfilled_structure (FullFilledStructure): The fullfilled structure to register
         """
         self.cls_fullfilled_type_map[fullfilled_type.cls] = fullfilled_type
+        # A (re-)registration can change the port the class maps to
+        self._port_cache.pop(fullfilled_type.cls, None)
 
         if isinstance(fullfilled_type, FullFilledModel):
             self.identifier_model_map[fullfilled_type.identifier] = fullfilled_type
@@ -334,7 +366,53 @@ class StructureRegistry(BaseModel):
         structure for the given class. It will then create a port
         for this class. You can pass overwrites if the port
         should not be created with the default values.
+
+        Ports are memoized per class and overrides, so registering many
+        functions that share types only builds each port once.
         """
+        return self._cached_port(
+            cls,
+            (
+                "arg",
+                key,
+                nullable,
+                description,
+                tuple(effects or []),
+                label,
+                tuple(validators or []),
+                type(default),
+                default,
+                assign_widget,
+                tuple(requires or []),
+            ),
+            lambda: self._build_argport_for_cls(
+                cls,
+                key,
+                nullable=nullable,
+                description=description,
+                effects=effects,
+                label=label,
+                validators=validators,
+                default=default,
+                assign_widget=assign_widget,
+                requires=requires,
+            ),
+        )
+
+    def _build_argport_for_cls(
+        self,
+        cls: Type[Any],
+        key: str,
+        nullable: bool = False,
+        description: Optional[str] = None,
+        effects: Optional[list[EffectInput]] = None,
+        label: Optional[str] = None,
+        validators: Optional[List[ValidatorInput]] = None,
+        default: Any = None,  # noqa: ANN401
+        assign_widget: Optional[AssignWidgetInput] = None,
+        requires: Optional[List[RequiresInput]] = None,
+    ) -> ArgPortInput:
+        """Build the (uncached) arg port for a given class."""
 
         fullfilled_type = self.get_fullfilled_type_for_cls(cls)
 
@@ -426,7 +504,53 @@ class StructureRegistry(BaseModel):
         structure for the given class. It will then create a port
         for this class. You can pass overwrites if the port
         should not be created with the default values.
+
+        Ports are memoized per class and overrides, so registering many
+        functions that share types only builds each port once.
         """
+        return self._cached_port(
+            cls,
+            (
+                "return",
+                key,
+                nullable,
+                description,
+                tuple(effects or []),
+                label,
+                tuple(validators or []),
+                type(default),
+                default,
+                return_widget,
+                tuple(provides or []),
+            ),
+            lambda: self._build_returnport_for_cls(
+                cls,
+                key,
+                nullable=nullable,
+                description=description,
+                effects=effects,
+                label=label,
+                validators=validators,
+                default=default,
+                return_widget=return_widget,
+                provides=provides,
+            ),
+        )
+
+    def _build_returnport_for_cls(
+        self,
+        cls: Type[Any],
+        key: str,
+        nullable: bool = False,
+        description: Optional[str] = None,
+        effects: Optional[list[EffectInput]] = None,
+        label: Optional[str] = None,
+        validators: Optional[List[ValidatorInput]] = None,
+        default: Any = None,  # noqa: ANN401
+        return_widget: Optional[ReturnWidgetInput] = None,
+        provides: Optional[List[ProvidesInput]] = None,
+    ) -> ReturnPortInput:
+        """Build the (uncached) return port for a given class."""
 
         fullfilled_type = self.get_fullfilled_type_for_cls(cls)
 
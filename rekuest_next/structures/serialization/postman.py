@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Sequence, Tuple, cast
 
 from rekuest_next.api.schema import Action
 import asyncio
+from rekuest_next.io.offload import afetch_returns
 from rekuest_next.structures.errors import ExpandingError, ShrinkingError
 from rekuest_next.structures.registry import StructureRegistry
 from rekuest_next.api.schema import (
@@ -498,7 +499,8 @@ async def aexpand_returns(
 ) -> Tuple[Any]:
     """Expands Returns
 
-    Expands the Returns according to the Action definition
+    Expands the Returns according to the Action definition. Returns that the
+    agent offloaded to the datalayer are fetched back first.
 
 
     Args:
@@ -512,6 +514,7 @@ async def aexpand_returns(
         List[Any]: The Expanded Returns
     """
     assert returns is not None, "Returns can't be empty"
+    returns = await afetch_returns(returns)
 
     expanded_returns: list[Any] = []
 
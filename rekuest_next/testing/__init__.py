@@ -0,0 +1,19 @@
+"""Local stand-ins for the rekuest backend, for end-to-end and soak tests.
+
+A :class:`FakeRekuestServer` speaks the agent websocket protocol of
+:mod:`rekuest_next.messages` and answers the few GraphQL operations an agent
+runs on startup (through :class:`FakeRekuestLink`). It fires assignments at a
+connected agent, injects disconnects and bounces, and measures end-to-end
+latencies and throughput (:class:`LoadReport`). Nothing leaves the machine.
+"""
+
+from .link import FakeRekuestLink
+from .server import AssignmentRecord, FakeRekuestServer, LoadReport, percentile
+
+__all__ = [
+    "AssignmentRecord",
+    "FakeRekuestLink",
+    "FakeRekuestServer",
+    "LoadReport",
+    "percentile",
+]
@@ -0,0 +1,53 @@
+"""A GraphQL stub for the operations an agent runs against the backend."""
+
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict
+
+from rath.links.base import AsyncTerminatingLink
+from rath.operation import GraphQLException, GraphQLResult, Operation
+
+if TYPE_CHECKING:
+    from rekuest_next.testing.server import FakeRekuestServer
+
+
+class FakeRekuestLink(AsyncTerminatingLink):
+    """Answers ``EnsureAgent`` and ``ImplementAgent`` for a fake server
+
+    Implemented agents are recorded on the server (``implementations``), so a
+    test can check what an agent registered. Every other operation fails.
+    """
+
+    server: Any = None
+    """The :class:`FakeRekuestServer` the agent belongs to."""
+
+    def _agent(self) -> Dict[str, Any]:
+        server: "FakeRekuestServer" = self.server
+        return {
+            "__typename": "Agent",
+            "id": server.agent_id,
+            "hash": server.agent_hash,
+            "client": {"__typename": "Client", "id": "client-1"},
+            "user": {"__typename": "User", "sub": "user-1"},
+            "memoryShelve": None,
+        }
+
+    async def aexecute(self, operation: Operation) -> AsyncIterator[GraphQLResult]:
+        """Execute an operation against the fake server.
+
+        Args:
+            operation (Operation): The operation to execute.
+
+        Yields:
+            GraphQLResult: The result of the operation.
+        """
+        server: "FakeRekuestServer" = self.server
+        name = operation.node.name.value if operation.node.name else None
+        if name == "EnsureAgent":
+            yield GraphQLResult(data={"ensureAgent": self._agent()})
+        elif name == "ImplementAgent":
+            server.implement(operation.variables["input"])
+            yield GraphQLResult(data={"implementAgent": self._agent()})
+        else:
+            raise GraphQLException(
+                f"The fake rekuest server does not implement {name}",
+                operation=operation,
+            )
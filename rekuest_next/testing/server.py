@@ -0,0 +1,540 @@
+"""A local stand-in for the agent websocket of the rekuest backend.
+
+The server accepts an agent's ``Register``, answers with an ``Init`` (granting
+the requested wire encoding if it is available here), answers heartbeats and
+acknowledges terminal reports with an ``EventAck``, just like the backend.
+Assignments are fired with :meth:`FakeRekuestServer.aassign` or, at a fixed
+rate, with :meth:`FakeRekuestServer.arun_load`, which also injects disconnects
+and bounces while it runs and reports latency percentiles and throughput.
+
+Example::
+
+    async with FakeRekuestServer() as server:
+        agent = RekuestAgent(
+            transport=WebsocketAgentTransport(
+                endpoint_url=server.endpoint_url, token_loader=server.atoken
+            ),
+            rath=server.rath(),
+            app_registry=registry,
+        )
+        async with agent.rath, agent:
+            provide = asyncio.create_task(agent.aprovide())
+            report = await server.arun_load("add_one", {"x": 1}, rate=200, count=1000)
+            print(report.summary())
+"""
+
+import asyncio
+import collections
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import pydantic
+from pydantic import BaseModel, Field
+from websockets.asyncio.server import Server, ServerConnection, serve
+from websockets.exceptions import ConnectionClosed
+
+from rekuest_next import messages
+from rekuest_next.agents.transport.encoding import (
+    decode_payload,
+    encode_message,
+    ensure_encoding,
+)
+from rekuest_next.agents.transport.errors import EncodingUnavailable
+from rekuest_next.agents.transport.websocket import KICK_CODE
+from rekuest_next.rath import RekuestNextRath
+from rekuest_next.testing.link import FakeRekuestLink
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_TYPES = frozenset(
+    {
+        messages.FromAgentMessageType.COMPLETED.value,
+        messages.FromAgentMessageType.FAILED.value,
+        messages.FromAgentMessageType.CRITICAL.value,
+        messages.FromAgentMessageType.CANCELLED.value,
+        messages.FromAgentMessageType.INTERRUPTED.value,
+    }
+)
+"""The reports that end a task."""
+
+DROP_CODE = 1011
+"""The close code of an injected disconnect (a server error: the agent reconnects)."""
+
+
+class _AgentPayload(BaseModel):
+    message: messages.FromAgentMessage = Field(discriminator="type")
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """The ``q``-th percentile of ``values``, interpolated linearly.
+
+    Args:
+        values (Sequence[float]): The values, in any order.
+        q (float): The percentile, between 0 and 100.
+
+    Returns:
+        Optional[float]: The percentile, None if there are no values.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * min(max(q, 0.0), 100.0) / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+@dataclass
+class AssignmentRecord:
+    """What the server saw of one assignment it fired."""
+
+    task: str
+    interface: str
+    assigned_at: float
+    """``time.monotonic()`` when the assignment was fired."""
+    delivered: bool = False
+    """Whether the assign was put on the wire (it waits while no agent is connected)."""
+    finished_at: Optional[float] = None
+    """``time.monotonic()`` when the first terminal report arrived."""
+    outcome: Optional[str] = None
+    """The type of the terminal report, e.g. ``COMPLETED``."""
+    yields: int = 0
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Seconds from firing the assignment to its terminal report."""
+        if self.finished_at is None:
+            return None
+        return self.finished_at - self.assigned_at
+
+
+@dataclass
+class LoadReport:
+    """The outcome of a load run (see :meth:`FakeRekuestServer.arun_load`)."""
+
+    assigned: int
+    completed: int
+    failed: int
+    outstanding: int
+    """Assignments without a terminal report when the run ended."""
+    duration: float
+    """Seconds from the first assignment to the last terminal report."""
+    latencies: List[float] = field(default_factory=list)
+    disconnects: int = 0
+    bounces: int = 0
+
+    @property
+    def throughput(self) -> float:
+        """Completed assignments per second."""
+        return self.completed / self.duration if self.duration > 0 else 0.0
+
+    def percentile(self, q: float) -> Optional[float]:
+        """The ``q``-th percentile of the end-to-end latencies, in seconds."""
+        return percentile(self.latencies, q)
+
+    def summary(self) -> str:
+        """A human readable summary of the run."""
+
+        def ms(q: float) -> str:
+            value = self.percentile(q)
+            return "-" if value is None else f"{value * 1000:.2f} ms"
+
+        return (
+            f"assigned {self.assigned}, completed {self.completed}, "
+            f"failed {self.failed}, outstanding {self.outstanding} "
+            f"in {self.duration:.2f} s ({self.throughput:.1f} assignments/s)\n"
+            f"latency p50 {ms(50)}, p90 {ms(90)}, p99 {ms(99)}, max {ms(100)}\n"
+            f"disconnects {self.disconnects}, bounces {self.bounces}"
+        )
+
+
+class FakeRekuestServer:
+    """A local agent websocket endpoint speaking the rekuest agent protocol
+
+    One agent is served at a time: a new registration takes over from the
+    connected agent. Assignments fired while no agent is connected are
+    delivered after the next ``Init``, which also asks the agent about the
+    delivered assignments that did not finish yet (``inquiries``).
+
+    Args:
+        host (str): The interface to listen on.
+        port (int): The port to listen on, 0 picks a free one.
+        agent_id (str): The agent id the ``Init`` and the GraphQL stub return.
+        ack_events (bool): Acknowledge terminal reports with an ``EventAck``.
+        heartbeat_interval (Optional[float]): Send a ``Heartbeat`` this often.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        agent_id: str = "agent-1",
+        ack_events: bool = True,
+        heartbeat_interval: Optional[float] = None,
+    ) -> None:
+        """Create a server, it listens once entered."""
+        self.host = host
+        self.port = port
+        self.agent_id = agent_id
+        self.agent_hash = uuid.uuid4().hex
+        self.ack_events = ack_events
+        self.heartbeat_interval = heartbeat_interval
+
+        self.registrations: List[messages.Register] = []
+        self.implementations: List[Dict[str, Any]] = []
+        self.assignments: Dict[str, AssignmentRecord] = {}
+        self.received: collections.Counter[str] = collections.Counter()
+        self.heartbeat_answers = 0
+        self.disconnects = 0
+        self.bounces = 0
+
+        self._server: Optional[Server] = None
+        self._connection: Optional[ServerConnection] = None
+        self._encoding = messages.WireEncoding.JSON
+        self._connected = asyncio.Event()
+        self._pending: List[messages.Assign] = []
+        self._waiters: Dict[str, asyncio.Future[AssignmentRecord]] = {}
+
+    @property
+    def endpoint_url(self) -> str:
+        """The url to point a ``WebsocketAgentTransport`` at."""
+        return f"ws://{self.host}:{self.port}/agi"
+
+    @property
+    def connected(self) -> bool:
+        """Whether an agent is connected (and was sent its ``Init``)."""
+        return self._connected.is_set()
+
+    async def atoken(self) -> str:
+        """A token loader for the transport: every token is accepted."""
+        return "fake-token"
+
+    def rath(self) -> RekuestNextRath:
+        """A rath client whose GraphQL operations this server answers."""
+        return RekuestNextRath(link=FakeRekuestLink(server=self))
+
+    def implement(self, agent_input: Dict[str, Any]) -> None:
+        """Record an ``ImplementAgent`` call of the GraphQL stub."""
+        self.implementations.append(agent_input)
+
+    async def __aenter__(self) -> "FakeRekuestServer":
+        """Start listening."""
+        self._server = await serve(self._ahandle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:  # noqa: ANN401
+        """Close the connection of the agent and stop listening."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for waiter in self._waiters.values():
+            waiter.cancel()
+        self._waiters.clear()
+
+    # --- Protocol ---
+
+    async def _ahandle(self, connection: ServerConnection) -> None:
+        try:
+            register = messages.Register.model_validate_json(await connection.recv())
+        except (ConnectionClosed, pydantic.ValidationError):
+            logger.warning("Connection did not register", exc_info=True)
+            await connection.close()
+            return
+
+        self.registrations.append(register)
+        previous = self._connection
+        if previous is not None:
+            await previous.close(KICK_CODE, "Another instance registered")
+
+        encoding = register.encoding
+        try:
+            ensure_encoding(encoding)
+        except EncodingUnavailable:
+            encoding = messages.WireEncoding.JSON
+
+        inquiries = [
+            messages.AssignInquiry(task=record.task)
+            for record in self.assignments.values()
+            if record.delivered and record.finished_at is None
+        ]
+        await connection.send(
+            messages.Init(
+                agent=self.agent_id, inquiries=inquiries, encoding=encoding
+            ).model_dump_json()
+        )
+        self._connection = connection
+        self._encoding = encoding
+        self._connected.set()
+
+        pending, self._pending = self._pending, []
+        for assign in pending:
+            await self._adeliver(assign)
+
+        heartbeat = (
+            asyncio.create_task(self._aheartbeat(connection))
+            if self.heartbeat_interval
+            else None
+        )
+        try:
+            async for frame in connection:
+                await self._aprocess(frame)
+        except ConnectionClosed:
+            pass
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+            if self._connection is connection:
+                self._connection = None
+                self._connected.clear()
+
+    async def _aheartbeat(self, connection: ServerConnection) -> None:
+        assert self.heartbeat_interval is not None
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            if self._connection is not connection:
+                return
+            await self._asend(messages.Heartbeat())
+
+    async def _aprocess(self, frame: str | bytes) -> None:
+        try:
+            message = _AgentPayload(
+                message=decode_payload(frame, self._encoding)
+            ).message
+        except pydantic.ValidationError:
+            logger.warning("Received an invalid message", exc_info=True)
+            return
+
+        kind: str = getattr(message.type, "value", message.type)
+        self.received[kind] += 1
+
+        if isinstance(message, messages.HeartbeatEvent):
+            self.heartbeat_answers += 1
+        elif isinstance(message, messages.Yield):
+            record = self.assignments.get(message.task)
+            if record is not None:
+                record.yields += 1
+        elif kind in TERMINAL_TYPES:
+            task: str = message.task  # type: ignore[union-attr]
+            record = self.assignments.get(task)
+            if record is not None and record.finished_at is None:
+                record.finished_at = time.monotonic()
+                record.outcome = kind
+                waiter = self._waiters.pop(task, None)
+                if waiter is not None and not waiter.done():
+                    waiter.set_result(record)
+            if self.ack_events:
+                await self._asend(
+                    messages.EventAck(
+                        event=message.id,
+                        task=task,
+                        seq=message.seq,  # type: ignore[union-attr]
+                    )
+                )
+
+    async def _asend(self, message: messages.ToAgentMessage) -> bool:
+        connection = self._connection
+        if connection is None:
+            return False
+        try:
+            await connection.send(encode_message(message, self._encoding))
+        except ConnectionClosed:
+            return False
+        return True
+
+    async def _adeliver(self, assign: messages.Assign) -> None:
+        if await self._asend(assign):
+            self.assignments[assign.task].delivered = True
+        else:
+            self._pending.append(assign)
+
+    # --- Driving the agent ---
+
+    async def aawait_connected(self, timeout: Optional[float] = None) -> None:
+        """Wait until an agent is connected.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait at most.
+        """
+        await asyncio.wait_for(self._connected.wait(), timeout)
+
+    async def aassign(
+        self, interface: str, args: Optional[Dict[str, Any]] = None
+    ) -> AssignmentRecord:
+        """Fire an assignment at the agent.
+
+        Args:
+            interface (str): The interface of the implementation to assign.
+            args (Optional[Dict[str, Any]]): The (shrunk) arguments.
+
+        Returns:
+            AssignmentRecord: The record the outcome will be filled in.
+        """
+        task = str(uuid.uuid4())
+        record = self.assignments[task] = AssignmentRecord(
+            task=task, interface=interface, assigned_at=time.monotonic()
+        )
+        await self._adeliver(
+            messages.Assign(
+                interface=interface,
+                task=task,
+                reference=task,
+                args=args or {},
+                user="user-1",
+                org="org-1",
+                action=f"action-{interface}",
+                implementation=f"implementation-{interface}",
+            )
+        )
+        return record
+
+    async def aresult(
+        self, record: AssignmentRecord, timeout: Optional[float] = None
+    ) -> AssignmentRecord:
+        """Wait for the terminal report of an assignment.
+
+        Args:
+            record (AssignmentRecord): The record :meth:`aassign` returned.
+            timeout (Optional[float]): Seconds to wait at most.
+
+        Returns:
+            AssignmentRecord: The finished record.
+        """
+        if record.finished_at is not None:
+            return record
+        waiter = self._waiters.get(record.task)
+        if waiter is None:
+            waiter = self._waiters[record.task] = (
+                asyncio.get_running_loop().create_future()
+            )
+        return await asyncio.wait_for(asyncio.shield(waiter), timeout)
+
+    async def adrop(self, code: int = DROP_CODE) -> None:
+        """Close the connection to the agent, as a crashing backend would.
+
+        Args:
+            code (int): The close code. The default makes the agent reconnect.
+        """
+        connection = self._connection
+        if connection is None:
+            return
+        self.disconnects += 1
+        await connection.close(code, "Injected disconnect")
+
+    async def abounce(self) -> None:
+        """Ask the agent to reconnect (``Bounce``)."""
+        if await self._asend(messages.Bounce()):
+            self.bounces += 1
+
+    async def akick(self, reason: Optional[str] = None) -> None:
+        """Tell the agent to disconnect for good (``Kick``)."""
+        await self._asend(messages.Kick(reason=reason))
+
+    async def _achaos(
+        self, disconnect_every: Optional[float], bounce_every: Optional[float]
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        next_drop = loop.time() + disconnect_every if disconnect_every else None
+        next_bounce = loop.time() + bounce_every if bounce_every else None
+        while next_drop is not None or next_bounce is not None:
+            now = loop.time()
+            deadlines = [d for d in (next_drop, next_bounce) if d is not None]
+            await asyncio.sleep(max(min(deadlines) - now, 0))
+            now = loop.time()
+            if next_drop is not None and now >= next_drop:
+                await self.adrop()
+                next_drop = now + disconnect_every  # type: ignore[operator]
+            if next_bounce is not None and now >= next_bounce:
+                await self.abounce()
+                next_bounce = now + bounce_every  # type: ignore[operator]
+
+    async def arun_load(
+        self,
+        interface: str,
+        args: Optional[Dict[str, Any]] = None,
+        rate: float = 100.0,
+        count: Optional[int] = None,
+        duration: Optional[float] = None,
+        disconnect_every: Optional[float] = None,
+        bounce_every: Optional[float] = None,
+        drain_timeout: float = 30.0,
+    ) -> LoadReport:
+        """Fire assignments at a fixed rate and measure how the agent keeps up.
+
+        Assignments are fired open loop: on schedule, whether or not earlier
+        ones finished. After the last one the run waits up to
+        ``drain_timeout`` for the outstanding ones.
+
+        Args:
+            interface (str): The interface of the implementation to assign.
+            args (Optional[Dict[str, Any]]): The (shrunk) arguments.
+            rate (float): Assignments per second.
+            count (Optional[int]): Stop after this many assignments.
+            duration (Optional[float]): Stop firing after this many seconds.
+            disconnect_every (Optional[float]): Drop the connection this often.
+            bounce_every (Optional[float]): Bounce the agent this often.
+            drain_timeout (float): Seconds to wait for outstanding assignments.
+
+        Returns:
+            LoadReport: Latencies and throughput of the run.
+        """
+        if count is None and duration is None:
+            raise ValueError("A load run needs a count or a duration")
+
+        await self.aawait_connected()
+        loop = asyncio.get_running_loop()
+        disconnects, bounces = self.disconnects, self.bounces
+        chaos = (
+            asyncio.create_task(self._achaos(disconnect_every, bounce_every))
+            if disconnect_every or bounce_every
+            else None
+        )
+
+        records: List[AssignmentRecord] = []
+        start = loop.time()
+        try:
+            while (count is None or len(records) < count) and (
+                duration is None or loop.time() - start < duration
+            ):
+                delay = start + len(records) / rate - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                records.append(await self.aassign(interface, args))
+
+            outstanding = [
+                asyncio.ensure_future(self.aresult(record))
+                for record in records
+                if record.finished_at is None
+            ]
+            if outstanding:
+                _, not_done = await asyncio.wait(outstanding, timeout=drain_timeout)
+                for waiter in not_done:
+                    waiter.cancel()
+        finally:
+            if chaos is not None:
+                chaos.cancel()
+
+        finished = [record for record in records if record.finished_at is not None]
+        end = max((record.finished_at for record in finished), default=None)  # type: ignore[type-var]
+        return LoadReport(
+            assigned=len(records),
+            completed=sum(
+                1
+                for record in finished
+                if record.outcome == messages.FromAgentMessageType.COMPLETED.value
+            ),
+            failed=sum(
+                1
+                for record in finished
+                if record.outcome != messages.FromAgentMessageType.COMPLETED.value
+            ),
+            outstanding=len(records) - len(finished),
+            duration=(end - records[0].assigned_at) if records and end else 0.0,
+            latencies=[record.latency for record in finished],  # type: ignore[misc]
+            disconnects=self.disconnects - disconnects,
+            bounces=self.bounces - bounces,
+        )
@@ -1,15 +1,19 @@
 """Some configuration for pytest"""
 
 from dataclasses import dataclass
-from typing import AsyncGenerator, Awaitable, Callable, Generator
+import asyncio
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable, Generator, List
 from uuid import uuid4
 import pytest
+from pydantic import Field
+from rekuest_next import messages
 from rekuest_next.app import AppRegistry
 from rekuest_next.structures.registry import StructureRegistry
 from rekuest_next.rekuest import RekuestNext, RekuestNextRath
 from rath.links.testing.direct_succeeding_link import DirectSucceedingLink
 from rekuest_next.agents.base import RekuestAgent
 from rekuest_next.postmans.graphql import GraphQLPostman
+from rekuest_next.agents.transport.base import AgentTransport
 from rekuest_next.agents.transport.websocket import WebsocketAgentTransport
 import os
 from dokker import local, Deployment, testing
@@ -104,6 +108,40 @@ def mock_shelver() -> MockShelver:
     return MockShelver()
 
 
+class RecordingTransport(AgentTransport):
+    """A transport that records every outgoing message and never receives."""
+
+    sent: List[messages.FromAgentMessage] = Field(default_factory=list)
+
+    @property
+    def connected(self) -> bool:
+        """Always connected."""
+        return True
+
+    async def asend(self, message: messages.FromAgentMessage) -> None:
+        """Record the message."""
+        self.sent.append(message)
+
+    async def aconnect(self) -> None:
+        """Nothing to connect."""
+        return None
+
+    async def areceive(self) -> AsyncIterator[messages.ToAgentMessage]:
+        """Never receive anything."""
+        await asyncio.Event().wait()
+        yield  # type: ignore[misc]
+
+    async def adisconnect(self) -> None:
+        """Nothing to disconnect."""
+        return None
+
+
+@pytest.fixture()
+def recording_transport() -> RecordingTransport:
+    """Fixture for a fresh recording transport"""
+    return RecordingTransport()
+
+
 @pytest.fixture()
 def mock_rekuest() -> RekuestNext:
     """Fixture for a mock rekuest"""
@@ -0,0 +1,113 @@
+"""No-Docker checks for the agent postman's local routing fast path.
+
+A call from inside an actor that targets an interface registered on the *same* agent
+must not travel to the backend as an ``AssignRequest``: it is dispatched straight to
+the local actor, while the actor's reports are still sent over the transport so the
+backend can keep its books.
+"""
+
+import pytest
+
+from rekuest_next import messages
+from rekuest_next.agents.base import BaseAgent
+from rekuest_next.api.schema import TaskEventKind
+from rekuest_next.app import AppRegistry
+from rekuest_next.register import register_func
+from rekuest_next.remote import _build_assign_input
+from rekuest_next.structures.default import get_default_structure_registry
+
+from .conftest import RecordingTransport
+
+
+def add_one(x: int) -> int:
+    """Add one to a number."""
+    return x + 1
+
+
+def _agent(transport: RecordingTransport, local_routing: bool = True) -> BaseAgent:
+    registry = AppRegistry()
+    register_func(add_one, get_default_structure_registry(), registry)
+    return BaseAgent(
+        transport=transport,
+        app_registry=registry,
+        name="local",
+        local_routing=local_routing,
+    )
+
+
+def _assign(**update: object):
+    assign = _build_assign_input(
+        args={"x": 1},
+        reference="ref-1",
+        hooks=None,
+        parent=None,
+        cached=False,
+        log=False,
+        capture=False,
+    )
+    return assign.model_copy(update=update)
+
+
+@pytest.mark.asyncio
+async def test_same_agent_call_is_dispatched_locally(
+    recording_transport: RecordingTransport,
+) -> None:
+    agent = _agent(recording_transport)
+    await agent.process(messages.Init(agent="agent-1", local_assign=True))
+
+    events = [
+        event
+        async for event in agent.caller_postman.aassign(
+            _assign(interface="add_one", agent="agent-1")
+        )
+    ]
+
+    assert [e.kind for e in events] == [TaskEventKind.YIELD, TaskEventKind.COMPLETED]
+    assert events[0].returns == {"return0": 2}
+
+    sent = recording_transport.sent
+    assert not any(isinstance(m, messages.AssignRequest) for m in sent)
+    local = [m for m in sent if isinstance(m, messages.LocalAssign)]
+    assert len(local) == 1 and local[0].interface == "add_one"
+    # The actor's reports are still mirrored to the backend under the local task id.
+    assert any(
+        isinstance(m, messages.Completed) and m.task == local[0].task for m in sent
+    )
+    assert local[0].task not in agent.managed_assignments
+
+
+def test_foreign_or_unknown_targets_stay_remote(
+    recording_transport: RecordingTransport,
+) -> None:
+    agent = _agent(recording_transport)
+    agent._remote_agent_id = "agent-1"
+    agent._local_assign = True
+    postman = agent.caller_postman
+
+    assert postman.resolve_local_interface(_assign(interface="add_one")) == "add_one"
+    assert (
+        postman.resolve_local_interface(_assign(interface="add_one", agent="agent-2"))
+        is None
+    )
+    assert postman.resolve_local_interface(_assign(interface="missing")) is None
+    assert postman.resolve_local_interface(_assign()) is None
+
+    disabled = _agent(RecordingTransport(), local_routing=False)
+    disabled._local_assign = True
+    assert (
+        disabled.caller_postman.resolve_local_interface(_assign(interface="add_one"))
+        is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_backends_without_local_assign_get_an_assign_request(
+    recording_transport: RecordingTransport,
+) -> None:
+    agent = _agent(recording_transport)
+    await agent.process(messages.Init(agent="agent-1"))
+
+    assert (
+        agent.caller_postman.resolve_local_interface(_assign(interface="add_one"))
+        is None
+    )
@@ -0,0 +1,108 @@
+"""Tests for the per-task ("context") capture mode."""
+
+import asyncio
+import logging
+import sys
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from rekuest_next import messages
+from rekuest_next.actors.debug import capture_to_list
+from koil import run_threaded
+
+
+def _assign(task: str, capture: bool) -> messages.Assign:
+    return messages.Assign.model_construct(task=task, capture=capture)
+
+
+def _agent() -> SimpleNamespace:
+    return SimpleNamespace(capture_mode="context", capture_flush_interval=0.01)
+
+
+async def _work(name: str, started: asyncio.Event, other: asyncio.Event) -> None:
+    print(f"hello from {name}")
+    started.set()
+    # Only returns if the other task runs at the same time
+    await asyncio.wait_for(other.wait(), 1)
+    logging.getLogger("user.code").warning(f"log from {name}")
+    await run_threaded(print, f"thread of {name}")
+
+
+@pytest.mark.asyncio
+async def test_captured_tasks_run_concurrently_with_separate_output() -> None:
+    agent = _agent()
+    a_started, b_started = asyncio.Event(), asyncio.Event()
+    logs_a: List[str] = []
+    logs_b: List[str] = []
+
+    async def run(name: str, logs: List[str], started, other) -> None:
+        async with capture_to_list(logs, agent, _assign(name, True)):
+            await _work(name, started, other)
+
+    await asyncio.gather(
+        run("a", logs_a, a_started, b_started),
+        run("b", logs_b, b_started, a_started),
+    )
+
+    for name, logs in (("a", logs_a), ("b", logs_b)):
+        output = "".join(logs)
+        assert f"hello from {name}" in output
+        assert f"log from {name}" in output
+        assert f"thread of {name}" in output
+        assert ("from b" in output) == (name == "b")
+
+
+@pytest.mark.asyncio
+async def test_captured_output_is_flushed_in_batches() -> None:
+    logs: List[str] = []
+    batches: List[str] = []
+
+    async def aflush() -> None:
+        if logs:
+            batch = logs[:]
+            del logs[: len(batch)]
+            batches.append("".join(batch))
+
+    async with capture_to_list(logs, _agent(), _assign("a", True), aflush=aflush):
+        print("first")
+        await asyncio.sleep(0.05)
+        print("second")
+        await asyncio.sleep(0.05)
+
+    assert len(batches) >= 2
+    assert "first" in batches[0] and "second" not in batches[0]
+    assert "second" in "".join(batches[1:])
+
+
+@pytest.mark.asyncio
+async def test_capture_is_installed_only_while_captured_tasks_run() -> None:
+    root = logging.getLogger()
+    stdout, level = sys.stdout, root.level
+    seen: List[logging.LogRecord] = []
+    other = logging.Handler()
+    other.emit = seen.append  # type: ignore[method-assign]
+    root.addHandler(other)
+    root.setLevel(logging.WARNING)
+    logs: List[str] = []
+
+    try:
+        async with capture_to_list(logs, _agent(), _assign("a", True)):
+            assert sys.stdout is not stdout
+            logging.getLogger("user.code").info("captured info")
+            logging.getLogger("user.code").debug("dropped debug")
+
+        assert sys.stdout is stdout
+        assert root.level == logging.WARNING
+        # The other handlers of the root logger saw nothing they would not have seen
+        assert seen == []
+        logging.getLogger("user.code").warning("after the task")
+    finally:
+        root.removeHandler(other)
+        root.setLevel(level)
+
+    output = "".join(logs)
+    assert "captured info" in output
+    assert "dropped debug" not in output
+    assert "after the task" not in output
@@ -0,0 +1,147 @@
+"""Tests for the memoized and on-disk cached definition building."""
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from rekuest_next.definition.cache import DefinitionCache
+from rekuest_next.definition.define import parse_docstring, prepare_definition
+from rekuest_next.structures.registry import StructureRegistry
+from .funcs import (
+    Karl,
+    LocalizedStructure,
+    localized_structure_function,
+    nested_model_with_annotations,
+    plain_basic_function,
+    plain_structure_function,
+)
+
+
+@pytest.mark.define
+def test_ports_are_memoized_per_type_and_overrides(
+    simple_registry: StructureRegistry,
+) -> None:
+    """Equal requests share a port, differing overrides do not."""
+    first = prepare_definition(plain_structure_function, simple_registry)
+    second = prepare_definition(plain_structure_function, simple_registry)
+
+    assert first.args[0] is second.args[0]
+    assert first == second
+
+    port = simple_registry.get_argport_for_cls(Karl, "karl")
+    assert simple_registry.get_argport_for_cls(Karl, "karl") is port
+    described = simple_registry.get_argport_for_cls(Karl, "karl", description="other")
+    assert described is not port
+    assert described.description == "other"
+
+
+@pytest.mark.define
+def test_registration_invalidates_port_cache(
+    simple_registry: StructureRegistry,
+) -> None:
+    """Re-registering a class must not hand out stale ports."""
+    simple_registry.register_as_model(Karl, "karl/old")
+    assert simple_registry.get_argport_for_cls(Karl, "k").identifier == "karl/old"
+
+    simple_registry.register_as_model(Karl, "karl/new")
+    assert simple_registry.get_argport_for_cls(Karl, "k").identifier == "karl/new"
+
+
+def test_docstrings_are_parsed_once() -> None:
+    """The same docstring text is only parsed once."""
+    doc = plain_basic_function.__doc__ or ""
+    assert parse_docstring(doc) is parse_docstring(doc)
+
+
+@pytest.mark.define
+def test_definition_cache_roundtrip(tmp_path: Path) -> None:
+    """A cached definition equals the built one and still warms the registry."""
+    cache = DefinitionCache(directory=tmp_path)
+
+    built = prepare_definition(
+        nested_model_with_annotations, StructureRegistry(), definition_cache=cache
+    )
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    registry = StructureRegistry()
+    loaded = prepare_definition(
+        nested_model_with_annotations, registry, definition_cache=cache
+    )
+
+    assert loaded == built
+    # The model is registered even though no ports were built
+    assert Karl in registry.cls_fullfilled_type_map
+    assert registry.get_fullfilled_model(built.args[0].children[0].identifier)
+
+
+@pytest.mark.define
+def test_definition_cache_is_keyed_by_options(tmp_path: Path) -> None:
+    """Different options produce a different cache entry."""
+    cache = DefinitionCache(directory=tmp_path)
+
+    plain = prepare_definition(
+        plain_basic_function, StructureRegistry(), definition_cache=cache
+    )
+    renamed = prepare_definition(
+        plain_basic_function,
+        StructureRegistry(),
+        name="Renamed",
+        definition_cache=cache,
+    )
+
+    assert plain.name != renamed.name == "Renamed"
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+@pytest.mark.define
+def test_definition_cache_is_keyed_by_registrations(tmp_path: Path) -> None:
+    """Registering a used type under another identifier does not hit the cache."""
+    cache = DefinitionCache(directory=tmp_path)
+
+    async def aexpand(value: str) -> LocalizedStructure:
+        return LocalizedStructure(value)
+
+    async def ashrink(value: Any) -> str:  # noqa: ANN401
+        return value.name
+
+    def build(identifier: str) -> str:
+        registry = StructureRegistry()
+        registry.register_as_structure(
+            LocalizedStructure, identifier, aexpand=aexpand, ashrink=ashrink
+        )
+        definition = prepare_definition(
+            localized_structure_function, registry, definition_cache=cache
+        )
+        return definition.args[0].identifier
+
+    assert build("app/first") == "app/first"
+    assert build("app/second") == "app/second"
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    assert build("app/first") == "app/first"
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+def test_local_functions_are_not_cached(tmp_path: Path) -> None:
+    """Functions without a stable module-level identity bypass the cache."""
+    cache = DefinitionCache(directory=tmp_path)
+
+    def local_function(x: int) -> int:
+        """Local"""
+        return x
+
+    prepare_definition(local_function, StructureRegistry(), definition_cache=cache)
+    assert not list(tmp_path.glob("*.json"))
+
+
+@pytest.mark.define
+def test_unhashable_overrides_bypass_the_port_cache(
+    simple_registry: StructureRegistry,
+) -> None:
+    """A dict default cannot be a cache key, so the port is built uncached."""
+    simple_registry.register_as_model(Karl, "karl")
+
+    port = simple_registry.get_argport_for_cls(Karl, "k", default={"x": 1})
+
+    assert simple_registry.get_argport_for_cls(Karl, "k", default={"x": 1}) == port
+    assert Karl not in simple_registry._port_cache
@@ -0,0 +1,99 @@
+"""Tests for the local fake rekuest server used for soak tests."""
+
+import asyncio
+from typing import AsyncIterator, Tuple
+
+import pytest
+import pytest_asyncio
+
+from rekuest_next.actors.types import RegisterConfig
+from rekuest_next.agents.base import RekuestAgent
+from rekuest_next.agents.transport.websocket import WebsocketAgentTransport
+from rekuest_next.app import AppRegistry
+from rekuest_next.register import register_func
+from rekuest_next.structures.default import get_default_structure_registry
+from rekuest_next.testing import FakeRekuestServer, percentile
+
+
+async def add_one(x: int) -> int:
+    """Add one to a number."""
+    return x + 1
+
+
+@pytest_asyncio.fixture
+async def served() -> AsyncIterator[Tuple[FakeRekuestServer, RekuestAgent]]:
+    registry = AppRegistry()
+    register_func(add_one, get_default_structure_registry(), registry, RegisterConfig())
+
+    async with FakeRekuestServer(heartbeat_interval=0.05) as server:
+        agent = RekuestAgent(
+            transport=WebsocketAgentTransport(
+                endpoint_url=server.endpoint_url,
+                token_loader=server.atoken,
+                time_between_retries=0.01,
+                jitter=False,
+            ),
+            rath=server.rath(),
+            app_registry=registry,
+            name="soak",
+        )
+        async with agent.rath, agent:
+            provide = asyncio.create_task(agent.aprovide())
+            await server.aawait_connected(timeout=5)
+            yield server, agent
+            provide.cancel()
+            try:
+                await provide
+            except asyncio.CancelledError:
+                pass
+
+
+def test_percentile_interpolates() -> None:
+    assert percentile([], 50) is None
+    assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+    assert percentile([1.0, 2.0], 50) == 1.5
+    assert percentile([1.0, 2.0, 3.0], 100) == 3.0
+
+
+@pytest.mark.asyncio
+async def test_agent_registers_and_completes_assignments(
+    served: Tuple[FakeRekuestServer, RekuestAgent],
+) -> None:
+    server, agent = served
+
+    (implemented,) = server.implementations
+    assert [i["interface"] for i in implemented["implementations"]] == ["add_one"]
+    assert server.registrations[0].token == "fake-token"
+
+    report = await server.arun_load("add_one", {"x": 1}, rate=500, count=50)
+
+    assert report.completed == 50 and report.outstanding == 0
+    assert len(report.latencies) == 50
+    assert report.throughput > 0
+    assert report.percentile(50) <= report.percentile(99)  # type: ignore[operator]
+    # Every terminal report was acknowledged
+    await asyncio.sleep(0.05)
+    assert agent._unacked_events == {}
+    assert server.heartbeat_answers > 0
+
+
+@pytest.mark.asyncio
+async def test_assignments_survive_disconnects_and_bounces(
+    served: Tuple[FakeRekuestServer, RekuestAgent],
+) -> None:
+    server, _ = served
+
+    report = await server.arun_load(
+        "add_one",
+        {"x": 1},
+        rate=200,
+        duration=0.5,
+        disconnect_every=0.15,
+        bounce_every=0.2,
+        drain_timeout=10,
+    )
+
+    assert report.disconnects > 0 and report.bounces > 0
+    assert report.outstanding == 0
+    assert report.completed == report.assigned
+    assert len(server.registrations) > 1
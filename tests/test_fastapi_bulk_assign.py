@@ -0,0 +1,203 @@
+"""Tests for the bulk assign endpoint of the FastAPI agent."""
+
+import asyncio
+import json
+from typing import AsyncIterator, List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from rekuest_next import messages
+from rekuest_next.actors.types import RegisterConfig
+from rekuest_next.app import AppRegistry
+from rekuest_next.contrib.fastapi.agent import FastApiAgent, FastApiTransport
+from rekuest_next.contrib.fastapi.routes import add_agent_routes, create_lifespan
+from rekuest_next.register import register_func
+from rekuest_next.structures.default import get_default_structure_registry
+
+
+async def add_one(x: int) -> int:
+    """Add one to a number."""
+    return x + 1
+
+
+async def fail(x: int) -> int:
+    """Always fail."""
+    raise ValueError("no")
+
+
+async def hang(x: int) -> int:
+    """Never return."""
+    await asyncio.Event().wait()
+    return x
+
+
+def _app() -> tuple[FastApiAgent, FastAPI]:
+    registry = AppRegistry()
+    for function in (add_one, fail, hang):
+        register_func(
+            function, get_default_structure_registry(), registry, RegisterConfig()
+        )
+    agent = FastApiAgent(app_registry=registry)
+    app = FastAPI(lifespan=create_lifespan(agent))
+    add_agent_routes(app, agent)
+    return agent, app
+
+
+def test_bulk_assign_submits_every_assignment() -> None:
+    _, app = _app()
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/bulk_assign",
+            json=[{"interface": "add_one", "args": {"x": i}} for i in range(5)],
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "submitted"
+    assert body["count"] == 5
+    assert len(set(body["tasks"])) == 5
+
+
+def test_bulk_assign_rejects_the_whole_batch_on_invalid_items() -> None:
+    agent, app = _app()
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/bulk_assign",
+            json=[
+                {"interface": "add_one", "args": {"x": 1}},
+                {"args": {"x": 1}},
+                "not-an-assignment",
+            ],
+        )
+
+    assert response.status_code == 422
+    assert [error["index"] for error in response.json()["errors"]] == [1, 2]
+    assert agent.managed_assignments == {}
+
+
+def test_bulk_assign_rejects_unregistered_interfaces() -> None:
+    agent, app = _app()
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/bulk_assign",
+            json=[
+                {"interface": "add_one", "args": {"x": 1}},
+                {"interface": "missing", "args": {"x": 1}},
+            ],
+            params={"stream": "true"},
+        )
+
+    assert response.status_code == 422
+    assert [error["index"] for error in response.json()["errors"]] == [1]
+    assert agent.managed_assignments == {}
+
+
+def _assign_messages(
+    agent: FastApiAgent, interface: str, count: int
+) -> List[messages.Assign]:
+    return [
+        agent.build_assign_message(
+            agent.build_assign_input({"args": {"x": i}}, interface=interface),
+            user="user",
+        )
+        for i in range(count)
+    ]
+
+
+async def _collect(
+    results: AsyncIterator[messages.FromAgentMessage],
+) -> List[messages.FromAgentMessage]:
+    return [message async for message in results]
+
+
+def test_streamed_bulk_assign_submits_before_the_results_are_read(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    agent, app = _app()
+    submitted: List[str] = []
+    asubmit_many = FastApiTransport.asubmit_many
+
+    async def recording_submit_many(
+        self: FastApiTransport, assigns: List[messages.ToAgentMessage]
+    ) -> List[str]:
+        tasks = await asubmit_many(self, assigns)
+        submitted.extend(tasks)
+        return tasks
+
+    monkeypatch.setattr(FastApiTransport, "asubmit_many", recording_submit_many)
+
+    with TestClient(app) as client:
+        assign_messages = _assign_messages(agent, "add_one", 3)
+        tasks = [assign.task for assign in assign_messages]
+        results = client.portal.call(agent.asubmit_bulk_streaming, assign_messages)
+
+        assert submitted == tasks
+        reports = client.portal.call(_collect, results)
+
+    completed = [m.task for m in reports if isinstance(m, messages.Completed)]
+    assert sorted(completed) == sorted(tasks)
+
+
+def test_unread_bulk_results_stop_listening_once_the_tasks_finish() -> None:
+    agent, app = _app()
+
+    async def wait_until_unlistened() -> None:
+        while agent.transport._task_listeners:
+            await asyncio.sleep(0.01)
+
+    with TestClient(app) as client:
+        client.portal.call(
+            agent.asubmit_bulk_streaming, _assign_messages(agent, "add_one", 3)
+        )
+        client.portal.call(asyncio.wait_for, wait_until_unlistened(), 5)
+
+
+def test_streamed_bulk_results_give_up_when_idle() -> None:
+    agent, app = _app()
+    agent.bulk_result_idle_timeout = 0.05
+
+    with TestClient(app) as client:
+        with client.stream(
+            "POST",
+            "/bulk_assign?stream=true",
+            json=[{"interface": "hang", "args": {"x": 1}}],
+        ) as r:
+            lines = [json.loads(line) for line in r.iter_lines() if line]
+
+        assert "No result for 0.05s" in lines[-1]["error"]
+        assert agent.transport._task_listeners == {}
+
+
+def test_bulk_assign_streams_results_as_ndjson() -> None:
+    _, app = _app()
+    payload = [{"interface": "add_one", "args": {"x": i}} for i in range(3)]
+    payload.append({"interface": "fail", "args": {"x": 0}})
+
+    with TestClient(app) as client:
+        with client.stream("POST", "/bulk_assign?stream=true", json=payload) as r:
+            assert r.status_code == 200
+            assert r.headers["content-type"].startswith("application/x-ndjson")
+            lines = [json.loads(line) for line in r.iter_lines() if line]
+
+    submitted, results = lines[0], lines[1:]
+    assert submitted["count"] == 4
+    tasks = submitted["tasks"]
+
+    terminal = {
+        line["task"]: line["type"] for line in results if line["type"] != "YIELD"
+    }
+    assert terminal == {
+        tasks[0]: "COMPLETED",
+        tasks[1]: "COMPLETED",
+        tasks[2]: "COMPLETED",
+        tasks[3]: "CRITICAL",
+    }
+    returns = {
+        line["task"]: line["returns"] for line in results if line["type"] == "YIELD"
+    }
+    assert returns == {tasks[i]: {"return0": i + 1} for i in range(3)}
@@ -0,0 +1,107 @@
+"""Tests for revision-based ETags on the FastAPI state routes."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from rekuest_next.api.schema import (
+    PortKind,
+    ReturnPortInput,
+    StateDefinitionInput,
+    StateImplementationInput,
+)
+from rekuest_next.contrib.fastapi.agent import FastApiAgent
+from rekuest_next.contrib.fastapi.detail_routes.states import (
+    build_state_detail_router,
+)
+from rekuest_next.contrib.fastapi.route_groups.states import build_state_router
+
+
+def _client() -> tuple[FastApiAgent, TestClient]:
+    definition = StateDefinitionInput(
+        name="DemoState",
+        ports=(ReturnPortInput(key="value", kind=PortKind.STRING, nullable=False),),
+    )
+    agent = FastApiAgent()
+    agent.current_session = "session-1"
+    agent._collected_state_schemas["demo_state"] = definition
+    agent.states["demo_state"] = object()
+    agent._current_shrunk_states["demo_state"] = {"value": "a"}
+
+    app = FastAPI()
+    app.include_router(build_state_router(agent))
+    app.include_router(
+        build_state_detail_router(
+            agent,
+            {
+                "demo_state": StateImplementationInput(
+                    interface="demo_state", definition=definition
+                )
+            },
+        )
+    )
+    return agent, TestClient(app)
+
+
+def test_state_list_revalidates_with_etag() -> None:
+    agent, client = _client()
+
+    first = client.get("/states")
+    assert first.status_code == 200
+    assert first.json()["states"]["demo_state"]["value"] == {"value": "a"}
+    etag = first.headers["etag"]
+
+    unchanged = client.get("/states", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["etag"] == etag
+
+    agent._current_shrunk_states["demo_state"] = {"value": "b"}
+    agent.global_revision += 1
+
+    changed = client.get("/states", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["current_global_revision"] == 1
+    assert changed.json()["states"]["demo_state"]["value"] == {"value": "b"}
+
+
+def test_current_state_revalidates_with_etag() -> None:
+    agent, client = _client()
+
+    first = client.get("/states/demo_state")
+    assert first.status_code == 200
+    assert first.json() == {"revision": 0, "state": {"value": "a"}}
+
+    weak = f"W/{first.headers['etag']}"
+    unchanged = client.get("/states/demo_state", headers={"If-None-Match": weak})
+    assert unchanged.status_code == 304
+
+    agent.current_session = "session-2"
+    assert (
+        client.get(
+            "/states/demo_state", headers={"If-None-Match": first.headers["etag"]}
+        ).status_code
+        == 200
+    )
+
+
+def test_reads_of_a_revision_share_one_serialization() -> None:
+    agent, client = _client()
+
+    first = client.get("/states", params={"state_keys": "demo_state"})
+    # Mutated without a new revision: the cached body is served
+    agent._current_shrunk_states["demo_state"]["value"] = "changed"
+    second = client.get("/states", params={"state_keys": "demo_state"})
+    assert second.content == first.content
+
+    agent.global_revision += 1
+    third = client.get("/states", params={"state_keys": "demo_state"})
+    assert third.json()["states"]["demo_state"]["value"] == {"value": "changed"}
+
+
+def test_unknown_state_is_not_cached() -> None:
+    agent, client = _client()
+    del agent.states["demo_state"]
+
+    response = client.get("/states/demo_state", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
@@ -0,0 +1,121 @@
+"""Tests for media that is streamed from disk."""
+
+import hashlib
+import io
+import threading
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from rekuest_next.io.s3 import aput_object, aupload_multipart
+from rekuest_next.links.upload import apply_recursive
+from rekuest_next.scalars import FileMediaLike, MediaLike
+from .test_s3_upload import FakeS3Client
+
+
+@pytest.fixture
+def media(tmp_path: Path) -> Path:
+    path = tmp_path / "acquisition.bin"
+    path.write_bytes(bytes(range(256)) * 40)
+    return path
+
+
+def test_paths_validate_to_file_media(media: Path) -> None:
+    file = MediaLike.validate(str(media))
+
+    assert isinstance(file, FileMediaLike)
+    assert file.file_name == "acquisition.bin"
+    assert file.size == 10240
+    assert file._value is None, "Nothing is opened before the upload"
+    assert MediaLike.validate(file) is file
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_mmap", [False, True])
+async def test_multipart_upload_streams_and_checksums(
+    media: Path, use_mmap: bool
+) -> None:
+    file = FileMediaLike(media, checksum="sha256", use_mmap=use_mmap)
+    client = FakeS3Client()
+
+    with file.open() as stream:
+        await aput_object(
+            client,
+            "bucket",
+            "key",
+            stream,
+            multipart_threshold=4096,
+            part_size=4096,
+        )
+
+    parts = [call["Body"] for name, call in client.calls if name == "upload_part"]
+    assert [len(part) for part in parts] == [4096, 4096, 2048]
+    assert b"".join(parts) == media.read_bytes()
+    assert file.digest == hashlib.sha256(media.read_bytes()).hexdigest()
+
+
+def test_rereading_does_not_change_the_checksum(media: Path) -> None:
+    file = FileMediaLike(media, checksum="md5")
+
+    with file.open() as stream:
+        stream.read(100)
+        stream.seek(0)
+        stream.read()
+
+    assert file.digest == hashlib.md5(media.read_bytes()).hexdigest()
+
+
+def test_partial_reads_have_no_checksum(media: Path) -> None:
+    file = FileMediaLike(media, checksum="sha256")
+
+    with file.open() as stream:
+        stream.read(100)
+
+    assert file.digest is None
+
+
+def test_value_is_closed_after_the_upload(media: Path) -> None:
+    file = FileMediaLike(media)
+    value = file.value
+    assert value.read(4) == bytes(range(4))
+
+    with file.open() as stream:
+        stream.read()
+
+    assert value.closed
+    assert file._value is None
+
+
+@pytest.mark.asyncio
+async def test_parts_are_read_off_the_event_loop(media: Path) -> None:
+    readers: List[int] = []
+
+    class RecordingStream(io.BytesIO):
+        def read(self, size: int | None = -1) -> bytes:
+            readers.append(threading.get_ident())
+            return super().read(size)
+
+    await aupload_multipart(
+        FakeS3Client(),
+        "bucket",
+        "key",
+        RecordingStream(media.read_bytes()),
+        part_size=4096,
+    )
+
+    assert readers and threading.get_ident() not in readers
+
+
+@pytest.mark.asyncio
+async def test_apply_recursive_discovers_file_media(media: Path) -> None:
+    file = FileMediaLike(media)
+    variables = {"input": {"media": file, "others": [file, "x"]}}
+
+    substituted = await apply_recursive(_store_id, variables, MediaLike)
+
+    assert substituted == {"input": {"media": "stored", "others": ["stored", "x"]}}
+
+
+async def _store_id(file: MediaLike) -> str:
+    return "stored"
@@ -0,0 +1,87 @@
+"""Import-time guards for the lazy top-level package.
+
+``import rekuest_next`` must stay cheap: the public names are resolved lazily
+and the generated GraphQL models defer building their schemas. These checks run
+``python -X importtime`` in a fresh interpreter so they measure a cold import.
+"""
+
+import importlib.util
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+import rekuest_next
+
+#: Modules that are expensive to import and must not be pulled in by a bare
+#: ``import rekuest_next``.
+HEAVY_MODULES = (
+    "rekuest_next.api.schema",
+    "rekuest_next.blok.parser",
+    "rekuest_next.remote",
+    "rekuest_next.agents.base",
+)
+
+#: Generous upper bound for the cumulative import time of the package itself.
+IMPORT_BUDGET_US = 250_000
+
+
+def _importtime(statement: str) -> Dict[str, int]:
+    """Return the cumulative import time (in µs) of every module ``statement`` imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = line[len("import time:") :].split("|")
+        if cum.strip().isdigit():
+            cumulative[name.strip()] = int(cum)
+    return cumulative
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("arkitekt_next") is not None,
+    reason="arkitekt_next installed: the service registration import stays eager",
+)
+def test_bare_import_is_lazy() -> None:
+    timings = _importtime("import rekuest_next")
+
+    assert "rekuest_next" in timings
+    for module in HEAVY_MODULES:
+        assert module not in timings, f"{module} is imported eagerly"
+    assert timings["rekuest_next"] < IMPORT_BUDGET_US
+
+
+def test_schema_models_are_built_on_first_use() -> None:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from rekuest_next.api.schema import Action, AssignInput\n"
+            "assert not Action.__pydantic_complete__\n"
+            "assert not AssignInput.__pydantic_complete__\n"
+            "AssignInput(reference='r', args={}, cached=False, log=False,"
+            " capture=False, isHook=False, ephemeral=False)\n"
+            "assert AssignInput.__pydantic_complete__\n",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_public_names_resolve() -> None:
+    for name in rekuest_next.__all__:
+        if name == "RekuestNextService" and not importlib.util.find_spec(
+            "arkitekt_next"
+        ):
+            continue
+        assert getattr(rekuest_next, name) is not None
+    assert callable(rekuest_next.state)
+    assert callable(rekuest_next.declare)
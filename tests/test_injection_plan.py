@@ -0,0 +1,82 @@
+"""Tests for the per-actor injection plan that resolves an actor's locals."""
+
+from typing import Any, Dict, List
+
+import pytest
+
+from rekuest_next.actors.base import InjectionPlan
+from rekuest_next.actors.types import PreparedDependencyVariables
+from rekuest_next.agents.context import PreparedContextVariables
+from rekuest_next.declare import declare
+from rekuest_next.state.utils import PreparedStateVariables
+
+
+@declare(app="mymicroscope")
+class Microscope:
+    def acquire(self, exposure: float) -> bytes:
+        """Acquire a frame."""
+        return b""
+
+
+class CountingAgent:
+    """Duck-typed agent that records how often locals are resolved."""
+
+    def __init__(self) -> None:
+        self.contexts: Dict[str, Any] = {"conn": object()}
+        self.states: Dict[str, Any] = {"counter": object()}
+        self.locals_revision = 0
+        self.context_calls: List[str] = []
+
+    async def aget_context(self, interface: str) -> Any:  # noqa: ANN401
+        self.context_calls.append(interface)
+        return self.contexts[interface]
+
+    async def aget_write_proxy(self, interface: str) -> Any:  # noqa: ANN401
+        return self.states[interface]
+
+    async def aget_read_only_proxy(self, interface: str) -> Any:  # noqa: ANN401
+        return self.states[interface]
+
+
+def _plan() -> InjectionPlan:
+    return InjectionPlan.compile(
+        PreparedContextVariables(
+            context_variables={"connection": "conn"}, required_context_locks={}
+        ),
+        PreparedStateVariables(
+            write_state_variables={"counter": "counter"},
+            read_only_variables={},
+            required_state_locks={},
+        ),
+        PreparedDependencyVariables(dependency_variables={"microscope": Microscope}),
+    )
+
+
+@pytest.mark.asyncio
+async def test_plan_merges_inputs_and_locals() -> None:
+    agent = CountingAgent()
+    plan = _plan()
+
+    params = await plan.aresolve(agent, {"x": 1})
+
+    assert params["x"] == 1
+    assert params["connection"] is agent.contexts["conn"]
+    assert params["counter"] is agent.states["counter"]
+    # Dependency proxies are built once, not per assignment.
+    assert params["microscope"] is (await plan.aresolve(agent, {}))["microscope"]
+
+
+@pytest.mark.asyncio
+async def test_contexts_are_resolved_once_per_revision() -> None:
+    agent = CountingAgent()
+    plan = _plan()
+
+    await plan.aresolve(agent, {})
+    await plan.aresolve(agent, {})
+    assert agent.context_calls == ["conn"]
+
+    agent.contexts["conn"] = replacement = object()
+    agent.locals_revision += 1
+    params = await plan.aresolve(agent, {})
+    assert params["connection"] is replacement
+    assert agent.context_calls == ["conn", "conn"]
@@ -8,12 +8,20 @@ policy controls whether assignments to one actor run serially or in parallel.
 """
 
 import asyncio
+from dataclasses import dataclass
 
 import pytest
 
-from rekuest_next.agents.lock import LockGroup, TaskLock
+from rekuest_next import messages
+from rekuest_next.actors.actify import derive_implementation_details
+from rekuest_next.actors.types import RegisterConfig
+from rekuest_next.agents.lock import LockGroup, ReaderWriterLock, TaskLock
 from rekuest_next.api.schema import LockDefinitionInput, LockImplementationInput
+from rekuest_next.contrib.fastapi.agent import _lock_routing_keys
 from rekuest_next.rekuest import RekuestNext
+from rekuest_next.state.decorator import state
+from rekuest_next.state.lock import acquired_locks
+from rekuest_next.state.types import ReadOnly
 
 
 def test_collect_from_extensions_builds_task_locks(mock_rekuest: RekuestNext) -> None:
@@ -179,3 +187,128 @@ async def test_shared_lock_key_serializes_across_actors(
         ["in-1", "out-1", "in-2", "out-2"],
         ["in-2", "out-2", "in-1", "out-1"],
     )
+
+
+class RecordingLockAgent:
+    """Duck-typed agent that records the lock announcements it receives."""
+
+    def __init__(self) -> None:
+        self.announced: list[tuple[str, list[str]]] = []
+
+    async def alock(self, key: str, task: str) -> None:
+        self.announced.append(("lock", [key]))
+
+    async def aunlock(self, key: str) -> None:
+        self.announced.append(("unlock", [key]))
+
+    async def alock_group(self, keys: list[str], task: str) -> None:
+        self.announced.append(("lock", list(keys)))
+
+    async def aunlock_group(self, keys: list[str]) -> None:
+        self.announced.append(("unlock", list(keys)))
+
+
+def _task_lock(agent, key: str) -> TaskLock:
+    return TaskLock(
+        agent,
+        LockImplementationInput(
+            key=key, definition=LockDefinitionInput(key=key, description=key)
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_lock_group_is_announced_once() -> None:
+    agent = RecordingLockAgent()
+    locks = [_task_lock(agent, key) for key in ("c", "a", "b")]
+
+    async with LockGroup(locks, "assign-1"):
+        assert all(lock.lock.locked() for lock in locks)
+
+    assert agent.announced == [("lock", ["a", "b", "c"]), ("unlock", ["a", "b", "c"])]
+    assert not any(lock.lock.locked() for lock in locks)
+
+
+@pytest.mark.asyncio
+async def test_failed_group_announcement_releases_every_key() -> None:
+    class FailingGroupAgent(RecordingLockAgent):
+        async def alock_group(self, keys: list[str], task: str) -> None:
+            raise RuntimeError("transport down")
+
+    agent = FailingGroupAgent()
+    locks = [_task_lock(agent, key) for key in ("a", "b")]
+
+    with pytest.raises(RuntimeError, match="transport down"):
+        async with LockGroup(locks, "assign-1"):
+            pass
+
+    assert not any(lock.lock.locked() for lock in locks)
+    # Nothing was announced, so nothing is unannounced either
+    assert agent.announced == []
+
+
+def test_grouped_lock_messages_route_to_every_key() -> None:
+    grouped = messages.Lock(key="a", keys=["a", "b"], task="assign-1")
+    assert _lock_routing_keys(grouped) == ["a", "b"]
+    assert _lock_routing_keys(messages.Unlock(key="a")) == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_readers_share_and_waiting_writer_blocks_new_readers() -> None:
+    lock = ReaderWriterLock()
+
+    await lock.acquire_shared()
+    await asyncio.wait_for(lock.acquire_shared(), 1)
+    assert lock.readers == 2
+
+    writer = asyncio.create_task(lock.acquire())
+    await asyncio.sleep(0)
+    late_reader = asyncio.create_task(lock.acquire_shared())
+    await asyncio.sleep(0)
+    # The writer waits for the readers, the late reader waits for the writer
+    assert not writer.done() and not late_reader.done()
+
+    lock.release_shared()
+    lock.release_shared()
+    await asyncio.wait_for(writer, 1)
+    assert not late_reader.done()
+
+    lock.release()
+    await asyncio.wait_for(late_reader, 1)
+    assert lock.readers == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_group_keys_are_not_announced() -> None:
+    agent = RecordingLockAgent()
+    camera, stage = _task_lock(agent, "camera"), _task_lock(agent, "stage")
+
+    async with LockGroup([stage], "assign-1", shared_locks=[camera, stage]):
+        async with LockGroup([], "assign-2", shared_locks=[camera]):
+            assert camera.reading_tasks == {"assign-1", "assign-2"}
+        assert stage.locking_task == "assign-1"
+
+    assert agent.announced == [("lock", ["stage"]), ("unlock", ["stage"])]
+    assert not camera.lock.locked() and not stage.lock.locked()
+
+
+def test_read_only_state_infers_shared_lock() -> None:
+    @state(required_locks=["camera"])
+    @dataclass
+    class CameraState:
+        exposure: float = 0.0
+
+    def read(camera: ReadOnly[CameraState]) -> float:
+        """Read the exposure."""
+        return camera.exposure
+
+    details = derive_implementation_details(read, RegisterConfig())
+    assert details.locks == []
+    assert details.read_locks == ["camera"]
+
+    camera = CameraState()
+    with acquired_locks(shared=("camera",)):
+        with pytest.raises(RuntimeError, match="only held for reading"):
+            camera.exposure = 1.0
+    with acquired_locks("camera"):
+        camera.exposure = 1.0
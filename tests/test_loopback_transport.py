@@ -0,0 +1,133 @@
+"""Tests for the in-memory loopback transport."""
+
+import asyncio
+from typing import AsyncGenerator, AsyncIterator, Tuple
+
+import pytest
+import pytest_asyncio
+
+from rekuest_next import messages
+from rekuest_next.actors.types import RegisterConfig
+from rekuest_next.agents.transport.errors import AgentTransportException
+from rekuest_next.agents.transport.loopback import (
+    LoopbackAgent,
+    LoopbackAgentTransport,
+    LoopbackDriver,
+)
+from rekuest_next.app import AppRegistry
+from rekuest_next.register import register_func
+from rekuest_next.structures.default import get_default_structure_registry
+
+
+async def add_one(x: int) -> int:
+    """Add one to a number."""
+    return x + 1
+
+
+async def count_to(x: int) -> AsyncGenerator[int, None]:
+    """Count up to a number."""
+    for i in range(x):
+        yield i
+
+
+async def sleep_long() -> None:
+    """Sleep until cancelled."""
+    await asyncio.sleep(60)
+
+
+@pytest_asyncio.fixture
+async def looped() -> AsyncIterator[Tuple[LoopbackDriver, LoopbackAgent]]:
+    registry = AppRegistry()
+    for function in (add_one, count_to, sleep_long):
+        register_func(
+            function, get_default_structure_registry(), registry, RegisterConfig()
+        )
+
+    transport = LoopbackAgentTransport()
+    agent = LoopbackAgent(transport=transport, app_registry=registry, name="loop")
+    async with agent:
+        provide = asyncio.create_task(agent.aprovide())
+        yield transport.driver, agent
+        provide.cancel()
+        try:
+            await provide
+        except asyncio.CancelledError:
+            pass
+
+
+@pytest.mark.asyncio
+async def test_assignment_completes(
+    looped: Tuple[LoopbackDriver, LoopbackAgent],
+) -> None:
+    driver, agent = looped
+
+    task = await driver.aassign("add_one", {"x": 1})
+    events = [event async for event in driver.aevents(task)]
+
+    assert isinstance(events[-1], messages.Completed)
+    yields = [event for event in events if isinstance(event, messages.Yield)]
+    assert [event.returns for event in yields] == [{"return0": 2}]
+    # The terminal report was acknowledged
+    await asyncio.sleep(0)
+    assert agent._unacked_events == {}
+
+
+@pytest.mark.asyncio
+async def test_generator_reports_every_yield(
+    looped: Tuple[LoopbackDriver, LoopbackAgent],
+) -> None:
+    driver, _ = looped
+
+    task = await driver.aassign("count_to", {"x": 3})
+    events = [event async for event in driver.aevents(task)]
+
+    yields = [event for event in events if isinstance(event, messages.Yield)]
+    assert [event.returns for event in yields] == [
+        {"return0": 0},
+        {"return0": 1},
+        {"return0": 2},
+    ]
+    assert isinstance(events[-1], messages.Completed)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_assignments_are_routed_by_task(
+    looped: Tuple[LoopbackDriver, LoopbackAgent],
+) -> None:
+    driver, _ = looped
+
+    tasks = [await driver.aassign("add_one", {"x": i}) for i in range(50)]
+    for i, task in enumerate(tasks):
+        events = [event async for event in driver.aevents(task)]
+        assert {event.task for event in events} == {task}
+        (yielded,) = [e for e in events if isinstance(e, messages.Yield)]
+        assert yielded.returns == {"return0": i + 1}
+
+
+@pytest.mark.asyncio
+async def test_cancel_ends_the_task(
+    looped: Tuple[LoopbackDriver, LoopbackAgent],
+) -> None:
+    driver, _ = looped
+
+    task = await driver.aassign("sleep_long")
+    await asyncio.sleep(0.05)
+    await driver.acancel(task)
+
+    result = await driver.aresult(task, timeout=5)
+    assert isinstance(result, messages.Cancelled)
+
+
+@pytest.mark.asyncio
+async def test_unknown_task_raises(
+    looped: Tuple[LoopbackDriver, LoopbackAgent],
+) -> None:
+    driver, _ = looped
+
+    with pytest.raises(AgentTransportException):
+        await driver.aresult("not-assigned", timeout=1)
+
+
+def test_driver_requires_entered_transport() -> None:
+    with pytest.raises(AgentTransportException):
+        LoopbackAgentTransport().driver
@@ -0,0 +1,210 @@
+"""Tests for the metrics layer and its hooks into the agent runtime."""
+
+from typing import Iterator, List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from rekuest_next.actors.types import RegisterConfig
+from rekuest_next.agents.base import BaseAgent
+from rekuest_next.agents.lock import LockGroup
+from rekuest_next.agents.transport.loopback import LoopbackAgentTransport
+from rekuest_next.agents.transport.websocket import (
+    WebsocketAgentTransport,
+    token_loader,
+)
+from rekuest_next.app import AppRegistry
+from rekuest_next.contrib.fastapi.routes import add_metrics_routes
+from rekuest_next import messages
+from rekuest_next.metrics import (
+    MetricSample,
+    MetricsRegistry,
+    get_default_metrics_registry,
+    set_default_metrics_registry,
+)
+from rekuest_next.register import register_func
+from rekuest_next.rekuest import RekuestNext
+from rekuest_next.structures.default import get_default_structure_registry
+from .conftest import RecordingTransport
+from .test_micro_task import _agent, _assign, count_to
+
+
+@pytest.fixture
+def registry() -> Iterator[MetricsRegistry]:
+    previous = get_default_metrics_registry()
+    registry = MetricsRegistry()
+    set_default_metrics_registry(registry)
+    yield registry
+    set_default_metrics_registry(previous)
+
+
+def _values(registry: MetricsRegistry, name: str) -> List[MetricSample]:
+    return [sample for sample in registry.collect() if sample.name == name]
+
+
+def test_prometheus_text_format() -> None:
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency", "A latency.", ("phase",), buckets=(1, 2))
+    latency.labels("run").observe(0.5)
+    latency.labels("run").observe(1.5)
+    latency.labels("run").observe(5)
+    registry.counter("sent", "Sent messages.").inc(3)
+    registry.gauge("depth", "A depth.").set_function(lambda: 7)
+
+    assert registry.render_prometheus().splitlines() == [
+        "# HELP latency A latency.",
+        "# TYPE latency histogram",
+        'latency_bucket{phase="run",le="1.0"} 1.0',
+        'latency_bucket{phase="run",le="2.0"} 2.0',
+        'latency_bucket{phase="run",le="+Inf"} 3.0',
+        'latency_sum{phase="run"} 7.0',
+        'latency_count{phase="run"} 3.0',
+        "# HELP sent Sent messages.",
+        "# TYPE sent counter",
+        "sent_total 3.0",
+        "# HELP depth A depth.",
+        "# TYPE depth gauge",
+        "depth 7.0",
+    ]
+
+
+def test_sinks_receive_exports_and_failures_are_isolated() -> None:
+    registry = MetricsRegistry()
+    registry.counter("sent", "Sent messages.").inc()
+    received: List[List[MetricSample]] = []
+
+    def broken(samples: List[MetricSample]) -> None:
+        raise RuntimeError("sink down")
+
+    registry.add_sink(broken)
+    registry.add_sink(received.append)
+    registry.export()
+
+    assert received == [[MetricSample("sent_total", (), 1.0)]]
+
+
+def test_metric_names_are_typed() -> None:
+    registry = MetricsRegistry()
+    registry.counter("sent", "Sent messages.")
+    with pytest.raises(ValueError):
+        registry.gauge("sent", "Not a counter.")
+
+
+@pytest.mark.asyncio
+async def test_on_assign_records_phase_latencies(
+    registry: MetricsRegistry, recording_transport: RecordingTransport
+) -> None:
+    app_registry = AppRegistry()
+    register_func(
+        count_to, get_default_structure_registry(), app_registry, RegisterConfig()
+    )
+    agent = BaseAgent(
+        transport=recording_transport, app_registry=app_registry, name="m"
+    )
+    await agent.process(messages.Init(agent="agent-1", local_assign=True))
+
+    [event async for event in agent.caller_postman.aassign(_assign("count_to", 3))]
+
+    counts = {
+        dict(sample.labels)["phase"]: sample.value
+        for sample in _values(registry, "rekuest_assignment_phase_seconds_count")
+        if dict(sample.labels)["interface"] == "count_to"
+    }
+    assert counts == {"expand": 1, "execute": 1, "shrink": 1}
+
+
+@pytest.mark.asyncio
+async def test_micro_tasks_record_phase_latencies(
+    registry: MetricsRegistry, recording_transport: RecordingTransport
+) -> None:
+    agent = _agent(recording_transport)
+    await agent.process(messages.Init(agent="agent-1", local_assign=True))
+
+    [event async for event in agent.caller_postman.aassign(_assign("add_one", 1))]
+
+    counts = {
+        dict(sample.labels)["phase"]: sample.value
+        for sample in _values(registry, "rekuest_assignment_phase_seconds_count")
+        if dict(sample.labels)["interface"] == "add_one"
+    }
+    assert counts == {"expand": 1, "execute": 1, "shrink": 1}
+
+
+@pytest.mark.asyncio
+async def test_lock_group_records_wait_per_lock(
+    registry: MetricsRegistry, mock_rekuest: RekuestNext
+) -> None:
+    def snap(x: int) -> int:
+        """Take a picture."""
+        return x
+
+    mock_rekuest.register(snap, locks=["camera"])
+    agent = mock_rekuest.agent
+    agent.collect_from_extensions()
+
+    async with LockGroup(agent.get_locks_for_keys(["camera"]), "task-1"):
+        pass
+
+    (count,) = _values(registry, "rekuest_lock_wait_seconds_count")
+    assert count.labels == (("lock", "camera"),)
+    assert count.value == 1
+
+
+def _gauge(registry: MetricsRegistry, name: str) -> float:
+    (sample,) = _values(registry, name)
+    return sample.value
+
+
+@pytest.mark.asyncio
+async def test_agent_gauges_sum_over_live_agents(registry: MetricsRegistry) -> None:
+    agents = [
+        BaseAgent(
+            transport=LoopbackAgentTransport(), app_registry=AppRegistry(), name=name
+        )
+        for name in ("first", "second")
+    ]
+    for agent, count in zip(agents, (2, 1)):
+        await agent.__aenter__()
+        agent._bind_metrics()
+        for i in range(count):
+            agent.managed_assignments[f"{agent.name}-{i}"] = _assign("count_to", i)
+
+    assert _gauge(registry, "rekuest_active_assignments") == 3
+
+    await agents[0].__aexit__(None, None, None)
+    assert _gauge(registry, "rekuest_active_assignments") == 1
+    await agents[1].__aexit__(None, None, None)
+
+
+@pytest.mark.asyncio
+async def test_transport_gauges_stop_counting_closed_transports(
+    registry: MetricsRegistry,
+) -> None:
+    first, second = (
+        WebsocketAgentTransport(
+            endpoint_url="ws://localhost:8000/agi", token_loader=token_loader
+        )
+        for _ in range(2)
+    )
+    async with first:
+        async with second:
+            assert first._in_queue is not None and second._in_queue is not None
+            await first._in_queue.put(None)
+            await second._in_queue.put(None)
+            assert _gauge(registry, "rekuest_transport_in_queue_depth") == 2
+
+        assert _gauge(registry, "rekuest_transport_in_queue_depth") == 1
+
+
+def test_metrics_route_serves_the_default_registry(registry: MetricsRegistry) -> None:
+    registry.counter("sent", "Sent messages.").inc()
+    app = FastAPI()
+    add_metrics_routes(app)
+
+    with TestClient(app) as client:
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "sent_total 1.0" in response.text
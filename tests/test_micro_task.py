@@ -0,0 +1,141 @@
+"""No-Docker checks for the micro-task execution path of functional actors."""
+
+from typing import AsyncGenerator
+
+import pytest
+
+from rekuest_next import messages
+from rekuest_next.actors.types import RegisterConfig
+from rekuest_next.agents.base import BaseAgent
+from rekuest_next.api.schema import TaskEventKind
+from rekuest_next.app import AppRegistry
+from rekuest_next.register import register_func
+from rekuest_next.remote import _build_assign_input
+from rekuest_next.state.publish import DirectPublisher, get_current_publisher
+from rekuest_next.structures.default import get_default_structure_registry
+
+from .conftest import RecordingTransport
+
+
+async def add_one(x: int) -> int:
+    """Add one to a number."""
+    return x + 1
+
+
+async def count_to(x: int) -> AsyncGenerator[int, None]:
+    """Count up to a number."""
+    for i in range(x):
+        yield i
+
+
+async def publishes_directly(x: int) -> bool:
+    """Check the state publishing context of the assignment."""
+    return isinstance(get_current_publisher(), DirectPublisher)
+
+
+def _agent(transport: RecordingTransport) -> BaseAgent:
+    registry = AppRegistry()
+    for function in (add_one, count_to, publishes_directly):
+        register_func(
+            function,
+            get_default_structure_registry(),
+            registry,
+            RegisterConfig(micro_task=True),
+        )
+    return BaseAgent(transport=transport, app_registry=registry, name="micro")
+
+
+def _assign(interface: str, x: int):
+    return _build_assign_input(
+        args={"x": x},
+        reference="ref-1",
+        hooks=None,
+        parent=None,
+        cached=False,
+        log=False,
+        capture=False,
+    ).model_copy(update={"interface": interface, "agent": "agent-1"})
+
+
+@pytest.mark.asyncio
+async def test_micro_function_yields_unless_the_backend_allows_folding(
+    recording_transport: RecordingTransport,
+) -> None:
+    agent = _agent(recording_transport)
+    await agent.process(messages.Init(agent="agent-1", local_assign=True))
+
+    events = [
+        event async for event in agent.caller_postman.aassign(_assign("add_one", 1))
+    ]
+
+    assert [e.kind for e in events] == [TaskEventKind.YIELD, TaskEventKind.COMPLETED]
+    (yielded,) = [m for m in recording_transport.sent if isinstance(m, messages.Yield)]
+    assert yielded.returns == {"return0": 2}
+    (completed,) = [
+        m for m in recording_transport.sent if isinstance(m, messages.Completed)
+    ]
+    assert completed.returns is None
+
+
+@pytest.mark.asyncio
+async def test_micro_function_folds_result_into_completed(
+    recording_transport: RecordingTransport,
+) -> None:
+    agent = _agent(recording_transport)
+    await agent.process(
+        messages.Init(agent="agent-1", fold_returns=True, local_assign=True)
+    )
+
+    events = [
+        event async for event in agent.caller_postman.aassign(_assign("add_one", 1))
+    ]
+
+    # The caller still sees a yield followed by the completion.
+    assert [e.kind for e in events] == [TaskEventKind.YIELD, TaskEventKind.COMPLETED]
+    assert events[0].returns == {"return0": 2}
+
+    reports = [
+        m for m in recording_transport.sent if not isinstance(m, messages.LocalAssign)
+    ]
+    assert not any(isinstance(m, (messages.Progress, messages.Yield)) for m in reports)
+    (completed,) = [m for m in reports if isinstance(m, messages.Completed)]
+    assert completed.returns == {"return0": 2}
+
+
+@pytest.mark.asyncio
+async def test_micro_generator_still_yields(
+    recording_transport: RecordingTransport,
+) -> None:
+    agent = _agent(recording_transport)
+    await agent.process(messages.Init(agent="agent-1", local_assign=True))
+
+    events = [
+        event async for event in agent.caller_postman.aassign(_assign("count_to", 3))
+    ]
+
+    assert [e.returns for e in events if e.kind == TaskEventKind.YIELD] == [
+        {"return0": 0},
+        {"return0": 1},
+        {"return0": 2},
+    ]
+    (completed,) = [
+        m for m in recording_transport.sent if isinstance(m, messages.Completed)
+    ]
+    assert completed.returns is None
+
+
+@pytest.mark.asyncio
+async def test_micro_tasks_publish_state_directly(
+    recording_transport: RecordingTransport,
+) -> None:
+    agent = _agent(recording_transport)
+    await agent.process(messages.Init(agent="agent-1", local_assign=True))
+
+    events = [
+        event
+        async for event in agent.caller_postman.aassign(
+            _assign("publishes_directly", 1)
+        )
+    ]
+
+    assert events[0].returns == {"return0": True}
@@ -0,0 +1,75 @@
+"""Tests for the in-place JSON-pointer patch applier."""
+
+import copy
+import random
+
+import jsonpatch  # type: ignore[import-untyped]
+import pytest
+
+from rekuest_next.state.apply import (
+    PatchApplicationError,
+    apply_operation,
+    apply_operations,
+    parse_pointer,
+)
+from rekuest_next.state.diff import diff_json
+
+
+def test_pointer_tokens_are_unescaped() -> None:
+    assert parse_pointer("") == ()
+    assert parse_pointer("/a~1b/c~0d/0") == ("a/b", "c~d", "0")
+
+
+def test_single_operations_modify_in_place() -> None:
+    document = {"positions": [1, 2], "meta": {"label": "a"}}
+
+    assert apply_operation(document, "add", "/positions/-", 3) is document
+    apply_operation(document, "add", "/positions/0", 0)
+    apply_operation(document, "replace", "/meta/label", "b")
+    apply_operation(document, "remove", "/positions/1")
+    apply_operation(document, "add", "/meta/a~1b", True)
+
+    assert document == {"positions": [0, 2, 3], "meta": {"label": "b", "a/b": True}}
+    assert apply_operation(document, "replace", "", [1]) == [1]
+
+
+def test_invalid_operations_raise() -> None:
+    with pytest.raises(PatchApplicationError):
+        apply_operation({"a": 1}, "replace", "/b", 2)
+    with pytest.raises(PatchApplicationError):
+        apply_operation({"a": [1]}, "remove", "/a/1")
+    with pytest.raises(PatchApplicationError):
+        apply_operation({"a": 1}, "add", "/a/b/c", 2)
+
+
+def test_copy_values_keeps_inserted_values_untouched() -> None:
+    value = {"x": 1}
+    document = apply_operations(
+        {},
+        [
+            {"op": "add", "path": "/item", "value": value},
+            {"op": "replace", "path": "/item/x", "value": 2},
+        ],
+        copy_values=True,
+    )
+    assert document == {"item": {"x": 2}}
+    assert value == {"x": 1}
+
+
+def _random_document(rng: random.Random, depth: int = 0) -> object:
+    if depth > 2 or rng.random() < 0.3:
+        return rng.choice([1, "a", None, True, 2.5])
+    if rng.random() < 0.5:
+        return [_random_document(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {f"k{i}": _random_document(rng, depth + 1) for i in range(rng.randint(0, 4))}
+
+
+def test_batch_matches_jsonpatch() -> None:
+    rng = random.Random(7)
+    for _ in range(200):
+        old, new = _random_document(rng), _random_document(rng)
+        operations = diff_json(old, new)
+
+        expected = jsonpatch.apply_patch(old, operations, in_place=False)
+        assert expected == new
+        assert apply_operations(copy.deepcopy(old), operations) == expected
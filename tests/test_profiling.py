@@ -0,0 +1,122 @@
+"""Tests for the opt-in per-assignment profiling."""
+
+import asyncio
+import pstats
+from pathlib import Path
+from typing import AsyncGenerator, List
+
+import pytest
+
+from rekuest_next import messages
+from rekuest_next.actors.profiling import AssignmentProfiler
+from rekuest_next.actors.types import RegisterConfig
+from rekuest_next.agents.base import BaseAgent
+from rekuest_next.app import AppRegistry
+from rekuest_next.datalayer import LocalDataLayer
+from rekuest_next.register import register_func
+from rekuest_next.structures.default import get_default_structure_registry
+from .conftest import RecordingTransport
+
+
+def busy_sum(x: int) -> int:
+    """Sum up to a number in a worker thread."""
+    return sum(range(x))
+
+
+async def busy_ticks(x: int) -> AsyncGenerator[int, None]:
+    """Yield a few busy ticks."""
+    for i in range(x):
+        yield sum(range(1000 * (i + 1)))
+
+
+def _agent(transport: RecordingTransport, profile: bool, **kwargs: object) -> BaseAgent:
+    registry = AppRegistry()
+    for function in (busy_sum, busy_ticks):
+        register_func(
+            function,
+            get_default_structure_registry(),
+            registry,
+            RegisterConfig(profile=profile),
+        )
+    return BaseAgent(
+        transport=transport,
+        app_registry=registry,
+        name="profiled",
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+async def _run(
+    agent: BaseAgent,
+    transport: RecordingTransport,
+    interface: str,
+    profile: bool | None = None,
+) -> List[messages.Log]:
+    await agent.process(
+        messages.Assign(
+            interface=interface,
+            task="task-1",
+            args={"x": 3},
+            user="user",
+            org="org",
+            action="action",
+            implementation="implementation",
+            profile=profile,
+        )
+    )
+    sent = transport.sent
+    for _ in range(200):
+        if any(isinstance(m, (messages.Completed, messages.Critical)) for m in sent):
+            break
+        await asyncio.sleep(0.01)
+    return [m for m in sent if isinstance(m, messages.Log)]
+
+
+@pytest.mark.asyncio
+async def test_unprofiled_assignments_send_no_profile(
+    recording_transport: RecordingTransport,
+) -> None:
+    agent = _agent(recording_transport, profile=False)
+    logs = await _run(agent, recording_transport, "busy_sum")
+    assert logs == []
+
+
+@pytest.mark.asyncio
+async def test_threaded_functions_are_profiled_in_their_thread(
+    recording_transport: RecordingTransport,
+) -> None:
+    agent = _agent(recording_transport, profile=True)
+    (log,) = await _run(agent, recording_transport, "busy_sum")
+    assert log.level == "DEBUG"
+    assert "busy_sum" in log.message
+
+
+@pytest.mark.asyncio
+async def test_assign_can_request_a_profile(
+    tmp_path: Path, recording_transport: RecordingTransport
+) -> None:
+    agent = _agent(
+        recording_transport,
+        profile=False,
+        datalayer=LocalDataLayer(root=str(tmp_path)),
+    )
+
+    (log,) = await _run(agent, recording_transport, "busy_ticks", profile=True)
+
+    assert "busy_ticks" in log.message
+    (stored,) = tmp_path.iterdir()
+    assert stored.name in log.message
+    # The stored dump is a regular pstats profile
+    assert pstats.Stats(str(stored)).total_calls > 0  # type: ignore[attr-defined]
+
+
+def test_threaded_generators_are_profiled_per_step() -> None:
+    profiler = AssignmentProfiler()
+
+    def gen(n: int):
+        for i in range(n):
+            yield busy_sum(i)
+
+    assert list(profiler.wrap_sync(gen)(3)) == [0, 0, 1]
+    summary = profiler.summary()
+    assert summary is not None and "busy_sum" in summary
@@ -0,0 +1,91 @@
+"""Tests for the rate-limited progress/log channel used by worker threads."""
+
+import asyncio
+from typing import List
+
+import pytest
+from koil import run_threaded
+
+from rekuest_next import messages
+from rekuest_next.actors.reporting import ReportChannel
+
+
+def _channel(sent: List[messages.FromAgentMessage], max_rate: float) -> ReportChannel:
+    async def asend(message: messages.FromAgentMessage) -> None:
+        sent.append(message)
+
+    return ReportChannel("task-1", asend, asyncio.get_running_loop(), max_rate)
+
+
+@pytest.mark.asyncio
+async def test_tight_progress_loop_is_coalesced() -> None:
+    sent: List[messages.FromAgentMessage] = []
+    channel = _channel(sent, max_rate=20)
+
+    def work() -> None:
+        for i in range(101):
+            channel.post_progress(i)
+            channel.post_log("INFO", f"step {i}")
+
+    await run_threaded(work)
+    await channel.aclose()
+
+    progresses = [m for m in sent if isinstance(m, messages.Progress)]
+    logs = [m for m in sent if isinstance(m, messages.Log)]
+    assert len(progresses) < 10
+    assert progresses[-1].progress == 100
+    # Every line arrives, in order, but batched
+    assert "\n".join(m.message for m in logs).split("\n") == [
+        f"step {i}" for i in range(101)
+    ]
+    assert len(logs) < 10
+
+
+@pytest.mark.asyncio
+async def test_flusher_is_rate_limited() -> None:
+    sent: List[messages.FromAgentMessage] = []
+    channel = _channel(sent, max_rate=10)
+
+    channel.post_progress(1)
+    await asyncio.sleep(0.02)
+    assert [m.progress for m in sent] == [1]
+
+    channel.post_progress(2)
+    channel.post_progress(3)
+    await asyncio.sleep(0.02)
+    # The second flush waits for its slot ...
+    assert [m.progress for m in sent] == [1]
+    await asyncio.sleep(0.15)
+    # ... and only carries the newest value
+    assert [m.progress for m in sent] == [1, 3]
+    await channel.aclose()
+
+
+@pytest.mark.asyncio
+async def test_log_levels_are_batched_separately() -> None:
+    sent: List[messages.FromAgentMessage] = []
+    channel = _channel(sent, max_rate=0)
+
+    channel.post_log("INFO", "a")
+    channel.post_log("INFO", "b")
+    channel.post_log("ERROR", "c")
+    await channel.aclose()
+
+    assert [(m.level, m.message) for m in sent] == [("INFO", "a\nb"), ("ERROR", "c")]
+
+
+@pytest.mark.asyncio
+async def test_reports_after_close_are_dropped() -> None:
+    sent: List[messages.FromAgentMessage] = []
+    channel = _channel(sent, max_rate=0)
+
+    channel.post_progress(1)
+    await channel.aclose()
+    tasks = asyncio.all_tasks()
+
+    await run_threaded(channel.post_log, "INFO", "late")
+    await asyncio.sleep(0.01)
+
+    assert [type(m) for m in sent] == [messages.Progress]
+    assert asyncio.all_tasks() == tasks
+    assert not channel._logs
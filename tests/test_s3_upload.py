@@ -0,0 +1,209 @@
+"""Tests for the pooled S3 clients and multipart uploads of the datalayer."""
+
+import asyncio
+import contextlib
+import io
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from rekuest_next.datalayer import DataLayer
+from rekuest_next.io.s3 import (
+    S3ClientPool,
+    S3Credentials,
+    aput_object,
+    current_grant_credentials,
+)
+
+
+@dataclass(frozen=True)
+class Credentials:
+    access_key: str = "access"
+    secret_key: str = "secret"
+    session_token: str = "token"
+
+
+class FakeS3Client:
+    """Records the S3 calls of an upload."""
+
+    def __init__(self, fail_part: int | None = None) -> None:
+        self.calls: List[Tuple[str, Dict[str, Any]]] = []
+        self.fail_part = fail_part
+
+    async def put_object(self, **kwargs: Any) -> None:  # noqa: ANN401
+        self.calls.append(("put_object", {**kwargs, "Body": kwargs["Body"].read()}))
+
+    async def create_multipart_upload(self, **kwargs: Any) -> Dict[str, str]:  # noqa: ANN401
+        self.calls.append(("create_multipart_upload", kwargs))
+        return {"UploadId": "upload-1"}
+
+    async def upload_part(self, **kwargs: Any) -> Dict[str, str]:  # noqa: ANN401
+        if kwargs["PartNumber"] == self.fail_part:
+            raise RuntimeError("part failed")
+        self.calls.append(("upload_part", kwargs))
+        return {"ETag": f"etag-{kwargs['PartNumber']}"}
+
+    async def complete_multipart_upload(self, **kwargs: Any) -> None:  # noqa: ANN401
+        self.calls.append(("complete_multipart_upload", kwargs))
+
+    async def abort_multipart_upload(self, **kwargs: Any) -> None:  # noqa: ANN401
+        self.calls.append(("abort_multipart_upload", kwargs))
+
+
+class CountingPool(S3ClientPool):
+    """Creates fake clients and records which are open."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        super().__init__(*args, **kwargs)
+        self.created = 0
+        self.open: List[FakeS3Client] = []
+
+    async def _acreate_client(
+        self, endpoint_url: str, credentials: S3Credentials
+    ) -> Tuple[Any, contextlib.AsyncExitStack]:
+        self.created += 1
+        client = FakeS3Client()
+        self.open.append(client)
+        stack = contextlib.AsyncExitStack()
+        stack.callback(self.open.remove, client)
+        return client, stack
+
+
+@pytest.mark.asyncio
+async def test_pool_shares_one_client_across_grants() -> None:
+    loads: List[int] = []
+
+    async def endpoint() -> str:
+        loads.append(1)
+        return "http://s3"
+
+    pool = CountingPool(endpoint)
+    first, second = Credentials(), Credentials(session_token="other")
+    for _ in range(3):
+        async with pool.aclient(first):
+            pass
+
+    async with pool.aclient(second) as client:
+        # Tasks started while borrowed, like multipart parts, sign as the grant
+        async def signing_credentials() -> S3Credentials | None:
+            return current_grant_credentials.get()
+
+        assert await asyncio.create_task(signing_credentials()) == second
+        async with pool.aclient(first) as nested:
+            assert nested is client
+            assert current_grant_credentials.get() == first
+        assert current_grant_credentials.get() == second
+
+    assert current_grant_credentials.get() is None
+    assert pool.created == 1
+    assert len(loads) == 1, "The endpoint is loaded once"
+
+    await pool.aclose()
+    assert pool.open == []
+
+
+@pytest.mark.asyncio
+async def test_pool_closes_a_borrowed_client_once_returned() -> None:
+    async def endpoint() -> str:
+        return "http://s3"
+
+    pool = CountingPool(endpoint)
+    async with pool.aclient(Credentials()):
+        await pool.aclose()
+        assert len(pool.open) == 1
+    assert pool.open == []
+
+
+@pytest.mark.asyncio
+async def test_requests_are_signed_with_the_grant_credentials() -> None:
+    pytest.importorskip("aiobotocore")
+
+    async def endpoint() -> str:
+        return "http://s3.invalid"
+
+    signed: List[str] = []
+
+    class Sent(Exception):
+        pass
+
+    def record(request: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        signed.append(request.headers["Authorization"].decode())
+        raise Sent()  # Nothing goes on the wire
+
+    pool = S3ClientPool(endpoint)
+    for access_key in ("first", "second"):
+        async with pool.aclient(Credentials(access_key=access_key)) as client:
+            if not signed:
+                client.meta.events.register("before-send.s3", record)
+            with pytest.raises(Sent):
+                await client.put_object(Bucket="bucket", Key="key", Body=b"abc")
+    await pool.aclose()
+
+    assert [header.split("Credential=")[1].split("/")[0] for header in signed] == [
+        "first",
+        "second",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_datalayer_closes_its_pool() -> None:
+    datalayer = DataLayer(endpoint_url="http://s3")
+    async with datalayer:
+        pool = datalayer.client_pool()
+        assert datalayer.client_pool() is pool
+        assert await pool.aendpoint_url() == "http://s3"
+    assert datalayer.client_pool() is not pool
+
+
+@pytest.mark.asyncio
+async def test_small_files_are_put_in_one_request() -> None:
+    client = FakeS3Client()
+    await aput_object(client, "bucket", "key", io.BytesIO(b"abc"))
+    assert client.calls == [
+        ("put_object", {"Bucket": "bucket", "Key": "key", "Body": b"abc"})
+    ]
+
+
+@pytest.mark.asyncio
+async def test_large_files_are_uploaded_in_parts() -> None:
+    client = FakeS3Client()
+    data = bytes(range(256)) * 10
+
+    await aput_object(
+        client,
+        "bucket",
+        "key",
+        io.BytesIO(data),
+        multipart_threshold=1000,
+        part_size=1000,
+        concurrency=2,
+    )
+
+    parts = [call for name, call in client.calls if name == "upload_part"]
+    assert b"".join(part["Body"] for part in parts) == data
+    assert [part["PartNumber"] for part in parts] == [1, 2, 3]
+    name, complete = client.calls[-1]
+    assert name == "complete_multipart_upload"
+    assert complete["MultipartUpload"]["Parts"] == [
+        {"PartNumber": number, "ETag": f"etag-{number}"} for number in (1, 2, 3)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_part_aborts_the_upload() -> None:
+    client = FakeS3Client(fail_part=2)
+
+    with pytest.raises(RuntimeError):
+        await aput_object(
+            client,
+            "bucket",
+            "key",
+            io.BytesIO(b"x" * 5000),
+            multipart_threshold=1000,
+            part_size=1000,
+        )
+
+    names = [name for name, _ in client.calls]
+    assert names[-1] == "abort_multipart_upload"
+    assert "complete_multipart_upload" not in names
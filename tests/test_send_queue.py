@@ -0,0 +1,70 @@
+"""Tests for the bounded, credit-based outbound queue of agent transports."""
+
+import asyncio
+import json
+
+import pytest
+
+from rekuest_next import messages
+from rekuest_next.agents.transport.encoding import encode_message
+from rekuest_next.agents.transport.flow import SendQueue
+from rekuest_next.messages import WireEncoding
+
+
+@pytest.mark.asyncio
+async def test_yields_wait_for_credit() -> None:
+    queue = SendQueue(yield_window=2)
+
+    await queue.put(messages.Yield(task="a", returns={"i": 0}))
+    await queue.put(messages.Yield(task="a", returns={"i": 1}))
+
+    # The third yield of "a" is suspended until the sender takes one off ...
+    blocked = asyncio.create_task(queue.put(messages.Yield(task="a", returns={"i": 2})))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+
+    # ... while other tasks are not held up by it.
+    await asyncio.wait_for(queue.put(messages.Yield(task="b", returns={})), 1)
+    await asyncio.wait_for(queue.put(messages.Completed(task="c")), 1)
+
+    await queue.get()
+    await asyncio.wait_for(blocked, 1)
+    assert queue.pending_yields("a") == 2
+
+
+@pytest.mark.asyncio
+async def test_conflating_yields_replace_the_waiting_one() -> None:
+    queue = SendQueue(yield_window=1)
+
+    for i in range(5):
+        await asyncio.wait_for(
+            queue.put(messages.Yield(task="a", returns={"i": i}, conflate=True)), 1
+        )
+    await queue.put(messages.Completed(task="a"))
+
+    sent = [await queue.get() for _ in range(queue.qsize())]
+    assert [type(m) for m in sent] == [messages.Yield, messages.Completed]
+    assert isinstance(sent[0], messages.Yield)
+    assert sent[0].returns == {"i": 4}
+    assert "conflate" not in json.loads(encode_message(sent[0], WireEncoding.JSON))
+
+
+@pytest.mark.asyncio
+async def test_queue_is_bounded_and_joinable() -> None:
+    queue = SendQueue(maxsize=1)
+
+    await queue.put(messages.Completed(task="a"))
+    blocked = asyncio.create_task(queue.put(messages.Completed(task="b")))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+
+    await queue.get()
+    queue.task_done()
+    await asyncio.wait_for(blocked, 1)
+
+    joined = asyncio.create_task(queue.join())
+    await asyncio.sleep(0)
+    assert not joined.done()
+    await queue.get()
+    queue.task_done()
+    await asyncio.wait_for(joined, 1)
@@ -0,0 +1,232 @@
+"""Tests for resuming the state stream after a reconnect."""
+
+import asyncio
+import json
+from typing import Iterator, List
+
+import pytest
+import websockets
+
+from rekuest_next import messages
+from rekuest_next.agents.base import BaseAgent
+from rekuest_next.agents.transport.websocket import WebsocketAgentTransport
+from rekuest_next.state.publish import Patch
+from .conftest import RecordingTransport
+from .test_state_transaction import TransactionAgent
+from .test_transport_lifecycle import FakeConnect, FakeSocket, _token
+
+
+async def _agent_with_revisions(
+    transport: RecordingTransport, revisions: int, history: int
+) -> TransactionAgent:
+    agent = TransactionAgent(
+        transport=transport,
+        published=[],
+        patch_history_size=history,
+    )
+    agent._current_shrunk_states["StageState"] = {"positions": []}
+    for revision in range(1, revisions + 1):
+        agent.global_revision = revision
+        agent._current_shrunk_states["StageState"]["positions"].append(revision)
+        await agent._apublish_state_patch(
+            messages.StatePatch(
+                session_id=agent.current_session,
+                global_rev=revision,
+                state_name="StageState",
+                ts=0,
+                op="add",
+                path="/positions/-",
+                value=revision,
+                old_value=None,
+            )
+        )
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_init_replays_only_the_missing_patches(
+    recording_transport: RecordingTransport,
+) -> None:
+    agent = await _agent_with_revisions(recording_transport, 10, history=5)
+
+    await agent.process(messages.Init(agent="agent-1", global_rev=7))
+
+    sent = recording_transport.sent
+    assert [patch.global_rev for patch in sent] == [8, 9, 10]
+
+
+@pytest.mark.asyncio
+async def test_replayed_patches_keep_their_published_values(
+    recording_transport: RecordingTransport,
+) -> None:
+    agent = TransactionAgent(transport=recording_transport, published=[])
+    agent._current_shrunk_states["Table"] = {"rows": []}
+
+    for op, path, value in (("add", "/rows/-", [1]), ("add", "/rows/0/-", 2)):
+        patch = Patch(op=op, path=path, value=value)
+        # Values arrive shrunk already, skip the port based shrinking
+        agent._aapply_patch_to_shrunk_state("Table", patch, value)
+        agent.global_revision += 1
+        await agent._apublish_state_patch(
+            messages.StatePatch(
+                session_id=agent.current_session,
+                global_rev=agent.global_revision,
+                state_name="Table",
+                ts=0,
+                op=op,
+                path=path,
+                value=value,
+                old_value=None,
+            )
+        )
+
+    assert agent._current_shrunk_states["Table"] == {"rows": [[1, 2]]}
+    await agent.process(messages.Init(agent="agent-1", global_rev=0))
+    assert [patch.value for patch in recording_transport.sent] == [[1], 2]
+
+
+@pytest.mark.asyncio
+async def test_init_without_a_gap_resends_nothing(
+    recording_transport: RecordingTransport,
+) -> None:
+    agent = await _agent_with_revisions(recording_transport, 3, history=5)
+
+    await agent.process(messages.Init(agent="agent-1", global_rev=3))
+    await agent.process(messages.Init(agent="agent-1"))
+
+    assert recording_transport.sent == []
+
+
+@pytest.mark.asyncio
+async def test_evicted_gap_falls_back_to_a_snapshot(
+    recording_transport: RecordingTransport,
+) -> None:
+    agent = await _agent_with_revisions(recording_transport, 10, history=5)
+
+    await agent.process(messages.Init(agent="agent-1", global_rev=4))
+
+    (snapshot,) = recording_transport.sent
+    assert isinstance(snapshot, messages.StateSnapshot)
+    assert snapshot.global_rev == 10
+    assert snapshot.snapshots == {"StageState": {"positions": list(range(1, 11))}}
+
+
+@pytest.mark.asyncio
+async def test_register_announces_the_last_sent_revision(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    first, second = FakeSocket(), FakeSocket()
+    sockets: Iterator[FakeSocket] = iter([first, second])
+    monkeypatch.setattr(
+        websockets, "connect", lambda *args, **kwargs: FakeConnect(next(sockets))
+    )
+
+    transport = WebsocketAgentTransport(
+        endpoint_url="ws://localhost:8000/agi",
+        token_loader=_token,
+        time_between_retries=0,
+    )
+
+    async with transport as transport:
+        await transport.aconnect()
+        await asyncio.sleep(0.05)
+        first.feed(messages.Init(agent="agent-1"))
+        await asyncio.sleep(0.05)
+        await transport.arelease_state(discard=False)
+
+        await transport.asend(
+            messages.StateSnapshot(session_id="session-1", global_rev=42, snapshots={})
+        )
+        await asyncio.sleep(0.05)
+        first.drop()
+        await asyncio.sleep(0.1)
+
+        registers: List[dict[str, object]] = [
+            json.loads(socket.sent[0]) for socket in (first, second)
+        ]
+        assert registers[0]["global_rev"] is None
+        assert registers[1]["state_session"] == "session-1"
+        assert registers[1]["global_rev"] == 42
+
+        await transport.adisconnect()
+
+
+class ForwardingAgent(BaseAgent):
+    """Agent that publishes state straight to its transport."""
+
+    async def apublish_patch(self, patch: messages.StatePatch) -> None:
+        await self.transport.asend(patch)
+
+    async def apublish_snapshot(self, snapshot: messages.StateSnapshot) -> None:
+        await self.transport.asend(snapshot)
+
+
+async def _publish(agent: BaseAgent, revisions: range) -> None:
+    for revision in revisions:
+        agent.global_revision = revision
+        await agent._apublish_state_patch(
+            messages.StatePatch(
+                session_id=agent.current_session,
+                global_rev=revision,
+                state_name="StageState",
+                ts=0,
+                op="add",
+                path="/positions/-",
+                value=revision,
+                old_value=None,
+            )
+        )
+
+
+def _sent_revisions(socket: FakeSocket) -> List[int]:
+    frames = [json.loads(frame) for frame in socket.sent]
+    return [frame["global_rev"] for frame in frames if frame["type"] == "STATE_PATCH"]
+
+
+@pytest.mark.asyncio
+async def test_patches_queued_over_a_reconnect_are_delivered_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    first, second = FakeSocket(), FakeSocket()
+    sockets: Iterator[FakeSocket] = iter([first, second])
+    monkeypatch.setattr(
+        websockets, "connect", lambda *args, **kwargs: FakeConnect(next(sockets))
+    )
+    transport = WebsocketAgentTransport(
+        endpoint_url="ws://localhost:8000/agi",
+        token_loader=_token,
+        time_between_retries=0,
+    )
+
+    async with transport as transport:
+        agent = ForwardingAgent(transport=transport)
+        await transport.aconnect()
+        await asyncio.sleep(0.05)
+        first.feed(messages.Init(agent="agent-1"))
+        await asyncio.sleep(0.05)
+        await agent.process(messages.Init(agent="agent-1"))
+
+        # Every send takes 10ms, so most patches are still queued at the drop
+        await _publish(agent, range(1, 6))
+        await asyncio.sleep(0.015)
+        first.drop()
+        await asyncio.sleep(0.05)
+        delivered = _sent_revisions(first)
+        assert delivered and delivered[-1] < 5
+
+        register = json.loads(second.sent[0])
+        assert register["global_rev"] == delivered[-1], (
+            "Register announces what was written, not what was queued"
+        )
+        # Published before the new connection's Init was handled
+        await _publish(agent, range(6, 8))
+
+        second.feed(messages.Init(agent="agent-1", global_rev=delivered[-1]))
+        await asyncio.sleep(0.05)
+        await agent.process(messages.Init(agent="agent-1", global_rev=delivered[-1]))
+        await _publish(agent, range(8, 9))
+        await asyncio.sleep(0.2)
+
+        assert delivered + _sent_revisions(second) == list(range(1, 9))
+
+        await transport.adisconnect()
@@ -0,0 +1,238 @@
+"""Tests for transactional state mutation and diff-at-commit publishing."""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from rekuest_next import messages
+from rekuest_next.api.schema import StateDefinitionInput
+from rekuest_next.agents.base import BaseAgent, QueuedPatchEvent
+from rekuest_next.contrib.fastapi.retriever.protocol import Snapshot
+from rekuest_next.contrib.sql_lite.retriever import SQLLiteRetriever
+from rekuest_next.contrib.sql_lite.sink import SQLLiteSink
+from rekuest_next.state.decorator import state
+from rekuest_next.state.diff import diff_json
+from rekuest_next.state.lock import acquired_locks
+from rekuest_next.state.observable import StateConfig, make_evented
+from rekuest_next.state.publish import BasePublisher, Patch
+from rekuest_next.state.transaction import TRANSACTION_OP, state_transaction
+from rekuest_next.structures.registry import StructureRegistry
+from .conftest import RecordingTransport
+
+
+@state
+@dataclass
+class StageState:
+    positions: List[int] = field(default_factory=list)
+    label: str = "stage"
+
+
+def _shrink(stage: "StageState") -> dict[str, Any]:
+    return {"positions": list(stage.positions), "label": stage.label}
+
+
+class RecordingHolder:
+    """State holder that records every published patch."""
+
+    def __init__(self) -> None:
+        self.patches: List[tuple[str, Patch]] = []
+
+    def publish_patch(self, interface: str, patch: Patch, task_id: Any = None) -> None:  # noqa: ANN401
+        self.patches.append((interface, patch))
+
+
+def test_diff_is_minimal() -> None:
+    old = {"a": 1, "b": [1, 2, 3], "c": {"x": True}}
+    new = {"a": 1, "b": [1, 5], "c": {"x": 1}, "d": None}
+
+    assert diff_json(old, new) == [
+        {"op": "replace", "path": "/b/1", "value": 5},
+        {"op": "remove", "path": "/b/2"},
+        {"op": "replace", "path": "/c/x", "value": 1},
+        {"op": "add", "path": "/d", "value": None},
+    ]
+    assert diff_json(old, old) == []
+
+
+def test_transaction_publishes_once() -> None:
+    stage = StageState()
+    holder = RecordingHolder()
+
+    with BasePublisher(holder), acquired_locks():
+        with state_transaction(stage):
+            for i in range(100):
+                stage.positions.append(i)
+            stage.label = "moved"
+
+    ((interface, patch),) = holder.patches
+    assert interface == "StageState"
+    assert patch.op == TRANSACTION_OP
+    # The state as committed, detached from later mutations
+    assert patch.value is not stage
+    assert patch.value.positions == list(range(100))
+    assert patch.value.label == "moved"
+
+
+def test_transaction_rolls_back_on_error() -> None:
+    stage = StageState(positions=[1, 2])
+    holder = RecordingHolder()
+
+    with BasePublisher(holder):
+        with pytest.raises(RuntimeError):
+            with state_transaction(stage):
+                stage.positions.append(3)
+                stage.label = "moved"
+                raise RuntimeError("failed")
+
+        assert stage.positions == [1, 2] and stage.label == "stage"
+        assert holder.patches == []
+
+        # The restored state still emits events
+        stage.positions.append(4)
+    assert [patch.op for _, patch in holder.patches] == ["add"]
+
+
+def test_dict_rooted_state_rolls_back_in_place() -> None:
+    config = StateConfig(
+        state_name="Settings",
+        definition=StateDefinitionInput(name="Settings", ports=()),
+        structure_registry=StructureRegistry(),
+    )
+    settings = make_evented({"mode": "idle", "points": [1, 2]}, config)
+    holder = RecordingHolder()
+
+    with BasePublisher(holder):
+        with pytest.raises(RuntimeError):
+            with state_transaction(settings):
+                settings["mode"] = "busy"
+                settings["points"].append(3)
+                del settings["points"][0]
+                settings["extra"] = True
+                raise RuntimeError("failed")
+
+        assert settings == {"mode": "idle", "points": [1, 2]}
+        assert holder.patches == []
+
+        # The restored containers still emit events
+        settings["points"].append(4)
+    assert [(patch.op, patch.path) for _, patch in holder.patches] == [
+        ("add", "/points/-")
+    ]
+
+
+class TransactionAgent(BaseAgent):
+    """Agent that shrinks states trivially and records what it publishes."""
+
+    published: List[messages.StatePatch] = []
+
+    async def ashrink_state(self, interface: str, state: Any) -> Any:  # noqa: ANN401
+        return _shrink(state)
+
+    async def apublish_patch(self, patch: messages.StatePatch) -> None:
+        self.published.append(patch)
+
+    async def apublish_snapshot(self, snapshot: messages.StateSnapshot) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_agent_publishes_the_diff_in_consecutive_revisions(
+    recording_transport: RecordingTransport,
+) -> None:
+    agent = TransactionAgent(transport=recording_transport, published=[])
+    stage = StageState(positions=[1, 2])
+    agent._current_shrunk_states["StageState"] = _shrink(stage)
+
+    holder = RecordingHolder()
+
+    with BasePublisher(holder):
+        with state_transaction(stage):
+            stage.positions[0] = 7
+            stage.positions.append(3)
+            stage.label = "moved"
+
+    ((interface, patch),) = holder.patches
+    await agent._aprocess_patch_event(
+        QueuedPatchEvent(interface=interface, patch=patch)
+    )
+
+    assert [(p.op, p.path, p.value) for p in agent.published] == [
+        ("replace", "/positions/0", 7),
+        ("add", "/positions/2", 3),
+        ("replace", "/label", "moved"),
+    ]
+    assert [p.global_rev for p in agent.published] == [1, 2, 3]
+    assert agent._current_shrunk_states["StageState"] == _shrink(stage)
+
+
+@pytest.mark.asyncio
+async def test_mutations_after_commit_are_published_once(
+    recording_transport: RecordingTransport,
+) -> None:
+    agent = TransactionAgent(transport=recording_transport, published=[])
+    stage = StageState(positions=[1, 2])
+    agent._current_shrunk_states["StageState"] = _shrink(stage)
+
+    holder = RecordingHolder()
+
+    with BasePublisher(holder), acquired_locks():
+        with state_transaction(stage):
+            stage.label = "moved"
+        # Mutated before the agent drained the transaction patch
+        stage.positions.append(3)
+
+    for interface, patch in holder.patches:
+        await agent._aprocess_patch_event(
+            QueuedPatchEvent(interface=interface, patch=patch)
+        )
+
+    assert [(p.op, p.path, p.value) for p in agent.published] == [
+        ("replace", "/label", "moved"),
+        ("add", "/positions/-", 3),
+    ]
+    assert agent._current_shrunk_states["StageState"] == _shrink(stage)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_sink_stores_a_transaction(
+    tmp_path: Path, recording_transport: RecordingTransport
+) -> None:
+    db_path = str(tmp_path / "state.db")
+    sink = SQLLiteSink(db_path=db_path)
+    await sink.ainitialize()
+    session = await sink.acreate_session([], [])
+
+    stage = StageState(positions=[1, 2])
+    await sink.adump_snapshot(
+        messages.StateSnapshot(
+            session_id=session, global_rev=0, snapshots={"StageState": _shrink(stage)}
+        )
+    )
+
+    agent = TransactionAgent(
+        transport=recording_transport, published=[], current_session=session
+    )
+    agent._current_shrunk_states["StageState"] = _shrink(stage)
+
+    holder = RecordingHolder()
+    with BasePublisher(holder), acquired_locks():
+        with state_transaction(stage):
+            stage.positions[0] = 7
+            stage.positions.append(3)
+            stage.label = "moved"
+
+    ((interface, patch),) = holder.patches
+    await agent._aprocess_patch_event(
+        QueuedPatchEvent(interface=interface, patch=patch)
+    )
+    for published in agent.published:
+        await sink.awrite_patch(published)
+
+    retriever = SQLLiteRetriever(db_path=db_path)
+    snapshot = await retriever.aget_state_at_global_rev(
+        agent.global_revision, "StageState", session
+    )
+    assert isinstance(snapshot, Snapshot)
+    assert snapshot.data == _shrink(stage)
@@ -7,6 +7,7 @@ closes it — after flushing whatever is still queued.
 """
 
 import asyncio
+import json
 from typing import AsyncIterator, List, cast
 
 import pytest
@@ -16,7 +17,11 @@ from websockets.frames import Close
 
 from rekuest_next import messages
 from rekuest_next.agents.transport.errors import AgentWasKicked
-from rekuest_next.agents.transport.websocket import KICK_CODE, WebsocketAgentTransport
+from rekuest_next.agents.transport.websocket import (
+    BOUNCED_CODE,
+    KICK_CODE,
+    WebsocketAgentTransport,
+)
 
 
 DROP = object()
@@ -247,3 +252,101 @@ async def test_adisconnect_without_a_live_socket_does_not_hang() -> None:
         await asyncio.wait_for(transport.adisconnect(), timeout=1)
 
     assert transport._send_queue.qsize() == 1, "The message has nowhere to go"
+
+
+def test_retry_delay_backs_off_exponentially_with_full_jitter() -> None:
+    transport = WebsocketAgentTransport(
+        endpoint_url="ws://localhost:8000/agi",
+        token_loader=_token,
+        time_between_retries=1,
+        max_time_between_retries=10,
+        jitter=False,
+    )
+    assert [transport.retry_delay(retry) for retry in range(6)] == [
+        1,
+        2,
+        4,
+        8,
+        10,
+        10,
+    ]
+
+    transport.jitter = True
+    delays = [transport.retry_delay(3) for _ in range(200)]
+    assert all(0 <= delay <= 8 for delay in delays)
+    assert len(set(delays)) > 1, "Jittered delays should differ"
+
+
+@pytest.mark.asyncio
+async def test_a_bounce_reconnects_at_once_with_the_cached_token(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    first, second = FakeSocket(), FakeSocket()
+    sockets = iter([first, second])
+    monkeypatch.setattr(
+        websockets, "connect", lambda *args, **kwargs: FakeConnect(next(sockets))
+    )
+    loads = 0
+
+    async def counting_token() -> str:
+        nonlocal loads
+        loads += 1
+        return "token"
+
+    transport = WebsocketAgentTransport(
+        endpoint_url="ws://localhost:8000/agi",
+        token_loader=counting_token,
+        time_between_retries=60,
+    )
+
+    async with transport as transport:
+        await transport.aconnect()
+        await asyncio.sleep(0.05)
+        first.feed(messages.Init(agent="agent-1"))
+        await asyncio.sleep(0.05)
+
+        first.drop(code=BOUNCED_CODE)
+        await asyncio.sleep(0.1)
+
+        assert second.sent, "A bounce should be retried without the backoff delay"
+        assert loads == 1, "The token should be reused for the reconnect"
+        metrics = transport.reconnect_metrics
+        assert (metrics.connects, metrics.reconnects) == (2, 1)
+        assert metrics.last_reconnect_latency is not None
+        assert metrics.last_reconnect_latency < 1
+
+        await transport.adisconnect()
+
+
+@pytest.mark.asyncio
+async def test_a_close_before_the_init_reloads_the_token(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    first, second = FakeSocket(), FakeSocket()
+    sockets = iter([first, second])
+    monkeypatch.setattr(
+        websockets, "connect", lambda *args, **kwargs: FakeConnect(next(sockets))
+    )
+    tokens = iter(["expired", "fresh"])
+
+    async def rotating_token() -> str:
+        return next(tokens)
+
+    transport = WebsocketAgentTransport(
+        endpoint_url="ws://localhost:8000/agi",
+        token_loader=rotating_token,
+        time_between_retries=0,
+    )
+
+    async with transport as transport:
+        await transport.aconnect()
+        await asyncio.sleep(0.05)
+
+        # The backend rejects the token in the Register with a close code
+        first.drop(code=1008)
+        await asyncio.sleep(0.1)
+
+        registers = [json.loads(socket.sent[0]) for socket in (first, second)]
+        assert [register["token"] for register in registers] == ["expired", "fresh"]
+
+        await transport.adisconnect()
@@ -0,0 +1,187 @@
+"""Tests for the binary wire encodings of agent messages."""
+
+import array
+import asyncio
+from typing import List
+
+import pytest
+import websockets
+
+from rekuest_next import messages
+from rekuest_next.agents.transport.encoding import (
+    NDARRAY_KEY,
+    decode_payload,
+    encode_message,
+)
+from rekuest_next.agents.transport.websocket import WebsocketAgentTransport
+from rekuest_next.contrib.fastapi.agent import (
+    FastAPIConnectionManager,
+    _WebSocketSubscriptions,
+)
+from .test_transport_lifecycle import FakeConnect, FakeSocket, _token
+
+
+class FakeArray:
+    """Quacks like an ndarray: a dtype, a shape and its raw bytes."""
+
+    def __init__(self, values: List[float]) -> None:
+        self.data = array.array("d", values)
+        self.shape = (len(values),)
+        self.dtype = type("dtype", (), {"str": "<f8"})()
+
+    def tobytes(self) -> bytes:
+        return self.data.tobytes()
+
+
+class RecordingWebSocket:
+    """Records the frames a connection manager sends."""
+
+    def __init__(self) -> None:
+        self.frames: List[str | bytes] = []
+
+    async def send_text(self, data: str) -> None:
+        self.frames.append(data)
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.frames.append(data)
+
+
+@pytest.fixture(params=[messages.WireEncoding.MSGPACK, messages.WireEncoding.CBOR])
+def encoding(request: pytest.FixtureRequest) -> messages.WireEncoding:
+    pytest.importorskip(
+        "msgpack" if request.param == messages.WireEncoding.MSGPACK else "cbor2"
+    )
+    return request.param
+
+
+def test_json_encoding_is_unchanged() -> None:
+    message = messages.Yield(task="task-1", returns={"x": [1, 2]})
+    assert (
+        encode_message(message, messages.WireEncoding.JSON) == message.model_dump_json()
+    )
+
+
+def test_binary_roundtrip_keeps_bytes_and_arrays(
+    encoding: messages.WireEncoding,
+) -> None:
+    message = messages.Yield(
+        task="task-1",
+        returns={"raw": b"\x00\x01\x02", "trace": FakeArray([1.0, 2.5]), "n": 3},
+    )
+
+    payload = encode_message(message, encoding)
+    assert isinstance(payload, bytes)
+
+    decoded = decode_payload(payload, encoding)
+    assert decoded["type"] == "YIELD"
+    assert decoded["returns"]["raw"] == b"\x00\x01\x02"
+    assert decoded["returns"]["n"] == 3
+    packed = decoded["returns"]["trace"][NDARRAY_KEY]
+    assert packed["dtype"] == "<f8" and packed["shape"] == [2]
+    assert array.array("d", packed["data"]).tolist() == [1.0, 2.5]
+
+
+def test_binary_messages_validate(encoding: messages.WireEncoding) -> None:
+    snapshot = messages.StateSnapshot(
+        session_id="session-1", global_rev=3, snapshots={"stage": {"x": [1.0]}}
+    )
+    decoded = decode_payload(encode_message(snapshot, encoding), encoding)
+    assert messages.StateSnapshot.model_validate(decoded) == snapshot
+
+
+def test_text_frames_are_always_json(encoding: messages.WireEncoding) -> None:
+    init = messages.Init(agent="agent-1")
+    assert decode_payload(init.model_dump_json(), encoding)["agent"] == "agent-1"
+
+
+@pytest.mark.asyncio
+async def test_transport_switches_encoding_once_granted(
+    encoding: messages.WireEncoding, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    socket = FakeSocket()
+    monkeypatch.setattr(
+        websockets, "connect", lambda *args, **kwargs: FakeConnect(socket)
+    )
+    transport = WebsocketAgentTransport(
+        endpoint_url="ws://localhost:8000/agi", token_loader=_token, encoding=encoding
+    )
+
+    async with transport as transport:
+        await transport.aconnect()
+        await asyncio.sleep(0.05)
+
+        await transport.asend(messages.HeartbeatEvent())
+        socket.feed(messages.Init(agent="agent-1", encoding=encoding))
+        await asyncio.sleep(0.05)
+        await transport.asend(messages.HeartbeatEvent())
+        await asyncio.sleep(0.05)
+
+        register, before, after = socket.sent
+        assert isinstance(register, str) and encoding.value in register
+        assert isinstance(before, str), "Nothing is binary before the Init grants it"
+        assert isinstance(after, bytes)
+        assert decode_payload(after, encoding)["type"] == "HEARTBEAT_ANSWER"
+
+        await transport.adisconnect()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_starts_over_in_json(
+    encoding: messages.WireEncoding, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first, second = FakeSocket(), FakeSocket()
+    sockets = iter([first, second])
+    monkeypatch.setattr(
+        websockets, "connect", lambda *args, **kwargs: FakeConnect(next(sockets))
+    )
+    transport = WebsocketAgentTransport(
+        endpoint_url="ws://localhost:8000/agi",
+        token_loader=_token,
+        encoding=encoding,
+        time_between_retries=0,
+    )
+
+    async with transport as transport:
+        await transport.aconnect()
+        await asyncio.sleep(0.05)
+        first.feed(messages.Init(agent="agent-1", encoding=encoding))
+        await asyncio.sleep(0.05)
+
+        first.drop()
+        await asyncio.sleep(0.05)
+        # Queued while the granted encoding was still the last one seen
+        await transport.asend(messages.HeartbeatEvent())
+        await asyncio.sleep(0.1)
+
+        register, queued = second.sent
+        assert isinstance(register, str) and encoding.value in register
+        assert isinstance(queued, str), "A new connection is JSON until its Init"
+        assert decode_payload(queued, messages.WireEncoding.JSON)["type"] == (
+            "HEARTBEAT_ANSWER"
+        )
+
+        second.feed(messages.Init(agent="agent-1", encoding=encoding))
+        await asyncio.sleep(0.05)
+        await transport.asend(messages.HeartbeatEvent())
+        await asyncio.sleep(0.05)
+        assert isinstance(second.sent[-1], bytes)
+
+        await transport.adisconnect()
+
+
+@pytest.mark.asyncio
+async def test_connection_manager_encodes_per_connection(
+    encoding: messages.WireEncoding,
+) -> None:
+    manager = FastAPIConnectionManager()
+    text, binary = RecordingWebSocket(), RecordingWebSocket()
+    await manager.connect(text, _WebSocketSubscriptions())  # type: ignore[arg-type]
+    await manager.connect(binary, _WebSocketSubscriptions(encoding=encoding))  # type: ignore[arg-type]
+
+    message = messages.Lock(key="stage", task="task-1")
+    await manager.broadcast_model(message)
+
+    assert text.frames == [message.model_dump_json()]
+    (frame,) = binary.frames
+    assert isinstance(frame, bytes)
+    assert messages.Lock.model_validate(decode_payload(frame, encoding)) == message
@@ -0,0 +1,111 @@
+"""Tests for offloading oversized yield returns to the datalayer."""
+
+from pathlib import Path
+
+import pytest
+
+from rekuest_next import messages
+from rekuest_next.agents.base import BaseAgent
+from rekuest_next.datalayer import LocalDataLayer
+from rekuest_next.definition.define import prepare_definition
+from rekuest_next.io.errors import DownloadError
+from rekuest_next.io.offload import OFFLOAD_KEY, afetch_returns, is_offloaded
+from rekuest_next.structures.registry import StructureRegistry
+from rekuest_next.structures.serialization.postman import aexpand_returns
+from .funcs import plain_basic_function
+from .conftest import RecordingTransport
+
+
+def _agent(
+    transport: RecordingTransport, datalayer: LocalDataLayer, threshold: int
+) -> BaseAgent:
+    return BaseAgent(
+        transport=transport,
+        offload_threshold=threshold,
+        datalayer=datalayer,
+    )
+
+
+@pytest.mark.asyncio
+async def test_small_yields_stay_inline(
+    tmp_path: Path, recording_transport: RecordingTransport
+) -> None:
+    agent = _agent(
+        recording_transport, LocalDataLayer(root=str(tmp_path)), threshold=1024
+    )
+
+    await agent._adispatch(messages.Yield(task="task-1", returns={"return0": "hi"}))
+
+    (sent,) = recording_transport.sent
+    assert sent.returns == {"return0": "hi"}
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_large_yields_carry_a_reference(
+    tmp_path: Path, recording_transport: RecordingTransport
+) -> None:
+    datalayer = LocalDataLayer(root=str(tmp_path))
+    agent = _agent(recording_transport, datalayer, threshold=1024)
+    returns = {"return0": "x" * 4096}
+
+    await agent._adispatch(messages.Yield(task="task-1", returns=returns))
+
+    (sent,) = recording_transport.sent
+    assert is_offloaded(sent.returns)
+    assert sent.returns[OFFLOAD_KEY]["size"] > 4096
+    assert sent.seq == 1
+    assert await afetch_returns(sent.returns, datalayer) == returns
+
+
+class FailingDataLayer(LocalDataLayer):
+    """A datalayer whose uploads always fail."""
+
+    async def aput_bytes(
+        self,
+        data: bytes,
+        file_name: str,
+        content_type: str = "application/octet-stream",
+    ) -> str:
+        raise ConnectionError("upload failed")
+
+
+@pytest.mark.asyncio
+async def test_failed_offloads_send_the_yield_inline(
+    tmp_path: Path, recording_transport: RecordingTransport
+) -> None:
+    agent = _agent(
+        recording_transport, FailingDataLayer(root=str(tmp_path)), threshold=1024
+    )
+    returns = {"return0": "x" * 4096}
+
+    await agent._adispatch(messages.Yield(task="task-1", returns=returns))
+
+    (sent,) = recording_transport.sent
+    assert sent.returns == returns
+
+
+@pytest.mark.asyncio
+async def test_expand_returns_fetches_offloaded_returns(
+    tmp_path: Path,
+    simple_registry: StructureRegistry,
+    recording_transport: RecordingTransport,
+) -> None:
+    definition = prepare_definition(
+        plain_basic_function, structure_registry=simple_registry
+    )
+    agent = _agent(
+        recording_transport, LocalDataLayer(root=str(tmp_path)), threshold=16
+    )
+    await agent._adispatch(
+        messages.Yield(task="task-1", returns={"return0": "hallo" * 10})
+    )
+    (sent,) = recording_transport.sent
+
+    with pytest.raises(DownloadError):
+        await aexpand_returns(definition, sent.returns, simple_registry)
+
+    async with LocalDataLayer(root=str(tmp_path)):
+        assert await aexpand_returns(definition, sent.returns, simple_registry) == (
+            "hallo" * 10,
+        )